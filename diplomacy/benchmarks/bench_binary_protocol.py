@@ -0,0 +1,105 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for websocket protocols: JSON text frames versus binary protocol.
+
+Encodes and decodes network data built from a played game (a GameProcessed notification,
+a GamePhaseUpdate notification, and a SetOrders request), and reports
+frame sizes and encoding / decoding times for each protocol. Requires package `msgpack`.
+
+.. code-block:: bash
+
+    python benchmarks/bench_binary_protocol.py --years 10 --messages 100
+"""
+import argparse
+
+import ujson as json
+
+from bench_utils import play_random_game, timeit
+from diplomacy.communication import binary_protocol, notifications, requests
+from diplomacy.engine.message import Message
+from diplomacy.utils import strings
+
+
+def build_samples(args):
+    """Return a list of couples (label, network data) to encode."""
+    game = play_random_game(nb_years=args.years)
+    for index in range(args.messages):
+        game.add_message(
+            Message(
+                sender="FRANCE",
+                recipient="ENGLAND" if index % 2 else "GLOBAL",
+                message="Message %d" % index,
+                phase=game.current_short_phase,
+                time_sent=index + 1,
+            )
+        )
+    phase_data = game.get_phase_data()
+    address = {"token": "token", "game_id": game.game_id, "game_role": "FRANCE"}
+    return [
+        (
+            "game processed",
+            notifications.GameProcessed(
+                previous_phase_data=phase_data, current_phase_data=phase_data, **address
+            ),
+        ),
+        (
+            "game state",
+            notifications.GamePhaseUpdate(
+                phase_data=game.get_phase_data(), phase_data_type=strings.STATE, **address
+            ),
+        ),
+        (
+            "set orders",
+            requests.SetOrders(phase="S1901M", orders=["A PAR - BUR", "F BRE - MAO"], **address),
+        ),
+    ]
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for websocket protocols.")
+    parser.add_argument("--years", type=int, default=10, help="number of years played in game")
+    parser.add_argument("--messages", type=int, default=100, help="number of messages in phase")
+    parser.add_argument("--repeat", type=int, default=20, help="encodings per sample")
+    args = parser.parse_args()
+    if not binary_protocol.is_available():
+        parser.error("Package msgpack is required for binary protocol.")
+
+    for label, data in build_samples(args):
+        json_dict = data.to_dict()
+        json_frame = json.dumps(json_dict)
+        binary_frame = binary_protocol.encode(json_dict)
+        for protocol, encode, decode, frame in (
+            ("json", json.dumps, json.loads, json_frame),
+            ("binary", binary_protocol.encode, binary_protocol.decode, binary_frame),
+        ):
+            encoding = timeit(lambda: [encode(json_dict) for _ in range(args.repeat)], repeat=20)
+            decoding = timeit(lambda: [decode(frame) for _ in range(args.repeat)], repeat=20)
+            print(
+                "%-14s %-6s: %7d bytes, encode %.3f ms, decode %.3f ms"
+                % (
+                    label,
+                    protocol,
+                    len(frame.encode("utf-8") if isinstance(frame, str) else frame),
+                    encoding * 1000 / args.repeat,
+                    decoding * 1000 / args.repeat,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
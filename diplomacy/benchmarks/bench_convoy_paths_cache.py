@@ -0,0 +1,87 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark convoy paths cache loading and building.
+
+Measures:
+
+- **import**: time to import diplomacy.engine.map in a new process (no convoy paths are loaded).
+- **load**: time to load convoy paths of each map from its cache file.
+- **build**: time to build cache files for given maps in a temporary directory,
+  with one process and with the number of processes requested.
+
+.. code-block:: bash
+
+    python benchmarks/bench_convoy_paths_cache.py
+    python benchmarks/bench_convoy_paths_cache.py --maps standard modern ancmed --processes 4
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+
+from diplomacy.utils import convoy_paths
+
+from bench_utils import timeit
+
+
+def time_import(repeat):
+    """Return best time (in seconds) to import diplomacy.engine.map in a new process."""
+    code = "import time; t = time.perf_counter(); import diplomacy.engine.map; "
+    code += "print(time.perf_counter() - t)"
+    return min(
+        float(subprocess.check_output([sys.executable, "-c", code]).decode().strip())
+        for _ in range(repeat)
+    )
+
+
+def time_build(map_names, nb_processes):
+    """Return time (in seconds) to build cache files for given maps in a new directory."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        convoy_paths.build_convoy_paths_caches(
+            map_names, nb_processes=nb_processes, force=True, cache_dir=cache_dir
+        )
+        return time.perf_counter() - start
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark convoy paths cache.")
+    parser.add_argument("--maps", nargs="+", default=["standard", "modern", "ancmed", "pure"])
+    parser.add_argument("--processes", type=int, default=None, help="processes for build")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs per measure")
+    args = parser.parse_args()
+
+    print("import diplomacy.engine.map: %.2f ms" % (time_import(args.repeat) * 1000))
+    for map_name in args.maps:
+
+        def load():
+            convoy_paths.CONVOYS_PATH_CACHE.clear()
+            convoy_paths.load_convoy_paths(map_name)
+
+        load()  # Build cache file if missing.
+        print("load %-10s %.2f ms" % (map_name, timeit(load, repeat=args.repeat) * 1000))
+    print("build (1 process): %.2f s" % time_build(args.maps, 1))
+    print(
+        "build (%s processes): %.2f s"
+        % (args.processes or "all", time_build(args.maps, args.processes))
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for DAIDE token encoding and decoding.
+
+Loads DAIDE communications from CSV files in `diplomacy/daide/tests` (requests sent by
+clients, responses and notifications sent by server), then measures throughput of:
+
+- requests: encoding DAIDE strings to bytes and parsing bytes into DAIDE requests.
+- responses: encoding DAIDE strings to bytes and decoding bytes back to strings.
+
+.. code-block:: bash
+
+    python benchmarks/bench_daide_codec.py --repeat 5
+"""
+import argparse
+import glob
+import os
+
+from bench_utils import timeit
+from diplomacy.daide.requests import RequestBuilder
+from diplomacy.daide.utils import bytes_to_str, str_to_bytes
+
+CORPORA_PATTERN = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "diplomacy", "daide", "tests", "*.csv"
+)
+
+
+def load_corpora():
+    """Return DAIDE requests and responses found in test CSV files, as 2 lists of strings."""
+    daide_requests, daide_responses = [], []
+    for file_name in sorted(glob.glob(CORPORA_PATTERN)):
+        with open(file_name, "r") as file:
+            for line in file.read().split("\n"):
+                if line.startswith("#") or not line:
+                    continue
+                _, request, *resp_notifs = line.split(",")
+                if request:
+                    daide_requests.append(request)
+                daide_responses.extend(resp_notif for resp_notif in resp_notifs if resp_notif)
+    # Keep only requests that can be parsed.
+    parsable_requests = []
+    for request in daide_requests:
+        try:
+            RequestBuilder.from_bytes(str_to_bytes(request))
+        except (AssertionError, ValueError, RuntimeError):
+            continue
+        parsable_requests.append(request)
+    return parsable_requests, daide_responses
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for DAIDE token codec.")
+    parser.add_argument("--repeat", type=int, default=5, help="number of passes over corpora")
+    args = parser.parse_args()
+    daide_requests, daide_responses = load_corpora()
+    request_bytes = [str_to_bytes(request) for request in daide_requests]
+    response_bytes = [str_to_bytes(response) for response in daide_responses]
+    nb_request_tokens = sum(len(data) // 2 for data in request_bytes) * args.repeat
+    nb_response_tokens = sum(len(data) // 2 for data in response_bytes) * args.repeat
+
+    def parse_requests():
+        for _ in range(args.repeat):
+            for request in daide_requests:
+                str(RequestBuilder.from_bytes(str_to_bytes(request)))
+
+    def encode_decode_responses():
+        for _ in range(args.repeat):
+            for response in daide_responses:
+                bytes_to_str(str_to_bytes(response))
+
+    for label, function, nb_tokens, count in (
+        ("requests", parse_requests, nb_request_tokens, len(daide_requests)),
+        ("responses", encode_decode_responses, nb_response_tokens, len(daide_responses)),
+    ):
+        duration = timeit(function, repeat=5)
+        print(
+            "%-9s: %5d messages, %.2f ms per pass, %.2f M tokens/s"
+            % (label, count, duration * 1000 / args.repeat, nb_tokens / duration / 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for Game.filter_messages(): messages scan versus indexed message store.
+
+Builds a press game phase with ``--messages`` messages exchanged between 7 powers
+(mostly private messages, some global messages and some suggestions), then measures time
+to filter messages for every power, observers and omniscient observers, as server does
+when sending a phase to all game roles.
+
+.. code-block:: bash
+
+    python benchmarks/bench_filter_messages.py --messages 10000
+"""
+import argparse
+import random
+
+import ujson as json
+
+from bench_utils import timeit
+from diplomacy.engine.game import Game
+from diplomacy.engine.message import GLOBAL, Message
+from diplomacy.utils import strings
+from diplomacy.utils.message_store import MessageStore
+from diplomacy.utils.sorted_dict import SortedDict
+
+POWER_NAMES = ["AUSTRIA", "ENGLAND", "FRANCE", "GERMANY", "ITALY", "RUSSIA", "TURKEY"]
+GAME_ROLES = POWER_NAMES + [strings.OBSERVER_TYPE, strings.OMNISCIENT_TYPE]
+
+
+def build_messages(count, seed=0):
+    """Return a dictionary {timestamp => message} for a press game phase."""
+    rng = random.Random(seed)
+    messages = {}
+    for index in range(count):
+        sender = rng.choice(POWER_NAMES)
+        draw = rng.random()
+        if draw < 0.1:
+            recipient, message_type, body = GLOBAL, None, "Message %d" % index
+        elif draw < 0.2:
+            recipient = sender
+            message_type = strings.SUGGESTED_MESSAGE
+            body = json.dumps({"recipient": rng.choice(POWER_NAMES), "payload": index})
+        else:
+            recipient, message_type, body = rng.choice(POWER_NAMES), None, "Message %d" % index
+        messages[index + 1] = Message(
+            sender=sender,
+            recipient=recipient,
+            message=body,
+            phase="S1901M",
+            time_sent=index + 1,
+            type=message_type,
+        )
+    return messages
+
+
+def filter_for_all_roles(messages, timestamp_from=None):
+    """Filter messages for all game roles."""
+    for game_role in GAME_ROLES:
+        Game.filter_messages(messages, game_role, timestamp_from)
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for Game.filter_messages().")
+    parser.add_argument("--messages", type=int, default=10000, help="number of messages in phase")
+    args = parser.parse_args()
+
+    messages = build_messages(args.messages)
+    recent = args.messages - args.messages // 100
+    for label, container in (
+        ("sorted dict", SortedDict(int, Message, messages)),
+        ("message store", MessageStore(messages)),
+    ):
+        duration_all = timeit(lambda: filter_for_all_roles(container))
+        duration_recent = timeit(lambda: filter_for_all_roles(container, recent))
+        print(
+            "%-14s: all messages %.2f ms, last 1%% messages %.2f ms"
+            % (label, duration_all * 1000, duration_recent * 1000)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark Game.fork() against deepcopy() on a late-game state.
+
+Measures the time to clone a game, and the time to clone a game then
+set orders and process one phase on the clone (typical what-if evaluation).
+
+.. code-block:: bash
+
+    python benchmarks/bench_game_fork.py --years 20
+"""
+import argparse
+from copy import deepcopy
+
+from bench_utils import play_random_game, timeit
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark Game.fork() against deepcopy().")
+    parser.add_argument(
+        "--years", type=int, default=20, help="number of years played before cloning"
+    )
+    parser.add_argument("--clones", type=int, default=5, help="number of clones per measure")
+    parser.add_argument("--map", default="standard", help="map name")
+    args = parser.parse_args()
+
+    game = play_random_game(args.map, args.years, seed=0)
+    possible_orders = game.get_all_possible_orders()
+    orders = {
+        power_name: [possible_orders[loc][0] for loc in game.get_orderable_locations(power_name)]
+        for power_name in game.powers
+    }
+    print(
+        "Game at phase %s with %d phases in history."
+        % (game.get_current_phase(), len(game.state_history))
+    )
+
+    def clone_and_process(clone_function):
+        for _ in range(args.clones):
+            clone = clone_function(game)
+            for power_name, power_orders in orders.items():
+                clone.set_orders(power_name, power_orders)
+            clone.process()
+
+    print("%-10s %18s %24s" % ("method", "clone (ms/clone)", "clone+process (ms/clone)"))
+    for name, clone_function in (("deepcopy", deepcopy), ("fork", lambda game: game.fork())):
+        clone_time = timeit(lambda: [clone_function(game) for _ in range(args.clones)], repeat=1)
+        process_time = timeit(lambda: clone_and_process(clone_function), repeat=1)
+        print(
+            "%-10s %18.3f %24.3f"
+            % (name, clone_time * 1000 / args.clones, process_time * 1000 / args.clones)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Load test for server games processing: games processed in server IO loop
+versus games adjudicated in worker processes.
+
+Creates ``--games`` active server games (each played for ``--years`` years with random orders),
+sets random orders for all of them, then processes all games at once as if they all reached
+their deadline. Meanwhile, a probe measures IO loop latency, i.e. delay before a trivial request
+could be handled by server.
+
+.. code-block:: bash
+
+    python benchmarks/bench_game_processing.py --games 100 --workers 4
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+from tornado.queues import Queue
+
+from bench_utils import play_random_game
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+def create_games(server, args):
+    """Add given number of active games to server, with random orders set for current phase."""
+    rng = random.Random(0)
+    game_dict = play_random_game(nb_years=args.years).to_dict()
+    games = []
+    for _ in range(args.games):
+        server_game = ServerGame.from_dict(game_dict)
+        server_game.game_id = server.create_game_id()
+        server_game.server = server
+        server_game.rules = ["NO_DEADLINE", "POWER_CHOICE"]
+        server_game.set_status(strings.ACTIVE)
+        possible_orders = server_game.get_all_possible_orders()
+        for power_name in server_game.powers:
+            server_game.set_orders(
+                power_name,
+                [
+                    rng.choice(possible_orders[loc])
+                    for loc in server_game.get_orderable_locations(power_name)
+                    if possible_orders[loc]
+                ],
+            )
+        server.games.add(server_game.game_id, server_game)
+        games.append(server_game)
+    return games
+
+
+def percentile(values, ratio):
+    """Return given percentile (ratio between 0 and 1) of given values."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(ratio * len(values)))]
+
+
+@gen.coroutine
+def process_all_games(server, games):
+    """Process all given games like server scheduler does, and return a couple
+    (IO loop latencies in seconds, total processing time in seconds).
+    """
+    queue = Queue()
+    for server_game in games:
+        queue.put_nowait(server_game)
+    latencies = []
+    done = []
+
+    @gen.coroutine
+    def probe():
+        while True:
+            start = time.perf_counter()
+            yield gen.sleep(0)
+            latencies.append(time.perf_counter() - start)
+            if done:
+                break
+
+    @gen.coroutine
+    def consume():
+        while queue.qsize():
+            server_game = queue.get_nowait()
+            yield server._process_game(server_game)  # pylint: disable=protected-access
+
+    probe()
+    start = time.perf_counter()
+    yield [consume() for _ in range(max(1, server.processing_workers))]
+    duration = time.perf_counter() - start
+    done.append(True)
+    # Let probe get its latest measure.
+    yield gen.sleep(0.01)
+    return latencies, duration
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Load test for server games processing.")
+    parser.add_argument("--games", type=int, default=100, help="number of games to process")
+    parser.add_argument("--years", type=int, default=10, help="number of years played per game")
+    parser.add_argument("--workers", type=int, default=4, help="number of worker processes")
+    args = parser.parse_args()
+
+    print("games processed at once: %d" % args.games)
+    for workers in (0, args.workers):
+        with tempfile.TemporaryDirectory() as server_dir:
+            server = Server(server_dir, processing_workers=workers)
+            games = create_games(server, args)
+            if workers:
+                # Start worker processes before measuring.
+                IOLoop.current().run_sync(lambda: process_all_games(server, games[:workers]))
+                games = create_games(server, args)
+            latencies, duration = IOLoop.current().run_sync(
+                lambda: process_all_games(server, games)
+            )
+            if server.processing_pool:
+                server.processing_pool.shutdown()
+            Server.__cache__.pop(server_dir)
+        print(
+            "%-22s : loop latency p50 %.2f ms, p99 %.2f ms, max %.2f ms, total %.0f ms"
+            % (
+                "workers = %d" % workers,
+                percentile(latencies, 0.5) * 1000,
+                percentile(latencies, 0.99) * 1000,
+                max(latencies) * 1000,
+                duration * 1000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
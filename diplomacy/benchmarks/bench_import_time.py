@@ -0,0 +1,84 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark import time of diplomacy modules, using ``python -X importtime``.
+
+Each statement is run in a new Python process. For each statement, prints best cumulative
+import time of imported diplomacy top-level modules, and the slowest imported modules.
+
+.. code-block:: bash
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --statements "import diplomacy.daide.server" --top 20
+"""
+import argparse
+import subprocess
+import sys
+
+DEFAULT_STATEMENTS = [
+    "import diplomacy",
+    "from diplomacy import Game; Game()",
+    "from diplomacy import Game; Game().get_all_possible_orders()",
+    "from diplomacy import Server",
+    "from diplomacy import connect",
+    "import diplomacy.daide.server",
+]
+
+
+def import_times(statement):
+    """Run given statement in a new process with -X importtime.
+
+    :return: a dictionary {module name => (self time, cumulative time)} in microseconds,
+        for modules imported while running statement.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative_time, module_name = line[len("import time:") :].split("|")
+        if not self_time.strip().isdigit():
+            continue  # Header line
+        times[module_name.strip()] = (int(self_time), int(cumulative_time))
+    return times
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark import time of diplomacy modules.")
+    parser.add_argument("--statements", nargs="+", default=DEFAULT_STATEMENTS)
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs per statement")
+    parser.add_argument("--top", type=int, default=5, help="number of slowest modules to print")
+    args = parser.parse_args()
+
+    for statement in args.statements:
+        runs = [import_times(statement) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: sum(times[name][1] for name in times if "." not in name))
+        total = sum(cumulative for name, (_, cumulative) in best.items() if "." not in name)
+        print("%s: %.2f ms (%d modules)" % (statement, total / 1000, len(best)))
+        print("    tornado imported: %s" % ("tornado" in best))
+        slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+        for name, (self_time, _) in slowest:
+            print("    %8.2f ms  %s" % (self_time / 1000, name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for Jsonable (de)serialization of requests and notifications.
+
+Round-trips (build, to_dict, JSON dump and load, from_dict) a set of requests and notifications
+built from a played game, using:
+
+- reference implementation: models walked with functions from module `parsing`
+  (as Jsonable did before models were compiled). Nested Jsonable objects (e.g. messages in
+  phase data) are still converted with their compiled models.
+- compiled models (default Jsonable behavior).
+- compiled models with objects built in trusted context.
+
+.. code-block:: bash
+
+    python benchmarks/bench_jsonable.py --years 10 --messages 100
+"""
+import argparse
+import uuid
+
+import ujson as json
+
+from bench_utils import play_random_game, timeit
+from diplomacy.communication import notifications, requests
+from diplomacy.engine.message import Message
+from diplomacy.utils import parsing, strings
+from diplomacy.utils.jsonable import trusted
+
+
+def reference_build(cls, kwargs):
+    """Build a network data object as Jsonable.__init__() did before models were compiled."""
+    model = cls.get_model()
+    updated_kwargs = {model_key: None for model_key in model}
+    updated_kwargs.update(kwargs)
+    updated_kwargs[strings.NAME] = updated_kwargs[strings.NAME] or cls.get_class_name()
+    updated_kwargs[cls.id_field] = updated_kwargs[cls.id_field] or str(uuid.uuid4())
+    parsing.validate_data(updated_kwargs, model)
+    parsing.update_data(updated_kwargs, model)
+    with trusted():
+        # Skip compiled validation and update (values are already updated).
+        return cls(**updated_kwargs)
+
+
+def reference_to_dict(obj):
+    """Convert a Jsonable object to a dictionary walking its model."""
+    return {
+        key: parsing.to_json(getattr(obj, key), key_type)
+        for key, key_type in obj.get_model().items()
+    }
+
+
+def reference_from_dict(cls, json_dict):
+    """Build a Jsonable object from a dictionary walking its model."""
+    kwargs = {
+        key: parsing.to_type(json_dict.get(key, None), key_type)
+        for key, key_type in cls.get_model().items()
+    }
+    return reference_build(cls, kwargs)
+
+
+def build_samples(args):
+    """Return a list of couples (class, kwargs) for requests and notifications to round-trip."""
+    game = play_random_game(nb_years=args.years)
+    for index in range(args.messages):
+        game.add_message(
+            Message(
+                sender="FRANCE",
+                recipient="ENGLAND" if index % 2 else "GLOBAL",
+                message="Message %d" % index,
+                phase=game.current_short_phase,
+                time_sent=index + 1,
+            )
+        )
+    phase_data = game.get_phase_data()
+    address = {"token": "token", "game_id": game.game_id, "game_role": "FRANCE"}
+    message = game.messages.first_value()
+    return [
+        (
+            notifications.GameProcessed,
+            dict(address, previous_phase_data=phase_data, current_phase_data=phase_data),
+        ),
+        (notifications.GameMessageReceived, dict(address, message=message)),
+        (notifications.PowerOrdersUpdate, dict(address, power_name="FRANCE", orders=["A PAR H"])),
+        (requests.SendGameMessage, dict(address, phase="S1901M", message=message)),
+        (requests.SetOrders, dict(address, phase="S1901M", orders=["A PAR H", "F BRE - MAO"])),
+        (requests.Synchronize, dict(address, phase="S1901M", timestamp=10)),
+    ]
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for Jsonable serialization.")
+    parser.add_argument("--years", type=int, default=10, help="number of years played in game")
+    parser.add_argument("--messages", type=int, default=100, help="number of messages in phase")
+    parser.add_argument("--repeat", type=int, default=20, help="round-trips per sample")
+    args = parser.parse_args()
+    samples = build_samples(args)
+
+    def run_reference():
+        for cls, kwargs in samples:
+            for _ in range(args.repeat):
+                obj = reference_build(cls, kwargs)
+                reference_from_dict(cls, json.loads(json.dumps(reference_to_dict(obj))))
+
+    def run_compiled():
+        for cls, kwargs in samples:
+            for _ in range(args.repeat):
+                obj = cls(**kwargs)
+                cls.from_dict(json.loads(json.dumps(obj.to_dict())))
+
+    def run_trusted():
+        for cls, kwargs in samples:
+            for _ in range(args.repeat):
+                with trusted():
+                    obj = cls(**kwargs)
+                cls.from_dict(json.loads(json.dumps(obj.to_dict())))
+
+    for label, function in (
+        ("reference", run_reference),
+        ("compiled", run_compiled),
+        ("compiled + trusted", run_trusted),
+    ):
+        print("%-18s : %.2f ms" % (label, timeit(function, repeat=20) * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for listing server games: loading every game from disk versus games index.
+
+Creates ``--games`` games on disk (each played for ``--phases`` phases with a few messages),
+then measures time to answer a games list query either by loading each game from disk
+(previous ``on_list_games`` behavior) or by filtering summaries in a GameIndex.
+
+.. code-block:: bash
+
+    python benchmarks/bench_list_games.py --games 500
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from diplomacy.engine.message import Message
+from diplomacy.server.game_index import GameIndex
+from diplomacy.server.journal import GameJournal
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+def create_games(games_path, args):
+    """Save given number of games in given folder and return a games index for them."""
+    journal = GameJournal(games_path)
+    index = GameIndex(os.path.join(games_path, "..", "games_index.json"))
+    for _ in range(args.games):
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        server_game.set_status(strings.ACTIVE)
+        for phase_index in range(args.phases):
+            for message_index in range(5):
+                server_game.add_message(
+                    Message(
+                        sender="FRANCE",
+                        recipient="ENGLAND",
+                        message="Message %d" % message_index,
+                        phase=server_game.current_short_phase,
+                        time_sent=phase_index * 10 + message_index + 1,
+                    )
+                )
+            server_game.process()
+        journal.save(server_game.game_id, server_game.to_dict())
+        index.update(server_game)
+    index.save()
+    return journal, index
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for listing server games.")
+    parser.add_argument("--games", type=int, default=200, help="number of games on disk")
+    parser.add_argument("--phases", type=int, default=10, help="number of phases per game")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_path:
+        games_path = os.path.join(data_path, "games")
+        os.makedirs(games_path)
+        journal, index = create_games(games_path, args)
+        game_ids = [
+            filename[:-5] for filename in os.listdir(games_path) if filename.endswith(".json")
+        ]
+
+        start = time.perf_counter()
+        selected = []
+        for game_id in game_ids:
+            server_game = ServerGame.from_dict(journal.load(game_id))
+            if not server_game.registration_password:
+                selected.append(
+                    (server_game.game_id, server_game.get_controlled_power_names("user"))
+                )
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded_index = GameIndex(index.path)
+        loaded_index.load(games_path, None)
+        startup_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [
+            (summary.game_id, summary.get_controlled_power_names("user"))
+            for summary in loaded_index.select("user", include_protected=False)
+        ]
+        index_time = time.perf_counter() - start
+        assert sorted(selected) == sorted(indexed)
+
+    print("games listed           : %d" % len(selected))
+    print("load every game (ms)   : %.2f" % (load_time * 1000))
+    print("games index (ms)       : %.2f" % (index_time * 1000))
+    print("index loading (ms)     : %.2f  (once, at server startup)" % (startup_time * 1000))
+
+
+if __name__ == "__main__":
+    main()
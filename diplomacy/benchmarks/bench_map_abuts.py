@@ -0,0 +1,100 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark Map adjacency lookups and adjudication on standard, modern and world maps.
+
+For each map, measures:
+
+- **build cache**: time to build map caches (Map.build_cache()).
+- **abuts**: average time of a Map.abuts() call, over moves, supports and convoys
+  from all locations to their neighbours (including coasts).
+- **abut_list**: average time of a Map.abut_list() call with incl_no_coast=True.
+- **process**: time to adjudicate the first movement phase with random orders.
+
+.. code-block:: bash
+
+    python benchmarks/bench_map_abuts.py
+"""
+import argparse
+import random
+
+from diplomacy import Game
+
+from bench_utils import timeit
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark Map adjacency lookups.")
+    parser.add_argument("--repeat", type=int, default=5, help="number of runs per measure")
+    args = parser.parse_args()
+
+    print(
+        "%-10s %17s %12s %16s %13s"
+        % ("map", "build cache (ms)", "abuts (us)", "abut_list (us)", "process (ms)")
+    )
+    for map_name in ("standard", "modern", "world"):
+        game = Game(map_name=map_name)
+        this_map = game.map
+        locs = [loc.upper() for loc in this_map.locs]
+        queries = [
+            (unit_type, loc, order_type, dest)
+            for loc in locs
+            for dest in this_map.dest_with_coasts[loc]
+            for unit_type in ("A", "F")
+            for order_type in ("-", "S", "C")
+        ]
+        build_time = timeit(this_map.build_cache, repeat=args.repeat)
+        abuts_time = timeit(
+            lambda: [this_map.abuts(*query) for query in queries], repeat=args.repeat
+        )
+        abut_list_time = timeit(
+            lambda: [this_map.abut_list(loc, incl_no_coast=True) for loc in locs],
+            repeat=args.repeat,
+        )
+
+        # Adjudicating first movement phase with random orders
+        rng = random.Random(0)
+        possible_orders = game.get_all_possible_orders()
+        orders = {
+            power_name: [
+                rng.choice(possible_orders[loc])
+                for loc in game.get_orderable_locations(power_name)
+                if possible_orders[loc]
+            ]
+            for power_name in game.powers
+        }
+        games = []
+        for _ in range(args.repeat):
+            games.append(game.fork())
+            for power_name, power_orders in orders.items():
+                games[-1].set_orders(power_name, power_orders)
+        process_time = timeit(lambda: games.pop().process(), repeat=args.repeat)
+
+        print(
+            "%-10s %17.2f %12.3f %16.3f %13.2f"
+            % (
+                map_name,
+                build_time * 1000,
+                abuts_time * 1e6 / len(queries),
+                abut_list_time * 1e6 / len(locs),
+                process_time * 1000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for notifications sent when a server game is processed.
+
+Creates a game with one token per power and ``--observers`` observer tokens, all connected
+to fake connection handlers, then measures time to build and serialize (as sent on websockets)
+all notifications sent by Notifier.notify_game_processed().
+
+.. code-block:: bash
+
+    python benchmarks/bench_notify_game_processed.py --observers 200
+"""
+import argparse
+import tempfile
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from bench_utils import play_random_game, timeit
+from diplomacy.engine.message import Message
+from diplomacy.server.connection_handler import ConnectionHandler
+from diplomacy.server.notifier import Notifier
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils.network_data import NetworkData
+
+
+class FakeConnectionHandler:
+    """Connection handler serializing messages as ConnectionHandler.write_message() does."""
+
+    translate_notification = staticmethod(ConnectionHandler.translate_notification)
+
+    @staticmethod
+    def write_message(message):
+        """Return message as it would be sent on websocket."""
+        return message.json() if isinstance(message, NetworkData) else message
+
+
+def create_game(server, args):
+    """Create a server game with connected power and observer tokens."""
+    server_game = ServerGame.from_dict(play_random_game(nb_years=args.years).to_dict())
+    server_game.server = server
+    connection_handler = FakeConnectionHandler()
+    server.users.add_user("user", "")
+    for power in server_game.powers.values():
+        power.add_token(server.users.connect_user("user", connection_handler))
+    for _ in range(args.observers):
+        server_game.add_observer_token(server.users.connect_user("user", connection_handler))
+    for index in range(args.messages):
+        server_game.add_message(
+            Message(
+                sender="FRANCE",
+                recipient="ENGLAND" if index % 2 else "GLOBAL",
+                message="Message %d" % index,
+                phase=server_game.current_short_phase,
+                time_sent=index + 1,
+            )
+        )
+    return server_game
+
+
+@gen.coroutine
+def notify_and_send(server, server_game, previous_phase_data, current_phase_data):
+    """Notify game processed, then serialize all queued notifications."""
+    yield Notifier(server).notify_game_processed(
+        server_game, previous_phase_data, current_phase_data
+    )
+    while server.notifications.qsize():
+        connection_handler, notification = server.notifications.get_nowait()
+        connection_handler.write_message(notification)
+        server.notifications.task_done()
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for game processed notifications.")
+    parser.add_argument("--observers", type=int, default=200, help="number of observer tokens")
+    parser.add_argument("--years", type=int, default=10, help="number of years played in game")
+    parser.add_argument("--messages", type=int, default=50, help="number of messages in phase")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as server_dir:
+        server = Server(server_dir)
+        server_game = create_game(server, args)
+        previous_phase_data = server_game.get_phase_data()
+        current_phase_data = server_game.get_phase_data()
+        io_loop = IOLoop.current()
+        duration = timeit(
+            lambda: io_loop.run_sync(
+                lambda: notify_and_send(
+                    server, server_game, previous_phase_data, current_phase_data
+                )
+            ),
+            repeat=5,
+        )
+        Server.__cache__.pop(server_dir)
+    print("observers              : %d" % args.observers)
+    print("notify game processed  : %.2f ms" % (duration * 1000))
+
+
+if __name__ == "__main__":
+    main()
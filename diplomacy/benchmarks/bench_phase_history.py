@@ -0,0 +1,86 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark phase history storage with and without rule DELTA_HISTORY.
+
+Reports, for long games, memory used by game history, JSON save size,
+and time spent in to_dict(), from_dict() and get_phase_history().
+
+.. code-block:: bash
+
+    python benchmarks/bench_phase_history.py --years 30 --games 3
+"""
+import argparse
+
+import ujson as json
+
+from bench_utils import deep_sizeof, play_random_game, timeit
+from diplomacy import Game
+
+
+def measure_history_memory(game):
+    """Return number of bytes used by history fields of dictionaries in given game."""
+    seen = set()
+    return sum(
+        deep_sizeof(history, seen)
+        for history in (
+            game.state_history,
+            game.stance_history,
+            game.is_bot_history,
+            game.deceiving_history,
+        )
+    )
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark phase history storage.")
+    parser.add_argument("--years", type=int, default=30, help="number of years per game")
+    parser.add_argument("--games", type=int, default=3, help="number of games per mode")
+    parser.add_argument("--map", default="standard", help="map name")
+    args = parser.parse_args()
+
+    print(
+        "%-14s %8s %12s %12s %12s %12s %12s"
+        % (
+            "mode",
+            "phases",
+            "memory (KB)",
+            "json (KB)",
+            "to_dict (ms)",
+            "from_dict (ms)",
+            "history (ms)",
+        )
+    )
+    for mode, rules in (("full", None), ("delta", ["DELTA_HISTORY"])):
+        totals = [0.0] * 6
+        for seed in range(args.games):
+            game = play_random_game(args.map, args.years, rules=rules, seed=seed)
+            game_dict = game.to_dict()
+            totals[0] += len(game.state_history)
+            totals[1] += measure_history_memory(game) / 1024
+            totals[2] += len(json.dumps(game_dict)) / 1024
+            totals[3] += timeit(game.to_dict) * 1000
+            totals[4] += timeit(lambda: Game.from_dict(game_dict), repeat=3) * 1000
+            totals[5] += timeit(game.get_phase_history) * 1000
+        print(
+            "%-14s %8d %12.1f %12.1f %12.2f %12.2f %12.2f"
+            % (mode, *(total / args.games for total in totals))
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark Game.get_all_possible_orders() on standard, modern and world maps.
+
+For each map, measures:
+
+- **first call**: first call on a game state (average over movement phases of a random game).
+- **same state**: repeated calls on an unchanged game state.
+- **one unit moved**: calls after moving a single army to an adjacent empty province.
+
+.. code-block:: bash
+
+    python benchmarks/bench_possible_orders.py --years 10
+"""
+import argparse
+
+from bench_utils import play_random_game, timeit
+
+
+def _get_moved_units(game):
+    """Return a tuple (power name, units, units with one army moved to an adjacent empty province),
+    or None if no army can be moved.
+    """
+    occupied = {unit[2:5] for power in game.powers.values() for unit in power.units}
+    for power in game.powers.values():
+        for unit in power.units:
+            if unit[0] != "A":
+                continue
+            for dest in game.map.abut_list(unit[2:], incl_no_coast=True):
+                dest = dest.upper()
+                if dest not in occupied and game.map.is_valid_unit("A " + dest):
+                    moved_units = [
+                        "A " + dest if other_unit == unit else other_unit
+                        for other_unit in power.units
+                    ]
+                    return power.name, list(power.units), moved_units
+    return None
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark Game.get_all_possible_orders().")
+    parser.add_argument("--years", type=int, default=10, help="number of years to play")
+    parser.add_argument("--repeat", type=int, default=20, help="number of calls per measure")
+    args = parser.parse_args()
+
+    print(
+        "%-10s %7s %16s %16s %20s"
+        % ("map", "phases", "first call (ms)", "same state (ms)", "one unit moved (ms)")
+    )
+    for map_name in ("standard", "modern", "world"):
+        # Collecting games at each movement phase.
+        game = play_random_game(map_name, nb_years=0, seed=0)
+        phases = [
+            phase_data
+            for phase_data in play_random_game(map_name, args.years, seed=0).get_phase_history()
+            if phase_data.name.endswith("M")
+        ]
+        first_call_time = float("inf")
+        for _ in range(5):
+            games = []
+            for phase_data in phases:
+                game.set_phase_data(phase_data)
+                games.append(game.fork())
+            first_call_time = min(
+                first_call_time,
+                timeit(
+                    lambda: [current_game.get_all_possible_orders() for current_game in games],
+                    repeat=1,
+                ),
+            )
+
+        game = games[-1]
+        same_state_time = timeit(
+            lambda: [game.get_all_possible_orders() for _ in range(args.repeat)], repeat=1
+        )
+
+        power_name, units, moved_units = _get_moved_units(game)
+
+        def move_unit():
+            for _ in range(args.repeat // 2):
+                game.set_units(power_name, moved_units, reset=True)
+                game.get_all_possible_orders()
+                game.set_units(power_name, units, reset=True)
+                game.get_all_possible_orders()
+
+        moved_time = timeit(move_unit, repeat=1)
+        print(
+            "%-10s %7d %16.3f %16.3f %20.3f"
+            % (
+                map_name,
+                len(games),
+                first_call_time * 1000 / len(games),
+                same_state_time * 1000 / args.repeat,
+                moved_time * 1000 / (args.repeat // 2 * 2),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark SVG rendering, by rendering whole map (legacy) or by filling a template.
+
+For each map, plays a random game, then measures:
+
+- **init**: time to create a renderer (SVG is parsed once per process when using template).
+- **render**: average time to render current phase (Renderer.render()).
+- **render_phases**: time to render all phases of the game (Renderer.render_phases()).
+
+.. code-block:: bash
+
+    python benchmarks/bench_renderer.py --years 10
+"""
+import argparse
+
+from diplomacy.engine.renderer import Renderer
+
+from bench_utils import play_random_game, timeit
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark SVG rendering.")
+    parser.add_argument("--years", type=int, default=10, help="number of years to play")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per measure")
+    args = parser.parse_args()
+
+    print(
+        "%-10s %-9s %7s %10s %12s %19s"
+        % ("map", "mode", "phases", "init (ms)", "render (ms)", "render_phases (ms)")
+    )
+    for map_name in ("standard", "modern", "ancmed"):
+        game = play_random_game(map_name=map_name, nb_years=args.years)
+        phases = game.get_phase_history() + [game.get_phase_data()]
+        for use_template in (False, True):
+            init_time = timeit(lambda: Renderer(game, use_template=use_template), args.repeat)
+            renderer = Renderer(game, use_template=use_template)
+            render_time = timeit(lambda: [renderer.render() for _ in range(10)], args.repeat)
+            phases_time = timeit(lambda: renderer.render_phases(phases), args.repeat)
+            print(
+                "%-10s %-9s %7d %10.2f %12.2f %19.2f"
+                % (
+                    map_name,
+                    "template" if use_template else "legacy",
+                    len(phases),
+                    init_time * 1000,
+                    render_time * 100,
+                    phases_time * 1000,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for server games scheduler.
+
+1. Scheduler storage: ``--games`` games with random deadlines within ``--horizon`` steps are
+   added, all re-scheduled once (as when a game deadline changes), then all steps are run
+   until every game is due, using:
+
+   - reference implementation: priority dict (heap), as scheduler did before timing wheel.
+   - timing wheel.
+
+2. Scheduler processing: ``--processed-games`` games due at a same step are processed by
+   a coroutine callback simulating ``--work-ms`` milliseconds of asynchronous work
+   (e.g. adjudication in a worker process), with tasks processed one by one (batch size 1)
+   or in batches. Scheduler lag metrics are printed.
+
+.. code-block:: bash
+
+    python benchmarks/bench_scheduler.py --games 10000 --horizon 3600
+"""
+import argparse
+import random
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from bench_utils import timeit
+from diplomacy.server.scheduler import Scheduler
+from diplomacy.utils import strings
+from diplomacy.utils.priority_dict import PriorityDict
+from diplomacy.utils.timing_wheel import TimingWheel
+
+
+def run_reference(deadlines, new_deadlines, horizon):
+    """Add, re-schedule and pop all games using a priority dict."""
+    heap = PriorityDict()
+    for game_id, deadline in enumerate(deadlines):
+        heap[game_id] = deadline
+    for game_id, deadline in enumerate(new_deadlines):
+        del heap[game_id]
+        heap[game_id] = deadline
+    count = 0
+    for current_time in range(1, horizon + 1):
+        while heap:
+            deadline, game_id = heap.smallest()
+            if deadline > current_time:
+                break
+            del heap[game_id]
+            count += 1
+    assert count == len(deadlines)
+
+
+def run_timing_wheel(deadlines, new_deadlines, horizon):
+    """Add, re-schedule and pop all games using a timing wheel."""
+    wheel = TimingWheel()
+    for game_id, deadline in enumerate(deadlines):
+        wheel.put(game_id, deadline)
+    for game_id, deadline in enumerate(new_deadlines):
+        wheel.put(game_id, deadline)
+    count = 0
+    for _ in range(horizon):
+        count += len(wheel.advance())
+    assert count == len(deadlines)
+
+
+def run_scheduler(nb_games, work_seconds, batch_size):
+    """Process given number of games due at a same step. Return scheduler stats."""
+
+    @gen.coroutine
+    def callback(data):
+        # pylint: disable=unused-argument
+        yield gen.sleep(work_seconds)
+        return True
+
+    scheduler = Scheduler(1, callback, batch_size=batch_size)
+
+    @gen.coroutine
+    def run():
+        IOLoop.current().spawn_callback(scheduler.process_tasks)
+        for game_id in range(nb_games):
+            yield scheduler.add_data(game_id, 1)
+        yield scheduler._step()  # pylint: disable=protected-access
+        yield scheduler.tasks_queue.join()
+
+    IOLoop.current().run_sync(run)
+    return scheduler.get_stats()
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for server games scheduler.")
+    parser.add_argument("--games", type=int, default=10000, help="number of scheduled games")
+    parser.add_argument("--horizon", type=int, default=3600, help="max deadline, in steps")
+    parser.add_argument(
+        "--processed-games", type=int, default=1000, help="number of games due at a same step"
+    )
+    parser.add_argument("--work-ms", type=float, default=1, help="processing time per game")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    deadlines = [rng.randint(1, args.horizon) for _ in range(args.games)]
+    new_deadlines = [rng.randint(1, args.horizon) for _ in range(args.games)]
+    for label, function in (("priority dict", run_reference), ("timing wheel", run_timing_wheel)):
+        duration = timeit(lambda: function(deadlines, new_deadlines, args.horizon))
+        print("%-16s: %.2f ms" % (label, duration * 1000))
+
+    for batch_size in (1, 32):
+        stats = {}
+
+        def process():
+            stats.update(run_scheduler(args.processed_games, args.work_ms / 1000, batch_size))
+
+        duration = timeit(process, repeat=1)
+        print(
+            "batch size %-5d: %.2f ms, %d batches, max queue delay %d ms"
+            % (
+                batch_size,
+                duration * 1000,
+                stats[strings.PROCESSED_BATCHES],
+                stats[strings.MAX_QUEUE_DELAY_MS],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
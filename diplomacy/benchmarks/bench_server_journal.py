@@ -0,0 +1,123 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Load test for server game persistence: full JSON rewrites versus append-only journal.
+
+Simulates long press games: messages are sent by random powers, a phase is processed every
+``--messages-per-phase`` messages, and each game is saved on disk every ``--messages-per-save``
+messages (as the server does at each backup, for every modified game). Saving uses either:
+
+- **json**: whole ``game.to_dict()`` written in ``<game ID>.json`` (previous server behavior).
+- **journal**: delta appended to ``<game ID>.journal``, with periodic compaction (GameJournal).
+
+For each mode, prints bytes written on disk, write amplification (bytes written divided by
+final size of game JSON), save latency (average and maximum, including ``to_dict()``), and time
+to load games back from disk.
+
+.. code-block:: bash
+
+    python benchmarks/bench_server_journal.py --games 10 --messages 1000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import ujson as json
+
+from diplomacy.engine.message import Message
+from diplomacy.server.journal import GameJournal, load_json_from_disk, save_json_on_disk
+from diplomacy.server.server_game import ServerGame
+
+
+def run(mode, args):
+    """Run load test for given mode ("json" or "journal") and return a dictionary of measures."""
+    rng = random.Random(0)
+    games = [ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"]) for _ in range(args.games)]
+    for server_game in games:
+        server_game.set_status("active")
+    power_names = sorted(games[0].powers)
+    latencies = []
+    with tempfile.TemporaryDirectory() as games_path:
+        journal = GameJournal(games_path)
+        bytes_written = 0
+        for index in range(args.messages):
+            for server_game in games:
+                sender, recipient = rng.sample(power_names, 2)
+                server_game.add_message(
+                    Message(
+                        sender=sender,
+                        recipient=recipient,
+                        message="Message %d from %s to %s: %s"
+                        % (index, sender, recipient, "blah " * rng.randint(1, 40)),
+                        phase=server_game.current_short_phase,
+                        time_sent=index + 1,
+                    )
+                )
+                if index % args.messages_per_phase == args.messages_per_phase - 1:
+                    server_game.process()
+                if index % args.messages_per_save != args.messages_per_save - 1:
+                    continue
+                start = time.perf_counter()
+                game_dict = server_game.to_dict()
+                if mode == "json":
+                    path = os.path.join(games_path, "%s.json" % server_game.game_id)
+                    save_json_on_disk(path, game_dict)
+                    bytes_written += os.path.getsize(path)
+                else:
+                    journal.save(server_game.game_id, game_dict)
+                latencies.append(time.perf_counter() - start)
+        if mode == "journal":
+            bytes_written = journal.bytes_written
+
+        # Loading games back
+        start = time.perf_counter()
+        for server_game in games:
+            if mode == "json":
+                load_json_from_disk(os.path.join(games_path, "%s.json" % server_game.game_id))
+            else:
+                journal.load(server_game.game_id)
+        load_time = time.perf_counter() - start
+    final_size = sum(len(json.dumps(server_game.to_dict())) for server_game in games)
+    return {
+        "written (MB)": bytes_written / 1e6,
+        "amplification": bytes_written / final_size,
+        "save avg (ms)": sum(latencies) / len(latencies) * 1000,
+        "save max (ms)": max(latencies) * 1000,
+        "load (ms)": load_time * 1000,
+    }
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Load test for server game persistence.")
+    parser.add_argument("--games", type=int, default=10, help="number of games")
+    parser.add_argument("--messages", type=int, default=500, help="number of messages per game")
+    parser.add_argument("--messages-per-phase", type=int, default=50)
+    parser.add_argument("--messages-per-save", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {mode: run(mode, args) for mode in ("json", "journal")}
+    print("%-15s %12s %12s" % ("", "json", "journal"))
+    for measure in results["json"]:
+        print(
+            "%-15s %12.2f %12.2f" % (measure, results["json"][measure], results["journal"][measure])
+        )
+
+
+if __name__ == "__main__":
+    main()
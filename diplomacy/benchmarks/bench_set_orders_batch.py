@@ -0,0 +1,142 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for orders submission on server: sequential SetOrders versus SetOrdersBatch.
+
+Creates ``--games`` server games where all powers are controlled by a same user, then measures
+time to submit random orders for all powers of all games, using:
+
+- one SetOrders request per power, with Map.compact() cache disabled (as before batching).
+- one SetOrders request per power.
+- one SetOrdersBatch request per game.
+
+Requests are handled directly by server request managers (no network), including game saving.
+
+.. code-block:: bash
+
+    python benchmarks/bench_set_orders_batch.py --games 20
+"""
+import argparse
+import random
+import tempfile
+
+from bench_utils import timeit
+from diplomacy.communication import requests
+from diplomacy.engine.map import Map
+from diplomacy.server import request_managers
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+class _ConnectionHandler:
+    """Connection handler which ignores notifications."""
+
+    @staticmethod
+    def translate_notification(notification):
+        """Ignore notification."""
+        return None
+
+
+def build_games(server, token, nb_games, seed=0):
+    """Add games to server and return a list of couples (game, {power name => orders})."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(nb_games):
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        server_game.server = server
+        server.add_new_game(server_game)
+        for power_name in server_game.powers:
+            server_game.control(power_name, "user", token)
+        server_game.set_status(strings.ACTIVE)
+        possible_orders = server_game.get_all_possible_orders()
+        orders = {
+            power_name: [
+                rng.choice(possible_orders[loc])
+                for loc in server_game.get_orderable_locations(power_name)
+                if possible_orders[loc]
+            ]
+            for power_name in server_game.powers
+        }
+        games.append((server_game, orders))
+    return games
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for orders submission on server.")
+    parser.add_argument("--games", type=int, default=20, help="number of games")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = Server(directory)
+        try:
+            server.users.add_user("user", "")
+            token = server.users.connect_user("user", _ConnectionHandler())
+            connection_handler = server.users.get_connection_handler(token)
+            games = build_games(server, token, args.games)
+
+            def handle(request):
+                request_managers.handle_request(server, request, connection_handler).result()
+
+            def run_sequential():
+                for server_game, orders in games:
+                    for power_name, power_orders in orders.items():
+                        handle(
+                            requests.SetOrders(
+                                token=token,
+                                game_id=server_game.game_id,
+                                game_role=power_name,
+                                phase=server_game.current_short_phase,
+                                orders=power_orders,
+                                wait=True,
+                            )
+                        )
+
+            def run_sequential_without_cache():
+                compact = Map.compact
+                Map.compact = Map._compact  # pylint: disable=protected-access
+                try:
+                    run_sequential()
+                finally:
+                    Map.compact = compact
+
+            def run_batch():
+                for server_game, orders in games:
+                    handle(
+                        requests.SetOrdersBatch(
+                            token=token,
+                            game_id=server_game.game_id,
+                            game_role=next(iter(orders)),
+                            phase=server_game.current_short_phase,
+                            orders=orders,
+                            wait=True,
+                        )
+                    )
+
+            for label, function in (
+                ("SetOrders, no compact cache", run_sequential_without_cache),
+                ("SetOrders", run_sequential),
+                ("SetOrdersBatch", run_batch),
+            ):
+                print("%-28s: %.2f ms" % (label, timeit(function) * 1000))
+        finally:
+            server.stop_daide_server(None)
+            Server.__cache__.pop(directory, None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark for game synchronization after a client reconnection:
+separate notifications versus bulk GameSynchronized notifications.
+
+Creates a game where ``--messages`` global messages are sent in each phase, lets it progress
+``--phases`` phases while an omniscient client game is disconnected, then measures time to
+synchronize client game: server request handling, serialization, client parsing and update.
+
+.. code-block:: bash
+
+    python benchmarks/bench_synchronize.py --phases 20 --messages 200
+"""
+import argparse
+import tempfile
+import time
+
+import ujson as json
+
+from diplomacy.client import notification_managers
+from diplomacy.communication import notifications, requests
+from diplomacy.engine.game import Game
+from diplomacy.engine.message import Message
+from diplomacy.server import request_managers
+from diplomacy.server.connection_handler import ConnectionHandler
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import constants, strings
+
+
+class FakeConnectionHandler:
+    """Connection handler sending notifications as server ConnectionHandler does."""
+
+    translate_notification = staticmethod(ConnectionHandler.translate_notification)
+
+
+def synchronize(server, client_game, token, chunk_size):
+    """Synchronize given client game. Return number of websocket frames sent."""
+    request = requests.Synchronize(
+        token=token,
+        game_id=client_game.game_id,
+        game_role=client_game.role,
+        phase=client_game.current_short_phase,
+        timestamp=client_game.get_latest_timestamp(),
+        chunk_size=chunk_size,
+    )
+    connection_handler = server.users.get_connection_handler(token)
+    request_managers.handle_request(server, request, connection_handler).result()
+    count = 0
+    while server.notifications.qsize():
+        _, message = server.notifications.get_nowait()
+        notification = notifications.parse_dict(json.loads(message))
+        notification_managers.MAPPING[type(notification)](client_game, notification)
+        count += 1
+    return count
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark for game synchronization.")
+    parser.add_argument("--phases", type=int, default=20, help="phases played while disconnected")
+    parser.add_argument("--messages", type=int, default=200, help="messages sent per phase")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as server_dir:
+        server = Server(server_dir)
+        server.users.add_user("user", "")
+        token = server.users.connect_user("user", FakeConnectionHandler())
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        server_game.server = server
+        server_game.add_omniscient_token(token)
+        server.add_new_game(server_game)
+        client_game_dict = server_game.cast(strings.OMNISCIENT_TYPE, "user").to_dict()
+        for phase_index in range(args.phases + 1):
+            for index in range(args.messages):
+                server_game.add_message(
+                    Message(
+                        sender="FRANCE",
+                        recipient="GLOBAL",
+                        message="Message %d" % index,
+                        phase=server_game.current_short_phase,
+                    )
+                )
+            if phase_index < args.phases:
+                server_game.set_status(strings.ACTIVE)
+                server_game.process()
+
+        for label, chunk_size in (
+            ("separate notifications", None),
+            ("bulk notifications", constants.DEFAULT_SYNCHRONIZATION_CHUNK_SIZE),
+        ):
+            client_game = Game.from_dict(client_game_dict)
+            start = time.perf_counter()
+            count = synchronize(server, client_game, token, chunk_size)
+            duration = time.perf_counter() - start
+            print("%-22s : %4d frames, %.2f ms" % (label, count, duration * 1000))
+        server.stop_daide_server(None)
+        Server.__cache__.pop(server_dir)
+
+
+if __name__ == "__main__":
+    main()
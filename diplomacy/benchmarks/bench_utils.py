@@ -0,0 +1,100 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Helper functions shared by benchmark scripts.
+
+Benchmark scripts are run directly from the project root, e.g.:
+
+.. code-block:: bash
+
+    python benchmarks/bench_phase_history.py --years 30
+"""
+import gc
+import random
+import sys
+import time
+
+from diplomacy import Game
+
+
+def play_random_game(map_name="standard", nb_years=30, rules=None, seed=0):
+    """Play a game with random orders.
+
+    :param map_name: name of map to play on.
+    :param nb_years: number of years to play (game may end earlier).
+    :param rules: (optional) list of rules for the game.
+    :param seed: seed for random order selection.
+    :return: the played game.
+    """
+    rng = random.Random(seed)
+    game = Game(map_name=map_name, rules=rules)
+    last_year = int(game.get_current_phase()[1:5]) + nb_years
+    while not game.is_game_done and int(game.get_current_phase()[1:5]) < last_year:
+        possible_orders = game.get_all_possible_orders()
+        for power_name in game.powers:
+            game.set_orders(
+                power_name,
+                [
+                    rng.choice(possible_orders[loc])
+                    for loc in game.get_orderable_locations(power_name)
+                    if possible_orders[loc]
+                ],
+            )
+        game.process()
+    return game
+
+
+def timeit(function, repeat=5):
+    """Return best wall-clock time (in seconds) of given callable over given number of calls.
+    Garbage collection is disabled while timing, as in standard module timeit.
+    """
+    best = float("inf")
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def deep_sizeof(obj, seen=None):
+    """Return size in bytes of given object and of all objects it references.
+    Objects referenced many times are counted once. Supports dicts, sequences, sets,
+    and objects with __slots__ (e.g. SortedDict).
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(element, seen) for element in obj)
+    elif hasattr(type(obj), "__mro__") and not isinstance(obj, (str, bytes, int, float)):
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot.startswith("__"):
+                    slot = "_%s%s" % (cls.__name__, slot)
+                if hasattr(obj, slot):
+                    size += deep_sizeof(getattr(obj, slot), seen)
+    return size
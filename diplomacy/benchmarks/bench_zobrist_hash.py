@@ -0,0 +1,87 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Benchmark Zobrist hash computation on all bundled maps.
+
+For each map, measures a full hash rebuild (Game.rebuild_hash()) and incremental updates (Game.update_hash() for every unit and center on board).
+
+.. code-block:: bash
+
+    python benchmarks/bench_zobrist_hash.py --repeat 200
+"""
+import argparse
+import glob
+import os
+
+from diplomacy import Game
+from diplomacy.utils import exceptions
+
+from bench_utils import timeit
+
+MAPS_PATH = os.path.join(os.path.dirname(__file__), "..", "diplomacy", "maps")
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark Zobrist hash on all bundled maps.")
+    parser.add_argument("--repeat", type=int, default=200, help="number of calls per measure")
+    args = parser.parse_args()
+
+    print("%-28s %6s %16s %18s" % ("map", "pieces", "rebuild (us)", "update (us/piece)"))
+    for map_path in sorted(glob.glob(os.path.join(MAPS_PATH, "*.map"))):
+        map_name = os.path.basename(map_path)[:-4]
+        try:
+            game = Game(map_name=map_name)
+        except exceptions.DiplomacyException:
+            continue
+        pieces = [
+            (power.name, unit[0], unit[2:], False)
+            for power in game.powers.values()
+            for unit in power.units
+        ] + [
+            (power.name, "", center, True)
+            for power in game.powers.values()
+            for center in power.centers
+        ]
+        if not pieces:
+            continue
+        expected_hash = game.get_hash()
+
+        def rebuild():
+            for _ in range(args.repeat):
+                game.rebuild_hash()
+
+        def update():
+            for _ in range(args.repeat):
+                for power_name, unit_type, loc, is_center in pieces:
+                    game.update_hash(power_name, unit_type=unit_type, loc=loc, is_center=is_center)
+
+        rebuild_time = timeit(rebuild)
+        update_time = timeit(update)
+        assert game.get_hash() == expected_hash
+        print(
+            "%-28s %6d %16.2f %18.3f"
+            % (
+                map_name,
+                len(pieces),
+                rebuild_time * 1e6 / args.repeat,
+                update_time * 1e6 / args.repeat / len(pieces),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
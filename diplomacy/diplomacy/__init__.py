@@ -14,11 +14,42 @@
 #  You should have received a copy of the GNU Affero General Public License along
 #  with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ==============================================================================
-"""Module diplomacy, represent strategy game Diplomacy."""
+"""Module diplomacy, represent strategy game Diplomacy.
+
+Engine classes are imported eagerly. Client and server classes (which depend on tornado),
+and sub-packages client, server and daide, are only imported the first time they are accessed,
+so that processes which only need the engine (e.g. bots) start faster.
+"""
+import importlib
+
 from .engine.map import Map
 from .engine.power import Power
 from .engine.game import Game
 from .engine.message import Message
-from .client.connection import Connection, connect
-from .server.server import Server
 from .utils.game_phase_data import GamePhaseData
+
+# Lazy attributes: {attribute name => name of module (relative to this package) defining it}
+LAZY_ATTRIBUTES = {
+    "Connection": ".client.connection",
+    "connect": ".client.connection",
+    "Server": ".server.server",
+}
+LAZY_SUBMODULES = ("client", "daide", "server")
+
+__all__ = ["Map", "Power", "Game", "Message", "GamePhaseData"] + list(LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """Import lazy attributes and sub-packages on first access (PEP 562)."""
+    if name in LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(LAZY_ATTRIBUTES[name], __name__), name)
+    elif name in LAZY_SUBMODULES:
+        value = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_ATTRIBUTES) | set(LAZY_SUBMODULES))
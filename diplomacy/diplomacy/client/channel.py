@@ -179,6 +179,8 @@ class Channel:
     demote_moderator = _req_fn(
         requests.SetGrade, grade=strings.MODERATOR, grade_update=strings.DEMOTE
     )
+    get_game_cache_stats = _req_fn(requests.GetGameCacheStats)
+    get_scheduler_stats = _req_fn(requests.GetSchedulerStats)
 
     # ====================================================================
     # Game API. Intended to be called by NetworkGame object, not directly.
@@ -193,6 +195,7 @@ class Channel:
     _send_recipient_annotation = _req_fn(requests.SendRecipientAnnotation)
     _send_game_message = _req_fn(requests.SendGameMessage)
     _set_orders = _req_fn(requests.SetOrders)
+    _set_orders_batch = _req_fn(requests.SetOrdersBatch)
     _send_log_data = _req_fn(requests.SendLogData)
     _send_order_suggestions = _req_fn(requests.SendOrderSuggestions)
     _set_comm_status = _req_fn(requests.SetCommStatus)
@@ -29,26 +29,30 @@ import ujson as json
 
 from diplomacy.client import notification_managers
 from diplomacy.client.response_managers import RequestFutureContext, handle_response
-from diplomacy.communication import notifications, requests, responses
+from diplomacy.communication import binary_protocol, notifications, requests, responses
 from diplomacy.utils import exceptions, strings, constants
 
 LOGGER = logging.getLogger(__name__)
 
 
 @gen.coroutine
-def connect(hostname, port, use_ssl=False):
+def connect(hostname, port, use_ssl=False, use_binary=False):
     """Connect to given hostname and port.
 
     :param hostname: a hostname
     :param port: a port
     :param use_ssl: telling if connection should be securized (True) or not (False).
+    :param use_binary: telling if connection should ask server for binary protocol
+        (see module diplomacy.communication.binary_protocol). Ignored if binary protocol
+        is not available. Connection falls back to JSON if server does not accept binary protocol.
     :return: a Connection object connected.
     :type hostname: str
     :type port: int
     :type use_ssl: bool
+    :type use_binary: bool
     :rtype: Connection
     """
-    connection = Connection(hostname, port, use_ssl)
+    connection = Connection(hostname, port, use_ssl, use_binary)
     yield connection._connect("Trying to connect.")  # pylint: disable=protected-access
     return connection
 
@@ -68,6 +72,8 @@ class Connection:
     - **hostname**: :class:`str` hostname to connect (e.g. 'localhost')
     - **port**: :class:`int` port to connect (e.g. 8888)
     - **use_ssl**: :class:`bool` telling if connection should be securized (True) or not (False).
+    - **use_binary**: :class:`bool` telling if connection should ask server for binary protocol.
+    - **is_binary**: :class:`bool` telling if server accepted binary protocol for current connection.
     - **url**: (property) :class:`str` websocket url to connect (generated with hostname and port)
     - **connection**: :class:`tornado.websocket.WebSocketClientConnection` a tornado websocket connection object
     - **connection_count**: :class:`int` number of successful connections from this Connection object.
@@ -93,6 +99,8 @@ class Connection:
         "hostname",
         "port",
         "use_ssl",
+        "use_binary",
+        "is_binary",
         "connection",
         "is_connecting",
         "is_reconnecting",
@@ -103,7 +111,7 @@ class Connection:
         "unknown_tokens",
     ]
 
-    def __init__(self, hostname, port, use_ssl=False):
+    def __init__(self, hostname, port, use_ssl=False, use_binary=False):
         """Constructor
 
         The connection class should not be initiated directly, but through the connect method
@@ -116,13 +124,17 @@ class Connection:
         :param hostname: hostname to connect (e.g. 'localhost')
         :param port: port to connect (e.g. 8888)
         :param use_ssl: telling if connection should be securized (True) or not (False).
+        :param use_binary: telling if connection should ask server for binary protocol.
         :type hostname: str
         :type port: int
         :type use_ssl: bool
+        :type use_binary: bool
         """
         self.hostname = hostname
         self.port = port
         self.use_ssl = bool(use_ssl)
+        self.use_binary = bool(use_binary) and binary_protocol.is_available()
+        self.is_binary = False
 
         self.connection: Optional[WebSocketClientConnection] = None
         self.connection_count = 0
@@ -199,9 +211,10 @@ class Connection:
 
         # Create a connection (currently using websockets).
         self.connection = None
+        subprotocols = [binary_protocol.get_subprotocol()] if self.use_binary else None
         for attempt_index in range(constants.NB_CONNECTION_ATTEMPTS):
             try:
-                future_connection = websocket_connect(self.url)
+                future_connection = websocket_connect(self.url, subprotocols=subprotocols)
                 self.connection = yield gen.with_timeout(
                     timedelta(seconds=constants.ATTEMPT_DELAY_SECONDS), future_connection
                 )
@@ -218,6 +231,10 @@ class Connection:
                 LOGGER.warning("Connection failing (attempt %d), retrying.", attempt_index + 1)
                 yield gen.sleep(constants.ATTEMPT_DELAY_SECONDS)
 
+        self.is_binary = bool(subprotocols) and (
+            self.connection.selected_subprotocol == subprotocols[0]
+        )
+
         if not self.connection_count:
             # Start receiving messages as soon as we are connected.
             ioloop.IOLoop.current().add_callback(self._handle_socket_messages)
@@ -239,13 +256,16 @@ class Connection:
 
     @gen.coroutine
     def _on_socket_message(self, socket_message):
-        """Manage given socket_message (string),
+        """Manage given socket_message (string, or bytes if binary protocol is used),
         that may be a string representation of either a request or a notification.
         """
 
         # Check response format and run callback (if defined).
         try:
-            json_message = json.loads(socket_message)
+            if isinstance(socket_message, bytes):
+                json_message = binary_protocol.decode(socket_message)
+            else:
+                json_message = json.loads(socket_message)
         except ValueError:
             LOGGER.exception("Unable to parse JSON from a socket message.")
             return
@@ -311,10 +331,22 @@ class Connection:
         # Send notification request without waiting any server response. Ignore errors if any.
         try:
             self.unknown_tokens.add(token)
-            self.connection.write_message(requests.UnknownToken(token=token).json())
+            self._write_request(requests.UnknownToken(token=token))
         except (WebSocketClosedError, StreamClosedError):
             pass
 
+    def _write_request(self, request):
+        """Write given request on websocket connection, using binary protocol if accepted by server.
+        Return write future.
+
+        :type request: requests._AbstractRequest
+        """
+        if self.is_binary:
+            return self.connection.write_message(
+                binary_protocol.encode(request.to_dict()), binary=True
+            )
+        return self.connection.write_message(request.json())
+
     def _register_to_send(self, request_context):
         """Register given request context as a request to send as soon as possible.
 
@@ -374,7 +406,7 @@ class Connection:
                 try:
                     if self.connection is None:
                         raise WebSocketClosedError()
-                    write_future = self.connection.write_message(request.json())
+                    write_future = self._write_request(request)
                 except (WebSocketClosedError, StreamClosedError) as exc:
                     # We were disconnected.
                     # Save request context as a request to send.
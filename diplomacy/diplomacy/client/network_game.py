@@ -20,6 +20,7 @@ import logging
 from diplomacy.client.channel import Channel
 from diplomacy.communication import notifications
 from diplomacy.engine.game import Game
+from diplomacy.utils import constants
 from diplomacy.utils.exceptions import DiplomacyException
 
 LOGGER = logging.getLogger(__name__)
@@ -131,6 +132,7 @@ class NetworkGame(Game):
     send_deceiving = _game_request_method(Channel._send_deceiving)
     send_recipient_annotation = _game_request_method(Channel._send_recipient_annotation)
     set_orders = _game_request_method(Channel._set_orders)
+    set_orders_batch = _game_request_method(Channel._set_orders_batch)
     send_log_data = _game_request_method(Channel._send_log_data)
     send_order_suggestions = _game_request_method(Channel._send_order_suggestions)
     set_comm_status = _game_request_method(Channel._set_comm_status)
@@ -148,7 +150,11 @@ class NetworkGame(Game):
         """Send a :class:`.Synchronize` request to synchronize this game with associated server game."""
         if not self.channel:
             raise DiplomacyException("Invalid client game.")
-        return self.channel._synchronize(game=self, timestamp=self.get_latest_timestamp())
+        return self.channel._synchronize(
+            game=self,
+            timestamp=self.get_latest_timestamp(),
+            chunk_size=constants.DEFAULT_SYNCHRONIZATION_CHUNK_SIZE,
+        )
 
     # Admin / Moderator API.
     delete = _game_request_method(Channel._delete_game)
@@ -162,6 +162,41 @@ def on_game_phase_update(game, notification):
         game.set_phase_data(notification.phase_data)
 
 
+def on_game_synchronized(game, notification):
+    """Manage notification GameSynchronized.
+    Synchronized data are applied in one pass, sorted as server sorts them
+    (see diplomacy.server.request_manager_utils.SynchronizedData).
+
+    :param game: a Network game
+    :param notification: notification received
+    :type game: diplomacy.client.network_game.NetworkGame
+    :type notification: diplomacy.communication.notifications.GameSynchronized
+    """
+    data_to_apply = [
+        (message.time_sent, 0, Game.add_message, message) for message in notification.messages
+    ]
+    data_to_apply += [
+        (phase_data.state["timestamp"], 1, Game.extend_phase_history, phase_data)
+        for phase_data in notification.phase_history
+    ]
+    if notification.phase_data:
+        data_to_apply.append(
+            (
+                notification.phase_data.state["timestamp"],
+                2,
+                Game.set_phase_data,
+                notification.phase_data,
+            )
+        )
+    data_to_apply.sort(key=lambda data: data[:2])
+    for _, _, apply_fn, data in data_to_apply:
+        if apply_fn is Game.set_phase_data:
+            # Keep phases added to history.
+            Game.set_phase_data(game, data, clear_history=False)
+        else:
+            apply_fn(game, data)
+
+
 def on_game_status_update(game, notification):
     """Manage notification GameStatusUpdate.
 
@@ -295,6 +330,7 @@ MAPPING = {
     notifications.GameProcessed: on_game_processed,
     notifications.GamePhaseUpdate: on_game_phase_update,
     notifications.GameStatusUpdate: on_game_status_update,
+    notifications.GameSynchronized: on_game_synchronized,
     notifications.OmniscientUpdated: on_omniscient_updated,
     notifications.PowerOrdersFlag: on_power_orders_flag,
     notifications.PowerOrdersUpdate: on_power_orders_update,
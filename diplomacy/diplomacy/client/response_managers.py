@@ -354,6 +354,27 @@ def on_set_orders(context, response):
         Game.set_orders(context.game, request.power_name, orders)
 
 
+def on_set_orders_batch(context, response):
+    """Manage response for request SetOrdersBatch.
+
+    :param context: request context
+    :param response: response received
+    :return: a dictionary mapping each power name to the list of errors raised
+        while setting its orders.
+    :type context: RequestFutureContext
+    :type response: responses.DataOrderErrors
+    """
+    request = context.request  # type: requests.SetOrdersBatch
+    for power_name, orders in request.orders.items():
+        if Game.is_player_game(context.game):
+            # Player game only stores orders for its own power.
+            if power_name == context.game.power.name:
+                Game.set_orders(context.game, power_name, orders)
+        else:
+            Game.set_orders(context.game, power_name, orders)
+    return response.data
+
+
 def on_set_comm_status(context, response):
     """Manage response for request SetCommStatus
     :param context: request context
@@ -427,6 +448,8 @@ MAPPING = {
     requests.GetAvailableMaps: default_manager,
     requests.GetDaidePort: default_manager,
     requests.GetDummyWaitingPowers: default_manager,
+    requests.GetGameCacheStats: default_manager,
+    requests.GetSchedulerStats: default_manager,
     requests.GetGamesInfo: default_manager,
     requests.GetPhaseHistory: on_get_phase_history,
     requests.GetPlayablePowers: default_manager,
@@ -452,6 +475,7 @@ MAPPING = {
     requests.SetGameStatus: on_set_game_status,
     requests.SetGrade: default_manager,
     requests.SetOrders: on_set_orders,
+    requests.SetOrdersBatch: on_set_orders_batch,
     requests.SetWaitFlag: on_set_wait_flag,
     requests.SignIn: on_sign_in,
     requests.Synchronize: default_manager,
@@ -0,0 +1,208 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Binary encoding for requests, responses and notifications exchanged on websockets.
+
+By default, network data are exchanged as JSON text frames. If optional package `msgpack` is
+installed, a client can ask for binary frames by requesting websocket sub-protocol returned by
+get_subprotocol(). If server accepts this sub-protocol, both sides then exchange JSON
+dictionaries encoded with MessagePack, where frequent strings are interned:
+
+- dictionary keys found in vocabulary are replaced with their integer ID
+  (JSON keys are always strings, so integer keys are not ambiguous).
+- string values found in vocabulary are replaced with MessagePack extension values
+  containing their ID on 1 byte (extension type 1) or 2 bytes (extension type 2).
+
+Vocabulary contains fields names of network data and game models, power names, locations and
+units of standard map. Sub-protocol name contains a hash of vocabulary, so that a client and
+a server with different vocabularies fall back to JSON.
+"""
+import hashlib
+import inspect
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SUBPROTOCOL_PREFIX = "diplomacy.msgpack."
+EXT_ID_1_BYTE = 1
+EXT_ID_2_BYTES = 2
+
+# Vocabulary data built on first use: see _get_vocabulary().
+_VOCABULARY = None
+
+
+class _Vocabulary:
+    """Interned strings with their encoded forms."""
+
+    __slots__ = ["strings", "key_ids", "value_codes", "subprotocol"]
+
+    def __init__(self, strings):
+        """Initialize vocabulary with given sorted list of strings."""
+        assert len(strings) <= 0xFFFF
+        self.strings = strings
+        self.key_ids = {string: index for index, string in enumerate(strings)}
+        self.value_codes = {
+            string: (
+                msgpack.ExtType(EXT_ID_1_BYTE, bytes((index,)))
+                if index <= 0xFF
+                else msgpack.ExtType(EXT_ID_2_BYTES, index.to_bytes(2, "big"))
+            )
+            for index, string in enumerate(strings)
+        }
+        digest = hashlib.sha1("\n".join(strings).encode("utf-8")).hexdigest()
+        self.subprotocol = SUBPROTOCOL_PREFIX + digest[:12]
+
+
+def _collect_strings():
+    """Return sorted list of strings to intern."""
+    # Imported here to prevent recursive imports with communication modules.
+    # pylint: disable=import-outside-toplevel
+    from diplomacy.communication import notifications, requests, responses
+    from diplomacy.engine.game import Game
+    from diplomacy.engine.log import Log
+    from diplomacy.engine.message import Message
+    from diplomacy.engine.power import Power
+    from diplomacy.utils.game_phase_data import GamePhaseData
+    from diplomacy.utils.network_data import NetworkData
+
+    strings = set()
+    for module in (requests, responses, notifications):
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, NetworkData) and cls.id_field is not None:
+                # Fields are read from header and params, as abstract classes may not
+                # have a valid model.
+                strings.update(cls.header)
+                strings.update(cls.params)
+                strings.add(cls.get_class_name())
+    for cls in (Game, Power, Message, Log, GamePhaseData):
+        strings.update(cls.get_model())
+    game = Game()
+    strings.update(game.get_state())
+    strings.update(game.map.powers)
+    for location in game.map.locs:
+        location = location.upper()
+        strings.update((location, "A " + location, "F " + location))
+    return sorted(strings)
+
+
+def _get_vocabulary():
+    """Return vocabulary, building it on first call."""
+    global _VOCABULARY  # pylint: disable=global-statement
+    if _VOCABULARY is None:
+        _VOCABULARY = _Vocabulary(_collect_strings())
+    return _VOCABULARY
+
+
+def is_available():
+    """Return True if binary protocol can be used (i.e. if package msgpack is installed)."""
+    return msgpack is not None
+
+
+def get_subprotocol():
+    """Return websocket sub-protocol name for binary protocol,
+    or None if binary protocol is not available.
+    """
+    return _get_vocabulary().subprotocol if is_available() else None
+
+
+def _intern(value, key_ids, value_codes):
+    """Return a copy of given JSON value with interned keys and strings."""
+    if isinstance(value, str):
+        return value_codes.get(value, value)
+    if isinstance(value, dict):
+        return {
+            key_ids.get(key, key) if isinstance(key, str) else str(key): _intern(
+                element, key_ids, value_codes
+            )
+            for key, element in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_intern(element, key_ids, value_codes) for element in value]
+    return value
+
+
+def encode(json_dict):
+    """Encode given JSON dictionary to bytes."""
+    vocabulary = _get_vocabulary()
+    return msgpack.packb(
+        _intern(json_dict, vocabulary.key_ids, vocabulary.value_codes), use_bin_type=True
+    )
+
+
+def decode(data):
+    """Decode given bytes to a JSON dictionary.
+    Raise a ValueError if data is not a valid encoded dictionary.
+    """
+    vocabulary_strings = _get_vocabulary().strings
+
+    def ext_hook(code, ext_data):
+        """Convert an extension value to an interned string."""
+        if code not in (EXT_ID_1_BYTE, EXT_ID_2_BYTES):
+            raise ValueError("Unknown extension type %s" % code)
+        index = int.from_bytes(ext_data, "big")
+        if index >= len(vocabulary_strings):
+            raise ValueError("Unknown interned string %d" % index)
+        return vocabulary_strings[index]
+
+    def object_pairs_hook(pairs):
+        """Convert interned keys back to strings."""
+        return {vocabulary_strings[key] if type(key) is int else key: value for key, value in pairs}
+
+    try:
+        json_dict = msgpack.unpackb(
+            data,
+            raw=False,
+            strict_map_key=False,
+            ext_hook=ext_hook,
+            object_pairs_hook=object_pairs_hook,
+        )
+    except (IndexError, TypeError) as exc:
+        raise ValueError(str(exc))
+    if not isinstance(json_dict, dict):
+        raise ValueError("Unable to convert binary data to a dictionary.")
+    return json_dict
+
+
+def address_body(address, body):
+    """Return encoded dictionary made of given address fields and given encoded body.
+    Used to send a same encoded body to many recipients (see diplomacy.server.notifier).
+
+    :param address: JSON dictionary of fields to add. Must not share keys with body.
+    :param body: encoded JSON dictionary (as returned by encode()).
+    :return: bytes
+    """
+    head = body[0]
+    if head & 0xF0 == 0x80:
+        count, header_size = head & 0x0F, 1
+    elif head == 0xDE:
+        count, header_size = int.from_bytes(body[1:3], "big"), 3
+    elif head == 0xDF:
+        count, header_size = int.from_bytes(body[1:5], "big"), 5
+    else:
+        raise ValueError("Expected an encoded dictionary.")
+    count += len(address)
+    if count <= 0x0F:
+        header = bytes((0x80 | count,))
+    elif count <= 0xFFFF:
+        header = b"\xde" + count.to_bytes(2, "big")
+    else:
+        header = b"\xdf" + count.to_bytes(4, "big")
+    encoded_address = encode(address)
+    # Skip address map header.
+    encoded_address = encoded_address[1:] if len(address) <= 0x0F else encoded_address[3:]
+    return header + encoded_address + body[header_size:]
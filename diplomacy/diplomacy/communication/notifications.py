@@ -288,6 +288,39 @@ class LogDataReceived(_GameNotification):
         super(LogDataReceived, self).__init__(**kwargs)
 
 
+class GameSynchronized(_GameNotification):
+    """Notification about data sent to synchronize a game (see request Synchronize),
+    sent instead of separate GameMessageReceived and GamePhaseUpdate notifications.
+    Data may be split into many GameSynchronized notifications, to be applied in order.
+
+    Properties:
+
+        - **messages**: list of :class:`diplomacy.engine.message.Message` received
+          for current phase.
+        - **phase_history**: list of :class:`diplomacy.utils.game_phase_data.GamePhaseData`
+          to add to game history.
+        - **phase_data**: (optional) :class:`diplomacy.utils.game_phase_data.GamePhaseData`
+          of current phase, if game was processed since client latest timestamp.
+    """
+
+    __slots__ = ["messages", "phase_history", "phase_data"]
+    params = {
+        strings.MESSAGES: parsing.DefaultValueType(
+            parsing.SequenceType(parsing.JsonableClassType(Message)), []
+        ),
+        strings.PHASE_HISTORY: parsing.DefaultValueType(
+            parsing.SequenceType(parsing.JsonableClassType(GamePhaseData)), []
+        ),
+        strings.PHASE_DATA: parsing.OptionalValueType(parsing.JsonableClassType(GamePhaseData)),
+    }
+
+    def __init__(self, **kwargs):
+        self.messages = None  # type: list
+        self.phase_history = None  # type: list
+        self.phase_data = None  # type: GamePhaseData
+        super(GameSynchronized, self).__init__(**kwargs)
+
+
 class GameMessageReceived(_GameNotification):
     """Notification about a game message received.
 
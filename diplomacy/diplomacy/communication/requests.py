@@ -86,9 +86,9 @@ import logging
 from diplomacy.engine.message import Message
 from diplomacy.engine.log import Log
 from diplomacy.utils import common, exceptions, parsing, strings
+from diplomacy.utils.message_store import MessageStore
 from diplomacy.utils.network_data import NetworkData
 from diplomacy.utils.parsing import OptionalValueType
-from diplomacy.utils.sorted_dict import SortedDict
 
 LOGGER = logging.getLogger(__name__)
 
@@ -372,6 +372,40 @@ class GetDummyWaitingPowers(_AbstractChannelRequest):
         super(GetDummyWaitingPowers, self).__init__(**kwargs)
 
 
+class GetGameCacheStats(_AbstractChannelRequest):
+    """Channel request to get counters of server registry of games loaded in memory.
+    Require admin privileges.
+
+    :return:
+
+        - Server: :class:`.DataGameCacheStats`
+        - Client: a dictionary with number of loaded games (``'loaded_games'``), their estimated
+          size in bytes (``'loaded_size'``), registry limits (``'max_loaded_games'``,
+          ``'max_loaded_size'``, 0 meaning no limit), and counters of cache ``'hits'``,
+          ``'misses'`` and ``'evictions'`` since server started.
+    """
+
+    __slots__ = []
+
+
+class GetSchedulerStats(_AbstractChannelRequest):
+    """Channel request to get counters and lag metrics of server games scheduler.
+    Require admin privileges.
+
+    :return:
+
+        - Server: :class:`.DataSchedulerStats`
+        - Client: a dictionary with scheduler time (``'current_time'``), number of games waiting
+          for their deadline (``'scheduled_data'``) or for processing (``'queued_data'``),
+          number of ``'processed_tasks'`` and ``'processed_batches'`` since server started,
+          and latest and max lag of scheduler steps (``'last_step_lag_ms'``,
+          ``'max_step_lag_ms'``) and of queued games (``'last_queue_delay_ms'``,
+          ``'max_queue_delay_ms'``), in milliseconds.
+    """
+
+    __slots__ = []
+
+
 class GetAvailableMaps(_AbstractChannelRequest):
     """Channel request to get maps available on server.
 
@@ -891,7 +925,7 @@ class SetGameState(_AbstractGameRequest):
         strings.ORDERS: parsing.DictType(str, parsing.SequenceType(str)),
         strings.RESULTS: parsing.DictType(str, parsing.SequenceType(str)),
         strings.MESSAGES: parsing.DictType(
-            int, parsing.JsonableClassType(Message), SortedDict.builder(int, Message)
+            int, parsing.JsonableClassType(Message), MessageStore.builder(int, Message)
         ),
         strings.STANCES: parsing.DefaultValueType(
             parsing.DictType(str, parsing.DictType(str, int)), {}
@@ -906,7 +940,7 @@ class SetGameState(_AbstractGameRequest):
         self.state = {}
         self.orders = {}
         self.results = {}
-        self.messages = {}  # type: SortedDict
+        self.messages = {}  # type: MessageStore
         self.stances = {}
         self.is_bot = {}
         self.deceiving = {}
@@ -965,6 +999,34 @@ class SetOrders(_AbstractGameRequest):
         super(SetOrders, self).__init__(**kwargs)
 
 
+class SetOrdersBatch(_AbstractGameRequest):
+    """Game request to set orders for many powers at once. Orders of each power replace its
+    previous orders, as with request :class:`.SetOrders`. Request user must either be a game master,
+    or control all given powers.
+
+    :param orders: dictionary mapping power names to their list of orders.
+    :param wait: if provided, wait flag to set for all given powers.
+    :type orders: dict
+    :type wait: bool, optional
+    :return:
+
+        - Server: :class:`.DataOrderErrors`
+        - Client: a dictionary mapping each power name to the list of errors raised
+          while setting its orders (empty list if all orders were accepted).
+    """
+
+    __slots__ = ["orders", "wait"]
+    params = {
+        strings.ORDERS: parsing.DictType(str, parsing.SequenceType(str)),
+        strings.WAIT: parsing.OptionalValueType(bool),
+    }
+
+    def __init__(self, **kwargs):
+        self.orders = None
+        self.wait = None
+        super(SetOrdersBatch, self).__init__(**kwargs)
+
+
 class SetCommStatus(_AbstractGameRequest):
     """Game request to toggle a players communication status
     :param power_name. If not given, request user must be a game player, and power if inferred from request game role
@@ -1016,16 +1078,25 @@ class Synchronize(_AbstractGameRequest):
     be up to date with server game state.
 
     :param timestamp: timestamp since which client game needs to synchronize.
+    :param chunk_size: (optional) if provided, server sends synchronization data
+        (messages and phases) in :class:`.GameSynchronized` notifications containing at most
+        ``chunk_size`` items each (0 means all items in one notification), and only to requesting
+        address. Otherwise, server sends a separate notification for each item.
     :type timestamp: int
+    :type chunk_size: int, optional
     :return: (server and client) a :class:`.DataGameInfo` object.
     """
 
-    __slots__ = ["timestamp"]
-    params = {strings.TIMESTAMP: int}
+    __slots__ = ["timestamp", "chunk_size"]
+    params = {
+        strings.TIMESTAMP: int,
+        strings.CHUNK_SIZE: parsing.OptionalValueType(int),
+    }
     phase_dependent = False
 
     def __init__(self, **kwargs):
         self.timestamp = None  # type: int
+        self.chunk_size = None  # type: int
         super(Synchronize, self).__init__(**kwargs)
 
 
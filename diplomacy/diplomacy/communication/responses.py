@@ -300,6 +300,27 @@ class DataGamesToPowerNames(UniqueData):
     params = {strings.DATA: parsing.DictType(str, parsing.SequenceType(str))}
 
 
+class DataGameCacheStats(UniqueData):
+    """Unique data containing a dictionary of counters for server registry of loaded games."""
+
+    __slots__ = []
+    params = {strings.DATA: parsing.DictType(str, int)}
+
+
+class DataSchedulerStats(UniqueData):
+    """Unique data containing a dictionary of scheduler counters and lag metrics."""
+
+    __slots__ = []
+    params = {strings.DATA: parsing.DictType(str, int)}
+
+
+class DataOrderErrors(UniqueData):
+    """Unique data containing a dictionary mapping a power name to a list of order errors."""
+
+    __slots__ = []
+    params = {strings.DATA: parsing.DictType(str, parsing.SequenceType(str))}
+
+
 def parse_dict(json_response):
     """Parse a JSON dictionary expected to represent a response.
     Raise an exception if either:
@@ -22,6 +22,10 @@ from diplomacy.daide.tokens import Token
 
 # Constants
 LOGGER = logging.getLogger(__name__)
+_OPE_PAR_BYTES = bytes(tokens.OPE_PAR)
+_CLO_PAR_BYTES = bytes(tokens.CLO_PAR)
+_OPE_PAR_ID = tokens.str_to_id(str(tokens.OPE_PAR))
+_CLO_PAR_ID = tokens.str_to_id(str(tokens.CLO_PAR))
 
 
 def break_next_group(daide_bytes):
@@ -35,39 +39,38 @@ def break_next_group(daide_bytes):
     """
     if not daide_bytes:
         return b"", b""
+    if daide_bytes[:2] != _OPE_PAR_BYTES:
+        return None, daide_bytes
 
-    # Finding the matching closing parenthesis
-    pos = 0
+    # Finding the matching closing parenthesis, scanning token IDs without copying bytes
     parentheses_level = 0
-    while True:
-        if daide_bytes[pos : pos + 2] == bytes(tokens.OPE_PAR):
+    view = memoryview(daide_bytes)[: len(daide_bytes) & ~1]
+    for index, (token_id,) in enumerate(tokens.TOKEN_STRUCT.iter_unpack(view)):
+        if token_id == _OPE_PAR_ID:
             parentheses_level += 1
-        elif daide_bytes[pos : pos + 2] == bytes(tokens.CLO_PAR):
+        elif token_id == _CLO_PAR_ID:
             parentheses_level -= 1
-        if parentheses_level <= 0:
-            break
-        if pos >= len(daide_bytes):  # Parentheses don't match - Not returning group
-            pos = 0
-            break
-        pos += 2
+            if not parentheses_level:
+                pos = 2 * index + 2
+                return daide_bytes[:pos], daide_bytes[pos:]
 
-    # Returning
-    return (daide_bytes[: pos + 2], daide_bytes[pos + 2 :]) if pos else (None, daide_bytes)
+    # Parentheses don't match - Not returning group
+    return None, daide_bytes
 
 
 def add_parentheses(daide_bytes):
     """Add parentheses to a list of bytes"""
     if not daide_bytes:
         return daide_bytes
-    return bytes(tokens.OPE_PAR) + daide_bytes + bytes(tokens.CLO_PAR)
+    return _OPE_PAR_BYTES + daide_bytes + _CLO_PAR_BYTES
 
 
 def strip_parentheses(daide_bytes):
     """Removes parentheses from the DAIDE bytes and returns the inner content.
     The first and last token are expected to be parentheses.
     """
-    assert daide_bytes[:2] == bytes(tokens.OPE_PAR), 'Expected bytes to start with "("'
-    assert daide_bytes[-2:] == bytes(tokens.CLO_PAR), 'Expected bytes to end with ")"'
+    assert daide_bytes[:2] == _OPE_PAR_BYTES, 'Expected bytes to start with "("'
+    assert daide_bytes[-2:] == _CLO_PAR_BYTES, 'Expected bytes to end with ")"'
     return daide_bytes[2:-2]
 
 
@@ -198,7 +201,7 @@ class SingleToken(AbstractClause):
 
         # Getting the token
         self._bytes = token_bytes
-        self._str = str(Token(from_bytes=token_bytes))
+        self._str = tokens.id_to_str(tokens.bytes_to_id(token_bytes))
         return remaining_bytes
 
     def from_string(self, string, on_error="raise"):
@@ -213,7 +216,7 @@ class SingleToken(AbstractClause):
             return
 
         # Getting the token
-        self._bytes = bytes(Token(from_str=string))
+        self._bytes = tokens.TOKEN_STRUCT.pack(tokens.str_to_id(string))
         self._str = string
 
 
@@ -290,13 +293,9 @@ class String(AbstractClause):
             return daide_bytes
 
         # Extract its content
-        nb_bytes = len(str_group_bytes)
         self._bytes = str_group_bytes
         self._str = "".join(
-            [
-                str(Token(from_bytes=str_group_bytes[pos : pos + 2]))
-                for pos in range(2, nb_bytes - 2, 2)
-            ]
+            [tokens.id_to_str(token_id) for token_id in tokens.bytes_to_ids(str_group_bytes)[1:-1]]
         )
         return remaining_bytes
 
@@ -306,7 +305,9 @@ class String(AbstractClause):
         :param string: The string to use to build the clause
         :param on_error: The action to take when an error is encountered ('raise', 'warn', 'ignore')
         """
-        self._bytes = add_parentheses(b"".join([bytes(Token(from_str=char)) for char in string]))
+        self._bytes = add_parentheses(
+            tokens.ids_to_bytes([tokens.str_to_id(char) for char in string])
+        )
         self._str = string
 
 
@@ -345,14 +346,14 @@ class Number(AbstractClause):
             return daide_bytes
 
         number_bytes, remaining_bytes = daide_bytes[:2], daide_bytes[2:]
-        number_token = Token(from_bytes=number_bytes)
-        if not tokens.is_integer_token(number_token):
-            self.error(on_error, "The token is not an integer. Got %s" % number_token)
+        token_id = tokens.bytes_to_id(number_bytes)
+        if token_id >= tokens.INTEGER_LIMIT:
+            self.error(on_error, "The token is not an integer. Got %s" % tokens.id_to_str(token_id))
             return daide_bytes
 
         # Extract its content
         self._bytes = number_bytes
-        self._int = int(number_token)
+        self._int = tokens.id_to_int(token_id)
         return remaining_bytes
 
     def from_string(self, string, on_error="raise"):
@@ -361,8 +362,8 @@ class Number(AbstractClause):
         :param string: The string to use to build the clause
         :param on_error: The action to take when an error is encountered ('raise', 'warn', 'ignore')
         """
-        self._bytes = bytes(Token(from_int=int(string)))
         self._int = int(string)
+        self._bytes = tokens.TOKEN_STRUCT.pack(tokens.int_to_id(self._int))
 
 
 class Province(AbstractClause):
@@ -460,7 +461,7 @@ class Province(AbstractClause):
 
             self._str = str_province + str_coast
             self._bytes = add_parentheses(
-                bytes(Token(from_str=str_province)) + bytes(Token(from_str=str_coast))
+                tokens.ids_to_bytes([tokens.str_to_id(str_province), tokens.str_to_id(str_coast)])
             )
 
         # Province without coast
@@ -468,7 +469,7 @@ class Province(AbstractClause):
         else:
             str_province = self._alias_from_string.get(string, string)
             self._str = str_province
-            self._bytes = bytes(Token(from_str=str_province))
+            self._bytes = tokens.TOKEN_STRUCT.pack(tokens.str_to_id(str_province))
 
 
 class Turn(AbstractClause):
@@ -538,7 +539,7 @@ class Turn(AbstractClause):
 
         self._str = string
         self._bytes = add_parentheses(
-            bytes(Token(from_str=str_season)) + bytes(Token(from_int=int(str_year)))
+            tokens.ids_to_bytes([tokens.str_to_id(str_season), tokens.int_to_id(int(str_year))])
         )
 
 
@@ -571,7 +572,7 @@ class UnitType(SingleToken):
         if not str_unit_type:
             self.error(on_error, 'Unknown unit type "%s"' % string)
         self._str = string
-        self._bytes = bytes(Token(from_str=str_unit_type))
+        self._bytes = tokens.TOKEN_STRUCT.pack(tokens.str_to_id(str_unit_type))
 
 
 class Unit(AbstractClause):
@@ -28,7 +28,7 @@ from diplomacy.daide.clauses import (
     parse_bytes,
 )
 from diplomacy.daide import tokens
-from diplomacy.daide.tokens import Token, is_ascii_token
+from diplomacy.daide.tokens import Token
 from diplomacy.utils import parsing, strings
 
 
@@ -79,21 +79,20 @@ class DaideRequest(_AbstractGameRequest):
         self._bytes = daide_bytes
 
         # Building str representation
-        while daide_bytes:
-            token = Token(from_bytes=(daide_bytes[0], daide_bytes[1]))
-            new_str = str(token)
-            daide_bytes = daide_bytes[2:]
-            pad = (
-                ""
-                if (
-                    not self._str
-                    or self._str[-1] == "("
-                    or new_str == ")"
-                    or (is_ascii_token(token) and new_str != "(")
-                )
-                else " "
-            )
-            self._str = self._str + pad + new_str
+        buffer = []
+        previous_str = self._str
+        for token_id in tokens.bytes_to_ids(daide_bytes):
+            new_str = tokens.id_to_str(token_id)
+            if not (
+                not previous_str
+                or previous_str[-1] == "("
+                or new_str == ")"
+                or (token_id >> 8 == tokens.ASCII_BYTE and new_str != "(")
+            ):
+                buffer.append(" ")
+            buffer.append(new_str)
+            previous_str = new_str
+        self._str = self._str + "".join(buffer)
 
 
 # ====================
@@ -16,7 +16,10 @@
 # ==============================================================================
 """Tests the DAIDE tokens"""
 from enum import Enum
+import pytest
+from diplomacy.daide import tokens
 from diplomacy.daide.tokens import Token
+from diplomacy.daide.utils import bytes_to_str, str_to_bytes
 
 
 class ExpectedTokens(Enum):
@@ -269,3 +272,40 @@ def test_tokens():
         assert str(token_from_bytes) == token_str
         assert bytes(token_from_str) == token_bytes
         assert bytes(token_from_bytes) == token_bytes
+
+
+def test_token_ids():
+    """Test conversions between tokens and token IDs"""
+    for token in ExpectedTokens:
+        token_str = token.name[-3:]
+        assert tokens.str_to_id(token_str) == token.value
+        assert tokens.id_to_str(token.value) == token_str
+
+    # Integers
+    for value in (0, 1, 1901, 8191, -1, -8192):
+        token_id = tokens.int_to_id(value)
+        token_bytes = bytes(Token(from_int=value))
+        assert token_id < tokens.INTEGER_LIMIT
+        assert tokens.ids_to_bytes([token_id]) == token_bytes
+        assert tokens.id_to_int(token_id) == value == int(Token(from_bytes=token_bytes))
+        assert tokens.id_to_str(token_id) == str(value)
+
+    # ASCII chars, and bulk conversions
+    daide_bytes = str_to_bytes("SND ( FRA ) ( PRP ( PCE ( FRA ENG ) ) ) ( H i   ! ) #-5")
+    token_ids = tokens.bytes_to_ids(memoryview(daide_bytes))
+    assert tokens.ids_to_bytes(token_ids) == daide_bytes
+    assert token_ids[-1] == tokens.int_to_id(-5)
+    chars = [tokens.id_to_str(token_id) for token_id in token_ids[15:21]]
+    assert chars == ["H", "i", " ", " ", "!", ")"]
+    daide_str = "SND ( FRA ) ( PRP ( PCE ( FRA ENG ) ) ) ( H i ! ) #-5"
+    assert bytes_to_str(str_to_bytes(daide_str)) == daide_str
+
+    # Invalid values
+    for function, value in (
+        (tokens.id_to_str, 0x4FFF),
+        (tokens.str_to_id, "UNKNOWN"),
+        (tokens.int_to_id, 8192),
+        (tokens.bytes_to_ids, b"\x48"),
+    ):
+        with pytest.raises(ValueError):
+            function(value)
@@ -14,12 +14,24 @@
 #  You should have received a copy of the GNU Affero General Public License along
 #  with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ==============================================================================
-"""Contains the list of valid tokens and their byte representation"""
+"""Contains the list of valid tokens and their byte representation
+
+Tokens are also identified by their token ID, i.e. the integer value of their 2 bytes (big endian,
+e.g. 0x4604 for ECS). Token IDs are converted with lookup tables, so that DAIDE bytes can be
+decoded in bulk (see bytes_to_ids() and ids_to_bytes()) without building Token objects.
+"""
+import struct
 
 # Constants
 BYTES_TO_STR = {}  # (0x46, 0x04) -> 'ECS'
 STR_TO_BYTES = {}  # 'ECS' -> (0x46, 0x04)
 ASCII_BYTE = 0x4B  # Byte identifying an ASCII char
+INTEGER_LIMIT = 0x4000  # Token IDs lower than this limit are integers
+TOKEN_STRUCT = struct.Struct(">H")  # A token ID encoded as 2 bytes
+
+# Lookup tables
+ID_TO_STR = [None] * 0x10000  # 0x4604 -> 'ECS'
+STR_TO_ID = {}  # 'ECS' -> 0x4604 (only registered tokens)
 
 
 # Utilities
@@ -59,16 +71,9 @@ class Token:
         """Creates a token from a DAIDE string representation"""
         assert isinstance(from_str, str), "Expected a string"
 
-        # 1) Known token
-        # 2) ASCII Text
-        if from_str in STR_TO_BYTES:
-            self.repr_str = BYTES_TO_STR[STR_TO_BYTES[from_str]]
-            self.repr_bytes = STR_TO_BYTES[from_str]
-        elif len(from_str) == 1 and ord(from_str[0]) <= 255:
-            self.repr_str = from_str
-            self.repr_bytes = bytes((ASCII_BYTE, ord(from_str[0])))
-        else:
-            raise ValueError("Unable to parse %s as a token" % from_str)
+        # Known token or ASCII Text
+        self.repr_str = from_str
+        self.repr_bytes = TOKEN_STRUCT.pack(str_to_id(from_str))
 
     def _load_from_int(self, from_int):
         """Creates a token from an integer representation"""
@@ -78,18 +83,9 @@ class Token:
         if from_int > 8191 or from_int < -8192:
             raise ValueError("Valid values for strings are -8192 to +8191.")
 
-        # Negative numbers start with a 1
-        prefix = "0"
-        if from_int < 0:
-            prefix = "1"
-            from_int += 8192
-
-        # Encoding the number as 14 bit. + a prefix of '00' for a total of 16 bit
-        bit_encoding = bin(from_int)[2:]
-        bit_encoding = "00" + prefix + "0" * (13 - len(bit_encoding)) + bit_encoding
         self.repr_str = str(from_int)
         self.repr_int = from_int
-        self.repr_bytes = bytes((int(bit_encoding[0:8], 2), int(bit_encoding[8:16], 2)))
+        self.repr_bytes = TOKEN_STRUCT.pack(int_to_id(from_int))
 
     def _load_from_bytes(self, from_bytes):
         """Creates a token from its bytes representation"""
@@ -102,28 +98,12 @@ class Token:
                 )
             )
 
-        # Known token
-        if from_bytes in BYTES_TO_STR:
-            self.repr_str = BYTES_TO_STR[from_bytes]
-            self.repr_bytes = from_bytes
-
-        # Ascii text
-        elif from_bytes[0] == ASCII_BYTE:
-            self.repr_str = chr(from_bytes[1])
-            self.repr_bytes = from_bytes
-
-        # Integer
-        elif from_bytes[0] < 64:
-            bin_0, bin_1 = bin(from_bytes[0])[2:], bin(from_bytes[1])[2:]
-            from_binary = "0" * (6 - len(bin_0)) + bin_0 + "0" * (8 - len(bin_1)) + bin_1
-            is_negative = int(from_binary[0] == "1")
-            self.repr_int = is_negative * -8192 + int(from_binary[1:14], 2)
-            self.repr_str = str(self.repr_int)
-            self.repr_bytes = from_bytes
-
-        else:
-            # Unknown value
-            raise ValueError("Unable to parse bytes %s as a token" % (from_bytes,))
+        # Known token, Ascii text or Integer
+        token_id = (from_bytes[0] << 8) | from_bytes[1]
+        self.repr_str = id_to_str(token_id)
+        self.repr_bytes = bytes(from_bytes)
+        if token_id < INTEGER_LIMIT:
+            self.repr_int = id_to_int(token_id)
 
     def __bytes__(self):
         """Returns bytes representation"""
@@ -166,6 +146,67 @@ def is_integer_token(token):
     return isinstance(token, Token) and len(token.repr_bytes) == 2 and token.repr_bytes[0] < 64
 
 
+def id_to_int(token_id):
+    """Returns the integer represented by an integer token ID (14 bits, two's complement)"""
+    return token_id - INTEGER_LIMIT if token_id & 0x2000 else token_id
+
+
+def int_to_id(value):
+    """Returns the token ID representing an integer
+
+    :param value: An integer between -8192 and +8191
+    """
+    if value > 8191 or value < -8192:
+        raise ValueError("Valid values for strings are -8192 to +8191.")
+    return value & 0x3FFF
+
+
+def id_to_str(token_id):
+    """Returns the string representation of a token ID (e.g. 'ECS', 'A' or '1901')"""
+    token_str = ID_TO_STR[token_id]
+    if token_str is None:
+        raise ValueError("Unable to parse bytes %s as a token" % (TOKEN_STRUCT.pack(token_id),))
+    return token_str
+
+
+def str_to_id(token_str):
+    """Returns the token ID of a registered token or of an ASCII char
+
+    :param token_str: The DAIDE string representation of the token (e.g. 'ECS' or 'A')
+    """
+    token_id = STR_TO_ID.get(token_str)
+    if token_id is None:
+        if len(token_str) != 1 or ord(token_str) > 255:
+            raise ValueError("Unable to parse %s as a token" % token_str)
+        token_id = (ASCII_BYTE << 8) | ord(token_str)
+    return token_id
+
+
+def bytes_to_id(token_bytes):
+    """Returns the token ID of a single token
+
+    :param token_bytes: The bytes representation of the token (i.e. bytes of length 2)
+    """
+    if len(token_bytes) != 2:
+        raise ValueError("Expected a couple of 2 bytes. Got %d bytes" % len(token_bytes))
+    return (token_bytes[0] << 8) | token_bytes[1]
+
+
+def bytes_to_ids(daide_bytes):
+    """Decodes DAIDE bytes into a tuple of token IDs
+
+    :param daide_bytes: Any bytes-like object (e.g. bytes or memoryview) with an even length
+    """
+    if len(daide_bytes) % 2:
+        raise ValueError("Expected an even number of bytes. Got %d" % len(daide_bytes))
+    return struct.unpack(">%dH" % (len(daide_bytes) // 2), daide_bytes)
+
+
+def ids_to_bytes(token_ids):
+    """Encodes a sequence of token IDs into DAIDE bytes"""
+    return struct.pack(">%dH" % len(token_ids), *token_ids)
+
+
 def register_token(str_repr, bytes_repr):
     """Registers a token in the registry
 
@@ -179,9 +220,20 @@ def register_token(str_repr, bytes_repr):
         raise ValueError("Bytes %s have already been registered." % bytes_repr)
     STR_TO_BYTES[str_repr] = bytes_repr
     BYTES_TO_STR[bytes_repr] = str_repr
+    (token_id,) = TOKEN_STRUCT.unpack(bytes_repr)
+    STR_TO_ID[str_repr] = token_id
+    ID_TO_STR[token_id] = str_repr
     return Token(from_str=str_repr)
 
 
+# Integers and ASCII chars
+for _token_id in range(INTEGER_LIMIT):
+    ID_TO_STR[_token_id] = str(id_to_int(_token_id))
+for _char_code in range(256):
+    ID_TO_STR[(ASCII_BYTE << 8) | _char_code] = chr(_char_code)
+del _token_id, _char_code
+
+
 # ------------------------
 # Registering tokens
 # Coasts
@@ -16,7 +16,15 @@
 # ==============================================================================
 """Settings - Contains a list of utils to help handle DAIDE communication"""
 from collections import namedtuple
-from diplomacy.daide.tokens import is_integer_token, Token
+from diplomacy.daide.tokens import (
+    ID_TO_STR,
+    INTEGER_LIMIT,
+    bytes_to_ids,
+    id_to_str,
+    ids_to_bytes,
+    int_to_id,
+    str_to_id,
+)
 
 ClientConnection = namedtuple("ClientConnection", ["username", "daide_user", "token", "power_name"])
 
@@ -49,16 +57,16 @@ def str_to_bytes(daide_str):
 
     Note: Integers starts with a '#' character
     """
-    buffer = []
+    token_ids = []
     str_split = daide_str.split(" ") if daide_str else []
     for word in str_split:
         if word == "":
-            buffer.append(bytes(Token(from_str=" ")))
+            token_ids.append(str_to_id(" "))
         elif word[0] == "#":
-            buffer.append(bytes(Token(from_int=int(word[1:]))))
+            token_ids.append(int_to_id(int(word[1:])))
         else:
-            buffer.append(bytes(Token(from_str=word)))
-    return b"".join(buffer)
+            token_ids.append(str_to_id(word))
+    return ids_to_bytes(token_ids)
 
 
 def bytes_to_str(daide_bytes):
@@ -69,12 +77,9 @@ def bytes_to_str(daide_bytes):
 
     Note: Integers starts with a '#' character
     """
-    buffer = []
-    length = len(daide_bytes) if daide_bytes else 0
-    for i in range(0, length, 2):
-        token = Token(from_bytes=(daide_bytes[i], daide_bytes[i + 1]))
-        if is_integer_token(token):
-            buffer.append("#" + str(token))
-        else:
-            buffer.append(str(token))
-    return " ".join(buffer)
+    if not daide_bytes:
+        return ""
+    return " ".join(
+        "#" + ID_TO_STR[token_id] if token_id < INTEGER_LIMIT else id_to_str(token_id)
+        for token_id in bytes_to_ids(daide_bytes)
+    )
@@ -21,14 +21,15 @@
 """
 # pylint: disable=too-many-lines
 import base64
-import json
 import os
 import logging
 import sys
 import time
 import random
 from copy import deepcopy
-from typing import List, Optional, Union
+from functools import reduce
+from operator import xor
+from typing import Dict, List, Optional, Union
 
 from diplomacy import settings
 import diplomacy.utils.errors as err
@@ -49,10 +50,12 @@ from diplomacy.engine.log import Log
 from diplomacy.engine.power import Power
 from diplomacy.engine.renderer import Renderer
 from diplomacy.utils import PriorityDict, common, exceptions, parsing, strings
+from diplomacy.utils.delta_history import DeltaHistory, decode_history, is_delta
 from diplomacy.utils.jsonable import Jsonable
 from diplomacy.utils.sorted_dict import SortedDict
 from diplomacy.utils.constants import OrderSettings, DEFAULT_GAME_RULES
 from diplomacy.utils.game_phase_data import GamePhaseData, MESSAGES_TYPE, LOGS_TYPE
+from diplomacy.utils.message_store import MessageStore, get_advice_recipient
 
 # Constants
 UNDETERMINED, POWER, UNIT, LOCATION, COAST, ORDER, MOVE_SEP, OTHER = (
@@ -67,6 +70,52 @@ UNDETERMINED, POWER, UNIT, LOCATION, COAST, ORDER, MOVE_SEP, OTHER = (
 )
 LOGGER = logging.getLogger(__name__)
 
+# Index of unit types in Zobrist hash tables.
+UNIT_TYPE_IX = {"A": 0, "F": 1}
+
+# Game fields containing data from previous phases (shared between forked games, see Game.fork()).
+HISTORY_FIELDS = (
+    "order_history",
+    "message_history",
+    "state_history",
+    "result_history",
+    "log_history",
+    "stance_history",
+    "order_log_history",
+    "is_bot_history",
+    "deceiving_history",
+)
+
+# Game and power fields read by phase adjudication (see Game.adjudicate()).
+ADJUDICATION_FIELDS = (
+    strings.GAME_ID,
+    strings.MAP_NAME,
+    strings.META_RULES,
+    strings.NO_RULES,
+    strings.NOTE,
+    strings.OUTCOME,
+    strings.PHASE,
+    strings.ROLE,
+    strings.RULES,
+    strings.STATUS,
+    strings.VICTORY,
+    strings.WIN,
+)
+ADJUDICATION_POWER_FIELDS = (
+    strings.ADJUST,
+    strings.CENTERS,
+    strings.CIVIL_DISORDER,
+    strings.HOMES,
+    strings.INFLUENCE,
+    strings.NAME,
+    strings.ORDERS,
+    strings.ORDER_IS_SET,
+    strings.RETREATS,
+    strings.UNITS,
+)
+# Game fields modified by phase adjudication.
+ADJUDICATED_FIELDS = (strings.NOTE, strings.OUTCOME, strings.PHASE, strings.STATUS, strings.WIN)
+
 
 class Game(Jsonable):
     """Game class.
@@ -210,6 +259,8 @@ class Game(Jsonable):
         ie. time when this state was saved and archived in state history.
       - Format: {short phase name => state}
       - Wrapped in a sorted dict at runtime, see method __init__().
+      - With rule DELTA_HISTORY, each state is stored as a delta against previous state,
+        with a full state stored periodically (see :class:`diplomacy.utils.delta_history.DeltaHistory`).
 
     - **status**: game status (forming, active, paused, completed or canceled).
       Possible values in diplomacy.utils.strings.ALL_GAME_STATUSES.
@@ -287,6 +338,10 @@ class Game(Jsonable):
         "_phase_wrapper_type",
         "phase_abbr",
         "_unit_owner_cache",
+        "_possible_orders_cache",
+        "_units_orders_cache",
+        "_convoy_paths_cache",
+        "_history_shared",
         "daide_port",
         "fixed_state",
         "log_history",
@@ -525,6 +580,14 @@ class Game(Jsonable):
 
         # Caches
         self._unit_owner_cache = None  # {(unit, coast_required): owner}
+        self._possible_orders_cache = None  # ((phase, zobrist hash), {loc: possible orders})
+        self._units_orders_cache = None  # (phase, convoying locs, {unit: (orders, dependencies)})
+        self._convoy_paths_cache = (
+            None  # (convoying locs, convoy_paths_possible, convoy_paths_dest)
+        )
+
+        # Set when history fields are shared with a forked game (copy-on-write, see fork()).
+        self._history_shared = False
 
         # Remove rules from kwargs (if present), as we want to add them manually using self.add_rule().
         rules = kwargs.pop(strings.RULES, None)
@@ -613,11 +676,7 @@ class Game(Jsonable):
             SortedDict,
             {self._phase_wrapper_type(key): value for key, value in self.message_history.items()},
         )
-        self.state_history = SortedDict(
-            self._phase_wrapper_type,
-            dict,
-            {self._phase_wrapper_type(key): value for key, value in self.state_history.items()},
-        )
+        self.state_history = self._new_history(self.state_history)
         self.result_history = SortedDict(
             self._phase_wrapper_type,
             dict,
@@ -628,26 +687,14 @@ class Game(Jsonable):
             SortedDict,
             {self._phase_wrapper_type(key): value for key, value in self.log_history.items()},
         )
-        self.stance_history = SortedDict(
-            self._phase_wrapper_type,
-            dict,
-            {self._phase_wrapper_type(key): value for key, value in self.stance_history.items()},
-        )
+        self.stance_history = self._new_history(self.stance_history)
         self.order_log_history = SortedDict(
             self._phase_wrapper_type,
             dict,
             {self._phase_wrapper_type(key): value for key, value in self.order_log_history.items()},
         )
-        self.is_bot_history = SortedDict(
-            self._phase_wrapper_type,
-            dict,
-            {self._phase_wrapper_type(key): value for key, value in self.is_bot_history.items()},
-        )
-        self.deceiving_history = SortedDict(
-            self._phase_wrapper_type,
-            dict,
-            {self._phase_wrapper_type(key): value for key, value in self.deceiving_history.items()},
-        )
+        self.is_bot_history = self._new_history(self.is_bot_history)
+        self.deceiving_history = self._new_history(self.deceiving_history)
 
     def __str__(self):
         """Returns a string representation of the game instance"""
@@ -669,16 +716,71 @@ class Game(Jsonable):
 
         # Deep copying
         for key in self._slots:
-            if key in ["map", "renderer", "powers"]:
+            if key in ["map", "renderer", "powers", "_unit_owner_cache"]:
                 continue
             setattr(result, key, deepcopy(getattr(self, key)))
         setattr(result, "map", self.map)
+        setattr(result, "_unit_owner_cache", None)
+        setattr(result, "powers", {})
+        for power in self.powers.values():
+            result.powers[power.name] = deepcopy(power)
+            setattr(result.powers[power.name], "game", result)
+        return result
+
+    def fork(self):
+        """Return a copy of this game to evaluate candidate orders (e.g. for search or what-if analysis).
+
+        Unlike deepcopy(), history fields (order, message, state, result, log, stance, order log,
+        is_bot and deceiving histories) are not copied but shared with returned game.
+        Shared history fields are copied only when one of the two games has to modify
+        them, e.g. when processing a phase (copy-on-write). Powers and current orders
+        are copied. Possible orders and convoy paths caches are shared (they are replaced,
+        never modified), other caches are reset. Map is shared.
+
+        :return: a new game object
+        :rtype: Game
+        """
+        cls = self.__class__
+        result = cls.__new__(cls)
+        for key in self._slots:
+            if key in HISTORY_FIELDS or key in [
+                "_possible_orders_cache",
+                "_units_orders_cache",
+                "_convoy_paths_cache",
+            ]:
+                setattr(result, key, getattr(self, key))
+            elif key not in ["map", "renderer", "powers", "_unit_owner_cache"]:
+                setattr(result, key, deepcopy(getattr(self, key)))
+        setattr(result, "map", self.map)
+        setattr(result, "renderer", None)
+        setattr(result, "_unit_owner_cache", None)
         setattr(result, "powers", {})
         for power in self.powers.values():
             result.powers[power.name] = deepcopy(power)
             setattr(result.powers[power.name], "game", result)
+        self._history_shared = result._history_shared = True
         return result
 
+    def to_dict(self):
+        """Convert this game to a python dictionary ready for any JSON work.
+        With rule DELTA_HISTORY, a server game exports its state history as stored, ie. with
+        delta-encoded states between keyframes. Other games (e.g. games sent to clients) always
+        export full states.
+
+        :return: dict
+        """
+        if not (isinstance(self.state_history, DeltaHistory) and self.is_server_game()):
+            return super(Game, self).to_dict()
+        json_dict = {
+            key: getattr(self, key) if encoder is None else encoder(getattr(self, key))
+            for key, _, _, _, encoder in self.get_compiled_model()
+            if key != strings.STATE_HISTORY
+        }
+        json_dict[strings.STATE_HISTORY] = {
+            str(phase): state for phase, state in self.state_history.encoded_items()
+        }
+        return json_dict
+
     # ====================================================================
     #   Public Interface
     # ====================================================================
@@ -959,10 +1061,18 @@ class Game(Jsonable):
         :return: a dict of corresponding messages (empty if no corresponding messages found),
             mapping messages timestamps to messages.
         :type messages: diplomacy.utils.sorted_dict.SortedDict
+            or diplomacy.utils.message_store.MessageStore
         """
 
+        indexed = isinstance(messages, MessageStore)
+
         # Observer can see global messages and system messages sent to observers.
         if isinstance(game_role, str) and game_role == strings.OBSERVER_TYPE:
+            if indexed:
+                return {
+                    message.time_sent: message
+                    for message in messages.sub_for_observer(timestamp_from, timestamp_to)
+                }
             return {
                 message.time_sent: message
                 for message in messages.sub(timestamp_from, timestamp_to)
@@ -981,18 +1091,17 @@ class Game(Jsonable):
         elif not isinstance(game_role, list):
             game_role = list(game_role)
 
-        def is_advice_for_role(message: Message) -> bool:
-            """Return True if this message is advice for given game role(s)."""
-            return (
-                message.type in strings.ALL_SUGGESTION_TYPES
-                and json.loads(message.message).get("recipient") in game_role
-            )
+        if indexed:
+            return {
+                message.time_sent: message
+                for message in messages.sub_for_powers(game_role, timestamp_from, timestamp_to)
+            }
 
         return {
             message.time_sent: message
             for message in messages.sub(timestamp_from, timestamp_to)
             if (message.is_global() and message.type is None)
-            or is_advice_for_role(message)
+            or get_advice_recipient(message) in game_role
             or message.recipient in game_role
             or message.sender in game_role
         }
@@ -1179,6 +1288,7 @@ class Game(Jsonable):
         :type game_phase_data: GamePhaseData
         """
         phase = self._phase_wrapper_type(game_phase_data.name)
+        self._copy_shared_history()
         assert phase not in self.state_history
         assert phase not in self.message_history
         assert phase not in self.log_history
@@ -1228,6 +1338,7 @@ class Game(Jsonable):
         previous_order_logs = self.order_logs.copy()
 
         # Finish the game.
+        self._copy_shared_history()
         self._finish(winners)
 
         # Then clear game and save previous phase.
@@ -1866,6 +1977,43 @@ class Game(Jsonable):
         """
         if not self.is_fixed_state_unchanged(log_error=bool(orders)):
             return
+        self._set_power_orders(self._get_orderable_power(power_name), orders, expand, replace)
+
+    def set_orders_many(
+        self,
+        orders: Dict[str, Union[List[str], str]],
+        expand: bool = True,
+        replace: bool = True,
+    ) -> Dict[str, List[str]]:
+        """Sets the current orders for many powers in one pass
+
+        Orders are validated as with method set_orders(). All power names are checked before any
+        order is set, and errors are returned separately for each power.
+
+        :param orders: Dictionary mapping power names to their list of orders
+            (e.g. {'FRANCE': ['A MAR - PAR', ...], 'ENGLAND': ['F LON - NTH', ...]})
+        :param expand: Boolean. If set, performs order expansion and reformatting (see set_orders())
+        :param replace: Boolean. If set, replace previous orders on same units, otherwise prevents re-orders.
+        :return: Dictionary mapping each power name to the list of errors raised while setting its orders
+            (empty list if all orders were accepted).
+        """
+        powers = [
+            (self._get_orderable_power(name), power_orders) for name, power_orders in orders.items()
+        ]
+        results = {power.name: [] for power, _ in powers}
+        if not self.is_fixed_state_unchanged(log_error=any(orders.values())):
+            return results
+        for power, power_orders in powers:
+            nb_errors = len(self.error)
+            self._set_power_orders(power, power_orders, expand, replace)
+            results[power.name] = self.error[nb_errors:]
+        return results
+
+    def _get_orderable_power(self, power_name: str) -> Power:
+        """Return power with given name, if this game can set orders for this power.
+
+        :param power_name: The name of the power (e.g. 'FRANCE')
+        """
         power_name = power_name.upper()
 
         if not self.has_power(power_name):
@@ -1876,8 +2024,12 @@ class Game(Jsonable):
                 "Player game for %s only accepts orders for this power." % self.role
             )
 
-        power = self.get_power(power_name)
+        return self.get_power(power_name)
 
+    def _set_power_orders(
+        self, power: Power, orders: Union[List[str], str], expand: bool, replace: bool
+    ) -> None:
+        """Sets the current orders for a power (see method set_orders())"""
         if not isinstance(orders, list):
             orders = [orders]
 
@@ -1975,6 +2127,7 @@ class Game(Jsonable):
         """Clears all caches"""
         self.convoy_paths_possible, self.convoy_paths_dest = None, None
         self._unit_owner_cache = None
+        self._possible_orders_cache = None
 
     def set_current_phase(self, new_phase):
         """Changes the phase to the specified new phase (e.g. 'S1901M')"""
@@ -2007,6 +2160,29 @@ class Game(Jsonable):
             output_path=output_path,
         )
 
+    def render_phases(self, phases=None, incl_orders=True, incl_abbrev=False, output_format="svg"):
+        """Renders many phases of the game in one call (e.g. all phases of the game)
+
+        :param phases: Optional. A list of GamePhaseData to render.
+            Defaults to all phases in game history followed by current phase.
+        :param incl_orders:  Optional. Flag to indicate we also want to render orders.
+        :param incl_abbrev: Optional. Flag to indicate we also want to display the provinces abbreviations.
+        :param output_format: The desired output format. Currently, only 'svg' is supported.
+        :type phases: List[GamePhaseData], optional
+        :type incl_orders: bool, optional
+        :type incl_abbrev: bool, optional
+        :type output_format: str, optional
+        :return: A list of (phase name, rendered image in the specified format)
+        """
+        if not self.renderer:
+            self.renderer = Renderer(self)
+        return self.renderer.render_phases(
+            phases=phases,
+            incl_orders=incl_orders,
+            incl_abbrev=incl_abbrev,
+            output_format=output_format,
+        )
+
     def add_rule(self, rule):
         """Adds a rule to the current rule list
 
@@ -2090,9 +2266,11 @@ class Game(Jsonable):
         if reinit_powers:
             self.powers = {}
 
-    def process(self):
+    def process(self, adjudication=None):
         """Processes the current phase of the game.
 
+        :param adjudication: (optional) result of method Game.adjudicate() for this game,
+            computed elsewhere (e.g. in another process). If None, phase is adjudicated here.
         :return: game phase data with data before processing.
         """
         previous_phase = self._phase_wrapper_type(self.current_short_phase)
@@ -2112,7 +2290,11 @@ class Game(Jsonable):
                     print("-- %s" % error)
                 print("-" * 32)
             self.error = []
-        self._process()
+        self._copy_shared_history()
+        if adjudication is None:
+            self._process()
+        else:
+            self._apply_adjudication(adjudication)
 
         # result_history should have been updated with orders results for processed (previous) phase.
 
@@ -2162,6 +2344,72 @@ class Game(Jsonable):
             deceiving=previous_deceiving,
         )
 
+    def get_adjudication_input(self):
+        """Return a JSON dictionary with game data required to adjudicate current phase
+        (i.e. game without histories and press), to be passed to method Game.adjudicate().
+        """
+        game_dict = {
+            key: parsing.to_json(getattr(self, key), self.model[key]) for key in ADJUDICATION_FIELDS
+        }
+        game_dict[strings.POWERS] = {
+            power.name: {
+                key: parsing.to_json(getattr(power, key), Power.model[key])
+                for key in ADJUDICATION_POWER_FIELDS
+            }
+            for power in self.powers.values()
+        }
+        # Resolution data kept in memory between a movement phase and the next retreats phase.
+        game_dict[strings.DISLODGED] = dict(self.dislodged)
+        game_dict[strings.POPPED] = list(self.popped)
+        return game_dict
+
+    @classmethod
+    def adjudicate(cls, adjudication_input):
+        """Adjudicate a game phase from given input, without any game object to update.
+        Function is picklable, so that adjudication can be computed in another process.
+
+        :param adjudication_input: dictionary returned by method Game.get_adjudication_input().
+        :return: a picklable dictionary with adjudicated game data,
+            to be passed to method Game.process().
+        """
+        game = Game.from_dict(adjudication_input)
+        game.dislodged = dict(adjudication_input[strings.DISLODGED])
+        game.popped = list(adjudication_input[strings.POPPED])
+        game._process()
+        adjudication = game.get_adjudication_input()
+        # Histories are empty before processing, so they only contain phases saved while
+        # processing (i.e. results of processed phase, and phase saved if game was drawn).
+        # Histories values are sent as is (e.g. order results with their codes).
+        for key in HISTORY_FIELDS:
+            if getattr(game, key):
+                adjudication[key] = {
+                    str(phase): value for phase, value in getattr(game, key).items()
+                }
+        adjudication[strings.PHASE_TYPE] = game.phase_type
+        return adjudication
+
+    def _apply_adjudication(self, adjudication):
+        """Update this game with adjudicated game data (see method Game.adjudicate()),
+        as if method _process() was called.
+        """
+        for key in ADJUDICATED_FIELDS:
+            setattr(self, key, self.model[key].to_type(adjudication[key]))
+        for power_name, power_dict in adjudication[strings.POWERS].items():
+            power = self.powers[power_name]
+            for key, value in power_dict.items():
+                setattr(power, key, Power.model[key].to_type(value))
+        for key in HISTORY_FIELDS:
+            if key in adjudication:
+                history = getattr(self, key)
+                for phase, value in adjudication[key].items():
+                    history.put(self._phase_wrapper_type(phase), value)
+        self.result = {}
+        self.dislodged = dict(adjudication[strings.DISLODGED])
+        self.popped = list(adjudication[strings.POPPED])
+        self.phase_type = adjudication[strings.PHASE_TYPE]
+        self.rebuild_hash()
+        self.build_caches()
+
     def build_caches(self):
         """Rebuilds the various caches"""
         self.clear_cache()
@@ -2177,21 +2425,28 @@ class Game(Jsonable):
         if self.map is None:
             return 0
 
-        # Recalculating for each power
+        # Recalculating for each power, with a single XOR reduction over all pieces
+        zobrist = self.__class__.zobrist_tables[self.map_name]
+        loc_ix = zobrist["loc_ix"]
+        unit_keys, dis_unit_keys = zobrist["unit_keys"], zobrist["dis_unit_keys"]
+        keys = []
         for power in self.powers.values():
-            for unit in power.units:
-                self.update_hash(power.name, unit_type=unit[0], loc=unit[2:])
-            for dis_unit in power.retreats:
-                self.update_hash(
-                    power.name,
-                    unit_type=dis_unit[0],
-                    loc=dis_unit[2:],
-                    is_dislodged=True,
-                )
-            for center in power.centers:
-                self.update_hash(power.name, loc=center, is_center=True)
-            for home in power.homes:
-                self.update_hash(power.name, loc=home, is_home=True)
+            power_ix = zobrist["power_ix"][power.name.upper()]
+            power_unit_keys = unit_keys[power_ix]
+            power_dis_unit_keys = dis_unit_keys[power_ix]
+            power_centers = zobrist["centers"][power_ix]
+            power_homes = zobrist["homes"][power_ix]
+            keys += [
+                power_unit_keys[UNIT_TYPE_IX.get(unit[0], -1)][loc_ix[unit[2:].upper()]]
+                for unit in power.units
+            ]
+            keys += [
+                power_dis_unit_keys[UNIT_TYPE_IX.get(dis_unit[0], -1)][loc_ix[dis_unit[2:].upper()]]
+                for dis_unit in power.retreats
+            ]
+            keys += [power_centers[loc_ix[center[:3].upper()]] for center in power.centers]
+            keys += [power_homes[loc_ix[home[:3].upper()]] for home in power.homes]
+        self.zobrist_hash = reduce(xor, keys, 0)
 
         # Clearing cache
         self.clear_cache()
@@ -2227,16 +2482,15 @@ class Game(Jsonable):
             return
         zobrist = self.__class__.zobrist_tables[self.map_name]
         loc = loc[:3].upper() if is_center or is_home else loc.upper()
-        power = power.upper()
 
-        power_ix = zobrist["map_powers"].index(power)
-        loc_ix = zobrist["map_locs"].index(loc)
-        unit_type_ix = ["A", "F"].index(unit_type) if unit_type in ["A", "F"] else -1
+        power_ix = zobrist["power_ix"][power.upper()]
+        loc_ix = zobrist["loc_ix"][loc]
 
         # Dislodged
         if is_dislodged:
-            self.zobrist_hash ^= zobrist["dis_unit_type"][unit_type_ix][loc_ix]
-            self.zobrist_hash ^= zobrist["dis_units"][power_ix][loc_ix]
+            self.zobrist_hash ^= zobrist["dis_unit_keys"][power_ix][
+                UNIT_TYPE_IX.get(unit_type, -1)
+            ][loc_ix]
 
         # Supply Center
         elif is_center:
@@ -2248,8 +2502,9 @@ class Game(Jsonable):
 
         # Regular unit
         else:
-            self.zobrist_hash ^= zobrist["unit_type"][unit_type_ix][loc_ix]
-            self.zobrist_hash ^= zobrist["units"][power_ix][loc_ix]
+            self.zobrist_hash ^= zobrist["unit_keys"][power_ix][UNIT_TYPE_IX.get(unit_type, -1)][
+                loc_ix
+            ]
 
     def get_phase_data(self):
         """Return a GamePhaseData object representing current game."""
@@ -2424,7 +2679,9 @@ class Game(Jsonable):
         self.build_caches()
 
     def get_all_possible_orders(self):
-        """Computes a list of all possible orders for all locations
+        """Computes a list of all possible orders for all locations.
+        Result is cached until game state changes (see clear_cache()). During movement phases,
+        when only a few units change, only orders of units around them are recomputed.
 
         :return: A dictionary with locations as keys, and their respective list of possible orders as values
         """
@@ -2435,6 +2692,11 @@ class Game(Jsonable):
         if self.get_current_phase() == "COMPLETED":
             return {loc: list(possible_orders[loc]) for loc in possible_orders}
 
+        # Returning cached orders if game state did not change
+        cache_key = (self.phase, self.zobrist_hash)
+        if self._possible_orders_cache is not None and self._possible_orders_cache[0] == cache_key:
+            return {loc: list(orders) for loc, orders in self._possible_orders_cache[1].items()}
+
         # Building a dict of (unit, is_dislodged, retreat_list, duplicate) for each power
         # duplicate is to indicate that the real unit has a coast, and that was added a duplicate unit without the coast
         unit_dict = {}
@@ -2463,114 +2725,9 @@ class Game(Jsonable):
 
         # Movement phase
         if self.phase_type == "M":
-            # Building a list of units and homes for each power
-            power_units = {power_name: power.units[:] for power_name, power in self.powers.items()}
-
-            # Hold
-            for power_name in self.powers:
-                for unit in power_units[power_name]:
-                    order = unit + " H"
-                    possible_orders[unit[2:]].add(order)
-                    if "/" in unit:
-                        possible_orders[unit[2:5]].add(order)
-
-            # Move, Support, Convoy
-            for power_name in self.powers:
-                for unit in power_units[power_name]:
-                    unit_type, unit_loc = unit[0], unit[2:]
-                    unit_on_coast = "/" in unit_loc
-                    for dest in self.map.dest_with_coasts[unit_loc]:
-                        # Move (Regular)
-                        if self._abuts(unit_type, unit_loc, "-", dest):
-                            order = unit + " - " + dest
-                            possible_orders[unit_loc].add(order)
-                            if unit_on_coast:
-                                possible_orders[unit_loc[:3]].add(order)
-
-                        # Support (Hold)
-                        if self._abuts(unit_type, unit_loc, "S", dest):
-                            if dest in unit_dict:
-                                other_unit, _, _, duplicate = unit_dict[dest]
-                                if not duplicate:
-                                    order = unit + " S " + other_unit[0] + " " + dest
-                                    possible_orders[unit_loc].add(order)
-                                    if unit_on_coast:
-                                        possible_orders[unit_loc[:3]].add(order)
-
-                        # Support (Move)
-                        # Computing src of move (both from adjacent provinces and possible convoys)
-                        # We can't support a unit that needs us to convoy it to its destination
-                        abut_srcs = self.map.abut_list(dest, incl_no_coast=True)
-                        convoy_srcs = self._get_convoy_destinations(
-                            "A", dest, exclude_convoy_locs=[unit_loc]
-                        )
-
-                        # Computing coasts for source
-                        src_with_coasts = [
-                            self.map.find_coasts(src) for src in abut_srcs + convoy_srcs
-                        ]
-                        src_with_coasts = {val for sublist in src_with_coasts for val in sublist}
-
-                        for src in src_with_coasts:
-                            if src not in unit_dict:
-                                continue
-                            src_unit, _, _, duplicate = unit_dict[src]
-                            if duplicate:
-                                continue
-
-                            # Checking if src unit can move to dest (through adj or convoy), and that we can support it
-                            # Only armies can move through convoy
-                            if (
-                                src[:3] != unit_loc[:3]
-                                and self._abuts(unit_type, unit_loc, "S", dest)
-                                and (
-                                    (src in convoy_srcs and src_unit[0] == "A")
-                                    or self._abuts(src_unit[0], src, "-", dest)
-                                )
-                            ):
-                                # Adding with coast
-                                order = unit + " S " + src_unit[0] + " " + src + " - " + dest
-                                possible_orders[unit_loc].add(order)
-                                if unit_on_coast:
-                                    possible_orders[unit_loc[:3]].add(order)
-
-                                # Adding without coasts
-                                if "/" in dest:
-                                    order = (
-                                        unit + " S " + src_unit[0] + " " + src + " - " + dest[:3]
-                                    )
-                                    possible_orders[unit_loc].add(order)
-                                    if unit_on_coast:
-                                        possible_orders[unit_loc[:3]].add(order)
-
-                    # Move Via Convoy
-                    for dest in self._get_convoy_destinations(unit_type, unit_loc):
-                        order = unit + " - " + dest + " VIA"
-                        possible_orders[unit_loc].add(order)
-
-                    # Convoy
-                    if unit_type == "F":
-                        convoy_srcs = self._get_convoy_destinations(
-                            unit_type, unit_loc, unit_is_convoyer=True
-                        )
-                        for src in convoy_srcs:
-                            # Making sure there is an army at the source location
-                            if src not in unit_dict:
-                                continue
-                            src_unit, _, _, _ = unit_dict[src]
-                            if src_unit[0] != "A":
-                                continue
-
-                            # Checking where the src unit can actually go
-                            convoy_dests = self._get_convoy_destinations(
-                                "A", src, unit_is_convoyer=False
-                            )
-
-                            # Adding them as possible moves
-                            for dest in convoy_dests:
-                                if self._has_convoy_path("A", src, dest, convoying_loc=unit_loc):
-                                    order = unit + " C A " + src + " - " + dest
-                                    possible_orders[unit_loc].add(order)
+            for unit_possible_orders, _ in self._get_units_possible_orders(unit_dict).values():
+                for loc, orders in unit_possible_orders.items():
+                    possible_orders[loc] |= orders
 
         # Retreat phase
         if self.phase_type == "R":
@@ -2636,8 +2793,149 @@ class Game(Jsonable):
                         for loc in self.map.find_coasts(site):
                             possible_orders[loc].add("WAIVE")
 
-        # Returning
-        return {loc: sorted(possible_orders[loc]) for loc in possible_orders}
+        # Caching and returning
+        possible_orders = {loc: sorted(possible_orders[loc]) for loc in possible_orders}
+        self._possible_orders_cache = (cache_key, possible_orders)
+        return {loc: list(orders) for loc, orders in possible_orders.items()}
+
+    def _get_units_possible_orders(self, unit_dict):
+        """Computes possible orders for each unit on the board during a movement phase.
+        Results are cached for the current phase. When units are added, moved or removed,
+        only orders of units close to changed locations are recomputed, unless a fleet able to
+        convoy has changed (in which case, orders of all units are recomputed).
+
+        :param unit_dict: dict of (unit, is_dislodged, retreat_list, duplicate) for each location,
+            as built in get_all_possible_orders()
+        :return: A dictionary with units as keys and (possible orders, dependencies) as values
+            (see _get_unit_possible_orders())
+        """
+        units = {unit for power in self.powers.values() for unit in power.units}
+        self._build_list_possible_convoys()
+        convoying_locs = self._convoy_paths_cache[0]
+
+        # Reusing cached orders for the same phase and the same convoying fleets
+        cached_units_orders = {}
+        if self._units_orders_cache is not None:
+            phase, cached_convoying_locs, cached_units_orders = self._units_orders_cache
+            if phase != self.phase or cached_convoying_locs != convoying_locs:
+                cached_units_orders = {}
+        changed_locs = set()
+        for unit in units.symmetric_difference(cached_units_orders):
+            changed_locs.update((unit[2:], unit[2:5]))
+
+        units_orders = {}
+        for unit in units:
+            if unit in cached_units_orders and not cached_units_orders[unit][1] & changed_locs:
+                units_orders[unit] = cached_units_orders[unit]
+            else:
+                units_orders[unit] = self._get_unit_possible_orders(unit, unit_dict)
+        self._units_orders_cache = (self.phase, convoying_locs, units_orders)
+        return units_orders
+
+    def _get_unit_possible_orders(self, unit, unit_dict):
+        """Computes possible orders for a unit during a movement phase
+
+        :param unit: The unit (e.g. 'A PAR')
+        :param unit_dict: dict of (unit, is_dislodged, retreat_list, duplicate) for each location,
+            as built in get_all_possible_orders()
+        :return: A tuple (possible orders, dependencies) where possible orders is a dictionary
+            with locations as keys and sets of orders as values, and dependencies is the set of
+            locations (e.g. 'STP/SC' or 'STP') where units are looked up to compute these orders.
+            Orders only depend on units at these locations and on the fleets able to convoy.
+        """
+        unit_type, unit_loc = unit[0], unit[2:]
+        unit_on_coast = "/" in unit_loc
+        unit_locs = [unit_loc, unit_loc[:3]] if unit_on_coast else [unit_loc]
+        possible_orders = {loc: set() for loc in unit_locs}
+        dependencies = {unit_loc}
+
+        # Hold
+        for loc in unit_locs:
+            possible_orders[loc].add(unit + " H")
+
+        # Move, Support
+        for dest in self.map.dest_with_coasts[unit_loc]:
+            dependencies.add(dest)
+
+            # Move (Regular)
+            if self._abuts(unit_type, unit_loc, "-", dest):
+                for loc in unit_locs:
+                    possible_orders[loc].add(unit + " - " + dest)
+
+            # Support (Hold)
+            if self._abuts(unit_type, unit_loc, "S", dest):
+                if dest in unit_dict:
+                    other_unit, _, _, duplicate = unit_dict[dest]
+                    if not duplicate:
+                        for loc in unit_locs:
+                            possible_orders[loc].add(unit + " S " + other_unit[0] + " " + dest)
+
+            # Support (Move)
+            # Computing src of move (both from adjacent provinces and possible convoys)
+            # We can't support a unit that needs us to convoy it to its destination
+            abut_srcs = self.map.abut_list(dest, incl_no_coast=True)
+            convoy_srcs = self._get_convoy_destinations("A", dest, exclude_convoy_locs=[unit_loc])
+
+            # Computing coasts for source
+            src_with_coasts = [self.map.find_coasts(src) for src in abut_srcs + convoy_srcs]
+            src_with_coasts = {val for sublist in src_with_coasts for val in sublist}
+            dependencies |= src_with_coasts
+
+            for src in src_with_coasts:
+                if src not in unit_dict:
+                    continue
+                src_unit, _, _, duplicate = unit_dict[src]
+                if duplicate:
+                    continue
+
+                # Checking if src unit can move to dest (through adj or convoy), and that we can support it
+                # Only armies can move through convoy
+                if (
+                    src[:3] != unit_loc[:3]
+                    and self._abuts(unit_type, unit_loc, "S", dest)
+                    and (
+                        (src in convoy_srcs and src_unit[0] == "A")
+                        or self._abuts(src_unit[0], src, "-", dest)
+                    )
+                ):
+                    # Adding with coast
+                    for loc in unit_locs:
+                        possible_orders[loc].add(
+                            unit + " S " + src_unit[0] + " " + src + " - " + dest
+                        )
+
+                    # Adding without coasts
+                    if "/" in dest:
+                        for loc in unit_locs:
+                            possible_orders[loc].add(
+                                unit + " S " + src_unit[0] + " " + src + " - " + dest[:3]
+                            )
+
+        # Move Via Convoy
+        for dest in self._get_convoy_destinations(unit_type, unit_loc):
+            possible_orders[unit_loc].add(unit + " - " + dest + " VIA")
+
+        # Convoy
+        if unit_type == "F":
+            convoy_srcs = self._get_convoy_destinations(unit_type, unit_loc, unit_is_convoyer=True)
+            dependencies.update(convoy_srcs)
+            for src in convoy_srcs:
+                # Making sure there is an army at the source location
+                if src not in unit_dict:
+                    continue
+                src_unit, _, _, _ = unit_dict[src]
+                if src_unit[0] != "A":
+                    continue
+
+                # Checking where the src unit can actually go
+                convoy_dests = self._get_convoy_destinations("A", src, unit_is_convoyer=False)
+
+                # Adding them as possible moves
+                for dest in convoy_dests:
+                    if self._has_convoy_path("A", src, dest, convoying_loc=unit_loc):
+                        possible_orders[unit_loc].add(unit + " C A " + src + " - " + dest)
+
+        return possible_orders, dependencies
 
     # ====================================================================
     #   Private Interface - CONVOYS Methods
@@ -2647,8 +2945,6 @@ class Game(Jsonable):
         # Already generated
         if self.convoy_paths_possible is not None:
             return
-        self.convoy_paths_possible = []
-        self.convoy_paths_dest = {}
 
         # Finding fleets on water
         convoying_locs = []
@@ -2656,7 +2952,14 @@ class Game(Jsonable):
             for unit in power.units:
                 if unit[0] == "F" and self.map.area_type(unit[2:]) in ["WATER", "PORT"]:
                     convoying_locs += [unit[2:]]
-        convoying_locs = set(convoying_locs)
+        convoying_locs = frozenset(convoying_locs)
+
+        # Fleets on water did not move since paths were last generated
+        if self._convoy_paths_cache is not None and self._convoy_paths_cache[0] == convoying_locs:
+            _, self.convoy_paths_possible, self.convoy_paths_dest = self._convoy_paths_cache
+            return
+        self.convoy_paths_possible = []
+        self.convoy_paths_dest = {}
 
         # Finding all possible convoy paths
         for nb_fleets in range(1, len(convoying_locs) + 1):
@@ -2669,6 +2972,11 @@ class Game(Jsonable):
                     for dest in dests:
                         self.convoy_paths_dest[start].setdefault(dest, [])
                         self.convoy_paths_dest[start][dest] += [fleets]
+        self._convoy_paths_cache = (
+            convoying_locs,
+            self.convoy_paths_possible,
+            self.convoy_paths_dest,
+        )
 
     def _is_convoyer(self, army, loc):
         """Detects if there is a convoyer at thru location for army/fleet (e.g. can an army be convoyed through PAR)
@@ -3549,6 +3857,24 @@ class Game(Jsonable):
         }
         random.setstate(random_state)
 
+        # Index tables, to find power and location ids in constant time
+        # A unit is hashed with its type key XOR its owner key, so both keys are combined in advance
+        # unit_keys[power_ix][unit_type_ix][loc_ix] == unit_type[unit_type_ix][loc_ix] ^ units[power_ix][loc_ix]
+        zobrist = self.__class__.zobrist_tables[self.map_name]
+        zobrist["power_ix"] = {power_name: ix for ix, power_name in enumerate(map_powers)}
+        zobrist["loc_ix"] = {loc: ix for ix, loc in enumerate(map_locs)}
+        for keys_name, type_table, power_table in [
+            ("unit_keys", zobrist["unit_type"], zobrist["units"]),
+            ("dis_unit_keys", zobrist["dis_unit_type"], zobrist["dis_units"]),
+        ]:
+            zobrist[keys_name] = [
+                [
+                    [type_key ^ power_key for type_key, power_key in zip(type_keys, power_keys)]
+                    for type_keys in type_table
+                ]
+                for power_keys in power_table
+            ]
+
     # ====================================================================
     #   Private Interface - PROCESSING and phase change methods
     # ====================================================================
@@ -3609,6 +3935,7 @@ class Game(Jsonable):
         # Save results for current phase.
         # NB: result_history is updated here, neither in process() nor in draw(),
         # unlike order_history, message_history and state_history.
+        self._copy_shared_history()
         self.result_history.put(self._phase_wrapper_type(self.current_short_phase), self.result)
         self.result = {}
 
@@ -5388,6 +5715,7 @@ class Game(Jsonable):
 
     def _clear_history(self):
         """Clear all game history fields."""
+        self._copy_shared_history()
         self.state_history.clear()
         self.order_history.clear()
         self.result_history.clear()
@@ -5395,3 +5723,34 @@ class Game(Jsonable):
         self.log_history.clear()
         self.clear_orders()
         self.clear_vote()
+
+    def _new_history(self, history):
+        """Return a runtime sorted dictionary for a history field of dictionaries
+        (state, stance, is_bot or deceiving history).
+
+        With rule DELTA_HISTORY, returned history stores each phase as a delta
+        against previous phase (see :class:`diplomacy.utils.delta_history.DeltaHistory`).
+        Otherwise, returned history is a plain SortedDict. In both cases, given history
+        may contain delta-encoded entries (e.g. state history loaded from a saved server game).
+
+        :param history: dictionary mapping short phase names to dictionaries.
+        :return: a SortedDict or a DeltaHistory
+        """
+        entries = {self._phase_wrapper_type(key): value for key, value in history.items()}
+        if "DELTA_HISTORY" in self.rules:
+            return DeltaHistory(self._phase_wrapper_type, entries)
+        sorted_entries = SortedDict(self._phase_wrapper_type, dict, entries)
+        if any(is_delta(value) for value in entries.values()):
+            sorted_entries = SortedDict(
+                self._phase_wrapper_type, dict, dict(decode_history(sorted_entries.items()))
+            )
+        return sorted_entries
+
+    def _copy_shared_history(self):
+        """Copy history fields if they are shared with a forked game, before modifying them.
+        See method fork().
+        """
+        if self._history_shared:
+            for key in HISTORY_FIELDS:
+                setattr(self, key, getattr(self, key).copy())
+            self._history_shared = False
@@ -28,6 +28,7 @@ import diplomacy.utils.errors as err
 # Constants
 UNDETERMINED, POWER, UNIT, LOCATION, COAST, ORDER, MOVE_SEP, OTHER = 0, 1, 2, 3, 4, 5, 6, 7
 MAP_CACHE = {}
+COMPACT_CACHE_SIZE = 10000  # Max number of phrases kept by Map.compact() cache
 
 
 class Map:
@@ -37,14 +38,18 @@ class Map:
 
     - **abbrev**: Contains the power abbreviation, otherwise defaults to first letter of PowerName
       e.g. {'ENGLISH': 'E'}
-    - **abuts_cache**: Contains a cache of abuts for ['A,'F'] between all locations for orders ['S', 'C', '-']
-      e.g. {(A, PAR, -, MAR): 1, ...}
+    - **abut_lists_cache**: Contains a cache of abut_list(site, incl_no_coast=True) for every location
+      e.g. {'BUL': ('BLA', 'CON', 'GRE', 'RUM', 'SER', 'BUL/EC', 'BUL/SC', ...), ...}
+    - **abuts_matrix**: Contains an adjacency matrix for unit types ['A', 'F', '?'] and orders ['S', 'C', '-'],
+      with a row (bytearray) per location id, and a column per location id (see loc_ids)
+      e.g. {('A', '-'): [bytearray(b'\x00\x01...'), ...], ...}
     - **aliases**: Contains a dict of all the aliases (e.g. full province name to 3 char)
       e.g. {'EAST': 'EAS', 'STP ( /SC )': 'STP/SC', 'FRENCH': 'FRANCE', 'BUDAPEST': 'BUD', 'NOR': 'NWY', ... }
     - **centers**: Contains a dict of owned supply centers for each player at the beginning of the map
       e.g. {'RUSSIA': ['MOS', 'SEV', 'STP', 'WAR'], 'FRANCE': ['BRE', 'MAR', 'PAR'], ... }
     - **convoy_paths**: Contains a list of all possible convoys paths bucketed by number of fleets
       format: {nb of fleets: [(START_LOC, {FLEET LOC}, {DEST LOCS})]}
+      Loaded from convoy paths cache (or generated) the first time it is used.
     - **dest_with_coasts**: Contains a dictionary of locs with all destinations (incl coasts) that can be reached
       e.g. {'PAR': ['BRE', 'PIC', 'BUR', ...], ...}
     - **dummies**: Indicates the list of powers that are dummies
@@ -67,6 +72,8 @@ class Map:
       e.g. {'BUILDS': 'B', '>': '', 'SC': '/SC', 'REMOVING': 'D', 'WAIVED': 'V', 'ATTACK': '', ... }
     - **loc_abut**: Contains a adjacency list for each province
       e.g. {'LVP': ['CLY', 'edi', 'IRI', 'NAO', 'WAL', 'yor'], ...}
+    - **loc_ids**: Contains an integer id for every location (in uppercase and in its original case)
+      e.g. {'ADR': 0, 'AEG': 1, ..., 'BUL/EC': 15, 'BUL/SC': 16, 'BUL': 17, 'bul': 17, ...}
     - **loc_coasts**: Contains a mapping of all coasts for every location
       e.g. {'PAR': ['PAR'], 'BUL': ['BUL', 'BUL/EC', 'BUL/SC'], ... }
     - **loc_name**: Dict that indicates the 3 letter name of each location
@@ -119,7 +126,9 @@ class Map:
         "validated",
         "flow_sign",
         "root_map",
-        "abuts_cache",
+        "abuts_matrix",
+        "abut_lists_cache",
+        "loc_ids",
         "homes",
         "loc_name",
         "loc_type",
@@ -146,7 +155,9 @@ class Map:
         "unit_names",
         "keywords",
         "aliases",
-        "convoy_paths",
+        "_convoy_paths",
+        "_known_words",
+        "_compact_cache",
         "dest_with_coasts",
     ]
 
@@ -166,13 +177,13 @@ class Map:
         :param name: Name of the map to load (or full path to a custom map file)
         :param use_cache: Boolean flag to indicate we want a blank object that doesn't use cache
         """
-        if name in MAP_CACHE:
+        if name in MAP_CACHE and use_cache:
             return
         self.name = name
         self.first_year = 1901
         self.victory = self.phase = self.validated = self.flow_sign = None
         self.root_map = None
-        self.abuts_cache = {}
+        self.abuts_matrix, self.abut_lists_cache, self.loc_ids = {}, {}, {}
         self.homes, self.loc_name, self.loc_type, self.loc_abut, self.loc_coasts = (
             {},
             {},
@@ -197,9 +208,9 @@ class Map:
         self.load()
         self.build_cache()
         self.validate()
-        if name not in CONVOYS_PATH_CACHE and use_cache:
-            CONVOYS_PATH_CACHE[name] = add_to_cache(name)
-        self.convoy_paths = CONVOYS_PATH_CACHE.get(name, {})
+        self._convoy_paths = None
+        self._known_words = None
+        self._compact_cache = {}
         if use_cache:
             MAP_CACHE[name] = self
 
@@ -216,6 +227,16 @@ class Map:
     def __str__(self):
         return self.name
 
+    @property
+    def convoy_paths(self):
+        """Return convoy paths for this map (see class docstring), loaded on first use"""
+        if self._convoy_paths is None:
+            # Imported on first use, so that importing this module does not load convoy paths utilities.
+            from diplomacy.utils.convoy_paths import load_convoy_paths
+
+            self._convoy_paths = load_convoy_paths(self.name, map_object=self) or {}
+        return self._convoy_paths
+
     @property
     def svg_path(self):
         """Return path to the SVG file of this map (or None if it does not exist)"""
@@ -806,16 +827,46 @@ class Map:
                 map_loc.upper() for map_loc in self.locs if loc.upper()[:3] == map_loc.upper()[:3]
             ]
 
-        # Building abuts cache
-        for unit_type in ["A", "F"]:
-            for unit_loc in self.locs:
-                for other_loc in self.locs:
-                    for order_type in ["-", "S", "C"]:
-
-                        # Calculating and setting in cache
-                        unit_loc, other_loc = unit_loc.upper(), other_loc.upper()
-                        query_tuple = (unit_type, unit_loc, order_type, other_loc)
-                        self.abuts_cache[query_tuple] = self._abuts(*query_tuple)
+        # Interning locations
+        self.loc_ids = {}
+        for loc in self.locs:
+            self.loc_ids.setdefault(loc.upper(), len(self.loc_ids))
+        for loc in self.locs:
+            self.loc_ids[loc] = self.loc_ids[loc.upper()]
+        nb_locs = len(set(self.loc_ids.values()))
+
+        # Building abut lists cache
+        self.abut_lists_cache = {}
+        for site in list(self.loc_abut) + list(self.loc_ids):
+            for key in (site, site.upper(), site.lower()):
+                self.abut_lists_cache[key] = tuple(self._abut_list(key, incl_no_coast=True))
+
+        # Building abuts matrix
+        # Locations can only be adjacent to a location in a province listed in their abut list
+        province_locs = {}
+        for loc in self.locs:
+            province_locs.setdefault(loc.upper()[:3], []).append(loc.upper())
+        self.abuts_matrix = {
+            (unit_type, order_type): [bytearray(nb_locs) for _ in range(nb_locs)]
+            for unit_type in ["A", "F", "?"]
+            for order_type in ["-", "S", "C"]
+        }
+        for unit_loc in {loc.upper() for loc in self.locs}:
+            unit_loc_id = self.loc_ids[unit_loc]
+            other_locs = {
+                other_loc
+                for place in self.abut_list(unit_loc)
+                for other_loc in province_locs.get(place.upper()[:3], [])
+            }
+            for other_loc in other_locs:
+                other_loc_id = self.loc_ids[other_loc]
+                for order_type in ["-", "S", "C"]:
+                    is_adjacent = 0
+                    for unit_type in ["A", "F"]:
+                        if self._abuts(unit_type, unit_loc, order_type, other_loc):
+                            self.abuts_matrix[unit_type, order_type][unit_loc_id][other_loc_id] = 1
+                            is_adjacent = 1
+                    self.abuts_matrix["?", order_type][unit_loc_id][other_loc_id] = is_adjacent
 
         # Building dest_with_coasts
         for loc in self.locs:
@@ -884,6 +935,8 @@ class Map:
         for alias, loc in list(self.aliases.items()):
             if loc.startswith(place):
                 self.aliases.pop(alias)
+        self._known_words = None
+        self._compact_cache = {}
 
         # Homes
         for power_name, power_homes in list(self.homes.items()):
@@ -949,6 +1002,18 @@ class Map:
            Sea. (*bounce*)')
         :return: The compacted phrase in an array (e.g. ['ENGLAND', 'F', 'WES', 'TYS', '|'])
         """
+        # Same orders are compacted again and again (e.g. in every game played on this map)
+        cached = self._compact_cache.get(phrase)
+        if cached is not None:
+            return list(cached)
+        result = self._compact(phrase)
+        if len(self._compact_cache) >= COMPACT_CACHE_SIZE:
+            self._compact_cache.clear()
+        self._compact_cache[phrase] = tuple(result)
+        return result
+
+    def _compact(self, phrase):
+        """Compacts a full sentence into a list of short words (see method compact())"""
         if ":" in phrase:
             # Check if first part of phrase (before colon) is a power, and remove it if that's the case.
             index_colon = phrase.index(":")
@@ -1055,6 +1120,8 @@ class Map:
                        Numbers become negative if they don't exist
         :return: A list of tuple (e.g. ``[('A', 2), ('POR', 3), ('S', 5), ('SPA/NC', 4)]``)
         """
+        if strict and self._known_words is None:
+            self._known_words = set(self.aliases.values()) | set(self.keywords.values())
         result = []
         for thing in word:
             if " " in thing:
@@ -1079,7 +1146,7 @@ class Map:
                 data_type = LOCATION
             else:
                 data_type = POWER
-            if strict and thing not in list(self.aliases.values()) + list(self.keywords.values()):
+            if strict and thing not in self._known_words:
                 data_type = -data_type
             result += [(thing, data_type)]
         return result
@@ -1240,26 +1307,32 @@ class Map:
     def abuts(self, unit_type, unit_loc, order_type, other_loc):
         """Determines if a order for unit_type from unit_loc to other_loc is adjacent.
 
-        **Note**: This method uses the precomputed cache
+        **Note**: This method uses the precomputed adjacency matrix
 
-        :param unit_type: The type of unit ('A' or 'F')
+        :param unit_type: The type of unit ('A' or 'F', or '?' for any type)
         :param unit_loc: The location of the unit ('BUR', 'BUL/EC')
         :param order_type: The type of order ('S' for Support, 'C' for Convoy', '-' for move)
         :param other_loc: The location of the other unit
         :return: 1 if the locations are adjacent for the move, 0 otherwise
         """
-        if unit_type == "?":
-            return self.abuts_cache.get(
-                ("A", unit_loc.upper(), order_type, other_loc.upper()), 0
-            ) or self.abuts_cache.get(("F", unit_loc.upper(), order_type, other_loc.upper()), 0)
-
-        query_tuple = (unit_type, unit_loc.upper(), order_type, other_loc.upper())
-        return self.abuts_cache.get(query_tuple, 0)
+        loc_ids = self.loc_ids
+        try:
+            return self.abuts_matrix[unit_type, order_type][loc_ids[unit_loc]][loc_ids[other_loc]]
+        except KeyError:
+            unit_loc_id, other_loc_id = loc_ids.get(unit_loc.upper()), loc_ids.get(
+                other_loc.upper()
+            )
+            if (unit_type, order_type) not in self.abuts_matrix or None in (
+                unit_loc_id,
+                other_loc_id,
+            ):
+                return 0
+            return self.abuts_matrix[unit_type, order_type][unit_loc_id][other_loc_id]
 
     def _abuts(self, unit_type, unit_loc, order_type, other_loc):
         """Determines if a order for unit_type from unit_loc to other_loc is adjacent
 
-        **Note**: This method is used to generate the abuts_cache
+        **Note**: This method is used to generate the abuts_matrix
 
         :param unit_type: The type of unit ('A' or 'F')
         :param unit_loc: The location of the unit ('BUR', 'BUL/EC')
@@ -1365,6 +1438,15 @@ class Map:
             - An adjacency that starts with a capital letter (e.g. 'Bal') can only be used by a fleet
             - An adjacency that is uppercase can be used by both an army and a fleet
         """
+        if incl_no_coast and site in self.abut_lists_cache:
+            return list(self.abut_lists_cache[site])
+        return self._abut_list(site, incl_no_coast)
+
+    def _abut_list(self, site, incl_no_coast=False):
+        """Returns the adjacency list for the site (see abut_list())
+
+        **Note**: This method is used to generate the abut_lists_cache
+        """
         if site in self.loc_abut:
             abut_list = self.loc_abut.get(site, [])
         else:
@@ -1582,12 +1664,3 @@ class Map:
         except ValueError:
             pass
         return default
-
-
-# Loading at the bottom, to avoid load recursion
-from diplomacy.utils.convoy_paths import (
-    add_to_cache,
-    get_convoy_paths_cache,
-)  # pylint: disable=wrong-import-position
-
-CONVOYS_PATH_CACHE = get_convoy_paths_cache()
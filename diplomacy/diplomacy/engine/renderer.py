@@ -18,9 +18,15 @@
 """Renderer
 
 - Contains the renderer object which is responsible for rendering a game state to svg
+
+By default, each map SVG is parsed once per process into a template (see class SvgTemplate).
+A render then only builds the dynamic parts of the map (phase, notes, units, influence and orders)
+in a small skeleton document, and splices them into the serialized template.
 """
 import os
+import re
 from xml.dom import minidom
+from xml.sax.saxutils import escape
 from typing import Tuple
 from diplomacy import settings
 from diplomacy.utils.equilateral_triangle import EquilateralTriangle
@@ -32,26 +38,203 @@ LAYER_DISL = "DislodgedUnitLayer"
 ARMY = "Army"
 FLEET = "Fleet"
 
+# Top-level nodes modified when rendering (all other nodes, except influence classes, are static)
+DYNAMIC_TEXTS = ("CurrentPhase", "CurrentNote", "CurrentNote2")
+DYNAMIC_LAYERS = (LAYER_UNIT, LAYER_DISL, LAYER_ORDER, "HighestOrderLayer")
+NODE_SLOT = "@@NODE_SLOT_%d@@"
+CLASS_SLOT = "@@CLASS_SLOT_%d@@"
+SLOT_PATTERN = re.compile(r'@@NODE_SLOT_(\d+)@@| class="@@CLASS_SLOT_(\d+)@@"')
+
+# Templates loaded in this process: {(svg path, svg modification time) => SvgTemplate}
+SVG_TEMPLATES = {}
+
 
 def _attr(node_element, attr_name):
     """Shorthand method to retrieve an XML attribute"""
     return node_element.attributes[attr_name].value
 
 
+def _influence_nodes(map_layer):
+    """Return nodes from map layer whose class may be set by Renderer._set_influence(), in order."""
+    nodes = []
+    for map_node in map_layer.childNodes:
+        if map_node.nodeName not in ("g", "path", "polygon"):
+            continue
+        if not map_node.getAttribute("id").startswith("_"):
+            continue
+        if map_node.nodeName in ("path", "polygon"):
+            nodes.append(map_node)
+            continue
+        for sub_node in map_node.childNodes:
+            if (
+                sub_node.nodeName in ("path", "polygon")
+                and sub_node.getAttribute("class") != "water"
+            ):
+                nodes.append(sub_node)
+    return nodes
+
+
+def _find_map_layer(svg_node):
+    """Return first MapLayer node in given svg node, or None."""
+    for child_node in svg_node.childNodes:
+        if child_node.nodeName == "g" and _attr(child_node, "id") == "MapLayer":
+            return child_node
+    return None
+
+
+def get_svg_template(svg_path):
+    """Return the template for given SVG file, loaded once per process (reloaded if file is modified).
+
+    :param svg_path: path to SVG file
+    :rtype: SvgTemplate
+    """
+    key = (os.path.abspath(svg_path), os.path.getmtime(svg_path))
+    if key not in SVG_TEMPLATES:
+        SVG_TEMPLATES[key] = SvgTemplate(minidom.parse(svg_path).toxml())
+    return SVG_TEMPLATES[key]
+
+
+class SvgTemplate:
+    """Map SVG parsed once, to be shared by all renderers using this SVG
+
+    Properties:
+
+    - **metadata**: meta-data embedded in the SVG (colors, symbol sizes, coordinates). Read-only.
+    - **xml_map**: the SVG (as a string) without meta-data.
+    - **skeleton**: a small SVG (as a string) containing only nodes modified when rendering:
+      phase and notes texts, unit and order layers, and a map layer whose nodes only keep
+      attributes id and class.
+    - **parts**: {incl_abbrev => list of parts}, where each part is either a static string from
+      xml_map, or a slot (kind, index) to be filled with a rendered node (kind NODE_SLOT) or
+      a rendered influence class (kind CLASS_SLOT) from the skeleton.
+    """
+
+    __slots__ = ["metadata", "xml_map", "skeleton", "parts"]
+
+    def __init__(self, xml_map):
+        """Constructor
+
+        :param xml_map: The map SVG, as a string
+        """
+        self.metadata, self.xml_map = Renderer._load_metadata(xml_map)
+        self.parts = {}
+
+        # Building skeleton
+        xml_map = minidom.parseString(self.xml_map)
+        svg_node = xml_map.getElementsByTagName("svg")[0]
+        skeleton = minidom.parseString("<svg/>")
+        skeleton_svg_node = skeleton.documentElement
+        for child_node in self._dynamic_nodes(svg_node):
+            skeleton_svg_node.appendChild(child_node.cloneNode(True))
+        map_layer = _find_map_layer(svg_node)
+        if map_layer:
+            skeleton_map_layer = skeleton.createElement("g")
+            skeleton_map_layer.setAttribute("id", "MapLayer")
+            skeleton_svg_node.appendChild(skeleton_map_layer)
+            for map_node in map_layer.childNodes:
+                if map_node.nodeName not in ("g", "path", "polygon"):
+                    continue
+                if not map_node.getAttribute("id").startswith("_"):
+                    continue
+                skeleton_map_layer.appendChild(self._strip(skeleton, map_node))
+                if map_node.nodeName == "g":
+                    for sub_node in map_node.childNodes:
+                        if sub_node.nodeName in ("path", "polygon"):
+                            skeleton_map_layer.lastChild.appendChild(
+                                self._strip(skeleton, sub_node)
+                            )
+        self.skeleton = skeleton.toxml()
+
+    @staticmethod
+    def _dynamic_nodes(svg_node):
+        """Return top-level nodes modified when rendering (texts and layers), in order."""
+        return [
+            child_node
+            for child_node in svg_node.childNodes
+            if (child_node.nodeName == "text" and _attr(child_node, "id") in DYNAMIC_TEXTS)
+            or (child_node.nodeName == "g" and _attr(child_node, "id") in DYNAMIC_LAYERS)
+        ]
+
+    @staticmethod
+    def _strip(document, node):
+        """Return a copy of given node only with attributes id and class, and without children."""
+        stripped_node = document.createElement(node.nodeName)
+        for attr_name in ("id", "class"):
+            if node.hasAttribute(attr_name):
+                stripped_node.setAttribute(attr_name, node.getAttribute(attr_name))
+        return stripped_node
+
+    def get_parts(self, incl_abbrev):
+        """Return template parts (see class docstring) for given incl_abbrev flag."""
+        if incl_abbrev not in self.parts:
+            xml_map = minidom.parseString(self.xml_map)
+            Renderer._remove_layers(xml_map, incl_abbrev)
+            svg_node = xml_map.getElementsByTagName("svg")[0]
+
+            # Replacing dynamic nodes and classes with slots
+            for index, child_node in enumerate(self._dynamic_nodes(svg_node)):
+                svg_node.replaceChild(xml_map.createTextNode(NODE_SLOT % index), child_node)
+            map_layer = _find_map_layer(svg_node)
+            for index, node in enumerate(_influence_nodes(map_layer) if map_layer else []):
+                node.setAttribute("class", CLASS_SLOT % index)
+
+            parts = []
+            for index, part in enumerate(SLOT_PATTERN.split(xml_map.toxml())):
+                if index % 3 == 0:
+                    parts.append(part)
+                elif part is not None:
+                    parts.append((NODE_SLOT if index % 3 == 1 else CLASS_SLOT, int(part)))
+            self.parts[incl_abbrev] = parts
+        return self.parts[incl_abbrev]
+
+    def fill(self, skeleton, incl_abbrev):
+        """Return the rendered SVG, by filling template slots with nodes from given rendered skeleton.
+
+        :param skeleton: The skeleton document, after dynamic parts of the map were rendered on it.
+        :param incl_abbrev: Flag to indicate we also want to display the provinces abbreviations.
+        :return: The rendered SVG, as a string
+        """
+        svg_node = skeleton.documentElement
+        nodes = self._dynamic_nodes(svg_node)
+        map_layer = _find_map_layer(svg_node)
+        classes = [
+            (
+                ' class="%s"' % escape(node.getAttribute("class"), {'"': "&quot;"})
+                if node.hasAttribute("class")
+                else ""
+            )
+            for node in (_influence_nodes(map_layer) if map_layer else [])
+        ]
+        return "".join(
+            (
+                part
+                if isinstance(part, str)
+                else (nodes[part[1]].toxml() if part[0] == NODE_SLOT else classes[part[1]])
+            )
+            for part in self.get_parts(incl_abbrev)
+        )
+
+
 class Renderer:
     """Renderer object responsible for rendering a game state to svg"""
 
-    def __init__(self, game, svg_path=None):
+    def __init__(self, game, svg_path=None, use_template=True):
         """Constructor
 
         :param game: The instantiated game object to render
         :param svg_path: Optional. Can be set to the full path of a custom SVG to use for rendering the map.
+        :param use_template: Optional. If True (default), only dynamic parts of the map are rendered
+            and spliced into a template of the SVG (parsed once per process).
+            Otherwise, the whole SVG is parsed and modified for each render.
         :type game: diplomacy.Game
         :type svg_path: str, optional
+        :type use_template: bool, optional
         """
         self.game = game
         self.metadata = {}
         self.xml_map = None
+        self.template = None
+        self.use_template = use_template
 
         # If no SVG path provided, we default to the one in the maps folder
         if not svg_path:
@@ -59,11 +242,13 @@ class Renderer:
                 svg_path = os.path.join(settings.PACKAGE_DIR, "maps", "svg", file_name)
                 if os.path.exists(svg_path):
                     break
+        self.svg_path = svg_path
 
         # Loading XML
         if os.path.exists(svg_path):
-            self.xml_map = minidom.parse(svg_path).toxml()
-        self._load_metadata()
+            self.template = get_svg_template(svg_path)
+            self.metadata = self.template.metadata
+            self.xml_map = self.template.xml_map
 
     def render(self, incl_orders=True, incl_abbrev=False, output_format="svg", output_path=None):
         """Renders the current game and returns the XML representation
@@ -84,9 +269,74 @@ class Renderer:
         if not self.game or not self.game.map or not self.xml_map:
             return None
 
-        # Parsing XML
-        xml_map = minidom.parseString(self.xml_map)
+        # Rendering
+        if self.use_template:
+            skeleton = minidom.parseString(self.template.skeleton)
+            self._render_dynamic_parts(skeleton, incl_orders)
+            rendered_image = self.template.fill(skeleton, incl_abbrev)
+        else:
+            xml_map = minidom.parseString(self.xml_map)
+            self._render_dynamic_parts(xml_map, incl_orders)
+            self._remove_layers(xml_map, incl_abbrev)
+            rendered_image = xml_map.toxml()
+
+        # Saving to disk
+        if output_path:
+            with open(output_path, "w") as output_file:
+                output_file.write(rendered_image)
+
+        # Returning
+        return rendered_image
 
+    def render_phases(self, phases=None, incl_orders=True, incl_abbrev=False, output_format="svg"):
+        """Renders many phases of the game in one call
+
+        :param phases: Optional. A list of GamePhaseData to render.
+            Defaults to all phases in game history followed by current phase.
+        :param incl_orders:  Optional. Flag to indicate we also want to render orders.
+        :param incl_abbrev: Optional. Flag to indicate we also want to display the provinces abbreviations.
+        :param output_format: The desired output format. Valid values are: 'svg'
+        :type phases: List[diplomacy.utils.game_phase_data.GamePhaseData], optional
+        :type incl_orders: bool, optional
+        :type incl_abbrev: bool, optional
+        :type output_format: str, optional
+        :return: A list of (phase name, rendered image in the specified format)
+        """
+        if phases is None:
+            phases = self.game.get_phase_history() + [self.game.get_phase_data()]
+        if not phases:
+            return []
+
+        # Imported here to avoid load recursion (game module imports this module).
+        from diplomacy.engine.game import Game
+
+        # Rendering each phase on a fork of the game.
+        # We use Game.set_phase_data() to avoid methods overridden in derived classes (e.g. NetworkGame).
+        phase_game = self.game.fork()
+        renderer = Renderer(phase_game, self.svg_path, self.use_template)
+        rendered_images = []
+        for phase_data in phases:
+            Game.set_phase_data(phase_game, phase_data, clear_history=False)
+            rendered_images.append(
+                (
+                    phase_data.name,
+                    renderer.render(
+                        incl_orders=incl_orders,
+                        incl_abbrev=incl_abbrev,
+                        output_format=output_format,
+                    ),
+                )
+            )
+        return rendered_images
+
+    def _render_dynamic_parts(self, xml_map, incl_orders):
+        """Renders phase, notes, units, influence and orders on given xml map
+
+        :param xml_map: The xml map being generated (either the whole map or the template skeleton)
+        :param incl_orders: Flag to indicate we also want to render orders.
+        :return: Nothing
+        """
+        # pylint: disable=too-many-branches
         # Setting phase and note
         nb_centers = [
             (power.name[:3], len(power.centers))
@@ -187,7 +437,9 @@ class Renderer:
                     else:
                         raise RuntimeError("Unknown order: {}".format(order))
 
-        # Removing abbrev and mouse layer
+    @staticmethod
+    def _remove_layers(xml_map, incl_abbrev):
+        """Removes abbrev layer (unless incl_abbrev is set) and mouse layer from given xml map"""
         svg_node = xml_map.getElementsByTagName("svg")[0]
         for child_node in svg_node.childNodes:
             if child_node.nodeName != "g":
@@ -197,25 +449,17 @@ class Renderer:
             elif _attr(child_node, "id") == "MouseLayer":
                 svg_node.removeChild(child_node)
 
-        # Rendering
-        rendered_image = xml_map.toxml()
-
-        # Saving to disk
-        if output_path:
-            with open(output_path, "w") as output_file:
-                output_file.write(rendered_image)
-
-        # Returning
-        return rendered_image
+    @staticmethod
+    def _load_metadata(xml_map):
+        """Loads meta-data embedded in the XML map and clears unused nodes
 
-    def _load_metadata(self):
-        """Loads meta-data embedded in the XML map and clears unused nodes"""
-        if not self.xml_map:
-            return
-        xml_map = minidom.parseString(self.xml_map)
+        :param xml_map: The XML map, as a string
+        :return: A tuple (meta-data, XML map without meta-data nodes as a string)
+        """
+        xml_map = minidom.parseString(xml_map)
 
         # Data
-        self.metadata = {"color": {}, "symbol_size": {}, "orders": {}, "coord": {}}
+        metadata = {"color": {}, "symbol_size": {}, "orders": {}, "coord": {}}
 
         # Order drawings
         for order_drawing in xml_map.getElementsByTagName("jdipNS:ORDERDRAWING"):
@@ -225,13 +469,13 @@ class Renderer:
                 if child_node.nodeName == "jdipNS:POWERCOLORS":
                     for power_color in child_node.childNodes:
                         if power_color.nodeName == "jdipNS:POWERCOLOR":
-                            self.metadata["color"][_attr(power_color, "power").upper()] = _attr(
+                            metadata["color"][_attr(power_color, "power").upper()] = _attr(
                                 power_color, "color"
                             )
 
                 # Symbol size
                 elif child_node.nodeName == "jdipNS:SYMBOLSIZE":
-                    self.metadata["symbol_size"][_attr(child_node, "name")] = (
+                    metadata["symbol_size"][_attr(child_node, "name")] = (
                         _attr(child_node, "height"),
                         _attr(child_node, "width"),
                     )
@@ -243,16 +487,16 @@ class Renderer:
                 # Province
                 if child_node.nodeName == "jdipNS:PROVINCE":
                     province = _attr(child_node, "name").upper().replace("-", "/")
-                    self.metadata["coord"][province] = {}
+                    metadata["coord"][province] = {}
 
                     for coord_node in child_node.childNodes:
                         if coord_node.nodeName == "jdipNS:UNIT":
-                            self.metadata["coord"][province]["unit"] = (
+                            metadata["coord"][province]["unit"] = (
                                 _attr(coord_node, "x"),
                                 _attr(coord_node, "y"),
                             )
                         elif coord_node.nodeName == "jdipNS:DISLODGED_UNIT":
-                            self.metadata["coord"][province]["disl"] = (
+                            metadata["coord"][province]["disl"] = (
                                 _attr(coord_node, "x"),
                                 _attr(coord_node, "y"),
                             )
@@ -262,7 +506,7 @@ class Renderer:
         svg_node.removeChild(xml_map.getElementsByTagName("jdipNS:DISPLAY")[0])
         svg_node.removeChild(xml_map.getElementsByTagName("jdipNS:ORDERDRAWING")[0])
         svg_node.removeChild(xml_map.getElementsByTagName("jdipNS:PROVINCE_DATA")[0])
-        self.xml_map = xml_map.toxml()
+        return metadata, xml_map.toxml()
 
     def _norm_order(self, order):
         """Normalizes the order format and split it into tokens
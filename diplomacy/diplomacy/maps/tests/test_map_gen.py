@@ -19,13 +19,12 @@
 """
 import glob
 import os
-import pickle
 import sys
 
 import pytest
 
 from diplomacy.engine.map import Map
-from diplomacy.utils.convoy_paths import EXTERNAL_CACHE_PATH, get_file_md5
+from diplomacy.utils.convoy_paths import load_convoy_paths
 
 MODULE_PATH = sys.modules["diplomacy"].__path__[0]
 
@@ -61,20 +60,17 @@ def test_map_with_full_path():
 
 @pytest.mark.skipif(sys.version_info < (3, 8), reason="Test fails intermittently in Python 3.7 CI")
 def test_external_cache():
-    """Tests that all maps with a SVG are in the external cache"""
+    """Tests that all maps with a SVG have cached convoy paths"""
     maps = glob.glob(os.path.join(MODULE_PATH, "maps", "*.map"))
     assert maps, "Expected maps to be found."
-    assert os.path.exists(EXTERNAL_CACHE_PATH), "Expected external cache to exist"
 
-    # Checking that maps with a svg are in the external cache
-    with open(EXTERNAL_CACHE_PATH, "rb") as cache_file:
-        external_cache = pickle.load(cache_file)
-        for current_map in maps:
-            map_name = current_map[current_map.rfind("/") + 1 :].replace(".map", "")
-            this_map = Map(map_name)
-            if not this_map.svg_path:
-                continue
-            assert get_file_md5(current_map) in external_cache, (
-                'Map "%s" not found in external cache' % map_name
-            )
-            del this_map
+    # Checking that maps with a svg have a convoy paths cache file
+    for current_map in maps:
+        map_name = current_map[current_map.rfind("/") + 1 :].replace(".map", "")
+        this_map = Map(map_name)
+        if not this_map.svg_path:
+            continue
+        assert load_convoy_paths(map_name, build=False) is not None, (
+            'Map "%s" not found in convoy paths cache' % map_name
+        )
+        del this_map
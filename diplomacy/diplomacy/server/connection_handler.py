@@ -24,7 +24,7 @@ from tornado.websocket import WebSocketHandler, WebSocketClosedError
 import ujson as json
 
 import diplomacy.settings
-from diplomacy.communication import responses, requests
+from diplomacy.communication import binary_protocol, responses, requests
 from diplomacy.server import request_managers
 from diplomacy.utils import exceptions, strings
 from diplomacy.utils.network_data import NetworkData
@@ -55,6 +55,22 @@ class ConnectionHandler(WebSocketHandler):
         if self.server is None:
             self.server = server
 
+    @property
+    def is_binary(self):
+        """Return True if this connection exchanges binary frames (see module binary_protocol)."""
+        if self.ws_connection is None:
+            # Socket not opened yet or already closed.
+            return False
+        subprotocol = self.selected_subprotocol
+        return subprotocol is not None and subprotocol == binary_protocol.get_subprotocol()
+
+    def select_subprotocol(self, subprotocols):
+        """Return websocket sub-protocol to use among given ones requested by client
+        (see parent method). Accept binary protocol if available, otherwise use JSON.
+        """
+        subprotocol = binary_protocol.get_subprotocol()
+        return subprotocol if subprotocol is not None and subprotocol in subprotocols else None
+
     def get_compression_options(self):
         """Return compression options for the connection (see parent method).
         Non-None enables compression with default options.
@@ -95,8 +111,17 @@ class ConnectionHandler(WebSocketHandler):
         )
 
     def write_message(self, message, binary=False):
-        """Sends the given message to the client of this Web Socket."""
-        if isinstance(message, NetworkData):
+        """Sends the given message to the client of this Web Socket.
+        Message may be a network data object, a JSON string, or bytes already encoded
+        for binary protocol.
+        """
+        if self.is_binary:
+            if isinstance(message, NetworkData):
+                message = binary_protocol.encode(message.to_dict())
+            elif isinstance(message, str):
+                message = binary_protocol.encode(json.loads(message))
+            binary = True
+        elif isinstance(message, NetworkData):
             message = message.json()
         return super(ConnectionHandler, self).write_message(message, binary)
 
@@ -112,9 +137,14 @@ class ConnectionHandler(WebSocketHandler):
 
     @gen.coroutine
     def on_message(self, message):
-        """Parse given message and manage parsed data (expected a string representation of a request)."""
+        """Parse given message and manage parsed data (expected a string representation of a request,
+        or bytes if connection uses binary protocol).
+        """
         try:
-            json_request = json.loads(message)
+            if isinstance(message, bytes):
+                json_request = binary_protocol.decode(message)
+            else:
+                json_request = json.loads(message)
             if not isinstance(json_request, dict):
                 raise ValueError("Unable to convert a JSON string to a dictionary.")
         except ValueError as exc:
@@ -144,7 +174,7 @@ class ConnectionHandler(WebSocketHandler):
 
         if response:
             try:
-                yield self.write_message(response.json())
+                yield self.write_message(response)
 
             except WebSocketClosedError:
                 LOGGER.error("WebSocketClosedError: %s", response.json())
@@ -0,0 +1,275 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette, Steven Bocco
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Persistent index of server games summaries.
+
+A game summary contains the game data needed to describe a game in games lists
+(see requests ListGames and GetGamesInfo), so that such requests can be answered
+without loading games from disk. Server updates a game summary every time game is saved
+in memory (see method Server.save_game()), and saves index on disk with games backups.
+
+Index is saved in a single JSON file mapping each game ID to its summary. When server starts,
+summaries of games modified on disk after index file (e.g. if server stopped before saving index)
+are rebuilt by loading related games.
+"""
+import logging
+import os
+
+from diplomacy.server.journal import load_json_from_disk, save_json_on_disk
+from diplomacy.utils import constants, strings
+
+LOGGER = logging.getLogger(__name__)
+
+
+class GameSummary:
+    """Summary of a server game (see module docstring)."""
+
+    __slots__ = [
+        "game_id",
+        "phase",
+        "timestamp",
+        "timestamp_created",
+        "map_name",
+        "rules",
+        "status",
+        "n_players",
+        "n_controls",
+        "deadline",
+        "registration_password",
+        "no_observations",
+        "moderator_usernames",
+        "omniscient_usernames",
+        "controllers",
+        "bot_power_names",
+    ]
+
+    def __init__(self, **kwargs):
+        """Initialize a game summary from given fields (as returned by method to_dict())."""
+        self.game_id = kwargs["game_id"]  # type: str
+        self.phase = kwargs["phase"]  # type: str
+        self.timestamp = kwargs["timestamp"]  # type: int
+        self.timestamp_created = kwargs["timestamp_created"]  # type: int
+        self.map_name = kwargs["map_name"]  # type: str
+        self.rules = kwargs["rules"]  # type: list
+        self.status = kwargs["status"]  # type: str
+        self.n_players = kwargs["n_players"]  # type: int
+        self.n_controls = kwargs["n_controls"]  # type: int
+        self.deadline = kwargs["deadline"]  # type: int
+        self.registration_password = kwargs["registration_password"]  # type: bool
+        self.no_observations = kwargs["no_observations"]  # type: bool
+        self.moderator_usernames = set(kwargs["moderator_usernames"])  # type: set
+        self.omniscient_usernames = set(kwargs["omniscient_usernames"])  # type: set
+        # Dictionary mapping each map power name to its current controller.
+        self.controllers = kwargs["controllers"]  # type: dict
+        # Names of dummy powers currently associated to tokens (i.e. controlled by a bot).
+        self.bot_power_names = kwargs["bot_power_names"]  # type: list
+
+    @classmethod
+    def from_game(cls, server_game):
+        """Return summary of given server game.
+
+        :type server_game: diplomacy.server.server_game.ServerGame
+        """
+        return cls(
+            game_id=server_game.game_id,
+            phase=server_game.current_short_phase,
+            timestamp=server_game.get_latest_timestamp(),
+            timestamp_created=server_game.timestamp_created,
+            map_name=server_game.map_name,
+            rules=list(server_game.rules),
+            status=server_game.status,
+            n_players=server_game.count_controlled_powers(),
+            n_controls=server_game.get_expected_controls_count(),
+            deadline=server_game.deadline,
+            registration_password=bool(server_game.registration_password),
+            no_observations=server_game.no_observations,
+            moderator_usernames=server_game.moderator_usernames,
+            omniscient_usernames=server_game.omniscient_usernames,
+            controllers={
+                power.name: power.controller.last_value() for power in server_game.powers.values()
+            },
+            bot_power_names=[
+                power.name
+                for power in server_game.powers.values()
+                if power.is_dummy() and power.tokens
+            ],
+        )
+
+    def to_dict(self):
+        """Return a JSON dictionary for this summary."""
+        summary = {name: getattr(self, name) for name in self.__slots__}
+        summary["moderator_usernames"] = sorted(self.moderator_usernames)
+        summary["omniscient_usernames"] = sorted(self.omniscient_usernames)
+        return summary
+
+    def is_omniscient(self, username, is_admin=False):
+        """Return True if given username is allowed to be omniscient observer for this game.
+
+        :param username: user name
+        :param is_admin: True if user is a server administrator
+        """
+        return (
+            is_admin
+            or username in self.moderator_usernames
+            or username in self.omniscient_usernames
+        )
+
+    def get_observer_level(self, username, is_admin=False):
+        """Return the highest observation level allowed for given username
+        (see method ServerGame.get_observer_level()).
+
+        :param username: user name
+        :param is_admin: True if user is a server administrator
+        """
+        if is_admin or username in self.moderator_usernames:
+            return strings.MASTER_TYPE
+        if username in self.omniscient_usernames:
+            return strings.OMNISCIENT_TYPE
+        if not self.no_observations:
+            return strings.OBSERVER_TYPE
+        return None
+
+    def get_controlled_power_names(self, username):
+        """Return the list of power names currently controlled by given user name."""
+        if username == constants.PRIVATE_BOT_USERNAME:
+            return list(self.bot_power_names)
+        return [
+            power_name
+            for power_name, controller in self.controllers.items()
+            if controller == username
+        ]
+
+
+class GameIndex:
+    """Index of server games summaries, saved in a JSON file."""
+
+    __slots__ = ["path", "summaries", "modified"]
+
+    def __init__(self, path):
+        """Initialize an empty index.
+
+        :param path: path of JSON file where index is saved.
+        """
+        self.path = path
+        self.summaries = {}  # type: dict{str, GameSummary}
+        self.modified = False
+
+    def __contains__(self, game_id):
+        return game_id in self.summaries
+
+    def __len__(self):
+        return len(self.summaries)
+
+    def get(self, game_id):
+        """Return summary for given game ID, or None if game is not indexed."""
+        return self.summaries.get(game_id, None)
+
+    def update(self, server_game):
+        """Update summary of given server game.
+
+        :type server_game: diplomacy.server.server_game.ServerGame
+        """
+        self.summaries[server_game.game_id] = GameSummary.from_game(server_game)
+        self.modified = True
+
+    def remove(self, game_id):
+        """Remove summary of given game ID from index."""
+        if self.summaries.pop(game_id, None) is not None:
+            self.modified = True
+
+    def select(
+        self,
+        username,
+        is_admin=False,
+        game_id=None,
+        status=None,
+        map_name=None,
+        include_protected=True,
+        for_omniscience=False,
+    ):
+        """Return list of summaries of games matching given filters.
+
+        :param username: name of user who looks for games
+        :param is_admin: True if user is a server administrator
+        :param game_id: (optional) only select games with an ID containing or contained in this string
+            (case-insensitive)
+        :param status: (optional) only select games with this status
+        :param map_name: (optional) only select games with this map name
+        :param include_protected: if False, skip games protected by a registration password
+        :param for_omniscience: if True, only select games for which user is allowed
+            to be omniscient observer
+        :rtype: list[GameSummary]
+        """
+        selected = []
+        game_id = game_id.lower() if game_id else None
+        for summary in self.summaries.values():
+            if game_id and not (
+                summary.game_id.lower() in game_id or game_id in summary.game_id.lower()
+            ):
+                continue
+            if for_omniscience and not summary.is_omniscient(username, is_admin):
+                continue
+            if not include_protected and summary.registration_password:
+                continue
+            if status and summary.status != status:
+                continue
+            if map_name and summary.map_name != map_name:
+                continue
+            selected.append(summary)
+        return selected
+
+    def load(self, games_path, load_game):
+        """Load index from disk, then update summaries of games modified on disk
+        after index was saved, and remove summaries of games no more on disk.
+
+        :param games_path: folder where games are saved (see module diplomacy.server.journal).
+        :param load_game: function to load a server game from its game ID.
+        """
+        index_mtime = 0
+        if os.path.isfile(self.path):
+            index_mtime = os.path.getmtime(self.path)
+            self.summaries = {
+                game_id: GameSummary(**summary)
+                for game_id, summary in load_json_from_disk(self.path).items()
+            }
+        game_ids = set()
+        for filename in os.listdir(games_path):
+            if not filename.endswith(".json"):
+                continue
+            game_id = filename[:-5]
+            game_ids.add(game_id)
+            game_mtime = max(
+                os.path.getmtime(os.path.join(games_path, "%s%s" % (game_id, extension)))
+                for extension in (".json", ".journal")
+                if os.path.isfile(os.path.join(games_path, "%s%s" % (game_id, extension)))
+            )
+            if game_id not in self.summaries or game_mtime > index_mtime:
+                try:
+                    self.update(load_game(game_id))
+                except ValueError:
+                    LOGGER.exception("Unable to index game %s.", game_id)
+        for game_id in set(self.summaries) - game_ids:
+            self.remove(game_id)
+        LOGGER.info("Indexed %d game(s).", len(self.summaries))
+
+    def save(self):
+        """Save index on disk if modified since latest save."""
+        if self.modified:
+            save_json_on_disk(
+                self.path,
+                {game_id: summary.to_dict() for game_id, summary in self.summaries.items()},
+            )
+            self.modified = False
@@ -0,0 +1,148 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette, Steven Bocco
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Registry of server games loaded in memory, ordered from least to most recently used.
+
+Registry behaves like a dictionary {game ID => server game}. It does not evict games by itself:
+it only tells server which games to evict (method get_eviction_candidates()) when limits
+are exceeded, as only server knows if a game can be safely unloaded (e.g. not scheduled,
+no connected user). Size of a game is an estimation given by server (e.g. size on disk).
+"""
+from collections import OrderedDict
+
+from diplomacy.utils import strings
+
+
+class GameRegistry:
+    """LRU registry of loaded server games with count and size limits."""
+
+    __slots__ = [
+        "max_games",
+        "max_size",
+        "games",
+        "sizes",
+        "total_size",
+        "hits",
+        "misses",
+        "evictions",
+    ]
+
+    def __init__(self, max_games=0, max_size=0):
+        """Initialize registry.
+
+        :param max_games: maximum number of games to keep in memory. If 0, no limit.
+        :param max_size: maximum total size of games to keep in memory. If 0, no limit.
+        """
+        self.max_games = max_games
+        self.max_size = max_size
+        self.games = OrderedDict()  # type: OrderedDict  # game ID => server game
+        self.sizes = {}  # type: dict{str, int}
+        self.total_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, game_id):
+        return game_id in self.games
+
+    def __len__(self):
+        return len(self.games)
+
+    def __iter__(self):
+        return iter(list(self.games))
+
+    def __getitem__(self, game_id):
+        return self.games[game_id]
+
+    def __setitem__(self, game_id, server_game):
+        self.add(game_id, server_game)
+
+    def keys(self):
+        """Return list of loaded game IDs, from least to most recently used."""
+        return list(self.games.keys())
+
+    def values(self):
+        """Return list of loaded games, from least to most recently used."""
+        return list(self.games.values())
+
+    def items(self):
+        """Return list of couples (game ID, game), from least to most recently used."""
+        return list(self.games.items())
+
+    def get(self, game_id, default=None):
+        """Return game for given game ID and mark it as most recently used,
+        or return default value if game is not loaded. Update hits and misses counters.
+        """
+        server_game = self.games.get(game_id, None)
+        if server_game is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.games.move_to_end(game_id)
+        return server_game
+
+    def add(self, game_id, server_game, size=0):
+        """Add (or replace) a game as most recently used game.
+
+        :param game_id: game ID
+        :param server_game: game to add
+        :param size: estimated size of game
+        """
+        self.games[game_id] = server_game
+        self.games.move_to_end(game_id)
+        self.set_size(game_id, size)
+
+    def set_size(self, game_id, size):
+        """Update estimated size of given loaded game."""
+        if game_id in self.games:
+            self.total_size += size - self.sizes.get(game_id, 0)
+            self.sizes[game_id] = size
+
+    def pop(self, game_id, default=None):
+        """Remove and return game for given game ID, or return default value if not loaded."""
+        self.total_size -= self.sizes.pop(game_id, 0)
+        return self.games.pop(game_id, default)
+
+    def evict(self, game_id):
+        """Remove given game from registry and count it as evicted."""
+        if game_id in self.games:
+            self.pop(game_id)
+            self.evictions += 1
+
+    def is_full(self):
+        """Return True if registry exceeds its count or size limit."""
+        return bool(
+            (self.max_games and len(self.games) > self.max_games)
+            or (self.max_size and self.total_size > self.max_size)
+        )
+
+    def get_eviction_candidates(self):
+        """Return list of loaded games, from least to most recently used,
+        if registry exceeds its limits, else an empty list.
+        """
+        return self.values() if self.is_full() else []
+
+    def get_stats(self):
+        """Return a dictionary of registry counters."""
+        return {
+            strings.LOADED_GAMES: len(self.games),
+            strings.LOADED_SIZE: self.total_size,
+            strings.MAX_LOADED_GAMES: self.max_games,
+            strings.MAX_LOADED_SIZE: self.max_size,
+            strings.HITS: self.hits,
+            strings.MISSES: self.misses,
+            strings.EVICTIONS: self.evictions,
+        }
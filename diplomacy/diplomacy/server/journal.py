@@ -0,0 +1,257 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette, Steven Bocco
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Append-only storage of server games on disk.
+
+Each game is stored in two files in games folder:
+
+- ``<game ID>.json``: a snapshot, i.e. a full game dictionary (as returned by ``game.to_dict()``)
+  with an additional key SNAPSHOT_ID.
+- ``<game ID>.journal``: one JSON object per line. First line is a header ``{"snapshot": <ID>}``
+  with the ID of the snapshot the journal applies to. Each following line is an entry
+  ``{"delta": <delta>}`` with the delta (see module diplomacy.utils.delta_history)
+  between two consecutive saved versions of the game dictionary.
+
+Saving a game appends the delta against previous saved version to the journal. When journal becomes
+bigger than snapshot (or has too many entries), game is compacted: a new snapshot is written and
+journal is restarted. Loading a game replays journal entries on snapshot. A journal whose header
+does not match snapshot ID (e.g. server stopped while compacting) is ignored, and an incomplete
+last journal line (e.g. server stopped while appending) is skipped.
+
+To compute deltas, latest saved version of a game is kept in memory (about the size of the game
+itself). Versions of games not saved recently can be released (see GameJournal.release()):
+next save of such a game reloads its latest version from disk first.
+
+Snapshots can be read as plain game JSON files (extra key is ignored by ``from_dict()``),
+and game JSON files written by previous server versions are loaded as snapshots without journal.
+"""
+import logging
+import os
+
+import ujson as json
+
+from diplomacy.utils import common
+from diplomacy.utils.delta_history import apply_delta, compute_delta
+
+LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_ID = "__snapshot_id__"
+DEFAULT_MAX_JOURNAL_ENTRIES = 1000
+
+
+def get_backup_filename(filename):
+    """Return a backup filename from given filename (given filename with a special suffix)."""
+    return "%s.backup" % filename
+
+
+def save_json_on_disk(filename, json_dict):
+    """Save given JSON dictionary into given filename and back-up previous file version if exists."""
+    if os.path.exists(filename):
+        os.rename(filename, get_backup_filename(filename))
+    with open(filename, "w") as file:
+        json.dump(json_dict, file)
+
+
+def load_json_from_disk(filename):
+    """Return a JSON dictionary loaded from given filename.
+    If JSON parsing fail for given filename, try to load JSON dictionary for a backup file
+    (if present) and rename backup file to given filename
+    (backup file becomes current file versions).
+
+    :param filename: file path to open
+    :return: JSON dictionary loaded from file
+    :rtype: dict
+    """
+    try:
+        with open(filename, "rb") as file:
+            json_dict = json.load(file)
+    except ValueError as exception:
+        backup_filename = get_backup_filename(filename)
+        if not os.path.isfile(backup_filename):
+            raise exception
+        with open(backup_filename, "rb") as backup_file:
+            json_dict = json.load(backup_file)
+        os.rename(backup_filename, filename)
+    return json_dict
+
+
+def _stringify_deleted_keys(delta):
+    """Convert removed keys in given delta to strings, as JSON does for other dictionary keys,
+    so that delta can be replayed on a dictionary loaded from JSON.
+    """
+    if "del" in delta:
+        delta["del"] = [key if isinstance(key, str) else json.dumps(key) for key in delta["del"]]
+    for nested_delta in delta.get("sub", {}).values():
+        _stringify_deleted_keys(nested_delta)
+    return delta
+
+
+class _JournalState:
+    """Journal state of a game saved in current process.
+    Latest saved game dictionary is None if released from memory.
+    """
+
+    __slots__ = ["snapshot_id", "game_dict", "nb_entries", "journal_size", "snapshot_size"]
+
+    def __init__(self, snapshot_id, game_dict, snapshot_size):
+        self.snapshot_id = snapshot_id
+        self.game_dict = game_dict
+        self.nb_entries = 0
+        self.journal_size = 0
+        self.snapshot_size = snapshot_size
+
+
+class GameJournal:
+    """Save and load games from a folder using snapshots and append-only journals (see module docstring).
+
+    Latest saved version of each game saved with this object is kept in memory
+    (to compute next delta) until method release(), forget() or delete() is called for this game.
+    First save of a game in a process always writes a snapshot.
+    """
+
+    __slots__ = ["games_path", "max_entries", "states", "bytes_written"]
+
+    def __init__(self, games_path, max_entries=DEFAULT_MAX_JOURNAL_ENTRIES):
+        """Initialize journal.
+
+        :param games_path: folder where games files are saved.
+        :param max_entries: maximum number of entries in a journal before game is compacted.
+        """
+        self.games_path = games_path
+        self.max_entries = max_entries
+        self.states = {}  # type: dict{str, _JournalState}
+        self.bytes_written = 0
+
+    def get_snapshot_path(self, game_id):
+        """Return path to snapshot file for given game ID."""
+        return os.path.join(self.games_path, "%s.json" % game_id)
+
+    def get_journal_path(self, game_id):
+        """Return path to journal file for given game ID."""
+        return os.path.join(self.games_path, "%s.journal" % game_id)
+
+    def get_size(self, game_id):
+        """Return size in bytes of files (snapshot and journal) currently used by given game."""
+        state = self.states.get(game_id, None)
+        if state is not None:
+            return state.snapshot_size + state.journal_size
+        return sum(
+            os.path.getsize(path)
+            for path in (self.get_snapshot_path(game_id), self.get_journal_path(game_id))
+            if os.path.isfile(path)
+        )
+
+    def save(self, game_id, game_dict):
+        """Save given game dictionary, either as a journal entry or as a new snapshot.
+        Given dictionary must not be modified afterwards.
+
+        :param game_id: game ID
+        :param game_dict: game dictionary, as returned by ``game.to_dict()``
+        """
+        state = self.states.get(game_id, None)
+        if (
+            state is None
+            or state.nb_entries >= self.max_entries
+            or state.journal_size > state.snapshot_size
+        ):
+            self.compact(game_id, game_dict)
+            return
+        if state.game_dict is None:
+            state.game_dict = self.load(game_id)
+        delta = compute_delta(state.game_dict, game_dict, extend_lists=True)
+        if delta:
+            line = "%s\n" % json.dumps({"delta": _stringify_deleted_keys(delta)})
+            with open(self.get_journal_path(game_id), "a") as file:
+                file.write(line)
+            state.nb_entries += 1
+            state.journal_size += len(line)
+            self.bytes_written += len(line)
+        state.game_dict = game_dict
+
+    def compact(self, game_id, game_dict):
+        """Save given game dictionary as a new snapshot, and restart journal for this game.
+
+        :param game_id: game ID
+        :param game_dict: game dictionary, as returned by ``game.to_dict()``
+        """
+        snapshot_id = common.timestamp_microseconds()
+        snapshot = dict(game_dict)
+        snapshot[SNAPSHOT_ID] = snapshot_id
+        snapshot_path = self.get_snapshot_path(game_id)
+        save_json_on_disk(snapshot_path, snapshot)
+        snapshot_size = os.path.getsize(snapshot_path)
+
+        # Journal header is written to a temporary file, so that a journal is never truncated.
+        journal_path = self.get_journal_path(game_id)
+        header = "%s\n" % json.dumps({"snapshot": snapshot_id})
+        with open("%s.tmp" % journal_path, "w") as file:
+            file.write(header)
+        os.replace("%s.tmp" % journal_path, journal_path)
+
+        self.states[game_id] = _JournalState(snapshot_id, game_dict, snapshot_size)
+        self.bytes_written += snapshot_size + len(header)
+
+    def load(self, game_id):
+        """Return game dictionary for given game ID, by replaying journal on snapshot.
+        Raise a ValueError if snapshot file is not a valid JSON file.
+
+        :param game_id: game ID
+        :return: game dictionary (without snapshot ID)
+        """
+        game_dict = load_json_from_disk(self.get_snapshot_path(game_id))
+        snapshot_id = game_dict.pop(SNAPSHOT_ID, None)
+        journal_path = self.get_journal_path(game_id)
+        if snapshot_id is None or not os.path.isfile(journal_path):
+            return game_dict
+        with open(journal_path, "rb") as file:
+            for index, line in enumerate(file):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    LOGGER.warning("Ignored incomplete journal entry for game %s.", game_id)
+                    break
+                if index == 0:
+                    if entry.get("snapshot") != snapshot_id:
+                        LOGGER.warning("Ignored outdated journal for game %s.", game_id)
+                        break
+                else:
+                    game_dict = apply_delta(game_dict, entry["delta"])
+        return game_dict
+
+    def release(self, keep=()):
+        """Release from memory latest saved versions of games, except given ones
+        (e.g. games saved recently). Journals of released games are kept: next save of
+        a released game reloads its latest version from disk to compute delta.
+
+        :param keep: IDs of games to keep in memory
+        """
+        for game_id, state in self.states.items():
+            if game_id not in keep:
+                state.game_dict = None
+
+    def forget(self, game_id):
+        """Forget latest saved version of given game (e.g. when game is unloaded from memory).
+        Next save of this game will write a new snapshot.
+        """
+        self.states.pop(game_id, None)
+
+    def delete(self, game_id):
+        """Delete files of given game."""
+        self.forget(game_id)
+        for path in (self.get_snapshot_path(game_id), self.get_journal_path(game_id)):
+            for filename in (path, get_backup_filename(path)):
+                if os.path.isfile(filename):
+                    os.remove(filename)
@@ -14,11 +14,65 @@
 #  You should have received a copy of the GNU Affero General Public License along
 #  with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ==============================================================================
-"""Server notifier class. Used to send server notifications, allowing to ignore some addresses."""
+"""Server notifier class. Used to send server notifications, allowing to ignore some addresses.
+
+A game notification sent with same parameters to many addresses (e.g. to all observers of a game)
+is built and serialized only once per encoding (JSON or binary protocol): each recipient then receives
+a copy of serialized notification where only header fields (notification ID, token and game role)
+are replaced.
+"""
+import copy
+import uuid
+
 from tornado import gen
+import ujson as json
 
-from diplomacy.communication import notifications
+from diplomacy.communication import binary_protocol, notifications
 from diplomacy.utils import strings
+from diplomacy.utils.jsonable import trusted
+
+# Header fields specific to each recipient of a game notification.
+ADDRESS_FIELDS = (strings.NOTIFICATION_ID, strings.TOKEN, strings.GAME_ROLE)
+
+
+def _get_shared_body(notification, binary):
+    """Return JSON string (or bytes, if binary is True) of given game notification
+    without address fields.
+
+    :type notification: notifications._GameNotification
+    """
+    json_dict = notification.to_dict()
+    for field in ADDRESS_FIELDS:
+        json_dict.pop(field)
+    return binary_protocol.encode(json_dict) if binary else json.dumps(json_dict)
+
+
+def _address_notification(notification, token, game_role):
+    """Return a shallow copy of given game notification for given address, with a new ID.
+
+    :type notification: notifications._GameNotification
+    """
+    addressed_notification = copy.copy(notification)
+    addressed_notification.notification_id = str(uuid.uuid4())
+    addressed_notification.token = token
+    addressed_notification.game_role = game_role
+    return addressed_notification
+
+
+def _address_body(notification, body):
+    """Return JSON string (or bytes) of given addressed game notification,
+    given JSON string (or bytes) of notification without address fields
+    (see function _get_shared_body()).
+    """
+    if isinstance(body, bytes):
+        return binary_protocol.address_body(
+            {field: getattr(notification, field) for field in ADDRESS_FIELDS}, body
+        )
+    address = ",".join(
+        "%s:%s" % (json.dumps(field), json.dumps(getattr(notification, field)))
+        for field in ADDRESS_FIELDS
+    )
+    return "{%s,%s" % (address, body[1:])
 
 
 class Notifier:
@@ -91,6 +145,51 @@ class Notifier:
                         (connection_handler, translated_notification)
                     )
 
+    @gen.coroutine
+    def _notify_addresses(self, game_id, addresses, notification_class, **kwargs):
+        """Send a game notification with same parameters to given addresses.
+        Notification is built and serialized once for all addresses
+        (see module docstring).
+
+        :param game_id: related game ID
+        :param addresses: addresses to notify. Sequence of couples (game role, token).
+        :param notification_class: class of notification to send
+        :param kwargs: (optional) other parameters for notification
+        """
+        notification = None
+        bodies = {}  # {binary => shared body}
+        for game_role, token in addresses:
+            connection_handler = self.server.users.get_connection_handler(token)
+            if not connection_handler:
+                continue
+            if notification is None:
+                # Notification parameters are built by server.
+                with trusted():
+                    notification = notification_class(
+                        token=token, game_id=game_id, game_role=game_role, **kwargs
+                    )
+            addressed_notification = _address_notification(notification, token, game_role)
+            if self.ignores(addressed_notification):
+                continue
+            translated_notifications = connection_handler.translate_notification(
+                addressed_notification
+            )
+            if (
+                translated_notifications
+                and len(translated_notifications) == 1
+                and translated_notifications[0] is addressed_notification
+            ):
+                # Notification is sent as is: send its serialized version.
+                binary = getattr(connection_handler, "is_binary", False)
+                if binary not in bodies:
+                    bodies[binary] = _get_shared_body(notification, binary)
+                translated_notifications = [_address_body(addressed_notification, bodies[binary])]
+            if translated_notifications:
+                for translated_notification in translated_notifications:
+                    yield self.server.notifications.put(
+                        (connection_handler, translated_notification)
+                    )
+
     @gen.coroutine
     def _notify_game(self, server_game, notification_class, **kwargs):
         """Send a game notification.
@@ -101,12 +200,9 @@ class Notifier:
         :param kwargs: (optional) other notification parameters
         :type server_game: diplomacy.server.server_game.ServerGame
         """
-        for game_role, token in server_game.get_reception_addresses():
-            yield self._notify(
-                notification_class(
-                    token=token, game_id=server_game.game_id, game_role=game_role, **kwargs
-                )
-            )
+        yield self._notify_addresses(
+            server_game.game_id, server_game.get_reception_addresses(), notification_class, **kwargs
+        )
 
     @gen.coroutine
     def _notify_power(self, game_id, power, notification_class, **kwargs):
@@ -119,10 +215,9 @@ class Notifier:
         :param kwargs: (optional) other notification parameters.
         :type power: diplomacy.Power
         """
-        for token in power.tokens:
-            yield self._notify(
-                notification_class(token=token, game_id=game_id, game_role=power.name, **kwargs)
-            )
+        yield self._notify_addresses(
+            game_id, [(power.name, token) for token in power.tokens], notification_class, **kwargs
+        )
 
     @gen.coroutine
     def notify_game_processed(self, server_game, previous_phase_data, current_phase_data):
@@ -135,37 +230,29 @@ class Notifier:
         :type previous_phase_data: diplomacy.utils.game_phase_data.GamePhaseData
         :type current_phase_data: diplomacy.utils.game_phase_data.GamePhaseData
         """
-        # Send game updates to observers and omniscient observers..
-        for game_role, token in server_game.get_observer_addresses():
-            yield self._notify(
-                notifications.GameProcessed(
-                    token=token,
-                    game_id=server_game.game_id,
-                    game_role=game_role,
+        # Send game updates to observers and omniscient observers.
+        # Phase data is filtered and serialized once per role.
+        for role, addresses in (
+            (strings.OBSERVER_TYPE, server_game.get_observer_addresses()),
+            (strings.OMNISCIENT_TYPE, server_game.get_omniscient_addresses()),
+        ):
+            addresses = list(addresses)
+            if addresses:
+                yield self.notify_game_addresses(
+                    server_game.game_id,
+                    addresses,
+                    notifications.GameProcessed,
                     previous_phase_data=server_game.filter_phase_data(
-                        previous_phase_data, strings.OBSERVER_TYPE, False
+                        previous_phase_data, role, False
                     ),
                     current_phase_data=server_game.filter_phase_data(
-                        current_phase_data, strings.OBSERVER_TYPE, True
+                        current_phase_data, role, True
                     ),
                 )
-            )
-        for game_role, token in server_game.get_omniscient_addresses():
-            yield self._notify(
-                notifications.GameProcessed(
-                    token=token,
-                    game_id=server_game.game_id,
-                    game_role=game_role,
-                    previous_phase_data=server_game.filter_phase_data(
-                        previous_phase_data, strings.OMNISCIENT_TYPE, False
-                    ),
-                    current_phase_data=server_game.filter_phase_data(
-                        current_phase_data, strings.OMNISCIENT_TYPE, True
-                    ),
-                )
-            )
         # Send game updates to powers.
         for power in server_game.powers.values():
+            if not power.tokens:
+                continue
             yield self._notify_power(
                 server_game.game_id,
                 power,
@@ -480,7 +567,4 @@ class Notifier:
         :param notification_class: class of notification to send
         :param kwargs: (optional) other parameters for notification
         """
-        for game_role, token in addresses:
-            yield self._notify(
-                notification_class(token=token, game_id=game_id, game_role=game_role, **kwargs)
-            )
+        yield self._notify_addresses(game_id, addresses, notification_class, **kwargs)
@@ -19,7 +19,7 @@ Put here to avoid having file request_managers.py with too many lines.
 """
 from collections.__init__ import namedtuple
 
-from diplomacy.communication import notifications
+from diplomacy.communication import notifications, responses
 from diplomacy.server.notifier import Notifier
 
 from diplomacy.utils import strings, exceptions
@@ -313,3 +313,29 @@ def assert_game_not_finished(server_game):
     """
     if server_game.is_game_completed or server_game.is_game_canceled:
         raise exceptions.GameFinishedException()
+
+
+def get_game_info(summary, username, is_admin):
+    """Return game info response data for given game summary, as seen by given user.
+
+    :param summary: game summary
+    :param username: name of user who requires game info
+    :param is_admin: True if user is a server administrator
+    :type summary: diplomacy.server.game_index.GameSummary
+    :rtype: diplomacy.communication.responses.DataGameInfo
+    """
+    return responses.DataGameInfo(
+        game_id=summary.game_id,
+        phase=summary.phase,
+        timestamp=summary.timestamp,
+        timestamp_created=summary.timestamp_created,
+        map_name=summary.map_name,
+        observer_level=summary.get_observer_level(username, is_admin),
+        controlled_powers=summary.get_controlled_power_names(username),
+        rules=summary.rules,
+        status=summary.status,
+        n_players=summary.n_players,
+        n_controls=summary.n_controls,
+        deadline=summary.deadline,
+        registration_password=summary.registration_password,
+    )
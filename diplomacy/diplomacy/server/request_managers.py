@@ -38,6 +38,7 @@ from diplomacy.server.request_manager_utils import (
     verify_request,
     transfer_special_tokens,
     assert_game_not_finished,
+    get_game_info,
 )
 from diplomacy.utils import exceptions, strings, constants, export
 from diplomacy.utils.common import hash_password
@@ -335,6 +336,40 @@ def on_get_dummy_waiting_powers(server, request, connection_handler):
     )
 
 
+def on_get_game_cache_stats(server, request, connection_handler):
+    """Manage request GetGameCacheStats.
+
+    :param server: server which receives the request.
+    :param request: request to manage.
+    :param connection_handler: connection handler from which the request was sent.
+    :return: an instance of responses.DataGameCacheStats
+    :type server: diplomacy.Server
+    :type request: diplomacy.communication.requests.GetGameCacheStats
+    """
+    verify_request(server, request, connection_handler)
+    server.assert_admin_token(request.token)
+    return responses.DataGameCacheStats(
+        data=server.games.get_stats(), request_id=request.request_id
+    )
+
+
+def on_get_scheduler_stats(server, request, connection_handler):
+    """Manage request GetSchedulerStats.
+
+    :param server: server which receives the request.
+    :param request: request to manage.
+    :param connection_handler: connection handler from which the request was sent.
+    :return: an instance of responses.DataSchedulerStats
+    :type server: diplomacy.Server
+    :type request: diplomacy.communication.requests.GetSchedulerStats
+    """
+    verify_request(server, request, connection_handler)
+    server.assert_admin_token(request.token)
+    return responses.DataSchedulerStats(
+        data=server.games_scheduler.get_stats(), request_id=request.request_id
+    )
+
+
 def on_get_games_info(server, request, connection_handler):
     """Manage request GetGamesInfo.
 
@@ -347,30 +382,13 @@ def on_get_games_info(server, request, connection_handler):
     """
     verify_request(server, request, connection_handler)
     username = server.users.get_name(request.token)
+    is_admin = server.users.has_admin(username)
     games = []
     for game_id in request.games:
-        try:
-            server_game = server.load_game(game_id)
-            games.append(
-                responses.DataGameInfo(
-                    game_id=server_game.game_id,
-                    phase=server_game.current_short_phase,
-                    timestamp=server_game.get_latest_timestamp(),
-                    timestamp_created=server_game.timestamp_created,
-                    map_name=server_game.map_name,
-                    observer_level=server_game.get_observer_level(username),
-                    controlled_powers=server_game.get_controlled_power_names(username),
-                    rules=server_game.rules,
-                    status=server_game.status,
-                    n_players=server_game.count_controlled_powers(),
-                    n_controls=server_game.get_expected_controls_count(),
-                    deadline=server_game.deadline,
-                    registration_password=bool(server_game.registration_password),
-                )
-            )
-        except exceptions.GameIdException:
-            # Invalid game ID, just pass.
-            pass
+        summary = server.game_index.get(game_id)
+        # Invalid game IDs are just ignored.
+        if summary is not None:
+            games.append(get_game_info(summary, username, is_admin))
     return responses.DataGames(data=games, request_id=request.request_id)
 
 
@@ -753,39 +771,20 @@ def on_list_games(server, request, connection_handler):
     verify_request(server, request, connection_handler)
     if request.map_name is not None and server.get_map(request.map_name) is None:
         raise exceptions.MapIdException()
-    selected_game_indices = []
-    for game_id in server.get_game_indices():
-        if request.game_id and not (
-            game_id.lower() in request.game_id.lower() or request.game_id.lower() in game_id.lower()
-        ):
-            continue
-        server_game = server.load_game(game_id)
-        if request.for_omniscience and not server.token_is_omniscient(request.token, server_game):
-            continue
-        if not request.include_protected and server_game.registration_password is not None:
-            continue
-        if request.status and server_game.status != request.status:
-            continue
-        if request.map_name and server_game.map_name != request.map_name:
-            continue
-        username = server.users.get_name(request.token)
-        selected_game_indices.append(
-            responses.DataGameInfo(
-                game_id=server_game.game_id,
-                phase=server_game.current_short_phase,
-                timestamp=server_game.get_latest_timestamp(),
-                timestamp_created=server_game.timestamp_created,
-                map_name=server_game.map_name,
-                observer_level=server_game.get_observer_level(username),
-                controlled_powers=server_game.get_controlled_power_names(username),
-                rules=server_game.rules,
-                status=server_game.status,
-                n_players=server_game.count_controlled_powers(),
-                n_controls=server_game.get_expected_controls_count(),
-                deadline=server_game.deadline,
-                registration_password=bool(server_game.registration_password),
-            )
+    username = server.users.get_name(request.token)
+    is_admin = server.users.has_admin(username)
+    selected_game_indices = [
+        get_game_info(summary, username, is_admin)
+        for summary in server.game_index.select(
+            username,
+            is_admin,
+            game_id=request.game_id,
+            status=request.status,
+            map_name=request.map_name,
+            include_protected=request.include_protected,
+            for_omniscience=request.for_omniscience,
         )
+    ]
     return responses.DataGames(data=selected_game_indices, request_id=request.request_id)
 
 
@@ -1295,6 +1294,59 @@ def on_set_orders(server, request, connection_handler):
     server.save_game(level.game)
 
 
+def on_set_orders_batch(server, request, connection_handler):
+    """Manage request SetOrdersBatch.
+
+    :param server: server which receives the request.
+    :param request: request to manage.
+    :param connection_handler: connection handler from which the request was sent.
+    :return: an instance of responses.DataOrderErrors
+    :type server: diplomacy.Server
+    :type request: diplomacy.communication.requests.SetOrdersBatch
+    """
+    level = verify_request(server, request, connection_handler, observer_role=False)
+    assert_game_not_finished(level.game)
+    if not request.phase or request.phase != level.game.current_short_phase:
+        raise exceptions.ResponseException(
+            "Invalid order phase, received %s, server phase is %s"
+            % (request.phase, level.game.current_short_phase)
+        )
+    username = server.users.get_name(request.token)
+    for power_name in request.orders:
+        if not level.game.has_power(power_name):
+            raise exceptions.MapPowerException(power_name)
+        if level.is_power() and not level.game.is_controlled_by(power_name, username):
+            raise exceptions.ResponseException(
+                "User %s does not currently control power %s" % (username, power_name)
+            )
+    for power_name in request.orders:
+        power = level.game.get_power(power_name)
+        previous_wait = power.wait
+        power.clear_orders()
+        power.wait = previous_wait
+    errors = level.game.set_orders_many(request.orders)
+    notifier = Notifier(server, ignore_addresses=[request.address_in_game])
+    for power_name, orders in request.orders.items():
+        level.game.send_initial_orders(power_name)
+        # Notify other power tokens.
+        notifier.notify_power_orders_update(level.game, level.game.get_power(power_name), orders)
+        if request.wait is not None:
+            level.game.set_wait(power_name, request.wait)
+            notifier.notify_power_wait_flag(
+                level.game, level.game.get_power(power_name), request.wait
+            )
+    if level.game.does_not_wait():
+        server.force_game_processing(level.game)
+    server.save_game(level.game)
+    return responses.DataOrderErrors(
+        data={
+            power_name: [str(error) for error in power_errors]
+            for power_name, power_errors in errors.items()
+        },
+        request_id=request.request_id,
+    )
+
+
 def on_set_comm_status(server, request, connection_handler):
     """Manage request SetCommStatus
     :param server: server which receives the request.
@@ -1434,23 +1486,52 @@ def on_synchronize(server, request, connection_handler):
         addresses = list(level.game.get_power_addresses(request.game_role))
 
     for data in data_to_send:
-        if data.type == "message":
-            notifier.notify_game_addresses(
-                level.game.game_id, addresses, notifications.GameMessageReceived, message=data.data
-            )
-        else:
-            if data.type not in ("state_history", "phase"):
-                raise AssertionError("Unknown synchronized data.")
-            phase_data = level.game.filter_phase_data(
-                data.data, request.game_role, is_current=(data.type == "phase")
-            )
+        if data.type not in ("message", "state_history", "phase"):
+            raise AssertionError("Unknown synchronized data.")
+    if request.chunk_size is not None:
+        # Send data in bulk notifications to requesting address only. Client applies
+        # data from each notification sorted as above (see SynchronizedData).
+        chunk_size = request.chunk_size or max(1, len(data_to_send))
+        for index in range(0, len(data_to_send), chunk_size):
+            chunk = data_to_send[index : index + chunk_size]
+            current_phase_data = None
+            for data in chunk:
+                if data.type == "phase":
+                    current_phase_data = level.game.filter_phase_data(
+                        data.data, request.game_role, is_current=True
+                    )
             notifier.notify_game_addresses(
                 level.game.game_id,
-                addresses,
-                notifications.GamePhaseUpdate,
-                phase_data=phase_data,
-                phase_data_type=data.type,
+                [request.address_in_game],
+                notifications.GameSynchronized,
+                messages=[data.data for data in chunk if data.type == "message"],
+                phase_history=[
+                    level.game.filter_phase_data(data.data, request.game_role, is_current=False)
+                    for data in chunk
+                    if data.type == "state_history"
+                ],
+                phase_data=current_phase_data,
             )
+    else:
+        for data in data_to_send:
+            if data.type == "message":
+                notifier.notify_game_addresses(
+                    level.game.game_id,
+                    addresses,
+                    notifications.GameMessageReceived,
+                    message=data.data,
+                )
+            else:
+                phase_data = level.game.filter_phase_data(
+                    data.data, request.game_role, is_current=(data.type == "phase")
+                )
+                notifier.notify_game_addresses(
+                    level.game.game_id,
+                    addresses,
+                    notifications.GamePhaseUpdate,
+                    phase_data=phase_data,
+                    phase_data_type=data.type,
+                )
     # Send game status.
     notifier.notify_game_addresses(
         level.game.game_id, addresses, notifications.GameStatusUpdate, status=level.game.status
@@ -1529,6 +1610,8 @@ MAPPING = {
     requests.GetAvailableMaps: on_get_available_maps,
     requests.GetDaidePort: on_get_daide_port,
     requests.GetDummyWaitingPowers: on_get_dummy_waiting_powers,
+    requests.GetGameCacheStats: on_get_game_cache_stats,
+    requests.GetSchedulerStats: on_get_scheduler_stats,
     requests.GetGamesInfo: on_get_games_info,
     requests.GetPhaseHistory: on_get_phase_history,
     requests.GetPlayablePowers: on_get_playable_powers,
@@ -1552,6 +1635,7 @@ MAPPING = {
     requests.SetGameStatus: on_set_game_status,
     requests.SetGrade: on_set_grade,
     requests.SetOrders: on_set_orders,
+    requests.SetOrdersBatch: on_set_orders_batch,
     requests.SendLogData: on_send_log_data,
     requests.SendCommentaryDurations: on_send_commentary_durations,
     requests.SetWaitFlag: on_set_wait_flag,
@@ -1563,6 +1647,17 @@ MAPPING = {
 }
 
 
+@gen.coroutine
+def _handle_request_after_processing(server, request, connection_handler):
+    """(coroutine) Wait for processing of request game to be done, then handle request.
+    See function handle_request() for parameters and return value.
+    """
+    while request.game_id in server.games_in_processing:
+        yield server.games_in_processing[request.game_id]
+    response = yield handle_request(server, request, connection_handler)
+    return response
+
+
 def handle_request(server, request, connection_handler):
     """(coroutine) Find request handler function for associated request, run it and return its result.
 
@@ -1576,6 +1671,9 @@ def handle_request(server, request, connection_handler):
     request_handler_fn = MAPPING.get(type(request), None)
     if not request_handler_fn:
         raise exceptions.RequestException()
+    if getattr(request, strings.GAME_ID, None) in server.games_in_processing:
+        # Game is being processed in a worker process. Request must be handled after processing.
+        return _handle_request_after_processing(server, request, connection_handler)
     if gen.is_coroutine_function(request_handler_fn):
         # Throw the future returned by this coroutine.
         return request_handler_fn(server, request, connection_handler)
@@ -25,14 +25,23 @@ To set unit as a minute, create Scheduler with unit_in_seconds = 60.
     In such case, a task with deadline 2 means 2 minutes to wait to process this task.
 To set unit as a second, create Scheduler with unit_in_seconds = 1.
     In such case, a task with deadline 2 means 2 seconds to wait to process this task.
+
+Waiting data are stored in a timing wheel (see diplomacy.utils.timing_wheel), so that adding,
+removing and re-scheduling a data is O(1), and a step only visits data due at this step.
+Data due at a same step are enqueued in batches, and tasks of a batch are processed
+concurrently (e.g. server games adjudicated in worker processes at same time).
 """
+import time
+
 from tornado import gen
 from tornado.locks import Lock
 from tornado.queues import Queue
 
 from diplomacy.utils.scheduler_event import SchedulerEvent
-from diplomacy.utils import exceptions
-from diplomacy.utils.priority_dict import PriorityDict
+from diplomacy.utils import exceptions, strings
+from diplomacy.utils.timing_wheel import TimingWheel
+
+DEFAULT_BATCH_SIZE = 32
 
 
 class _Deadline:
@@ -70,7 +79,7 @@ class _Task:
     - scheduler is explicitly required to remove associated data.
     """
 
-    __slots__ = ["data", "deadline", "valid"]
+    __slots__ = ["data", "deadline", "valid", "time_enqueued"]
 
     def __init__(self, data, deadline):
         """Initialize a task.
@@ -82,6 +91,7 @@ class _Task:
         self.data = data
         self.deadline = deadline
         self.valid = True  # Used to ease task removal from Tornado queue.
+        self.time_enqueued = None  # Clock time when task was put in queue, to compute queue delay.
 
     def __str__(self):
         return "%s(%s, %s)" % (self.__class__.__name__, type(self.data).__name__, self.deadline)
@@ -140,13 +150,15 @@ class Scheduler:
         "unit",
         "current_time",
         "callback_process",
+        "batch_size",
         "data_in_queue",
-        "data_in_heap",
+        "data_in_wheel",
         "tasks_queue",
         "lock",
+        "stats",
     ]
 
-    def __init__(self, unit_in_seconds, callback_process):
+    def __init__(self, unit_in_seconds, callback_process, batch_size=DEFAULT_BATCH_SIZE):
         """Initialize a scheduler.
 
         :param unit_in_seconds: number of seconds to wait for each step.
@@ -155,37 +167,82 @@ class Scheduler:
             - Signature: ``task_callback(task.data) -> bool``
             - If callback return True, task is considered done and is removed from scheduler.
             - Otherwise, task is rescheduled for another delay.
+        :param batch_size: max number of tasks enqueued together and processed concurrently.
         """
         assert isinstance(unit_in_seconds, int) and unit_in_seconds > 0
         assert callable(callback_process)
+        assert batch_size > 0
         self.unit = unit_in_seconds
         self.current_time = 0
         self.callback_process = callback_process
-        self.data_in_heap = PriorityDict()  # data => Deadline
+        self.batch_size = batch_size
+        self.data_in_wheel = TimingWheel()  # data => Deadline
         self.data_in_queue = {}  # type: dict{object, _Task}  # data => associated Task in queue
-        self.tasks_queue = Queue()
+        self.tasks_queue = Queue()  # Queue of batches (lists) of tasks.
         # Lock to modify this object safely inside one Tornado thread:
         # http://www.tornadoweb.org/en/stable/locks.html
         self.lock = Lock()
-
-    def _enqueue(self, task):
-        """Put a task in queue of tasks to process now."""
-        self.data_in_queue[task.data] = task
-        self.tasks_queue.put_nowait(task)
+        # Counters and lag metrics (see get_stats()).
+        self.stats = dict.fromkeys(
+            [
+                strings.PROCESSED_TASKS,
+                strings.PROCESSED_BATCHES,
+                strings.LAST_STEP_LAG_MS,
+                strings.MAX_STEP_LAG_MS,
+                strings.LAST_QUEUE_DELAY_MS,
+                strings.MAX_QUEUE_DELAY_MS,
+            ],
+            0,
+        )
+
+    def _enqueue(self, tasks):
+        """Put a batch of tasks in queue of tasks to process now."""
+        time_enqueued = time.monotonic()
+        for task in tasks:
+            task.time_enqueued = time_enqueued
+            self.data_in_queue[task.data] = task
+        self.tasks_queue.put_nowait(tasks)
+
+    def _record_delay(self, last_key, max_key, seconds):
+        """Save given delay (in seconds) as last and possibly max delay for given stats keys."""
+        milliseconds = max(0, int(seconds * 1000))
+        self.stats[last_key] = milliseconds
+        self.stats[max_key] = max(self.stats[max_key], milliseconds)
+
+    def get_stats(self):
+        """Return a dictionary of scheduler counters and lag metrics:
+
+        - current scheduler time, number of data waiting for their deadline and
+          number of data in queue (waiting for processing or being processed).
+        - number of tasks and batches of tasks processed since scheduler was created.
+        - step lag: delay between expected time of latest step and its actual start,
+          in milliseconds (latest and max value).
+        - queue delay: delay between enqueuing and processing of latest batch of tasks,
+          in milliseconds (latest and max value).
+        """
+        stats = dict(self.stats)
+        stats[strings.CURRENT_TIME] = self.current_time
+        stats[strings.SCHEDULED_DATA] = len(self.data_in_wheel)
+        stats[strings.QUEUED_DATA] = len(self.data_in_queue)
+        return stats
 
     @gen.coroutine
     def has_data(self, data):
         """Return True if given data is associated to any task."""
         with (yield self.lock.acquire()):
-            return data in self.data_in_heap or data in self.data_in_queue
+            return data in self.data_in_wheel or data in self.data_in_queue
+
+    def contains(self, data):
+        """Return True if given data is associated to any task, without waiting for lock.
+        Result may be outdated if a coroutine is currently updating scheduler.
+        """
+        return data in self.data_in_wheel or data in self.data_in_queue
 
     @gen.coroutine
     def get_info(self, data):
         """Return info about scheduling for given data, or None if data is not found."""
         with (yield self.lock.acquire()):
-            deadline = None  # type: _Deadline
-            if data in self.data_in_heap:
-                deadline = self.data_in_heap[data]
+            deadline = self.data_in_wheel.get(data)  # type: _Deadline
             if data in self.data_in_queue:
                 deadline = self.data_in_queue[data].deadline
             if deadline:
@@ -197,6 +254,10 @@ class Scheduler:
                 )
         return None
 
+    def _put_in_wheel(self, data, delay):
+        """Schedule given data to be processed after given delay from current time."""
+        self.data_in_wheel.put(data, self.current_time + delay, _Deadline(self.current_time, delay))
+
     @gen.coroutine
     def add_data(self, data, nb_units_to_wait):
         """Add data with a non-null deadline. For null deadlines, use no_wait().
@@ -207,10 +268,10 @@ class Scheduler:
         if not isinstance(nb_units_to_wait, int) or nb_units_to_wait <= 0:
             raise exceptions.NaturalIntegerNotNullException()
         with (yield self.lock.acquire()):
-            if data in self.data_in_heap or data in self.data_in_queue:
+            if data in self.data_in_wheel or data in self.data_in_queue:
                 raise exceptions.AlreadyScheduledException()
             # Add task to scheduler.
-            self.data_in_heap[data] = _Deadline(self.current_time, nb_units_to_wait)
+            self._put_in_wheel(data, nb_units_to_wait)
 
     @gen.coroutine
     def no_wait(self, data, nb_units_to_wait, processing_validator):
@@ -225,52 +286,70 @@ class Scheduler:
         if not isinstance(nb_units_to_wait, int) or nb_units_to_wait < 0:
             raise exceptions.NaturalIntegerException()
         with (yield self.lock.acquire()):
-            if data in self.data_in_heap:
-                # Move data from heap to queue with new delay.
-                del self.data_in_heap[data]
-                self._enqueue(_ImmediateTask(data, nb_units_to_wait, processing_validator))
+            if data in self.data_in_wheel:
+                # Move data from wheel to queue with new delay.
+                self.data_in_wheel.remove(data)
+                self._enqueue([_ImmediateTask(data, nb_units_to_wait, processing_validator)])
             elif data in self.data_in_queue:
                 # Change delay for future scheduling.
                 self.data_in_queue[data].update_delay(nb_units_to_wait)
             else:
                 # Add data to queue.
-                self._enqueue(_ImmediateTask(data, nb_units_to_wait, processing_validator))
+                self._enqueue([_ImmediateTask(data, nb_units_to_wait, processing_validator)])
 
     @gen.coroutine
     def remove_data(self, data):
         """Remove a data (and all associated tasks) from scheduler."""
         with (yield self.lock.acquire()):
-            if data in self.data_in_heap:
-                del self.data_in_heap[data]
+            if data in self.data_in_wheel:
+                self.data_in_wheel.remove(data)
             elif data in self.data_in_queue:
                 # Remove task from data_in_queue and invalidate it in queue.
                 self.data_in_queue.pop(data).valid = False
 
     @gen.coroutine
     def _step(self):
-        """Compute a step (check and enqueue tasks to run now) in scheduler."""
+        """Compute a step (check and enqueue tasks to run now) in scheduler.
+        Tasks due at this step are enqueued in batches of at most batch_size tasks.
+        """
         with (yield self.lock.acquire()):
             self.current_time += 1
-            while self.data_in_heap:
-                deadline, data = self.data_in_heap.smallest()
-                if deadline.deadline > self.current_time:
-                    break
-                del self.data_in_heap[data]
-                self._enqueue(_Task(data, deadline))
+            tasks = [_Task(data, deadline) for data, deadline in self.data_in_wheel.advance()]
+            for index in range(0, len(tasks), self.batch_size):
+                self._enqueue(tasks[index : index + self.batch_size])
 
     @gen.coroutine
     def schedule(self):
-        """Main scheduler method (callback to register in ioloop). Wait for unit seconds and
-        run tasks after each wait time.
+        """Main scheduler method (callback to register in ioloop). Run a step after each unit
+        seconds. Steps are timed from scheduler start, so that time spent in steps does not delay
+        next steps. If steps are late (e.g. if ioloop was blocked), they are run without waiting.
         """
+        start_time = time.monotonic()
+        nb_steps = 0
         while True:
-            yield gen.sleep(self.unit)
+            nb_steps += 1
+            step_time = start_time + nb_steps * self.unit
+            wait_time = step_time - time.monotonic()
+            if wait_time > 0:
+                yield gen.sleep(wait_time)
+            self._record_delay(
+                strings.LAST_STEP_LAG_MS, strings.MAX_STEP_LAG_MS, time.monotonic() - step_time
+            )
             yield self._step()
 
+    @gen.coroutine
+    def _process_data(self, data):
+        """Call processing callback on given data and return callback result."""
+        if gen.is_coroutine_function(self.callback_process):
+            remove_data = yield self.callback_process(data)
+        else:
+            remove_data = self.callback_process(data)
+        return remove_data
+
     @gen.coroutine
     def process_tasks(self):
-        """Main task processing method (callback to register in ioloop). Consume and process tasks in queue
-        and reschedule processed tasks when relevant.
+        """Main task processing method (callback to register in ioloop). Consume batches of tasks
+        in queue, process tasks of each batch concurrently and reschedule processed tasks when relevant.
 
         A task is processed if associated data was not removed from scheduler.
 
@@ -278,21 +357,37 @@ class Scheduler:
         (True means `task definitively done`) AND if task deadline is not null.
         """
         while True:
-            task = yield self.tasks_queue.get()  # type: _Task
+            tasks = yield self.tasks_queue.get()  # type: list
             try:
-                if task.valid and (
-                    not isinstance(task, _ImmediateTask) or task.can_still_process()
-                ):
-                    if gen.is_coroutine_function(self.callback_process):
-                        remove_data = yield self.callback_process(task.data)
-                    else:
-                        remove_data = self.callback_process(task.data)
-                    remove_data = remove_data or not task.deadline.delay
-                    with (yield self.lock.acquire()):
+                valid_tasks = [task for task in tasks if task.valid]
+                tasks_to_process = [
+                    task
+                    for task in valid_tasks
+                    if not isinstance(task, _ImmediateTask) or task.can_still_process()
+                ]
+                if valid_tasks:
+                    self._record_delay(
+                        strings.LAST_QUEUE_DELAY_MS,
+                        strings.MAX_QUEUE_DELAY_MS,
+                        time.monotonic() - valid_tasks[0].time_enqueued,
+                    )
+                results = yield [self._process_data(task.data) for task in tasks_to_process]
+                with (yield self.lock.acquire()):
+                    for task in valid_tasks:
+                        if (
+                            task not in tasks_to_process
+                            and self.data_in_queue.get(task.data) is task
+                        ):
+                            # Immediate task no more valid: drop it.
+                            del self.data_in_queue[task.data]
+                    for task, remove_data in zip(tasks_to_process, results):
+                        # Data may have been removed (or added again) while being processed.
+                        if self.data_in_queue.get(task.data) is not task:
+                            continue
                         del self.data_in_queue[task.data]
-                        if not remove_data:
-                            self.data_in_heap[task.data] = _Deadline(
-                                self.current_time, task.deadline.delay
-                            )
+                        if not (remove_data or not task.deadline.delay):
+                            self._put_in_wheel(task.data, task.deadline.delay)
+                    self.stats[strings.PROCESSED_TASKS] += len(tasks_to_process)
+                    self.stats[strings.PROCESSED_BATCHES] += 1
             finally:
                 self.tasks_queue.task_done()
@@ -46,17 +46,30 @@ These are public configurable server attributes. They are saved on disk at each
 
 - **allow_user_registrations**: (bool) indicate if server accepts users registrations (default True)
 - **backup_delay_seconds**: (int) number of seconds to wait between two consecutive full server backup
-  on disk (default 10 minutes)
+  on disk (default 10 minutes). Games modified since previous backup are appended to
+  their journal (see module diplomacy.server.journal), and games index
+  (see module diplomacy.server.game_index) is saved.
 - **ping_seconds**: (int) ping period used by server to check is connected sockets are alive.
 - **max_games**: (int) maximum number of games server accepts to create.
   If there are at least such number of games on server, server will not accept
   further game creation requests. If 0, no limit. (default 0)
 - **remove_canceled_games**: (bool) indicate if games must be deleted from server database
   when they are canceled (default False)
+- **max_loaded_games**: (int) maximum number of games server keeps loaded in memory.
+  When exceeded, least recently used inactive games (not scheduled and without connected users)
+  are saved and unloaded, and transparently reloaded from disk on next access. If 0, no limit.
+  (default 0)
+- **max_loaded_size**: (int) maximum total size (in bytes) of games loaded in memory, estimated
+  from their size on disk. Exceeding games are unloaded as above. If 0, no limit. (default 0)
+- **processing_workers**: (int) number of worker processes used to adjudicate scheduled games
+  phases outside server IO loop (see method Game.adjudicate()). Adjudicated data are then applied
+  to game in IO loop, and requests on a game are handled only after its processing is done.
+  If 0, games are processed directly in IO loop. (default 0)
 
 """
 import atexit
 import base64
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import os
 from random import randint
@@ -67,6 +80,7 @@ from typing import Dict, Set, List
 import tornado
 import tornado.web
 from tornado import gen
+from tornado.concurrent import Future
 from tornado.ioloop import IOLoop
 from tornado.iostream import StreamClosedError
 from tornado.queues import Queue
@@ -78,10 +92,14 @@ import diplomacy.settings
 from diplomacy.communication import notifications
 from diplomacy.daide.server import Server as DaideServer
 from diplomacy.server.connection_handler import ConnectionHandler
+from diplomacy.server.game_index import GameIndex
+from diplomacy.server.game_registry import GameRegistry
+from diplomacy.server.journal import GameJournal, load_json_from_disk, save_json_on_disk
 from diplomacy.server.notifier import Notifier
 from diplomacy.server.scheduler import Scheduler
 from diplomacy.server.server_game import ServerGame
 from diplomacy.server.users import Users
+from diplomacy.engine.game import Game
 from diplomacy.engine.map import Map
 from diplomacy.utils import common, exceptions, strings, constants, convoy_paths
 from diplomacy.utils.constants import DEFAULT_PORT
@@ -106,42 +124,6 @@ def get_absolute_path(directory=None):
     return os.path.abspath(directory or os.getcwd())
 
 
-def get_backup_filename(filename):
-    """Return a backup filename from given filename (given filename with a special suffix)."""
-    return "%s.backup" % filename
-
-
-def save_json_on_disk(filename, json_dict):
-    """Save given JSON dictionary into given filename and back-up previous file version if exists."""
-    if os.path.exists(filename):
-        os.rename(filename, get_backup_filename(filename))
-    with open(filename, "w") as file:
-        json.dump(json_dict, file)
-
-
-def load_json_from_disk(filename):
-    """Return a JSON dictionary loaded from given filename.
-    If JSON parsing fail for given filename, try to load JSON dictionary for a backup file
-    (if present) and rename backup file to given filename
-    (backup file becomes current file versions).
-
-    :param filename: file path to open
-    :return: JSON dictionary loaded from file
-    :rtype: dict
-    """
-    try:
-        with open(filename, "rb") as file:
-            json_dict = json.load(file)
-    except ValueError as exception:
-        backup_filename = get_backup_filename(filename)
-        if not os.path.isfile(backup_filename):
-            raise exception
-        with open(backup_filename, "rb") as backup_file:
-            json_dict = json.load(backup_file)
-        os.rename(backup_filename, filename)
-    return json_dict
-
-
 def ensure_path(folder_path):
     """Make sure given folder path exists and return given path.
     Raises an exception if path does not exists, cannot be created or is not a folder.
@@ -217,10 +199,12 @@ class Server:
         "remove_canceled_games",
         "users",
         "games",
+        "game_index",
         "daide_servers",
         "backup_server",
         "backup_games",
         "backup_delay_seconds",
+        "journal",
         "ping_seconds",
         "interruption_handler",
         "backend",
@@ -229,6 +213,9 @@ class Server:
         "server_dir",
         "daide_min_port",
         "daide_max_port",
+        "processing_workers",
+        "processing_pool",
+        "games_in_processing",
     ]
 
     # Servers cache.
@@ -274,7 +261,13 @@ class Server:
         self.games_scheduler = Scheduler(1, self._process_game)
         self.backup_server = None
         self.backup_games = {}
+        self.journal = GameJournal(self.games_path)
         self.interruption_handler = InterruptionHandler(self)
+        # Pool of worker processes used to adjudicate games (created on first use).
+        self.processing_pool = None  # type: ProcessPoolExecutor
+        # Dictionary mapping ID of each game currently processed in a worker process
+        # to a future done when game processing is done.
+        self.games_in_processing = {}  # type: Dict[str, Future]
         # Backend objects used to run server. If None, server is not yet started.
         # Initialized when you call Server.start() (see method below).
         self.backend = None  # type: _ServerBackend
@@ -285,6 +278,7 @@ class Server:
         self.remove_canceled_games = False
         self.backup_delay_seconds = constants.DEFAULT_BACKUP_DELAY_SECONDS
         self.ping_seconds = constants.DEFAULT_PING_SECONDS
+        self.processing_workers = 0
         self.users = None  # type: Users  # Users and administrators usernames.
         self.available_maps = {}  # type: Dict[str, List[str]] # {"map_name" => list("map_power")}
         self.maps_mtime = (
@@ -294,7 +288,11 @@ class Server:
         # Server games loaded on memory (stored on disk).
         # Saved separately (each game in one JSON file).
         # Each game also stores tokens connected (player tokens, observer tokens, omniscient tokens).
-        self.games = {}  # type: Dict[str, ServerGame]
+        # Least recently used inactive games are unloaded when registry limits are exceeded.
+        self.games = GameRegistry(constants.DEFAULT_MAX_LOADED_GAMES)  # type: GameRegistry
+
+        # Summaries of all server games (stored on disk), used to list games without loading them.
+        self.game_index = GameIndex(os.path.join(self.data_path, "games_index.json"))
 
         # Dictionary mapping game ID to list of power names.
         self.games_with_dummy_powers = {}  # type: Dict[str, List[str]]
@@ -322,6 +320,11 @@ class Server:
             kwargs.pop(strings.BACKUP_DELAY_SECONDS, self.backup_delay_seconds)
         )
         self.ping_seconds = int(kwargs.pop(strings.PING_SECONDS, self.ping_seconds))
+        self.games.max_games = int(kwargs.pop(strings.MAX_LOADED_GAMES, self.games.max_games))
+        self.games.max_size = int(kwargs.pop(strings.MAX_LOADED_SIZE, self.games.max_size))
+        self.processing_workers = int(
+            kwargs.pop(strings.PROCESSING_WORKERS, self.processing_workers)
+        )
         assert not kwargs
         LOGGER.debug("Ping        : %s", self.ping_seconds)
         LOGGER.debug("Backup delay: %s", self.backup_delay_seconds)
@@ -383,6 +386,12 @@ class Server:
             self.users = Users.from_dict(server_info[strings.USERS])
             self.available_maps = server_info[strings.AVAILABLE_MAPS]
             self.maps_mtime = server_info[strings.MAPS_MTIME]
+            # Keys added later: server.json saved by previous versions may not contain them.
+            self.games.max_games = server_info.get(strings.MAX_LOADED_GAMES, self.games.max_games)
+            self.games.max_size = server_info.get(strings.MAX_LOADED_SIZE, self.games.max_size)
+            self.processing_workers = server_info.get(
+                strings.PROCESSING_WORKERS, self.processing_workers
+            )
             # games and map are loaded from disk.
         else:
             LOGGER.info("Creating server.json.")
@@ -400,6 +409,9 @@ class Server:
 
         self._load_available_maps()
 
+        # Load games index (users must be loaded, as games may be loaded to be indexed).
+        self.game_index.load(self.games_path, self.load_game)
+
         LOGGER.info("Server loaded.")
 
     def _backup_server_data_now(self, force=False):
@@ -426,10 +438,14 @@ class Server:
             for server_game in self.games.values():
                 self.save_game(server_game)
         for game_id, game_dict in self.backup_games.items():
-            game_path = os.path.join(self.games_path, "%s.json" % game_id)
-            save_json_on_disk(game_path, game_dict)
+            self.journal.save(game_id, game_dict)
+            self.games.set_size(game_id, self.journal.get_size(game_id))
             LOGGER.info("Game data saved: %s", game_id)
+        # Games not modified since previous backup don't need their latest version in memory.
+        self.journal.release(keep=self.backup_games)
         self.backup_games.clear()
+        self.game_index.save()
+        self.unload_inactive_games()
 
     def backup_now(self, force=False):
         """Save backup of server data and loaded games immediately.
@@ -449,7 +465,12 @@ class Server:
         :type server_game: ServerGame
         """
         LOGGER.debug("Processing game %s (status %s).", server_game.game_id, server_game.status)
-        previous_phase_data, current_phase_data, kicked_powers = server_game.process()
+        if self.processing_workers and server_game.is_game_active:
+            previous_phase_data, current_phase_data, kicked_powers = (
+                yield self._process_game_in_worker(server_game)
+            )
+        else:
+            previous_phase_data, current_phase_data, kicked_powers = server_game.process()
         self.save_game(server_game)
 
         if previous_phase_data is None and kicked_powers is None:
@@ -487,6 +508,28 @@ class Server:
         # Game must be stopped if not active.
         return not server_game.is_game_active
 
+    @gen.coroutine
+    def _process_game_in_worker(self, server_game):
+        """Adjudicate current phase of given game in a worker process, then apply adjudicated
+        data to game. Game is registered in games_in_processing until it is processed,
+        so that requests on this game wait for processing to be done.
+
+        :param server_game: server game to process
+        :return: same as method ServerGame.process()
+        :type server_game: ServerGame
+        """
+        game_id = server_game.game_id
+        self.games_in_processing[game_id] = Future()
+        try:
+            if self.processing_pool is None:
+                self.processing_pool = ProcessPoolExecutor(max_workers=self.processing_workers)
+            adjudication = yield IOLoop.current().run_in_executor(
+                self.processing_pool, Game.adjudicate, server_game.get_adjudication_input()
+            )
+            return server_game.process(adjudication)
+        finally:
+            self.games_in_processing.pop(game_id).set_result(None)
+
     @gen.coroutine
     def _task_save_database(self):
         """IO loop callable: save database and loaded games periodically.
@@ -519,7 +562,9 @@ class Server:
         io_loop.add_callback(self._task_save_database)
         io_loop.add_callback(self._task_send_notifications)
         # These both coroutines are used to manage games.
-        io_loop.add_callback(self.games_scheduler.process_tasks)
+        # With worker processes, many games can be processed at same time.
+        for _ in range(max(1, self.processing_workers)):
+            io_loop.add_callback(self.games_scheduler.process_tasks)
         io_loop.add_callback(self.games_scheduler.schedule)
         # Set callback on KeyboardInterrupt.
         signal.signal(signal.SIGINT, self.interruption_handler.handler)
@@ -596,6 +641,9 @@ class Server:
             strings.USERS: self.users.to_dict(),
             strings.AVAILABLE_MAPS: self.available_maps,
             strings.MAPS_MTIME: self.maps_mtime,
+            strings.MAX_LOADED_GAMES: self.games.max_games,
+            strings.MAX_LOADED_SIZE: self.games.max_size,
+            strings.PROCESSING_WORKERS: self.processing_workers,
         }
 
     def save_game(self, server_game):
@@ -605,6 +653,7 @@ class Server:
         :type server_game: ServerGame
         """
         self.backup_games[server_game.game_id] = server_game.to_dict()
+        self.game_index.update(server_game)
         # Check dummy powers for a game every time we have to save it.
         self.register_dummy_power_names(server_game)
 
@@ -703,9 +752,7 @@ class Server:
         if not os.path.isfile(game_filename):
             raise exceptions.GameIdException()
         try:
-            server_game = ServerGame.from_dict(
-                load_json_from_disk(game_filename)
-            )  # type: ServerGame
+            server_game = ServerGame.from_dict(self.journal.load(game_id))  # type: ServerGame
             server_game.server = self
             server_game.filter_usernames(self.users.has_username)
             server_game.filter_tokens(self.users.has_token)
@@ -725,9 +772,10 @@ class Server:
         :type server_game: ServerGame
         """
         # Register game on memory.
-        self.games[server_game.game_id] = server_game
+        self.games.add(server_game.game_id, server_game)
         # Start DAIDE server for this game.
         self.start_new_daide_server(server_game.game_id, port=daide_port)
+        self.unload_inactive_games(keep=server_game)
 
     def get_game(self, game_id):
         """Return game saved on server matching given game ID.
@@ -739,13 +787,14 @@ class Server:
         :return: a ServerGame object.
         :rtype: ServerGame
         """
-        server_game = self.load_game(game_id)
-        if game_id not in self.games:
+        server_game = self.games.get(game_id)
+        if server_game is None:
+            server_game = self.load_game(game_id)
             LOGGER.debug("Game loaded: %s", game_id)
             # Check dummy powers for this game as soon as it's loaded from disk.
             self.register_dummy_power_names(server_game)
             # Register game on memory.
-            self.games[server_game.game_id] = server_game
+            self.games.add(game_id, server_game, self.journal.get_size(game_id))
             # Start DAIDE server for this game.
             self.start_new_daide_server(server_game.game_id)
             # We have just loaded game from disk. Start it if necessary.
@@ -759,8 +808,58 @@ class Server:
                 if server_game.is_game_active:
                     LOGGER.debug("Game loaded and scheduled: %s", server_game.game_id)
                     self.schedule_game(server_game)
+            self.unload_inactive_games(keep=server_game)
         return server_game
 
+    def game_is_inactive(self, server_game):
+        """Return True if given loaded game can be unloaded from memory, i.e. if game is not
+        scheduled, has no dummy powers waiting for bot orders (bots are only dispatched to
+        loaded games), and no token registered in game is currently connected to server.
+
+        :type server_game: ServerGame
+        """
+        if (
+            server_game.game_id in self.games_in_processing
+            or server_game.game_id in self.games_with_dummy_powers
+        ):
+            return False
+        return not self.games_scheduler.contains(server_game) and not any(
+            self.users.get_connection_handler(token)
+            for _, token in server_game.get_reception_addresses()
+        )
+
+    def unload_game(self, server_game):
+        """Save given game on disk if modified, then remove it from memory.
+        Game will be loaded again from disk on next call to get_game().
+
+        :type server_game: ServerGame
+        """
+        game_id = server_game.game_id
+        if game_id in self.backup_games:
+            self.journal.save(game_id, self.backup_games.pop(game_id))
+        self.journal.forget(game_id)
+        self.games.evict(game_id)
+        # Game should not have dummy powers waiting for orders (see game_is_inactive()).
+        # Anyway, dummy powers registry is rebuilt when game is reloaded.
+        self.games_with_dummy_powers.pop(game_id, None)
+        self.dispatched_dummy_powers.pop(game_id, None)
+        # Stop DAIDE server associated to this game.
+        self.stop_daide_server(game_id)
+        LOGGER.debug("Game unloaded: %s", game_id)
+
+    def unload_inactive_games(self, keep=None):
+        """Unload least recently used inactive games until loaded games registry
+        does not exceed its limits (or no more inactive games can be unloaded).
+
+        :param keep: (optional) game which must not be unloaded (e.g. game currently requested)
+        :type keep: ServerGame
+        """
+        for server_game in self.games.get_eviction_candidates():
+            if not self.games.is_full():
+                break
+            if server_game is not keep and self.game_is_inactive(server_game):
+                self.unload_game(server_game)
+
     def delete_game(self, server_game):
         """Delete given game from server (both from memory and disk)
         and perform any post-deletion processing.
@@ -770,12 +869,8 @@ class Server:
         """
         if not (server_game.is_game_canceled or server_game.is_game_completed):
             server_game.set_status(strings.CANCELED)
-        game_filename = os.path.join(self.games_path, "%s.json" % server_game.game_id)
-        backup_game_filename = get_backup_filename(game_filename)
-        if os.path.isfile(game_filename):
-            os.remove(game_filename)
-        if os.path.isfile(backup_game_filename):
-            os.remove(backup_game_filename)
+        self.journal.delete(server_game.game_id)
+        self.game_index.remove(server_game.game_id)
         self.games.pop(server_game.game_id, None)
         self.backup_games.pop(server_game.game_id, None)
         self.games_with_dummy_powers.pop(server_game.game_id, None)
@@ -20,6 +20,7 @@ from diplomacy.engine.message import GLOBAL, Message, OBSERVER, OMNISCIENT, SYST
 from diplomacy.engine.power import Power
 from diplomacy.utils import exceptions, parsing, strings
 from diplomacy.utils.game_phase_data import GamePhaseData
+from diplomacy.utils.jsonable import trusted
 
 
 class ServerGame(Game):
@@ -97,19 +98,20 @@ class ServerGame(Game):
             # Nothing to filter.
             return phase_data
         if role == strings.OBSERVER_TYPE:
-            # Filter messages.
-            return GamePhaseData(
-                name=phase_data.name,
-                state=phase_data.state,
-                orders=phase_data.orders,
-                results=phase_data.results,
-                messages=self.filter_messages(phase_data.messages, role),
-                logs=self.filter_logs(phase_data.logs, role),
-                stances=phase_data.stances,
-                order_logs=phase_data.order_logs,
-                is_bot=phase_data.is_bot,
-                deceiving=phase_data.deceiving,
-            )
+            # Filter messages. Phase data fields are already checked.
+            with trusted():
+                return GamePhaseData(
+                    name=phase_data.name,
+                    state=phase_data.state,
+                    orders=phase_data.orders,
+                    results=phase_data.results,
+                    messages=self.filter_messages(phase_data.messages, role),
+                    logs=self.filter_logs(phase_data.logs, role),
+                    stances=phase_data.stances,
+                    order_logs=phase_data.order_logs,
+                    is_bot=phase_data.is_bot,
+                    deceiving=phase_data.deceiving,
+                )
         # Filter for power roles.
         related_power_names = self.get_related_power_names(role)
         # Filter messages.
@@ -126,18 +128,19 @@ class ServerGame(Game):
             orders = phase_data.orders
         # results don't need to be filtered: it should be provided empty for current phase,
         # and it should be kept for a past phase/
-        return GamePhaseData(
-            name=phase_data.name,
-            state=phase_data.state,
-            orders=orders,
-            messages=messages,
-            logs=logs,
-            results=phase_data.results,
-            stances=phase_data.stances,
-            order_logs=phase_data.order_logs,
-            is_bot=phase_data.is_bot,
-            deceiving=phase_data.deceiving,
-        )
+        with trusted():
+            return GamePhaseData(
+                name=phase_data.name,
+                state=phase_data.state,
+                orders=orders,
+                messages=messages,
+                logs=logs,
+                results=phase_data.results,
+                stances=phase_data.stances,
+                order_logs=phase_data.order_logs,
+                is_bot=phase_data.is_bot,
+                deceiving=phase_data.deceiving,
+            )
 
     def game_can_start(self):
         """Return True if server game can start.
@@ -492,9 +495,12 @@ class ServerGame(Game):
         for power in self.powers.values():  # type: Power
             power.remove_tokens([token for token in power.tokens if not filter_function(token)])
 
-    def process(self):
+    def process(self, adjudication=None):
         """Process current game phase and move forward to next phase.
 
+        :param adjudication: (optional) result of method Game.adjudicate() for current phase,
+            if phase was adjudicated elsewhere (e.g. in a worker process).
+
         :return: a triple containing:
 
             - previous game state (before the processing)
@@ -531,7 +537,7 @@ class ServerGame(Game):
             return None, None, kicked_powers
 
         # Process game and retrieve previous state.
-        previous_phase_data = super(ServerGame, self).process()
+        previous_phase_data = super(ServerGame, self).process(adjudication)
         if self.count_controlled_powers() < self.get_expected_controls_count():
             pause = False
             for power in self.powers.values():
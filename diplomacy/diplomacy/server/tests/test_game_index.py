@@ -0,0 +1,106 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test persistent index of server games summaries."""
+import os
+
+from diplomacy.server.game_index import GameIndex, GameSummary
+from diplomacy.server.journal import GameJournal
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+def _new_game(map_name="standard", **kwargs):
+    """Return a new server game with a controlled power and a moderator."""
+    server_game = ServerGame(map_name=map_name, rules=["NO_DEADLINE", "POWER_CHOICE"], **kwargs)
+    server_game.control("FRANCE", "francois", "token_1", strings.HUMAN)
+    server_game.promote_moderator("marie")
+    return server_game
+
+
+def test_summary_matches_game():
+    """Test that a game summary describes game as game itself does."""
+    server_game = _new_game()
+    summary = GameSummary(**GameSummary.from_game(server_game).to_dict())
+    assert summary.phase == server_game.current_short_phase
+    assert summary.timestamp == server_game.get_latest_timestamp()
+    assert summary.n_players == server_game.count_controlled_powers() == 1
+    assert summary.n_controls == server_game.get_expected_controls_count()
+    for username in ("francois", "marie", "unknown"):
+        assert summary.get_observer_level(username) == server_game.get_observer_level(username)
+        assert summary.get_controlled_power_names(
+            username
+        ) == server_game.get_controlled_power_names(username)
+    assert summary.get_observer_level("unknown", is_admin=True) == strings.MASTER_TYPE
+
+
+def test_select():
+    """Test filtering games in index."""
+    index = GameIndex(None)
+    games = [
+        _new_game(game_id="game_a"),
+        _new_game(game_id="game_b", registration_password="secret"),
+        _new_game(game_id="other", map_name="pure"),
+    ]
+    for server_game in games:
+        index.update(server_game)
+
+    def selected(**kwargs):
+        return [summary.game_id for summary in index.select("francois", **kwargs)]
+
+    assert selected() == ["game_a", "game_b", "other"]
+    assert selected(game_id="GAME") == ["game_a", "game_b"]
+    assert selected(include_protected=False) == ["game_a", "other"]
+    assert selected(map_name="pure") == ["other"]
+    assert selected(status=strings.FORMING, for_omniscience=True) == []
+    assert [summary.game_id for summary in index.select("marie", for_omniscience=True)] == [
+        "game_a",
+        "game_b",
+        "other",
+    ]
+
+
+def test_load_updates_modified_games(tmp_path):
+    """Test that loading index rebuilds summaries of games saved after index and forgets
+    games removed from disk."""
+    games_path = str(tmp_path / "games")
+    os.makedirs(games_path)
+    journal = GameJournal(games_path)
+    index_path = str(tmp_path / "games_index.json")
+    games = {game_id: _new_game(game_id=game_id) for game_id in ("game_a", "game_b")}
+    index = GameIndex(index_path)
+    for server_game in games.values():
+        journal.save(server_game.game_id, server_game.to_dict())
+        index.update(server_game)
+    index.save()
+
+    # Modify game_a after index was saved, and delete game_b.
+    games["game_a"].control("ENGLAND", "elizabeth", "token_2", strings.HUMAN)
+    journal.save("game_a", games["game_a"].to_dict())
+    os.utime(journal.get_journal_path("game_a"), (1e10, 1e10))
+    journal.delete("game_b")
+
+    loaded_ids = []
+
+    def load_game(game_id):
+        loaded_ids.append(game_id)
+        return ServerGame.from_dict(journal.load(game_id))
+
+    index = GameIndex(index_path)
+    index.load(games_path, load_game)
+    assert loaded_ids == ["game_a"]
+    assert list(index.summaries) == ["game_a"]
+    assert index.get("game_a").get_controlled_power_names("elizabeth") == ["ENGLAND"]
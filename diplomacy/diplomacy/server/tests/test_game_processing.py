@@ -0,0 +1,75 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test games processing in server worker processes."""
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from diplomacy.communication import requests
+from diplomacy.server import request_managers
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+def test_process_game_in_worker(tmp_path):
+    """Test that a game processed in a worker process is updated as if processed in server loop,
+    and that requests on this game are handled only after processing."""
+    server = Server(str(tmp_path), processing_workers=1)
+    try:
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        server_game.server = server
+        server_game.set_status(strings.ACTIVE)
+        server.add_new_game(server_game)
+        server_game.set_orders("FRANCE", ["A PAR - BUR", "A MAR - BUR"])
+        server_game.set_orders("GERMANY", ["A MUN - BUR"])
+        expected_game = ServerGame.from_dict(server_game.to_dict())
+        expected_game.process()
+
+        handled_phases = []
+
+        def on_get_phase_history(server, request, connection_handler):
+            # pylint: disable=unused-argument
+            handled_phases.append(server.get_game(request.game_id).current_short_phase)
+
+        request = requests.GetPhaseHistory(
+            token="token", game_id=server_game.game_id, game_role="FRANCE", phase="S1901M"
+        )
+        previous_handler = request_managers.MAPPING[requests.GetPhaseHistory]
+        request_managers.MAPPING[requests.GetPhaseHistory] = on_get_phase_history
+
+        @gen.coroutine
+        def _process():
+            processing = server._process_game(server_game)  # pylint: disable=protected-access
+            assert server_game.game_id in server.games_in_processing
+            assert not server.game_is_inactive(server_game)
+            yield [processing, request_managers.handle_request(server, request, None)]
+
+        try:
+            IOLoop.current().run_sync(_process)
+        finally:
+            request_managers.MAPPING[requests.GetPhaseHistory] = previous_handler
+
+        assert not server.games_in_processing
+        assert handled_phases == ["F1901M"]
+        assert server_game.get_hash() == expected_game.get_hash()
+        assert server_game.get_state()["units"] == expected_game.get_state()["units"]
+        assert server_game.result_history.last_value() == expected_game.result_history.last_value()
+    finally:
+        if server.processing_pool:
+            server.processing_pool.shutdown()
+        server.stop_daide_server(None)
+        Server.__cache__.pop(str(tmp_path), None)
@@ -0,0 +1,133 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test registry of server games loaded in memory."""
+from diplomacy.engine.message import Message
+from diplomacy.server.game_registry import GameRegistry
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+def test_lru_order_and_counters():
+    """Test that registry tracks least recently used games and counts hits and misses."""
+    registry = GameRegistry(max_games=2)
+    registry.add("a", "game a", 10)
+    registry.add("b", "game b", 20)
+    assert registry.get_eviction_candidates() == []
+    assert registry.get("a") == "game a"
+    assert registry.get("c") is None
+    registry.add("c", "game c", 30)
+    assert registry.is_full()
+    assert registry.get_eviction_candidates() == ["game b", "game a", "game c"]
+    registry.evict("b")
+    assert not registry.is_full()
+    assert registry.keys() == ["a", "c"]
+    assert registry.get_stats() == {
+        "loaded_games": 2,
+        "loaded_size": 40,
+        "max_loaded_games": 2,
+        "max_loaded_size": 0,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_size_limit():
+    """Test that registry is full when total size of games exceeds size limit."""
+    registry = GameRegistry(max_size=100)
+    registry.add("a", "game a", 60)
+    registry.add("b", "game b", 30)
+    assert not registry.is_full()
+    registry.set_size("b", 50)
+    assert registry.is_full()
+    registry.pop("a")
+    assert not registry.is_full()
+    assert registry.get_stats()["evictions"] == 0
+
+
+def _add_game(server, index, status=strings.FORMING):
+    """Add and save a new game with one message on server. Return game."""
+    server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+    server_game.server = server
+    server_game.add_message(
+        Message(
+            sender="FRANCE",
+            recipient="ENGLAND",
+            message="message %d" % index,
+            phase=server_game.current_short_phase,
+            time_sent=index + 1,
+        )
+    )
+    server_game.set_status(status)
+    server.add_new_game(server_game)
+    server.save_game(server_game)
+    return server_game
+
+
+def test_server_unloads_inactive_games(tmp_path):
+    """Test that server saves and unloads least recently used games, then reloads them on access."""
+    server = Server(str(tmp_path), max_loaded_games=2)
+    try:
+        game_ids = [_add_game(server, index).game_id for index in range(3)]
+        # First game was saved on disk and unloaded when third game was added.
+        assert game_ids[0] not in server.games
+        assert game_ids[0] not in server.backup_games
+        assert server.has_game_id(game_ids[0])
+        assert list(server.games.keys()) == game_ids[1:]
+        assert server.get_daide_port(game_ids[0]) is None
+
+        # First game is reloaded from disk, and second game is unloaded.
+        server_game = server.get_game(game_ids[0])
+        assert list(server_game.messages.values())[0].message == "message 0"
+        assert list(server.games.keys()) == [game_ids[2], game_ids[0]]
+        assert server.get_game(game_ids[0]) is server_game
+        stats = server.games.get_stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 2)
+
+        # Latest saved versions of games not modified since previous backup are released.
+        server.backup_now()
+        assert any(state.game_dict is not None for state in server.journal.states.values())
+        server.backup_now()
+        assert all(state.game_dict is None for state in server.journal.states.values())
+    finally:
+        server.stop_daide_server(None)
+        Server.__cache__.pop(str(tmp_path), None)
+
+
+def test_server_keeps_games_with_dummy_powers(tmp_path):
+    """Test that server does not unload games with dummy powers waiting for bot orders."""
+    server = Server(str(tmp_path), max_loaded_games=1)
+    try:
+        active_game = _add_game(server, 0, status=strings.ACTIVE)
+        assert active_game.game_id in server.games_with_dummy_powers
+        forming_game_ids = [_add_game(server, index).game_id for index in (1, 2)]
+        # Active game is kept (and available for bots) although registry is full.
+        assert list(server.games.keys()) == [active_game.game_id, forming_game_ids[1]]
+        assert server.games.is_full()
+        assert active_game.game_id in server.games_with_dummy_powers
+        assert active_game.game_id in server.dispatched_dummy_powers
+
+        # Once game has no more dummy powers waiting for orders, it can be unloaded.
+        active_game.set_status(strings.COMPLETED)
+        server.save_game(active_game)
+        assert active_game.game_id not in server.games_with_dummy_powers
+        server.unload_inactive_games()
+        assert list(server.games.keys()) == [forming_game_ids[1]]
+    finally:
+        server.stop_daide_server(None)
+        Server.__cache__.pop(str(tmp_path), None)
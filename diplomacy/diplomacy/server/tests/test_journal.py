@@ -0,0 +1,132 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test append-only storage of server games."""
+import os
+
+import ujson as json
+
+from diplomacy.engine.message import Message
+from diplomacy.server.journal import GameJournal, SNAPSHOT_ID
+from diplomacy.server.server_game import ServerGame
+
+
+def _play(server_game, nb_messages):
+    """Add messages to given game, and return list of game dictionaries after each message."""
+    game_dicts = []
+    for index in range(nb_messages):
+        server_game.add_message(
+            Message(
+                sender="FRANCE",
+                recipient="ENGLAND",
+                message="message %d" % index,
+                phase=server_game.current_short_phase,
+                time_sent=index + 1,
+            )
+        )
+        if index % 5 == 4:
+            server_game.process()
+        game_dicts.append(server_game.to_dict())
+    return game_dicts
+
+
+def _new_game():
+    """Return a new started server game with press."""
+    server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+    server_game.set_status("active")
+    return server_game
+
+
+def test_save_and_load(tmp_path):
+    """Test that a game saved in journal is loaded back identical."""
+    server_game = _new_game()
+    journal = GameJournal(str(tmp_path))
+    for game_dict in _play(server_game, 12):
+        journal.save(server_game.game_id, game_dict)
+    expected = json.loads(json.dumps(server_game.to_dict()))
+    assert journal.load(server_game.game_id) == expected
+    assert GameJournal(str(tmp_path)).load(server_game.game_id) == expected
+    assert ServerGame.from_dict(journal.load(server_game.game_id)).get_hash() == (
+        server_game.get_hash()
+    )
+
+    # Snapshot was written once, other versions were appended to journal.
+    with open(journal.get_journal_path(server_game.game_id)) as file:
+        assert len(file.readlines()) == 12
+    with open(journal.get_snapshot_path(server_game.game_id)) as file:
+        assert SNAPSHOT_ID in json.load(file)
+
+    journal.delete(server_game.game_id)
+    assert not os.listdir(str(tmp_path))
+
+
+def test_compaction(tmp_path):
+    """Test that journal is compacted into a new snapshot after max entries."""
+    server_game = _new_game()
+    journal = GameJournal(str(tmp_path), max_entries=4)
+    snapshot_ids = set()
+    for game_dict in _play(server_game, 11):
+        journal.save(server_game.game_id, game_dict)
+        snapshot_ids.add(journal.states[server_game.game_id].snapshot_id)
+        with open(journal.get_journal_path(server_game.game_id)) as file:
+            assert len(file.readlines()) <= 1 + 4
+    assert len(snapshot_ids) >= 3
+    assert journal.load(server_game.game_id) == json.loads(json.dumps(server_game.to_dict()))
+
+
+def test_recovery(tmp_path):
+    """Test loading a game after an interrupted journal write or compaction."""
+    server_game = _new_game()
+    journal = GameJournal(str(tmp_path))
+    game_dicts = _play(server_game, 6)
+    for game_dict in game_dicts:
+        journal.save(server_game.game_id, game_dict)
+    journal_path = journal.get_journal_path(server_game.game_id)
+
+    # Incomplete last entry is skipped.
+    with open(journal_path, "a") as file:
+        file.write('{"delta": {"set": {"note": "incompl')
+    assert journal.load(server_game.game_id) == json.loads(json.dumps(game_dicts[-1]))
+
+    # Journal of a previous snapshot is ignored.
+    with open(journal_path) as file:
+        lines = file.readlines()
+    journal.compact(server_game.game_id, game_dicts[-1])
+    with open(journal_path, "w") as file:
+        file.writelines(lines)
+    assert journal.load(server_game.game_id) == json.loads(json.dumps(game_dicts[-1]))
+
+
+def test_release(tmp_path):
+    """Test that a released game is reloaded from disk on next save, without a new snapshot."""
+    server_game = _new_game()
+    journal = GameJournal(str(tmp_path))
+    game_dicts = _play(server_game, 8)
+    for game_dict in game_dicts[:4]:
+        journal.save(server_game.game_id, game_dict)
+    snapshot_id = journal.states[server_game.game_id].snapshot_id
+    journal.release(keep=["other game"])
+    assert journal.states[server_game.game_id].game_dict is None
+    for game_dict in game_dicts[4:]:
+        journal.save(server_game.game_id, game_dict)
+    assert journal.states[server_game.game_id].snapshot_id == snapshot_id
+    with open(journal.get_journal_path(server_game.game_id)) as file:
+        assert len(file.readlines()) == 8
+    assert journal.load(server_game.game_id) == json.loads(json.dumps(game_dicts[-1]))
+
+    # Kept games are not released.
+    journal.release(keep=[server_game.game_id])
+    assert journal.states[server_game.game_id].game_dict is game_dicts[-1]
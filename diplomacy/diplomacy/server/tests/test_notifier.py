@@ -0,0 +1,168 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test server notifier."""
+from unittest import mock
+
+import pytest
+import ujson as json
+from tornado.httputil import HTTPServerRequest
+from tornado.ioloop import IOLoop
+from tornado.web import Application
+from tornado.websocket import WebSocketClosedError
+
+from diplomacy.communication import binary_protocol, notifications
+from diplomacy.engine.message import Message
+from diplomacy.server.connection_handler import ConnectionHandler
+from diplomacy.server.notifier import Notifier
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+class _ConnectionHandler:
+    """Connection handler which sends notifications as is, as server ConnectionHandler does."""
+
+    translate_notification = staticmethod(ConnectionHandler.translate_notification)
+
+
+class _BinaryConnectionHandler(_ConnectionHandler):
+    """Connection handler using binary protocol."""
+
+    is_binary = True
+
+
+class _TranslatingConnectionHandler:
+    """Connection handler which translates notifications, as DAIDE connection handler does."""
+
+    @staticmethod
+    def translate_notification(notification):
+        """Translate notification to a list of strings."""
+        return ["translated %s" % notification.game_role]
+
+
+def test_notify_game_processed(tmp_path):
+    """Test that notifications shared by many addresses are serialized with each address."""
+    server = Server(str(tmp_path))
+    try:
+        server.users.add_user("user", "")
+        connection_handler = _ConnectionHandler()
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        server_game.add_message(
+            Message(
+                sender="FRANCE",
+                recipient="ENGLAND",
+                message="private",
+                phase=server_game.current_short_phase,
+                time_sent=1,
+            )
+        )
+        observer_tokens = [server.users.connect_user("user", connection_handler) for _ in range(3)]
+        for token in observer_tokens:
+            server_game.add_observer_token(token)
+        omniscient_token = server.users.connect_user("user", connection_handler)
+        server_game.add_omniscient_token(omniscient_token)
+        daide_token = server.users.connect_user("user", _TranslatingConnectionHandler())
+        server_game.get_power("ENGLAND").add_token(daide_token)
+        phase_data = server_game.get_phase_data()
+
+        IOLoop.current().run_sync(
+            lambda: Notifier(server, ignore_tokens=[observer_tokens[2]]).notify_game_processed(
+                server_game, phase_data, phase_data
+            )
+        )
+        sent = {}
+        while server.notifications.qsize():
+            _, message = server.notifications.get_nowait()
+            if message.startswith("translated"):
+                sent.setdefault(daide_token, []).append(message)
+            else:
+                notification = notifications.parse_dict(json.loads(message))
+                sent.setdefault(notification.token, []).append(notification)
+
+        # Ignored token gets no notification. Translating connection gets translated notifications.
+        assert set(sent) == {observer_tokens[0], observer_tokens[1], omniscient_token, daide_token}
+        assert sent[daide_token][0] == "translated ENGLAND"
+
+        game_processed = [
+            notification
+            for token in (observer_tokens[0], observer_tokens[1], omniscient_token)
+            for notification in sent[token]
+            if isinstance(notification, notifications.GameProcessed)
+        ]
+        assert len(game_processed) == 3
+        assert len({notification.notification_id for notification in game_processed}) == 3
+        observer_notification, _, omniscient_notification = game_processed
+        assert observer_notification.game_role == strings.OBSERVER_TYPE
+        assert omniscient_notification.game_role == strings.OMNISCIENT_TYPE
+        assert observer_notification.game_id == server_game.game_id
+        assert not observer_notification.previous_phase_data.messages
+        assert len(omniscient_notification.previous_phase_data.messages) == 1
+        # Observers also receive power wait flags.
+        assert len(sent[observer_tokens[0]]) == 1 + len(server_game.powers)
+    finally:
+        server.stop_daide_server(None)
+        Server.__cache__.pop(str(tmp_path), None)
+
+
+def test_notify_binary_connections(tmp_path):
+    """Test that JSON and binary connections receive same shared notifications."""
+    pytest.importorskip("msgpack")
+    server = Server(str(tmp_path))
+    try:
+        server.users.add_user("user", "")
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        json_tokens = [server.users.connect_user("user", _ConnectionHandler()) for _ in range(2)]
+        binary_tokens = [
+            server.users.connect_user("user", _BinaryConnectionHandler()) for _ in range(2)
+        ]
+        for token in json_tokens + binary_tokens:
+            server_game.add_observer_token(token)
+        phase_data = server_game.get_phase_data()
+
+        IOLoop.current().run_sync(
+            lambda: Notifier(server).notify_game_processed(server_game, phase_data, phase_data)
+        )
+        sent = {}
+        while server.notifications.qsize():
+            _, message = server.notifications.get_nowait()
+            if isinstance(message, bytes):
+                notification = notifications.parse_dict(binary_protocol.decode(message))
+                assert notification.token in binary_tokens
+            else:
+                notification = notifications.parse_dict(json.loads(message))
+                assert notification.token in json_tokens
+            if isinstance(notification, notifications.GameProcessed):
+                sent[notification.token] = notification
+        assert set(sent) == set(json_tokens + binary_tokens)
+        expected = sent[json_tokens[0]].current_phase_data.to_dict()
+        for notification in sent.values():
+            assert notification.game_role == strings.OBSERVER_TYPE
+            assert notification.current_phase_data.to_dict() == expected
+    finally:
+        server.stop_daide_server(None)
+        Server.__cache__.pop(str(tmp_path), None)
+
+
+def test_write_to_closed_connection_handler():
+    """Test that writing to a closed connection raises WebSocketClosedError,
+    which server notification loop expects."""
+    request = HTTPServerRequest(method="GET", uri="/", connection=mock.Mock())
+    connection_handler = ConnectionHandler(Application(), request)
+    assert connection_handler.ws_connection is None
+    assert not connection_handler.is_binary
+    with pytest.raises(WebSocketClosedError):
+        connection_handler.write_message('{"name": "test"}')
@@ -0,0 +1,88 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test server games scheduler."""
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from diplomacy.server.scheduler import Scheduler
+from diplomacy.utils import strings
+
+
+def test_scheduler():
+    """Test that data are processed at their deadlines, in batches, and rescheduled."""
+    processed = []
+    running = []
+    max_running = []
+
+    @gen.coroutine
+    def callback(data):
+        running.append(data)
+        max_running.append(len(running))
+        yield gen.moment
+        running.remove(data)
+        processed.append(data)
+        # Data "done" is processed only once.
+        return data == "done"
+
+    scheduler = Scheduler(1, callback, batch_size=10)
+
+    @gen.coroutine
+    def step():
+        del processed[:]
+        yield scheduler._step()  # pylint: disable=protected-access
+        yield scheduler.tasks_queue.join()
+        return set(processed)
+
+    @gen.coroutine
+    def run():
+        IOLoop.current().spawn_callback(scheduler.process_tasks)
+        for index in range(25):
+            yield scheduler.add_data(index, 1 + index % 2)
+        yield scheduler.add_data("done", 2)
+        yield scheduler.add_data("removed", 2)
+        yield scheduler.remove_data("removed")
+        info = yield scheduler.get_info(3)
+        assert (info.time_added, info.delay, info.current_time) == (0, 2, 0)
+
+        assert (yield step()) == set(range(0, 25, 2))
+        # Tasks of a same batch are processed concurrently.
+        assert max(max_running) == 10
+        assert scheduler.get_stats()[strings.PROCESSED_BATCHES] == 2
+        # Even data were rescheduled with delay 1, odd data were added with delay 2.
+        assert (yield step()) == set(range(25)) | {"done"}
+        assert scheduler.get_stats()[strings.PROCESSED_BATCHES] == 5
+        assert not scheduler.contains("done") and not scheduler.contains("removed")
+
+        # Processed data are rescheduled with same delay.
+        info = yield scheduler.get_info(3)
+        assert (info.time_added, info.delay, info.current_time) == (2, 2, 2)
+
+        # Immediate task not processed if validator fails, and dropped.
+        yield scheduler.no_wait("immediate", 0, False)
+        yield scheduler.tasks_queue.join()
+        assert "immediate" not in processed and not scheduler.contains("immediate")
+        yield scheduler.no_wait(4, 0, True)
+        yield scheduler.tasks_queue.join()
+        assert 4 in processed and not scheduler.contains(4)
+
+        stats = scheduler.get_stats()
+        assert stats[strings.CURRENT_TIME] == 2
+        assert stats[strings.SCHEDULED_DATA] == 24
+        assert stats[strings.QUEUED_DATA] == 0
+        assert stats[strings.PROCESSED_TASKS] == 13 + 26 + 1
+
+    IOLoop.current().run_sync(run)
@@ -0,0 +1,81 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test request SetOrdersBatch."""
+import pytest
+
+from diplomacy.communication import requests, responses
+from diplomacy.server import request_managers
+from diplomacy.server.connection_handler import ConnectionHandler
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import exceptions, strings
+
+
+class _ConnectionHandler:
+    """Connection handler which sends notifications as is, as server ConnectionHandler does."""
+
+    translate_notification = staticmethod(ConnectionHandler.translate_notification)
+
+
+def test_set_orders_batch(tmp_path):
+    """Test that a batch sets orders of all controlled powers and returns errors per power."""
+    server = Server(str(tmp_path))
+    try:
+        server.users.add_user("user", "")
+        token = server.users.connect_user("user", _ConnectionHandler())
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        server_game.server = server
+        server.add_new_game(server_game)
+        for power_name in ("FRANCE", "GERMANY"):
+            server_game.control(power_name, "user", token)
+        server_game.set_status(strings.ACTIVE)
+        connection_handler = server.users.get_connection_handler(token)
+
+        def _set_orders_batch(orders):
+            request = requests.SetOrdersBatch(
+                token=token,
+                game_id=server_game.game_id,
+                game_role="FRANCE",
+                phase=server_game.current_short_phase,
+                orders=orders,
+                wait=True,
+            )
+            return request_managers.handle_request(server, request, connection_handler).result()
+
+        response = _set_orders_batch(
+            {"FRANCE": ["A PAR - BUR", "F BRE - MAO"], "GERMANY": ["A MUN - BUR", "F KIE - LON"]}
+        )
+        assert isinstance(response, responses.DataOrderErrors)
+        assert not response.data["FRANCE"]
+        assert len(response.data["GERMANY"]) == 1 and "F KIE - LON" in response.data["GERMANY"][0]
+        assert server_game.get_orders("FRANCE") == ["A PAR - BUR", "F BRE - MAO"]
+        assert server_game.get_orders("GERMANY") == ["A MUN - BUR"]
+        assert server_game.get_power("FRANCE").wait and server_game.get_power("GERMANY").wait
+
+        # New orders replace previous ones.
+        _set_orders_batch({"FRANCE": ["A MAR - SPA"]})
+        assert server_game.get_orders("FRANCE") == ["A MAR - SPA"]
+        assert server_game.get_orders("GERMANY") == ["A MUN - BUR"]
+
+        # User can't set orders for a power it does not control.
+        with pytest.raises(exceptions.ResponseException):
+            _set_orders_batch({"FRANCE": ["A PAR - BUR"], "ITALY": ["A ROM - APU"]})
+        assert server_game.get_orders("FRANCE") == ["A MAR - SPA"]
+        assert not server_game.get_orders("ITALY")
+    finally:
+        server.stop_daide_server(None)
+        Server.__cache__.pop(str(tmp_path), None)
@@ -0,0 +1,114 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test game synchronization with separate and bulk notifications."""
+import ujson as json
+
+from diplomacy.client import notification_managers
+from diplomacy.communication import notifications, requests
+from diplomacy.engine.game import Game
+from diplomacy.engine.message import Message
+from diplomacy.server import request_managers
+from diplomacy.server.connection_handler import ConnectionHandler
+from diplomacy.server.server import Server
+from diplomacy.server.server_game import ServerGame
+from diplomacy.utils import strings
+
+
+class _ConnectionHandler:
+    """Connection handler which sends notifications as is, as server ConnectionHandler does."""
+
+    translate_notification = staticmethod(ConnectionHandler.translate_notification)
+
+
+def _add_messages(server_game, count):
+    for index in range(count):
+        server_game.add_message(
+            Message(
+                sender="FRANCE",
+                recipient="ENGLAND" if index % 2 else "GLOBAL",
+                message="message %d" % index,
+                phase=server_game.current_short_phase,
+            )
+        )
+
+
+def _synchronize(server, client_game, token, chunk_size):
+    """Synchronize given client game and return number of notifications received."""
+    request = requests.Synchronize(
+        token=token,
+        game_id=client_game.game_id,
+        game_role=client_game.role,
+        phase=client_game.current_short_phase,
+        timestamp=client_game.get_latest_timestamp(),
+        chunk_size=chunk_size,
+    )
+    connection_handler = server.users.get_connection_handler(token)
+    request_managers.handle_request(server, request, connection_handler).result()
+    count = 0
+    while server.notifications.qsize():
+        _, message = server.notifications.get_nowait()
+        notification = notifications.parse_dict(json.loads(message))
+        notification_managers.MAPPING[type(notification)](client_game, notification)
+        count += 1
+    return count
+
+
+def test_bulk_synchronization(tmp_path):
+    """Test that bulk synchronization updates client game as separate notifications do."""
+    server = Server(str(tmp_path))
+    try:
+        server.users.add_user("user", "")
+        token = server.users.connect_user("user", _ConnectionHandler())
+        server_game = ServerGame(rules=["NO_DEADLINE", "POWER_CHOICE"])
+        server_game.server = server
+        server_game.add_observer_token(token)
+        server.add_new_game(server_game)
+        _add_messages(server_game, 3)
+        client_game_dict = server_game.cast(strings.OBSERVER_TYPE, "user").to_dict()
+
+        # Game progresses while client is disconnected.
+        _add_messages(server_game, 4)
+        for _ in range(3):
+            # Game without controlled powers is paused after each processing.
+            server_game.set_status(strings.ACTIVE)
+            server_game.process()
+            _add_messages(server_game, 4)
+
+        client_games = {}
+        counts = {}
+        for chunk_size in (None, 0, 3):
+            client_games[chunk_size] = Game.from_dict(client_game_dict)
+            counts[chunk_size] = _synchronize(server, client_games[chunk_size], token, chunk_size)
+
+        # 2 global messages in current phase, 3 history phases, 1 current phase, 1 status update.
+        assert counts == {None: 7, 0: 2, 3: 3}
+        # Current phase data sent separately resets client game history.
+        expected_game = client_games[None]
+        assert len(expected_game.state_history) == 0
+        expected_game_dict = expected_game.to_dict()
+        for chunk_size in (0, 3):
+            client_game = client_games[chunk_size]
+            assert client_game.get_latest_timestamp() == expected_game.get_latest_timestamp()
+            assert len(client_game.state_history) == 3
+            assert len(client_game.messages) == 2
+            client_game_dict = client_game.to_dict()
+            for key in client_game_dict:
+                if not key.endswith("_history"):
+                    assert client_game_dict[key] == expected_game_dict[key], key
+    finally:
+        server.stop_daide_server(None)
+        Server.__cache__.pop(str(tmp_path), None)
@@ -0,0 +1,136 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test binary websocket protocol."""
+import socket
+
+import pytest
+import ujson as json
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from diplomacy.client.connection import connect
+from diplomacy.communication import binary_protocol, notifications, requests
+from diplomacy.engine.game import Game
+from diplomacy.engine.message import Message
+from diplomacy.server.server import Server
+
+pytest.importorskip("msgpack")
+
+
+def _get_free_port():
+    """Return a port available on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _game_processed():
+    """Return a GameProcessed notification for a game with a message."""
+    game = Game()
+    game.set_orders("FRANCE", ["A PAR - BUR", "F BRE - MAO"])
+    game.add_message(
+        Message(
+            sender="FRANCE",
+            recipient="ENGLAND",
+            message="Hello, A PAR",
+            phase=game.current_short_phase,
+            time_sent=1,
+        )
+    )
+    phase_data = game.get_phase_data()
+    return notifications.GameProcessed(
+        token="token",
+        game_id=game.game_id,
+        game_role="FRANCE",
+        previous_phase_data=phase_data,
+        current_phase_data=phase_data,
+    )
+
+
+def test_round_trip():
+    """Test that encoded dictionaries are decoded back to same JSON dictionaries."""
+    notification = _game_processed()
+    json_dict = json.loads(notification.json())
+    encoded = binary_protocol.encode(notification.to_dict())
+    assert isinstance(encoded, bytes)
+    assert len(encoded) < len(notification.json())
+    assert binary_protocol.decode(encoded) == json_dict
+    assert notifications.parse_dict(binary_protocol.decode(encoded)).to_dict() == json_dict
+
+    request = requests.SetOrders(
+        token="token", game_id="game", game_role="FRANCE", phase="S1901M", orders=["A PAR H"]
+    )
+    assert binary_protocol.decode(binary_protocol.encode(request.to_dict())) == json.loads(
+        request.json()
+    )
+
+
+def test_invalid_data():
+    """Test that invalid binary data raise a ValueError."""
+    for data in (b"\x01", b"\xc7\x01\x09\x00", b"\x81\xcd\xff\xff\x01"):
+        with pytest.raises(ValueError):
+            binary_protocol.decode(data)
+
+
+def test_address_body():
+    """Test that addressing an encoded body is equivalent to encoding full dictionary."""
+    notification = _game_processed()
+    json_dict = notification.to_dict()
+    address = {field: json_dict.pop(field) for field in ("notification_id", "token", "game_role")}
+    addressed = binary_protocol.address_body(address, binary_protocol.encode(json_dict))
+    assert binary_protocol.decode(addressed) == json.loads(notification.json())
+
+    # Map headers of all sizes are rewritten.
+    for size in (10, 100, 70000):
+        body = {"key %d" % index: index for index in range(size)}
+        decoded = binary_protocol.decode(
+            binary_protocol.address_body({"token": "token"}, binary_protocol.encode(body))
+        )
+        assert decoded == dict(body, token="token")
+
+
+def test_binary_connection(tmp_path):
+    """Test that a client asking for binary protocol exchanges binary frames with server."""
+    io_loop = IOLoop()
+    server = Server(str(tmp_path))
+    port = _get_free_port()
+    results = {}
+
+    @gen.coroutine
+    def client():
+        """Connect, create a game and send orders using binary protocol."""
+        try:
+            connection = yield connect("localhost", port, use_binary=True)
+            results["is_binary"] = connection.is_binary
+            channel = yield connection.authenticate("user", "password")
+            game = yield channel.create_game(power_name="FRANCE", rules=["NO_DEADLINE"])
+            yield game.set_orders(orders=["A PAR - BUR"])
+            results["orders"] = server.get_game(game.game_id).get_orders("FRANCE")
+            yield game.leave()
+            yield channel.logout()
+        finally:
+            io_loop.stop()
+
+    io_loop.add_callback(client)
+    try:
+        server.start(port, io_loop)
+    finally:
+        server.backend.http_server.stop()
+        server.stop_daide_server(None)
+        io_loop.close()
+        Server.__cache__.pop(str(tmp_path), None)
+    assert results == {"is_binary": True, "orders": ["A PAR - BUR"]}
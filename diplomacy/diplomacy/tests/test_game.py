@@ -18,7 +18,11 @@
 - Contains tests for the game object
 """
 from copy import deepcopy
+
+import pytest
+
 from diplomacy.engine.game import Game
+from diplomacy.utils import exceptions
 from diplomacy.utils.order_results import BOUNCE
 
 
@@ -491,6 +495,31 @@ def test_set_orders_no_replace():
     assert check_sorted(orders["FRANCE"], ["A BRE B"])
 
 
+def test_set_orders_many():
+    """Test - Sets orders for many powers at once"""
+    game = Game()
+    expected_game = Game()
+    orders = {
+        "FRANCE": ["A PAR - BUR", "A MAR - SPA", "F BRE - MAO"],
+        "GERMANY": ["A MUN - BUR", "F KIE - LON"],
+        "ITALY": [],
+    }
+    errors = game.set_orders_many(orders)
+    for power_name, power_orders in orders.items():
+        expected_game.set_orders(power_name, power_orders)
+        assert game.get_orders(power_name) == expected_game.get_orders(power_name)
+    assert set(errors) == {"FRANCE", "GERMANY", "ITALY"}
+    assert not errors["FRANCE"] and not errors["ITALY"]
+    assert len(errors["GERMANY"]) == 1 and "F KIE - LON" in str(errors["GERMANY"][0])
+    assert game.get_hash() == expected_game.get_hash()
+
+    # Orders for unknown powers are rejected before any order is set.
+    game = Game()
+    with pytest.raises(exceptions.MapPowerException):
+        game.set_orders_many({"FRANCE": ["A PAR - BUR"], "NOWHERE": ["A PAR - BUR"]})
+    assert not game.get_orders("FRANCE")
+
+
 def test_clear_units():
     """Tests - Clear units"""
     game = Game()
@@ -542,6 +571,32 @@ def test_set_current_phase():
     assert "A PAR B" in game.get_all_possible_orders()["PAR"]
 
 
+def test_possible_orders_cache():
+    """Tests - possible orders are cached, and updated when units change"""
+
+    def expected_possible_orders(game):
+        new_game = Game(map_name=game.map_name)
+        new_game.set_phase_data(game.get_phase_data())
+        return new_game.get_all_possible_orders()
+
+    game = Game()
+    possible_orders = game.get_all_possible_orders()
+    possible_orders["PAR"].clear()
+    assert "A PAR H" in game.get_all_possible_orders()["PAR"]
+
+    # Moving an army, then a fleet able to convoy
+    game.set_units("FRANCE", ["A BUR", "A MAR", "F BRE"], reset=True)
+    assert "A BUR - MUN" in game.get_all_possible_orders()["BUR"]
+    assert game.get_all_possible_orders() == expected_possible_orders(game)
+    game.set_units("ENGLAND", ["F ENG", "A WAL", "F LON"], reset=True)
+    assert "F ENG C A WAL - PIC" in game.get_all_possible_orders()["ENG"]
+    assert game.get_all_possible_orders() == expected_possible_orders(game)
+
+    # Cache is invalidated when processing
+    game.process()
+    assert game.get_all_possible_orders() == expected_possible_orders(game)
+
+
 def test_process_game():
     """Tests - Process game"""
     game = Game()
@@ -564,6 +619,19 @@ def test_deepcopy():
     assert game.get_hash() == game2.get_hash()
 
 
+def test_zobrist_hash():
+    """Tests - zobrist hash values are stable and match after incremental updates and rebuild"""
+    game = Game()
+    assert game.get_hash() == "1919110489198082658"
+    game.set_orders("FRANCE", "A PAR - BUR")
+    game.process()
+    assert game.get_hash() == "6532910942134419551"
+    assert game.rebuild_hash() == "6532910942134419551"
+    game.update_hash("FRANCE", unit_type="A", loc="BUR")
+    game.update_hash("FRANCE", unit_type="A", loc="BUR")
+    assert game.get_hash() == "6532910942134419551"
+
+
 def test_automatic_draw():
     """Tests - draw"""
     game = Game()
@@ -674,6 +742,75 @@ def test_histories():
     assert orders_phase_2["AUSTRIA"] == ["A BUD - GAL"]
 
 
+def test_delta_history():
+    """Test that rule DELTA_HISTORY stores and saves the same phase history as a regular game."""
+    from diplomacy.utils.delta_history import DeltaHistory, is_delta
+
+    orders = [
+        ("FRANCE", ["A PAR - BUR", "A MAR - SPA"]),
+        ("GERMANY", ["A MUN - RUH", "F KIE - DEN"]),
+        ("FRANCE", ["A BUR - BEL", "F BRE - MAO"]),
+        ("GERMANY", ["A RUH - HOL", "A BER - KIE"]),
+    ]
+    game = Game(rules=["DELTA_HISTORY"])
+    regular_game = Game()
+    assert isinstance(game.state_history, DeltaHistory)
+    assert not isinstance(regular_game.state_history, DeltaHistory)
+    for power_name, power_orders in orders * 4:
+        for current_game in (game, regular_game):
+            current_game.set_orders(power_name, power_orders)
+            current_game.process()
+
+    def _states(phase_history):
+        return [dict(phase_data.state, timestamp=0) for phase_data in phase_history]
+
+    assert len(game.state_history) > game.state_history.keyframe_interval
+    assert _states(game.get_phase_history()) == _states(regular_game.get_phase_history())
+    assert game.get_phase_from_history("F1902M").state["name"] == "F1902M"
+
+    # Server games save delta-encoded states, and are loaded back with full states.
+    game_to_json = game.to_dict()
+    assert any(is_delta(state) for state in game_to_json["state_history"].values())
+    game_copy = Game.from_dict(game_to_json)
+    assert isinstance(game_copy.state_history, DeltaHistory)
+    assert list(game_copy.state_history.values()) == list(game.state_history.values())
+
+    # Client games always export full states.
+    game_copy.role = "FRANCE"
+    for power in game_copy.powers.values():
+        power.role = "FRANCE"
+    assert not any(is_delta(state) for state in game_copy.to_dict()["state_history"].values())
+
+
+def test_fork():
+    """Test that a forked game shares history with its origin until one of them is processed."""
+    game = Game()
+    game.set_orders("FRANCE", ["A PAR - BUR", "A MAR - SPA"])
+    game.process()
+    fork = game.fork()
+    assert fork.map is game.map
+    assert fork.state_history is game.state_history
+    assert fork.get_state()["units"] == game.get_state()["units"]
+
+    # Processing the fork must not modify origin game.
+    fork.set_orders("FRANCE", ["A BUR - BEL"])
+    assert game.get_orders("FRANCE") == []
+    fork.process()
+    assert fork.state_history is not game.state_history
+    assert len(fork.state_history) == 2
+    assert len(game.state_history) == 1
+    assert game.get_current_phase() == "F1901M"
+    assert "A BEL" in fork.get_units("FRANCE")
+
+    # Processing origin game must not modify another fork.
+    other_fork = game.fork()
+    game.process()
+    assert len(game.state_history) == 2
+    assert len(other_fork.state_history) == 1
+    assert other_fork.get_current_phase() == "F1901M"
+    assert other_fork.get_units("FRANCE") == ["F BRE", "A SPA", "A BUR"]
+
+
 def test_result_history():
     """Test result history."""
     short_phase_name = "S1901M"
@@ -687,6 +824,47 @@ def test_result_history():
     assert BOUNCE in phase_data.results["A MAR"]
 
 
+def test_adjudicate():
+    """Test that applying an adjudication computed from a separate game input
+    gives same game as processing game in place."""
+    import pickle
+    import random
+
+    def _to_dict(current_game):
+        game_to_json = current_game.to_dict()
+        game_to_json["no_rules"] = sorted(game_to_json["no_rules"])
+        for state in game_to_json["state_history"].values():
+            # Timestamps differ, and hash saved in state of a drawn phase is a partially
+            # updated hash when game is processed in place.
+            state.pop("timestamp")
+            state.pop("zobrist_hash")
+        return game_to_json
+
+    rng = random.Random(4)
+    game = Game.from_dict(Game().to_dict())
+    other_game = Game.from_dict(game.to_dict())
+    while not game.is_game_done:
+        possible_orders = game.get_all_possible_orders()
+        for power_name in game.powers:
+            power_orders = [
+                rng.choice(possible_orders[loc])
+                for loc in game.get_orderable_locations(power_name)
+                if possible_orders[loc]
+            ]
+            game.set_orders(power_name, power_orders)
+            other_game.set_orders(power_name, power_orders)
+        # Adjudication input and output must be picklable, to be sent to another process.
+        adjudication_input = pickle.loads(pickle.dumps(other_game.get_adjudication_input()))
+        adjudication = pickle.loads(pickle.dumps(Game.adjudicate(adjudication_input)))
+        game.process()
+        other_game.process(adjudication)
+        assert other_game.get_hash() == game.get_hash()
+        assert other_game.get_all_possible_orders() == game.get_all_possible_orders()
+    # Game ends with an automatic draw after 100 years.
+    assert other_game.outcome == game.outcome
+    assert _to_dict(other_game) == _to_dict(game)
+
+
 def test_unit_owner():
     """Test Unit Owner Resolver making sure the cached results are correct"""
     game = Game()
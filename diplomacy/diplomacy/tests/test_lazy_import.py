@@ -0,0 +1,58 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test lazy import of diplomacy sub-packages."""
+import subprocess
+import sys
+
+
+def _modules_imported_by(statement):
+    """Return set of modules names in sys.modules after running given statement in a new process."""
+    code = "import sys; %s; print(' '.join(sys.modules))" % statement
+    return set(subprocess.check_output([sys.executable, "-c", code]).decode().split())
+
+
+def test_import_engine_only():
+    """Test that importing diplomacy only imports engine modules."""
+    modules = _modules_imported_by("import diplomacy; diplomacy.Game()")
+    assert "diplomacy.engine.game" in modules
+    for module_name in (
+        "tornado",
+        "diplomacy.client.connection",
+        "diplomacy.server.server",
+        "diplomacy.daide.server",
+        "diplomacy.utils.convoy_paths",
+        "tqdm",
+    ):
+        assert module_name not in modules, "%s should not be imported" % module_name
+
+
+def test_lazy_attributes():
+    """Test that lazy attributes and sub-packages are imported on access."""
+    import diplomacy
+    from diplomacy.client.connection import Connection, connect
+    from diplomacy.server.server import Server
+
+    assert diplomacy.Connection is Connection
+    assert diplomacy.connect is connect
+    assert diplomacy.Server is Server
+    assert diplomacy.daide is sys.modules["diplomacy.daide"]
+    assert "Server" in dir(diplomacy)
+    try:
+        diplomacy.unknown_attribute  # pylint: disable=pointless-statement
+        assert False, "Expected AttributeError"
+    except AttributeError:
+        pass
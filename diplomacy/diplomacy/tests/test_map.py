@@ -151,6 +151,11 @@ def test_abuts():
     assert this_map.abuts("F", "BOT", "S", "MOS") == 0
     assert this_map.abuts("F", "VEN", "S", "TUS") == 0
     assert this_map.abuts("A", "POR", "C", "MAO") == 1
+    assert this_map.abuts("A", "por", "S", "spa/nc") == 1
+    assert this_map.abuts("F", "BUL/SC", "-", "CON") == 1
+    assert this_map.abuts("F", "BUL/EC", "-", "AEG") == 0
+    assert this_map.abuts("A", "POR", "S", "XYZ") == 0
+    assert this_map.abuts("A", "POR", "H", "SPA") == 0
 
 
 def test_is_valid_unit():
@@ -198,6 +203,17 @@ def test_abut_list():
     assert this_map.abut_list("---") == ["ABC", "DEF", "GHI"]
     assert this_map.abut_list("AAA") == ["LOW", "HIG", "MAY"]
     assert this_map.abut_list("LVP") == ["CLY", "edi", "IRI", "NAO", "WAL", "yor"]
+    assert this_map.abut_list("CON", incl_no_coast=True) == [
+        "AEG",
+        "BUL/EC",
+        "BUL/SC",
+        "BLA",
+        "ANK",
+        "SMY",
+        "BUL",
+    ]
+    this_map.abut_list("CON", incl_no_coast=True).clear()
+    assert "BUL" in this_map.abut_list("CON", incl_no_coast=True)
 
 
 def test_compare_phases():
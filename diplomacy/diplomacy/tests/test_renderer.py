@@ -0,0 +1,62 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test SVG renderer."""
+from diplomacy.engine.game import Game
+from diplomacy.engine.renderer import Renderer
+
+
+def _play_game():
+    """Return a standard game played for a few phases (with moves, supports, convoys, retreats and builds)."""
+    game = Game()
+    game.set_orders("ENGLAND", ["F LON - ENG", "F EDI - NTH", "A LVP - WAL"])
+    game.set_orders("FRANCE", ["A PAR - BUR", "A MAR S A PAR - BUR", "F BRE - MAO"])
+    game.set_orders("GERMANY", ["A MUN - BUR", "F KIE - DEN", "A BER H"])
+    game.process()
+    game.set_orders("ENGLAND", ["F ENG C A WAL - BRE", "A WAL - BRE", "F NTH - NWY"])
+    game.set_orders("GERMANY", ["F DEN S F NTH - NWY", "A MUN - BUR"])
+    game.set_orders("FRANCE", ["F MAO - SPA/NC", "A BUR H"])
+    game.process()
+    while game.get_current_phase()[-1] != "M":
+        game.process()
+    return game
+
+
+def test_template_render():
+    """Test that rendering with a template returns same SVG as rendering whole map."""
+    game = _play_game()
+    renderer = Renderer(game, use_template=False)
+    template_renderer = Renderer(game)
+    assert template_renderer.template is Renderer(Game()).template
+    for incl_orders in (False, True):
+        for incl_abbrev in (False, True):
+            expected = renderer.render_phases(incl_orders=incl_orders, incl_abbrev=incl_abbrev)
+            rendered = template_renderer.render_phases(
+                incl_orders=incl_orders, incl_abbrev=incl_abbrev
+            )
+            assert rendered == expected
+
+
+def test_render_phases():
+    """Test rendering all phases of a game in one call."""
+    game = _play_game()
+    rendered = game.render_phases()
+    phase_names = [phase.name for phase in game.get_phase_history()] + [game.get_current_phase()]
+    assert [name for name, _ in rendered] == phase_names
+    assert rendered[-1][1] == game.render()
+    assert "unitengland" in rendered[1][1]
+    assert game.render_phases(phases=game.get_phase_history(to_phase=0)) == rendered[:1]
+    assert game.get_current_phase() == phase_names[-1]
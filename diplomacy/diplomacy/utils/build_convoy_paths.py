@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Small module script to prebuild convoy paths caches, one map per process. Usage:
+
+.. code-block:: bash
+
+    # build missing caches for all maps in package (in external cache directory).
+    python -m diplomacy.utils.build_convoy_paths
+
+    # build caches for given maps (names or paths to map files), even if already cached.
+    python -m diplomacy.utils.build_convoy_paths standard /path/to/custom.map --force
+
+    # build caches into a server directory (used by a server started with --server_dir).
+    python -m diplomacy.utils.build_convoy_paths --server_dir=<server dir>
+"""
+import argparse
+import logging
+
+from diplomacy.utils import convoy_paths
+
+
+def main():
+    """Parse command line and build caches."""
+    parser = argparse.ArgumentParser(description="Prebuild convoy paths caches.")
+    parser.add_argument(
+        "maps", nargs="*", help="map names or paths to map files (default: all maps in package)"
+    )
+    parser.add_argument(
+        "--processes",
+        "-p",
+        type=int,
+        default=None,
+        help="number of processes to use (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild caches even for maps already cached"
+    )
+    parser.add_argument(
+        "--server_dir",
+        type=str,
+        default=None,
+        help="build caches for a server using this server directory",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help="directory where to save cache files (default: %s)" % convoy_paths.EXTERNAL_CACHE_DIR,
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.server_dir:
+        convoy_paths.set_server_dir(args.server_dir)
+    cache_paths = convoy_paths.build_convoy_paths_caches(
+        map_names=args.maps or None,
+        nb_processes=args.processes,
+        force=args.force,
+        cache_dir=args.cache_dir,
+    )
+    for map_path, cache_path in sorted(cache_paths.items()):
+        print("%s -> %s" % (map_path, cache_path))
+    print("Built %d convoy paths cache(s)." % len(cache_paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,13 @@ ATTEMPT_DELAY_SECONDS = 5
 # Time to wait between to server backups.
 DEFAULT_BACKUP_DELAY_SECONDS = 10 * 60  # 10 minutes.
 
+# Default maximum number of games a server keeps loaded in memory (0 means no limit).
+DEFAULT_MAX_LOADED_GAMES = 0
+
+# Default maximum number of items (messages and phases) sent in a single notification
+# when a client game synchronizes with server game.
+DEFAULT_SYNCHRONIZATION_CHUNK_SIZE = 100
+
 # Default server ping interval. # Used for sockets ping.
 DEFAULT_PING_SECONDS = 30
 
@@ -16,17 +16,29 @@
 # ==============================================================================
 """Convoy paths
 - Contains utilities to generate all the possible convoy paths for a given map
+
+Convoy paths are cached on disk, in one file per map. A cache file is named
+``<map name>-<md5 of map file>.pkl``, and contains a dictionary with the cache version,
+the map name, the map file hash and the convoy paths. Editing a map file changes its hash,
+so convoy paths are regenerated the next time the map is used.
+
+Cache files are searched in the internal cache directory (shipped with the package) then in
+the external cache directory (in user home). Missing convoy paths are generated the first time
+a map is used, and saved in the external cache directory. Caches for many maps can be
+prebuilt in parallel with ``python -m diplomacy.utils.build_convoy_paths``.
+
+Legacy caches (a single file for all maps) are only read when a map has no cache file. They are
+then split into cache files for all maps in package, and marked as migrated (with a marker file
+in the external cache directory), so that they are not read again.
 """
 import collections
 import hashlib
 import glob
 import logging
 import pickle
-import multiprocessing
 import os
 from queue import Queue
 import threading
-import tqdm
 from diplomacy.engine.map import Map
 from diplomacy import settings
 
@@ -43,17 +55,37 @@ COAST_TYPES = ("COAST", "PORT")
 WATER_TYPES = ("WATER", "PORT")
 MAX_CONVOY_LENGTH = 13  # Convoys over this length are not supported, too reduce generation time
 
+CACHE_DIR_NAME = "convoy_paths"
+INTERNAL_CACHE_DIR = os.path.join(settings.PACKAGE_DIR, "maps", CACHE_DIR_NAME)
+EXTERNAL_CACHE_DIR = os.path.join(HOME_DIRECTORY, ".cache", "diplomacy", CACHE_DIR_NAME)
+
+# Legacy caches (a single file containing convoy paths for all maps). Only read if a map has no cache file.
 CACHE_FILE_NAME = "convoy_paths_cache.pkl"
 INTERNAL_CACHE_PATH = os.path.join(settings.PACKAGE_DIR, "maps", CACHE_FILE_NAME)
 EXTERNAL_CACHE_PATH = os.path.join(HOME_DIRECTORY, ".cache", "diplomacy", CACHE_FILE_NAME)
+LEGACY_MIGRATED_FILE_NAME = "legacy_cache_migrated"
+
+# Convoy paths loaded in memory, with map file hash as key
+CONVOYS_PATH_CACHE = {}
+
+# Convoy paths from legacy caches not yet saved in cache files, with map file hash as key.
+# None until legacy caches are loaded (once per process).
+LEGACY_CONVOY_PATHS = None
 
 
 def set_server_dir(server_dir):
+    """Use caches in given server directory, instead of internal and external caches"""
+    global INTERNAL_CACHE_DIR
+    global EXTERNAL_CACHE_DIR
     global INTERNAL_CACHE_PATH
     global EXTERNAL_CACHE_PATH
+    global LEGACY_CONVOY_PATHS
+    INTERNAL_CACHE_DIR = os.path.join(server_dir, "maps", CACHE_DIR_NAME)
+    EXTERNAL_CACHE_DIR = INTERNAL_CACHE_DIR
     INTERNAL_CACHE_PATH = os.path.join(server_dir, "maps", CACHE_FILE_NAME)
     EXTERNAL_CACHE_PATH = INTERNAL_CACHE_PATH
-    print(INTERNAL_CACHE_PATH)
+    LEGACY_CONVOY_PATHS = None
+    LOGGER.info("Using convoy paths cache directory %s", INTERNAL_CACHE_DIR)
 
 
 def _display_progress_bar(queue, max_loop_iters):
@@ -62,6 +94,8 @@ def _display_progress_bar(queue, max_loop_iters):
     :param queue: Multiprocessing queue to display the progress bar
     :param max_loop_iters: The expected maximum number of iterations
     """
+    import tqdm  # Only needed when building caches
+
     with tqdm.tqdm(total=max_loop_iters) as progress_bar:
         for item in iter(queue.get, None):  # type: int
             for _ in range(item):
@@ -158,11 +192,13 @@ def _get_convoy_paths(map_object, start_location, max_convoy_length, queue):
     return results
 
 
-def _build_convoy_paths_cache(map_object, max_convoy_length):
+def _build_convoy_paths_cache(map_object, max_convoy_length, nb_cores=None):
     """Builds the convoy paths cache for a map
 
     :param map_object: The instantiated map object
     :param max_convoy_length: The maximum convoy length permitted
+    :param nb_cores: (optional) number of processes to use. If 1, paths are generated in current process,
+        without progress bar (e.g. when map itself is generated in a worker process).
     :return: A dictionary where the key is the number of fleets in the path and
              the value is a list of convoy paths (start loc, {fleets}, {dest}) of that length for the map
     :type map_object: diplomacy.Map
@@ -180,26 +216,33 @@ def _build_convoy_paths_cache(map_object, max_convoy_length):
         loc.upper() for loc in map_object.locs if map_object.area_type(loc) in WATER_TYPES
     ]
 
-    # Starts the progress bar loop
-    manager = multiprocessing.Manager()
-    queue = manager.Queue()
-    progress_bar = threading.Thread(
-        target=_display_progress_bar, args=(queue, len(coasts) * len(water_locs))
-    )
-    progress_bar.start()
-
-    # Getting all paths for each coasts in parallel (except if the map is large, to avoid high memory usage)
-    nb_cores = (
-        multiprocessing.cpu_count()
-        if (len(water_locs) <= 30 or max_convoy_length <= MAX_CONVOY_LENGTH)
-        else 1
-    )
-    with multiprocessing.Pool(nb_cores) as pool:
-        tasks = [(map_object, coast, max_convoy_length, queue) for coast in coasts]
-        results = pool.starmap(_get_convoy_paths, tasks)
+    if nb_cores == 1:
+        results = [
+            _get_convoy_paths(map_object, coast, max_convoy_length, Queue()) for coast in coasts
+        ]
+    else:
+        import multiprocessing  # Only needed when building caches
+
+        # Starts the progress bar loop
+        manager = multiprocessing.Manager()
+        queue = manager.Queue()
+        progress_bar = threading.Thread(
+            target=_display_progress_bar, args=(queue, len(coasts) * len(water_locs))
+        )
+        progress_bar.start()
+
+        # Getting all paths for each coasts in parallel (except if the map is large, to avoid high memory usage)
+        nb_cores = nb_cores or (
+            multiprocessing.cpu_count()
+            if (len(water_locs) <= 30 or max_convoy_length <= MAX_CONVOY_LENGTH)
+            else 1
+        )
+        with multiprocessing.Pool(nb_cores) as pool:
+            tasks = [(map_object, coast, max_convoy_length, queue) for coast in coasts]
+            results = pool.starmap(_get_convoy_paths, tasks)
+        queue.put(None)
+        progress_bar.join()
     results = [item for sublist in results for item in sublist]
-    queue.put(None)
-    progress_bar.join()
 
     # Splitting into buckets
     buckets = collections.OrderedDict({i: [] for i in range(1, len(map_object.locs) + 1)})
@@ -224,6 +267,220 @@ def get_file_md5(file_path):
     return hash_md5.hexdigest()
 
 
+def get_map_path(map_name):
+    """Return path to the map file for given map name (or full path to a map file),
+    or None if map file does not exist.
+    """
+    if os.path.exists(map_name):
+        return map_name
+    map_path = os.path.join(settings.PACKAGE_DIR, "maps", map_name + ".map")
+    return map_path if os.path.exists(map_path) else None
+
+
+def get_cache_file_path(cache_dir, map_path, map_hash):
+    """Return path to the cache file for given map in given cache directory
+
+    :param cache_dir: The cache directory
+    :param map_path: The path to the map file
+    :param map_hash: The md5 hash of the map file
+    """
+    map_name = os.path.splitext(os.path.basename(map_path))[0]
+    return os.path.join(cache_dir, "%s-%s.pkl" % (map_name, map_hash))
+
+
+def _load_cache_file(cache_path, map_hash):
+    """Load convoy paths from a cache file
+
+    :param cache_path: The path to the cache file
+    :param map_hash: The expected md5 hash of the map file
+    :return: The convoy paths, or None if cache file does not exist or is invalid or outdated.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as file:
+            cache_data = pickle.load(file)
+    except (pickle.UnpicklingError, EOFError, OSError):
+        return None
+    if cache_data.get("__version__", "") != __VERSION__:
+        LOGGER.info(
+            'Ignoring convoy paths cache "%s" with version "%s" (expected "%s").',
+            cache_path,
+            cache_data.get("__version__", "<N/A>"),
+            __VERSION__,
+        )
+        return None
+    if cache_data.get("map_hash") != map_hash:
+        return None
+    return cache_data["convoy_paths"]
+
+
+def _save_cache_file(cache_path, map_path, map_hash, convoy_paths):
+    """Save convoy paths to a cache file (file is replaced atomically)
+
+    :param cache_path: The path to the cache file
+    :param map_path: The path to the map file
+    :param map_hash: The md5 hash of the map file
+    :param convoy_paths: The convoy paths for the map
+    """
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_data = {
+        "__version__": __VERSION__,
+        "map_name": os.path.splitext(os.path.basename(map_path))[0],
+        "map_hash": map_hash,
+        "convoy_paths": convoy_paths,
+    }
+    temp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+    try:
+        with open(temp_path, "wb") as file:
+            pickle.dump(cache_data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _try_save_cache_file(cache_path, map_path, map_hash, convoy_paths):
+    """Save convoy paths to a cache file, logging a warning if cache file cannot be written
+    (e.g. read-only cache directory). Return True if cache file was saved.
+    """
+    try:
+        _save_cache_file(cache_path, map_path, map_hash, convoy_paths)
+        return True
+    except OSError as exc:
+        LOGGER.warning("Unable to save convoy paths cache %s: %s", cache_path, exc)
+        return False
+
+
+def _get_legacy_migrated_paths():
+    """Return paths to marker files indicating that legacy caches were already split into cache files."""
+    return [
+        os.path.join(cache_dir, LEGACY_MIGRATED_FILE_NAME)
+        for cache_dir in (INTERNAL_CACHE_DIR, EXTERNAL_CACHE_DIR)
+    ]
+
+
+def _load_legacy_caches():
+    """Load legacy caches (single file for all maps) once, and split them into cache files
+    for all known maps (maps in package directory). Legacy caches are then marked as migrated
+    and will not be loaded again.
+
+    :return: A dictionary of convoy paths not saved in cache files (unknown maps, or cache files
+        which could not be written), with map file hash as key.
+    """
+    global LEGACY_CONVOY_PATHS
+    if LEGACY_CONVOY_PATHS is not None:
+        return LEGACY_CONVOY_PATHS
+    LEGACY_CONVOY_PATHS = {}
+    legacy_cache_paths = [
+        path
+        for path in collections.OrderedDict.fromkeys((EXTERNAL_CACHE_PATH, INTERNAL_CACHE_PATH))
+        if os.path.exists(path)
+    ]
+    if not legacy_cache_paths or any(os.path.exists(path) for path in _get_legacy_migrated_paths()):
+        return LEGACY_CONVOY_PATHS
+
+    # Internal cache has priority over external cache.
+    for legacy_cache_path in legacy_cache_paths:
+        try:
+            with open(legacy_cache_path, "rb") as file:
+                cache_data = pickle.load(file)
+        except (pickle.UnpicklingError, EOFError, OSError):
+            continue
+        if cache_data.get("__version__", "") == __VERSION__:
+            LEGACY_CONVOY_PATHS.update(
+                (map_hash, paths)
+                for map_hash, paths in cache_data.items()
+                if map_hash != "__version__"
+            )
+
+    # Splitting into cache files. Maps which already have a cache file are skipped.
+    migrated = True
+    for map_path in glob.glob(os.path.join(settings.PACKAGE_DIR, "maps", "*.map")):
+        map_hash = get_file_md5(map_path)
+        convoy_paths = LEGACY_CONVOY_PATHS.pop(map_hash, None)
+        if convoy_paths is None or any(
+            os.path.exists(get_cache_file_path(cache_dir, map_path, map_hash))
+            for cache_dir in (INTERNAL_CACHE_DIR, EXTERNAL_CACHE_DIR)
+        ):
+            continue
+        if not _try_save_cache_file(
+            get_cache_file_path(EXTERNAL_CACHE_DIR, map_path, map_hash),
+            map_path,
+            map_hash,
+            convoy_paths,
+        ):
+            # Kept in memory only.
+            LEGACY_CONVOY_PATHS[map_hash] = convoy_paths
+            migrated = False
+
+    if migrated:
+        migrated_path = os.path.join(EXTERNAL_CACHE_DIR, LEGACY_MIGRATED_FILE_NAME)
+        try:
+            os.makedirs(EXTERNAL_CACHE_DIR, exist_ok=True)
+            with open(migrated_path, "w") as file:
+                file.write("\n".join(legacy_cache_paths))
+        except OSError as exc:
+            LOGGER.warning("Unable to mark legacy convoy paths caches as migrated: %s", exc)
+    return LEGACY_CONVOY_PATHS
+
+
+def load_convoy_paths(map_name, max_convoy_length=MAX_CONVOY_LENGTH, build=True, map_object=None):
+    """Return convoy paths for a map, from memory or disk cache.
+    If map is not in cache, convoy paths are generated and saved in the external cache directory.
+
+    :param map_name: The name of the map (or full path to a map file)
+    :param max_convoy_length: The maximum convoy length permitted
+    :param build: If False, returns None instead of generating convoy paths missing from cache.
+    :param map_object: (optional) The instantiated map, used to generate convoy paths if needed.
+    :return: The convoy paths for that map, or None if map file does not exist.
+    :type map_object: diplomacy.Map
+    """
+    map_path = get_map_path(map_name)
+    if map_path is None:
+        return None
+    map_hash = get_file_md5(map_path)
+    if map_hash in CONVOYS_PATH_CACHE:
+        return CONVOYS_PATH_CACHE[map_hash]
+
+    # Loading from cache files
+    convoy_paths = None
+    for cache_dir in (INTERNAL_CACHE_DIR, EXTERNAL_CACHE_DIR):
+        convoy_paths = _load_cache_file(
+            get_cache_file_path(cache_dir, map_path, map_hash), map_hash
+        )
+        if convoy_paths is not None:
+            break
+
+    # Otherwise, migrating legacy caches if not yet done (map cache file may then exist)
+    if convoy_paths is None and LEGACY_CONVOY_PATHS is None:
+        _load_legacy_caches()
+        convoy_paths = _load_cache_file(
+            get_cache_file_path(EXTERNAL_CACHE_DIR, map_path, map_hash), map_hash
+        )
+
+    # Otherwise, using legacy caches not saved in cache files, or generating
+    if convoy_paths is None:
+        convoy_paths = LEGACY_CONVOY_PATHS.pop(map_hash, None)
+        if convoy_paths is None:
+            if not build:
+                return None
+            convoy_paths = _build_convoy_paths_cache(
+                map_object or Map(map_path, use_cache=False), max_convoy_length
+            )
+        # If cache file cannot be written, convoy paths are only kept in memory.
+        _try_save_cache_file(
+            get_cache_file_path(EXTERNAL_CACHE_DIR, map_path, map_hash),
+            map_path,
+            map_hash,
+            convoy_paths,
+        )
+
+    CONVOYS_PATH_CACHE[map_hash] = convoy_paths
+    return convoy_paths
+
+
 def add_to_cache(map_name, max_convoy_length=MAX_CONVOY_LENGTH):
     """Lazy generates convoys paths for a map and adds it to the disk cache
 
@@ -231,104 +488,101 @@ def add_to_cache(map_name, max_convoy_length=MAX_CONVOY_LENGTH):
     :param max_convoy_length: The maximum convoy length permitted
     :return: The convoy_paths for that map
     """
-    convoy_paths = {"__version__": __VERSION__}  # Uses hash as key
-    external_convoy_paths = {"__version__": __VERSION__}  # Uses hash as key
+    return load_convoy_paths(map_name, max_convoy_length)
 
-    # Loading from internal cache first
-    if os.path.exists(INTERNAL_CACHE_PATH):
-        try:
-            with open(INTERNAL_CACHE_PATH, "rb") as file:
-                cache_data = pickle.load(file)
-            if cache_data.get("__version__", "") == __VERSION__:
-                convoy_paths.update(cache_data)
-        except (pickle.UnpicklingError, EOFError):
-            pass
 
-    # Loading external cache
-    if os.path.exists(EXTERNAL_CACHE_PATH):
-        try:
-            with open(EXTERNAL_CACHE_PATH, "rb") as file:
-                cache_data = pickle.load(file)
-            if cache_data.get("__version__", "") != __VERSION__:
-                print(
-                    'Upgrading cache from "%s" to "%s"'
-                    % (cache_data.get("__version__", "<N/A>"), __VERSION__)
-                )
-            else:
-                convoy_paths.update(cache_data)
-                external_convoy_paths.update(cache_data)
-        except (pickle.UnpicklingError, EOFError):
-            pass
-
-    # Getting map MD5 hash
-    if os.path.exists(map_name):
-        map_path = map_name
-    else:
-        map_path = os.path.join(settings.PACKAGE_DIR, "maps", map_name + ".map")
-    if not os.path.exists(map_path):
-        return None
+def _build_cache_file(map_path, max_convoy_length, cache_dir):
+    """Generates convoy paths for a map and saves them to a cache file (run in a worker process)
+
+    :param map_path: The path to the map file
+    :param max_convoy_length: The maximum convoy length permitted
+    :param cache_dir: The directory where to save cache file
+    :return: The path to the cache file
+    """
     map_hash = get_file_md5(map_path)
+    convoy_paths = _build_convoy_paths_cache(
+        Map(map_path, use_cache=False), max_convoy_length, nb_cores=1
+    )
+    cache_path = get_cache_file_path(cache_dir, map_path, map_hash)
+    _save_cache_file(cache_path, map_path, map_hash, convoy_paths)
+    return cache_path
+
+
+def build_convoy_paths_caches(
+    map_names=None,
+    nb_processes=None,
+    force=False,
+    max_convoy_length=MAX_CONVOY_LENGTH,
+    cache_dir=None,
+):
+    """Generates convoy paths cache files for many maps, one map per process
+
+    :param map_names: (optional) list of map names or paths to map files. Defaults to all maps in package.
+    :param nb_processes: (optional) number of processes to use. Defaults to number of CPUs.
+    :param force: If True, regenerates convoy paths even for maps already in cache.
+    :param max_convoy_length: The maximum convoy length permitted
+    :param cache_dir: (optional) directory where to save cache files. Defaults to external cache directory.
+    :return: A dictionary with map paths as keys and cache file paths as values, for generated maps
+    """
+    cache_dir = cache_dir or EXTERNAL_CACHE_DIR
+    if map_names is None:
+        map_names = sorted(glob.glob(os.path.join(settings.PACKAGE_DIR, "maps", "*.map")))
+
+    # Finding maps to generate
+    map_paths = []
+    for map_name in map_names:
+        map_path = get_map_path(map_name)
+        if map_path is None:
+            LOGGER.warning("Unable to find map %s", map_name)
+            continue
+        map_hash = get_file_md5(map_path)
+        if not force and any(
+            _load_cache_file(get_cache_file_path(directory, map_path, map_hash), map_hash)
+            is not None
+            for directory in (INTERNAL_CACHE_DIR, EXTERNAL_CACHE_DIR, cache_dir)
+        ):
+            continue
+        map_paths.append(map_path)
+    if not map_paths:
+        return {}
+
+    # Generating maps in parallel (modules only needed when building caches)
+    import multiprocessing
+    import tqdm
+
+    nb_processes = min(nb_processes or multiprocessing.cpu_count(), len(map_paths))
+    tasks = [(map_path, max_convoy_length, cache_dir) for map_path in map_paths]
+    if nb_processes == 1:
+        cache_paths = [_build_cache_file(*task) for task in tqdm.tqdm(tasks)]
+    else:
+        with multiprocessing.Pool(nb_processes) as pool:
+            cache_paths = list(
+                tqdm.tqdm(pool.imap(_star_build_cache_file, tasks), total=len(tasks))
+            )
+    return dict(zip(map_paths, cache_paths))
 
-    # Generating and adding to alternate cache paths
-    if map_hash not in convoy_paths:
-        map_object = Map(map_name, use_cache=False)
-        convoy_paths[map_hash] = _build_convoy_paths_cache(map_object, max_convoy_length)
-        external_convoy_paths[map_hash] = convoy_paths[map_hash]
-        os.makedirs(os.path.dirname(EXTERNAL_CACHE_PATH), exist_ok=True)
-        with open(EXTERNAL_CACHE_PATH, "wb") as file:
-            pickle.dump(external_convoy_paths, file)
 
-    # Returning
-    return convoy_paths[map_hash]
+def _star_build_cache_file(task):
+    """Calls _build_cache_file() with arguments from given tuple (for multiprocessing.Pool.imap())"""
+    return _build_cache_file(*task)
 
 
 def get_convoy_paths_cache():
-    """Returns the current cache from disk"""
-    disk_convoy_paths = {}  # Uses hash as key
-    cache_convoy_paths = {}  # Use map name as key
+    """Returns the convoy paths of all maps in package that are in disk cache (without generating missing maps)
 
-    # Loading from internal cache first
-    if os.path.exists(INTERNAL_CACHE_PATH):
-        try:
-            with open(INTERNAL_CACHE_PATH, "rb") as file:
-                cache_data = pickle.load(file)
-            if cache_data.get("__version__", "") == __VERSION__:
-                disk_convoy_paths.update(cache_data)
-        except (pickle.UnpicklingError, EOFError):
-            pass
-
-    # Loading external cache
-    if os.path.exists(EXTERNAL_CACHE_PATH):
-        try:
-            with open(EXTERNAL_CACHE_PATH, "rb") as file:
-                cache_data = pickle.load(file)
-            if cache_data.get("__version__", "") == __VERSION__:
-                disk_convoy_paths.update(cache_data)
-        except (pickle.UnpicklingError, EOFError):
-            pass
-
-    # Getting map name and file paths
-    files_path = glob.glob(settings.PACKAGE_DIR + "/maps/*.map")
-    for file_path in files_path:
-        map_name = file_path.replace(settings.PACKAGE_DIR + "/maps/", "").replace(".map", "")
-        map_hash = get_file_md5(file_path)
-        if map_hash in disk_convoy_paths:
-            cache_convoy_paths[map_name] = disk_convoy_paths[map_hash]
-            cache_convoy_paths[file_path] = disk_convoy_paths[map_hash]
-
-    # Returning
+    :return: A dictionary with map names and map file paths as keys, and convoy paths as values
+    """
+    cache_convoy_paths = {}  # Use map name as key
+    for file_path in glob.glob(os.path.join(settings.PACKAGE_DIR, "maps", "*.map")):
+        map_name = os.path.splitext(os.path.basename(file_path))[0]
+        convoy_paths = load_convoy_paths(file_path, build=False)
+        if convoy_paths is not None:
+            cache_convoy_paths[map_name] = convoy_paths
+            cache_convoy_paths[file_path] = convoy_paths
     return cache_convoy_paths
 
 
 def rebuild_all_maps():
     """Rebuilds all the maps in the external cache"""
-    if os.path.exists(EXTERNAL_CACHE_PATH):
-        os.remove(EXTERNAL_CACHE_PATH)
-
-    files_path = glob.glob(settings.PACKAGE_DIR + "/maps/*.map")
-    for file_path in files_path:
-        map_name = file_path.replace(settings.PACKAGE_DIR + "/maps/", "").replace(".map", "")
-        map_hash = get_file_md5(file_path)
-        print("-" * 80)
-        print("Adding {} (Hash: {}) to cache\n".format(file_path, map_hash))
-        add_to_cache(map_name)
+    CONVOYS_PATH_CACHE.clear()
+    build_convoy_paths_caches(force=True)
@@ -0,0 +1,296 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Helper class to store a sorted history of dictionaries as deltas between consecutive values.
+
+A delta-encoded entry is a dictionary with a single key DELTA associated to a delta dictionary
+with following optional fields:
+
+- **set**: {key => new value} for keys added or replaced.
+- **del**: [key] for keys removed.
+- **sub**: {key => nested delta} for dictionary values partially updated.
+- **ext**: {key => list of new items} for list values only extended
+  (only generated if compute_delta() is called with extend_lists=True).
+
+Full (non-delta) entries are called keyframes.
+"""
+from diplomacy.utils import exceptions
+from diplomacy.utils.sorted_dict import SortedDict
+
+DELTA = "__delta__"
+DEFAULT_KEYFRAME_INTERVAL = 12
+
+
+def is_delta(value):
+    """Return True if given value is a delta-encoded entry."""
+    return isinstance(value, dict) and DELTA in value
+
+
+def compute_delta(previous, current, extend_lists=False):
+    """Return a delta dictionary to convert previous dictionary into current dictionary.
+
+    :param previous: previous dictionary
+    :param current: current dictionary
+    :param extend_lists: if True, lists which only got new items at the end are stored
+        as the list of new items (e.g. to journal a list of messages).
+    :return: a delta dictionary such that ``apply_delta(previous, delta) == current``.
+    """
+    changed, nested, extended = {}, {}, {}
+    removed = [key for key in previous if key not in current]
+    for key, value in current.items():
+        if key in previous:
+            previous_value = previous[key]
+            if previous_value == value:
+                continue
+            if isinstance(previous_value, dict) and isinstance(value, dict):
+                nested[key] = compute_delta(previous_value, value, extend_lists)
+                continue
+            if (
+                extend_lists
+                and isinstance(previous_value, list)
+                and isinstance(value, list)
+                and previous_value
+                and value[: len(previous_value)] == previous_value
+            ):
+                extended[key] = value[len(previous_value) :]
+                continue
+        changed[key] = value
+    delta = {}
+    if changed:
+        delta["set"] = changed
+    if removed:
+        delta["del"] = removed
+    if nested:
+        delta["sub"] = nested
+    if extended:
+        delta["ext"] = extended
+    return delta
+
+
+def apply_delta(previous, delta):
+    """Return a new dictionary built by applying given delta to previous dictionary.
+    Previous dictionary is not modified. Unchanged values are shared with previous dictionary.
+    """
+    current = dict(previous)
+    for key in delta.get("del", ()):
+        current.pop(key, None)
+    for key, nested_delta in delta.get("sub", {}).items():
+        current[key] = apply_delta(previous[key], nested_delta)
+    for key, items in delta.get("ext", {}).items():
+        current[key] = previous[key] + items
+    current.update(delta.get("set", {}))
+    return current
+
+
+def decode_history(items):
+    """Rebuild full values from a sequence of (key, entry) couples sorted by key,
+    where entries are either full dictionaries or delta-encoded entries.
+
+    :param items: iterable of (key, entry) couples.
+    :return: a generator of (key, full value) couples.
+    """
+    previous = None
+    for key, value in items:
+        if is_delta(value):
+            if previous is None:
+                raise exceptions.DiplomacyException(
+                    "History entry %s is a delta without previous keyframe." % key
+                )
+            value = apply_delta(previous, value[DELTA])
+        previous = value
+        yield key, value
+
+
+class DeltaHistory(SortedDict):
+    """Sorted dict of dictionaries where each value is stored as a delta against previous value.
+
+    A full value (keyframe) is stored every `keyframe_interval` entries, so that accessing
+    any value requires to apply at most `keyframe_interval - 1` deltas. Values are rebuilt lazily
+    on access, and share unchanged sub-values with previous values: they must be handled as read-only.
+
+    Adding a value after the greatest key (i.e. appending a new phase) is cheap.
+    Adding or removing a value anywhere else re-encodes the whole history.
+    """
+
+    __slots__ = ["__keyframe_interval", "__last_value"]
+
+    def __init__(self, key_type, kwargs=None, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        """Initialize a delta history.
+
+        :param key_type: expected type for keys.
+        :param kwargs: (optional) dictionary-like object: initial values for history.
+            Values must be either all full dictionaries, or entries encoded by another
+            delta history (e.g. as returned by method encoded_items()).
+        :param keyframe_interval: number of entries between two keyframes.
+        """
+        if keyframe_interval < 1:
+            raise exceptions.NaturalIntegerException(
+                "Keyframe interval must be a positive integer."
+            )
+        self.__keyframe_interval = keyframe_interval
+        self.__last_value = None
+        super(DeltaHistory, self).__init__(key_type, dict)
+        if kwargs:
+            entries = SortedDict(key_type, dict, kwargs)
+            if any(is_delta(value) for value in entries.values()):
+                # Entries were already encoded by a delta history: keep them as is.
+                if is_delta(entries.first_value()):
+                    raise exceptions.DiplomacyException("Delta history must start with a keyframe.")
+                for key, value in entries.items():
+                    SortedDict.put(self, key, value)
+            else:
+                for key, value in entries.items():
+                    self.put(key, value)
+
+    @property
+    def keyframe_interval(self):
+        """Get number of entries between two keyframes."""
+        return self.__keyframe_interval
+
+    def __str__(self):
+        return "DeltaHistory{%s}" % ", ".join("%s:%s" % (k, v) for k, v in self.items())
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self._value_at(self._position(key))
+
+    def get(self, key, default=None):
+        """Return value associated with key, or default value if key not found."""
+        return self[key] if key in self else default
+
+    def put(self, key, value):
+        """Add a key with a value to the history."""
+        if not isinstance(value, dict) or is_delta(value):
+            raise TypeError("Expected a full dictionary value, got %s" % type(value))
+        if not self:
+            SortedDict.put(self, key, value)
+        elif self.last_key() < key:
+            distance = 0
+            for distance, (_, entry) in enumerate(SortedDict.reversed_items(self), start=1):
+                if not is_delta(entry):
+                    break
+            if distance >= self.__keyframe_interval:
+                SortedDict.put(self, key, value)
+            else:
+                SortedDict.put(self, key, {DELTA: compute_delta(self.last_value(), value)})
+        else:
+            items = [(k, v) for k, v in self.items() if k != key]
+            items.append((key, value))
+            self._reset(sorted(items, key=lambda item: item[0]))
+            return
+        self.__last_value = value
+
+    def remove(self, key):
+        """Pop (remove and return) value associated with given key, or None if key not found."""
+        if key not in self:
+            return None
+        value = self[key]
+        if key == self.last_key():
+            SortedDict.remove(self, key)
+            self.__last_value = None
+        else:
+            self._reset([(k, v) for k, v in self.items() if k != key])
+        return value
+
+    def first_value(self):
+        """Get the value associated to lowest key in the dict."""
+        return SortedDict.first_value(self)
+
+    def last_value(self):
+        """Get the value associated to highest key in the dict."""
+        if self.__last_value is None:
+            self.__last_value = self._value_at(len(self) - 1)
+        return self.__last_value
+
+    def last_item(self):
+        """Get the item (key-value pair) for the highest key in the dict."""
+        return self.last_key(), self.last_value()
+
+    def values(self):
+        """Get an iterator to the values in the dict."""
+        return (value for _, value in self.items())
+
+    def reversed_values(self):
+        """Get an iterator to the values in the dict in reversed order or keys."""
+        return (value for _, value in self.reversed_items())
+
+    def items(self):
+        """Get an iterator to the items in the dict."""
+        return self._decoded_items(0, len(self) - 1)
+
+    def reversed_items(self):
+        """Get an iterator to the items in the dict in reversed order of keys.
+        Values are rebuilt one keyframe block at a time.
+        """
+        position = len(self) - 1
+        while position >= 0:
+            keyframe_position = self._keyframe_position(position)
+            yield from reversed(list(self._decoded_items(keyframe_position, position)))
+            position = keyframe_position - 1
+
+    def encoded_items(self):
+        """Get an iterator to the items in the dict with values as stored (full or delta-encoded)."""
+        return SortedDict.items(self)
+
+    def sub(self, key_from=None, key_to=None):
+        """Return a list of values associated to keys between key_from and key_to
+        (both bounds included). See SortedDict.sub() for details.
+        """
+        position_from, position_to = self._get_keys_interval(key_from, key_to)
+        return [value for _, value in self._decoded_items(position_from, position_to)]
+
+    def clear(self):
+        """Remove all items from dict."""
+        SortedDict.clear(self)
+        self.__last_value = None
+
+    def _reset(self, items):
+        """Clear history and fill it with given (key, full value) couples sorted by key."""
+        self.clear()
+        for key, value in items:
+            self.put(key, value)
+
+    def _position(self, key):
+        """Return position of given key in history."""
+        return self._get_keys_interval(key, key)[0]
+
+    def _value_at(self, position):
+        """Return full value at given position."""
+        value = None
+        for _, value in self._decoded_items(position, position):
+            pass
+        return value
+
+    def _decoded_items(self, position_from, position_to):
+        """Return a generator of (key, full value) couples for positions in closed interval
+        [position_from; position_to]. Decoding starts from the closest keyframe.
+        """
+        if position_from > position_to:
+            return
+        keyframe_position = self._keyframe_position(position_from)
+        decoded = decode_history(
+            self._item_at(position) for position in range(keyframe_position, position_to + 1)
+        )
+        for position, (key, value) in enumerate(decoded, start=keyframe_position):
+            if position >= position_from:
+                yield key, value
+
+    def _keyframe_position(self, position):
+        """Return position of the closest keyframe at or before given position."""
+        while is_delta(self._item_at(position)[1]):
+            position -= 1
+        return position
@@ -19,10 +19,11 @@ from diplomacy.engine.message import Message
 from diplomacy.engine.log import Log
 from diplomacy.utils import common, strings, parsing
 from diplomacy.utils.jsonable import Jsonable
+from diplomacy.utils.message_store import MessageStore
 from diplomacy.utils.sorted_dict import SortedDict
 
 MESSAGES_TYPE = parsing.IndexedSequenceType(
-    parsing.DictType(int, parsing.JsonableClassType(Message), SortedDict.builder(int, Message)),
+    parsing.DictType(int, parsing.JsonableClassType(Message), MessageStore.builder(int, Message)),
     "time_sent",
 )
 LOGS_TYPE = parsing.IndexedSequenceType(
@@ -40,20 +40,58 @@ Example:
             # my_attribute is now initialized based on model.
             # You can then do any further initialization if needed.
 
+Each Jsonable class compiles its model once (see Jsonable.get_compiled_model()) into functions
+used to validate, update, encode and decode attributes.
+
+Objects built by the program itself from already-checked values can skip validation
+by being created inside a ``trusted()`` context:
+
+.. code-block:: python
+
+    with trusted():
+        my_object = MyClass(my_attribute=[1, 2, 3])
+
 """
+import contextlib
 import logging
+import threading
+
 import ujson as json
 
 from diplomacy.utils import exceptions, parsing
 
 LOGGER = logging.getLogger(__name__)
 
+# Thread-local context:
+# - depth: counter of nested trusted() contexts.
+# - decoded: couple (class, decoded values) set by Jsonable.from_dict() while building an object.
+_CONTEXT = threading.local()
+
+
+@contextlib.contextmanager
+def trusted():
+    """Context manager to build Jsonable objects without validating given values.
+    Values are still updated (e.g. default values are set and collections are built).
+    To be used only for objects built from values that are known to match class models.
+    """
+    _CONTEXT.depth = getattr(_CONTEXT, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _CONTEXT.depth -= 1
+
+
+def is_trusted():
+    """Return True if Jsonable objects are currently built in a trusted() context."""
+    return getattr(_CONTEXT, "depth", 0) > 0
+
 
 class Jsonable:
     """Abstract class to ease conversion from/to JSON dict."""
 
     __slots__ = []
     __cached__models__ = {}
+    __compiled__models__ = {}
     model = {}
 
     def __init__(self, **kwargs):
@@ -65,23 +103,33 @@ class Jsonable:
 
         :param kwargs: arguments to build class. Must match keys and values types defined in model.
         """
-        model = self.get_model()
-
-        # Adding default value
-        updated_kwargs = {model_key: None for model_key in model}
-        updated_kwargs.update(kwargs)
-
-        # Validating and updating
-        try:
-            parsing.validate_data(updated_kwargs, model)
-        except exceptions.TypeException as exception:
-            LOGGER.error("Error occurred while building class %s", self.__class__)
-            raise exception
-        updated_kwargs = parsing.update_data(updated_kwargs, model)
-
-        # Building.
-        for model_key in model:
-            setattr(self, model_key, updated_kwargs[model_key])
+        compiled_model = self.get_compiled_model()
+
+        # Values decoded by from_dict() are already updated.
+        decoded_class, decoded_values = getattr(_CONTEXT, "decoded", None) or (None, {})
+        if decoded_class is type(self):
+            _CONTEXT.decoded = None
+        else:
+            decoded_values = {}
+
+        # Validating.
+        if not is_trusted():
+            for model_key, model_type, _, _, _ in compiled_model:
+                try:
+                    model_type.validate(kwargs.get(model_key, None))
+                except exceptions.TypeException as exception:
+                    LOGGER.error("Error occurred while checking key %s", model_key)
+                    LOGGER.error("Error occurred while building class %s", self.__class__)
+                    raise exception
+
+        # Updating and building.
+        for model_key, _, updater, _, _ in compiled_model:
+            value = kwargs.get(model_key, None)
+            if updater is not None and (
+                model_key not in decoded_values or decoded_values[model_key] is not value
+            ):
+                value = updater(value)
+            setattr(self, model_key, value)
 
     def json(self):
         """Convert this object to a JSON string ready to be sent/saved.
@@ -95,9 +143,9 @@ class Jsonable:
 
         :return: dict
         """
-        model = self.get_model()
         return {
-            key: parsing.to_json(getattr(self, key), key_type) for key, key_type in model.items()
+            key: getattr(self, key) if encoder is None else encoder(getattr(self, key))
+            for key, _, _, _, encoder in self.get_compiled_model()
         }
 
     @classmethod
@@ -119,24 +167,27 @@ class Jsonable:
         :return: an instance from this class or from a derived one from which it's called.
         :rtype: cls
         """
-        model = cls.get_model()
+        compiled_model = cls.get_compiled_model()
 
         # json_dict must be a a dictionary
         if not isinstance(json_dict, dict):
             raise exceptions.TypeException(dict, type(json_dict))
 
         # By default, we set None for all expected keys
-        default_json_dict = {key: None for key in model}
-        default_json_dict.update(json_dict)
+        default_json_dict = json_dict.copy()
         cls.update_json_dict(json_dict)
 
         # Building this object
         # NB: We don't care about extra keys in provided dict, we just focus on expected keys, nothing more.
-        kwargs = {
-            key: parsing.to_type(default_json_dict[key], key_type)
-            for key, key_type in model.items()
-        }
-        return cls(**kwargs)
+        kwargs = {}
+        for key, _, _, decoder, _ in compiled_model:
+            value = default_json_dict.get(key, None)
+            kwargs[key] = value if decoder is None else decoder(value)
+        _CONTEXT.decoded = (cls, kwargs)
+        try:
+            return cls(**kwargs)
+        finally:
+            _CONTEXT.decoded = None
 
     @classmethod
     def build_model(cls):
@@ -155,3 +206,29 @@ class Jsonable:
         if cls not in cls.__cached__models__:
             cls.__cached__models__[cls] = cls.build_model()
         return cls.__cached__models__[cls]
+
+    @classmethod
+    def get_compiled_model(cls):
+        """Return model associated to current class compiled into a list of tuples
+        (key, parser type, updater, decoder, encoder), and cache it for future uses.
+        Updater, decoder and encoder are functions equivalent to parser type methods
+        update(), to_type() and to_json(), or None if values don't need conversion
+        (see ParserType.get_updater(), ParserType.get_decoder() and ParserType.get_encoder()).
+
+        :return: list
+        """
+        if cls not in cls.__compiled__models__:
+            compiled_model = []
+            for key, key_type in cls.get_model().items():
+                parser_type = parsing.get_type(key_type)
+                compiled_model.append(
+                    (
+                        key,
+                        parser_type,
+                        parser_type.get_updater(),
+                        parser_type.get_decoder(),
+                        parser_type.get_encoder(),
+                    )
+                )
+            cls.__compiled__models__[cls] = compiled_model
+        return cls.__compiled__models__[cls]
@@ -0,0 +1,194 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Helper class to store game messages sorted by timestamps, with indexes
+allowing to quickly retrieve messages visible by a game role.
+
+Messages timestamps are indexed in sorted buckets:
+
+- **public**: global messages without type, visible by everyone.
+- **senders**: {power name => timestamps of messages sent by this power}.
+- **recipients**: {recipient name => timestamps of messages sent to this recipient}.
+- **advice**: {power name => timestamps of suggestion messages for this power}.
+  Suggestion recipient is read from message body once, when message is added.
+"""
+import bisect
+
+import ujson as json
+
+from diplomacy.engine.message import Message, OBSERVER
+from diplomacy.utils import strings
+from diplomacy.utils.sorted_dict import SortedDict
+
+
+def get_advice_recipient(message):
+    """Return recipient of given suggestion message, or None if message is not a suggestion
+    or if its body does not contain a recipient.
+    """
+    if message.type not in strings.ALL_SUGGESTION_TYPES:
+        return None
+    try:
+        return json.loads(message.message).get("recipient")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _insert(bucket, timestamp):
+    """Insert timestamp into given sorted bucket (list of timestamps)."""
+    if not bucket or bucket[-1] < timestamp:
+        bucket.append(timestamp)
+    else:
+        position = bisect.bisect_left(bucket, timestamp)
+        if position == len(bucket) or bucket[position] != timestamp:
+            bucket.insert(position, timestamp)
+
+
+def _discard(bucket, timestamp):
+    """Remove timestamp from given sorted bucket, if found."""
+    position = bisect.bisect_left(bucket, timestamp)
+    if position != len(bucket) and bucket[position] == timestamp:
+        del bucket[position]
+
+
+def _sub_bucket(bucket, key_from, key_to):
+    """Return timestamps from given sorted bucket in closed interval [key_from; key_to].
+    None bounds are ignored.
+    """
+    position_from = 0 if key_from is None else bisect.bisect_left(bucket, key_from)
+    position_to = len(bucket) if key_to is None else bisect.bisect_right(bucket, key_to)
+    return bucket[position_from:position_to]
+
+
+class MessageStore(SortedDict):
+    """Sorted dict mapping message timestamps to messages, indexed by senders and recipients.
+
+    Role views (methods sub_for_observer() and sub_for_powers()) only visit visible messages,
+    so their cost depends on number of returned messages instead of number of stored messages.
+    Messages must not be modified once stored.
+    """
+
+    __slots__ = ["__public", "__senders", "__recipients", "__advice"]
+
+    def __init__(self, kwargs=None):
+        """Initialize a message store.
+
+        :param kwargs: (optional) dictionary-like object: initial messages for message store.
+        """
+        self.__public = []
+        self.__senders = {}
+        self.__recipients = {}
+        self.__advice = {}
+        super(MessageStore, self).__init__(int, Message, kwargs)
+
+    @staticmethod
+    def builder(key_type=int, val_type=Message):
+        """Return a function to build message stores from a dictionary-like object.
+        See SortedDict.builder(). Key and value types must be int and Message.
+        """
+        assert key_type is int and val_type is Message
+        return MessageStore
+
+    def __str__(self):
+        return "MessageStore{%s}" % ", ".join("%s:%s" % (k, v) for k, v in self.items())
+
+    def put(self, key, value):
+        """Add a message to the store."""
+        if key in self:
+            self.remove(key)
+        super(MessageStore, self).put(key, value)
+        for bucket in self._get_buckets(value, create=True):
+            _insert(bucket, key)
+
+    def remove(self, key):
+        """Pop (remove and return) message associated with given key, or None if key not found."""
+        value = super(MessageStore, self).remove(key)
+        if value is not None:
+            for bucket in self._get_buckets(value, create=False):
+                _discard(bucket, key)
+        return value
+
+    def clear(self):
+        """Remove all messages from store."""
+        super(MessageStore, self).clear()
+        self.__public.clear()
+        self.__senders.clear()
+        self.__recipients.clear()
+        self.__advice.clear()
+
+    def copy(self):
+        """Return a shallow copy of this message store (messages are not indexed again)."""
+        result = super(MessageStore, self).copy()
+        result.__public = list(self.__public)
+        result.__senders = {name: list(bucket) for name, bucket in self.__senders.items()}
+        result.__recipients = {name: list(bucket) for name, bucket in self.__recipients.items()}
+        result.__advice = {name: list(bucket) for name, bucket in self.__advice.items()}
+        return result
+
+    def sub_for_observer(self, key_from=None, key_to=None):
+        """Return list of messages visible by observers (global messages without type
+        and messages sent to observers) with keys between key_from and key_to (both bounds included).
+        """
+        return self._sub_buckets(
+            [self.__public, self.__recipients.get(OBSERVER, ())], key_from, key_to
+        )
+
+    def sub_for_powers(self, power_names, key_from=None, key_to=None):
+        """Return list of messages visible by given powers (global messages without type,
+        messages sent or received by any of given powers, and suggestions for any of given powers)
+        with keys between key_from and key_to (both bounds included).
+
+        :param power_names: sequence of power names.
+        """
+        buckets = [self.__public]
+        for power_name in power_names:
+            for index in (self.__senders, self.__recipients, self.__advice):
+                if power_name in index:
+                    buckets.append(index[power_name])
+        return self._sub_buckets(buckets, key_from, key_to)
+
+    def _get_buckets(self, message, create):
+        """Return list of buckets where given message should be indexed.
+
+        :param message: message to index.
+        :param create: if True, create missing buckets, else skip them.
+        """
+        names = [
+            (self.__senders, message.sender),
+            (self.__recipients, message.recipient),
+            (self.__advice, get_advice_recipient(message)),
+        ]
+        buckets = [self.__public] if message.is_global() and message.type is None else []
+        for index, name in names:
+            if name is not None:
+                if create:
+                    buckets.append(index.setdefault(name, []))
+                elif name in index:
+                    buckets.append(index[name])
+        return buckets
+
+    def _sub_buckets(self, buckets, key_from, key_to):
+        """Return list of messages from union of given buckets, in closed interval
+        [key_from; key_to], sorted by timestamps.
+        """
+        buckets = [bucket for bucket in buckets if bucket]
+        if len(buckets) == 1:
+            keys = _sub_bucket(buckets[0], key_from, key_to)
+        else:
+            keys = set()
+            for bucket in buckets:
+                keys.update(_sub_bucket(bucket, key_from, key_to))
+            keys = sorted(keys)
+        return [self[key] for key in keys]
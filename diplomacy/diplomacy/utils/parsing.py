@@ -27,6 +27,10 @@ Attribute value is a value used in Python code and expected by type checking. It
 a basic Python type, or a class instance. Note that not all classes are allowed (see
 other type checkers below).
 
+Each parser type can also be compiled into plain functions (see ParserType.get_encoder(),
+ParserType.get_decoder() and ParserType.get_updater()). Compiled functions resolve nested parser
+types once and skip values which don't need conversion. They are used by Jsonable classes.
+
 """
 import inspect
 import logging
@@ -199,6 +203,24 @@ class ParserType(metaclass=ABCMeta):
         # pylint: disable=no-self-use
         return raw_value
 
+    def get_updater(self):
+        """Return a function equivalent to method update(),
+        or None if update() returns values unchanged.
+        """
+        return None if type(self).update is ParserType.update else self.update
+
+    def get_decoder(self):
+        """Return a function equivalent to method to_type(),
+        or None if JSON values are used unchanged.
+        """
+        return None if type(self).to_type is ParserType.to_type else self.to_type
+
+    def get_encoder(self):
+        """Return a function equivalent to method to_json(),
+        or None if raw values are already JSON values.
+        """
+        return None if type(self).to_json is ParserType.to_json else self.to_json
+
 
 class ConverterType(ParserType):
     """Type checker that allows to use another parser type with a converter function.
@@ -235,6 +257,23 @@ class ConverterType(ParserType):
     def to_json(self, raw_value):
         return self.element_type.to_json(raw_value)
 
+    def get_updater(self):
+        converter_function = self.converter_function
+        element_updater = self.element_type.get_updater()
+        if element_updater is None:
+            return converter_function
+        return lambda element: element_updater(converter_function(element))
+
+    def get_decoder(self):
+        json_converter_function = self.json_converter_function
+        element_decoder = self.element_type.get_decoder()
+        if element_decoder is None:
+            return json_converter_function
+        return lambda json_value: element_decoder(json_converter_function(json_value))
+
+    def get_encoder(self):
+        return self.element_type.get_encoder()
+
 
 class DefaultValueType(ParserType):
     """Type checker that allows a default value."""
@@ -285,6 +324,45 @@ class DefaultValueType(ParserType):
             else self.element_type.to_json(raw_value)
         )
 
+    def get_updater(self):
+        element_updater = self.element_type.get_updater()
+        if self.default_json_value is None:
+            if element_updater is None:
+                return None
+            return lambda element: None if element is None else element_updater(element)
+        default_json_value = self.default_json_value
+        element_decoder = self.element_type.get_decoder() or (lambda json_value: json_value)
+        element_updater = element_updater or (lambda element: element)
+        return lambda element: (
+            element_decoder(default_json_value) if element is None else element_updater(element)
+        )
+
+    def get_decoder(self):
+        default_json_value = self.default_json_value
+        element_decoder = self.element_type.get_decoder()
+        if element_decoder is None:
+            if default_json_value is None:
+                return None
+            return lambda json_value: default_json_value if json_value is None else json_value
+        if default_json_value is None:
+            return lambda json_value: None if json_value is None else element_decoder(json_value)
+        return lambda json_value: element_decoder(
+            default_json_value if json_value is None else json_value
+        )
+
+    def get_encoder(self):
+        default_json_value = self.default_json_value
+        element_encoder = self.element_type.get_encoder()
+        if element_encoder is None:
+            if default_json_value is None:
+                return None
+            return lambda raw_value: copy(default_json_value) if raw_value is None else raw_value
+        if default_json_value is None:
+            return lambda raw_value: None if raw_value is None else element_encoder(raw_value)
+        return lambda raw_value: (
+            copy(default_json_value) if raw_value is None else element_encoder(raw_value)
+        )
+
 
 class OptionalValueType(DefaultValueType):
     """Type checker that allows None as default value."""
@@ -338,6 +416,29 @@ class SequenceType(ParserType):
     def to_json(self, raw_value):
         return [self.element_type.to_json(seq_element) for seq_element in raw_value]
 
+    def get_updater(self):
+        return self._get_builder_function(self.element_type.get_updater())
+
+    def get_decoder(self):
+        return self._get_builder_function(self.element_type.get_decoder())
+
+    def get_encoder(self):
+        element_encoder = self.element_type.get_encoder()
+        if element_encoder is None:
+            return list
+        return lambda raw_value: [element_encoder(seq_element) for seq_element in raw_value]
+
+    def _get_builder_function(self, element_function):
+        """Return a function converting each element of a sequence with given element function
+        (if not None) and then building the sequence with sequence builder.
+        """
+        sequence_builder = self.sequence_builder
+        if element_function is None:
+            return lambda sequence: sequence_builder(list(sequence))
+        return lambda sequence: sequence_builder(
+            [element_function(seq_element) for seq_element in sequence]
+        )
+
 
 class JsonableClassType(ParserType):
     """Type checker for Jsonable classes."""
@@ -369,6 +470,12 @@ class JsonableClassType(ParserType):
     def to_json(self, raw_value):
         return raw_value.to_dict()
 
+    def get_decoder(self):
+        return self.element_type.from_dict
+
+    def get_encoder(self):
+        return lambda raw_value: raw_value.to_dict()
+
 
 class StringableType(ParserType):
     """Type checker for a class that can be converted to a string with str(obj)
@@ -420,6 +527,12 @@ class StringableType(ParserType):
     def to_json(self, raw_value):
         return str(raw_value)
 
+    def get_decoder(self):
+        return self.element_type.from_string if self.use_from_string else self.element_type
+
+    def get_encoder(self):
+        return str
+
 
 class DictType(ParserType):
     """Type checking for dictionary-like objects."""
@@ -472,6 +585,35 @@ class DictType(ParserType):
             for key, value in raw_value.items()
         }
 
+    def get_updater(self):
+        return self._get_builder_function(self.key_type.get_updater(), self.val_type.get_updater())
+
+    def get_decoder(self):
+        return self._get_builder_function(self.key_type.get_decoder(), self.val_type.get_decoder())
+
+    def get_encoder(self):
+        key_encoder = self.key_type.get_encoder()
+        val_encoder = self.val_type.get_encoder()
+        if val_encoder is None:
+            return lambda raw_value: {key_encoder(key): value for key, value in raw_value.items()}
+        return lambda raw_value: {
+            key_encoder(key): val_encoder(value) for key, value in raw_value.items()
+        }
+
+    def _get_builder_function(self, key_function, val_function):
+        """Return a function converting keys and values of a dictionary with given functions
+        (if not None) and then building the dictionary with dict builder.
+        """
+        dict_builder = self.dict_builder
+        key_function = key_function or (lambda key: key)
+        if val_function is None:
+            return lambda dictionary: dict_builder(
+                {key_function(key): value for key, value in dictionary.items()}
+            )
+        return lambda dictionary: dict_builder(
+            {key_function(key): val_function(value) for key, value in dictionary.items()}
+        )
+
 
 class IndexedSequenceType(ParserType):
     """Parser for objects stored as dictionaries in memory and saved as lists in JSON."""
@@ -511,6 +653,21 @@ class IndexedSequenceType(ParserType):
             {getattr(element, self.key_name): element for element in loaded_sequence}
         )
 
+    def get_updater(self):
+        return self.dict_type.get_updater()
+
+    def get_decoder(self):
+        key_name = self.key_name
+        sequence_decoder = self.sequence_type.get_decoder()
+        dict_updater = self.dict_type.get_updater()
+        return lambda json_value: dict_updater(
+            {getattr(element, key_name): element for element in sequence_decoder(json_value)}
+        )
+
+    def get_encoder(self):
+        sequence_encoder = self.sequence_type.get_encoder()
+        return lambda raw_value: sequence_encoder(raw_value.values())
+
 
 class EnumerationType(ParserType):
     """Type checker for a set of allowed basic values."""
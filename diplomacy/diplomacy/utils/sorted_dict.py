@@ -15,6 +15,8 @@
 #  with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ==============================================================================
 """Helper class to provide a dict with sorted keys."""
+from copy import copy
+
 from diplomacy.utils.common import is_dictionary
 from diplomacy.utils.sorted_set import SortedSet
 
@@ -211,6 +213,11 @@ class SortedDict:
         """Return smallest key greater then given key, or None if not exists."""
         return self.__keys.get_next_value(key)
 
+    def _item_at(self, position):
+        """Get the item (key-value pair) at given position in sorted keys."""
+        key = self.__keys[position]
+        return key, self.__couples[key]
+
     def _get_keys_interval(self, key_from, key_to):
         """Get a couple of internal key positions (index of key_from, index of key_to) allowing
         to easily retrieve values in closed interval [index of key_from; index of key_to]
@@ -267,5 +274,10 @@ class SortedDict:
                 self.put(key, value)
 
     def copy(self):
-        """Return a copy of this sorted dict."""
-        return SortedDict(self.__keys.element_type, self.__val_type, self.__couples)
+        """Return a shallow copy of this sorted dict (keys are not sorted again).
+        Copy has same class as this sorted dict.
+        """
+        result = copy(self)
+        result.__keys = self.__keys.copy()
+        result.__couples = self.__couples.copy()
+        return result
@@ -163,3 +163,9 @@ class SortedSet:
     def clear(self):
         """Remove all items from set."""
         self.__list.clear()
+
+    def copy(self):
+        """Return a copy of this sorted set."""
+        result = SortedSet(self.__type)
+        result.__list = list(self.__list)
+        return result
@@ -38,6 +38,7 @@ BUFFER_SIZE = "buffer_size"
 CANCELED = "canceled"
 CENTERS = "centers"
 CHANNEL = "channel"
+CHUNK_SIZE = "chunk_size"
 CIVIL_DISORDER = "civil_disorder"
 CLEAR_INVALID_STATE_HISTORY = "clear_invalid_state_history"
 CLIENT_NAME = "client_name"
@@ -52,17 +53,20 @@ CURRENT_ORDER = "current_order"
 CURRENT_PHASE = "current_phase"
 CURRENT_PHASE_DATA = "current_phase_data"
 CURRENT_STATE = "current_state"
+CURRENT_TIME = "current_time"
 CURRENT_TURN = "current_turn"
 DATA = "data"
 DEADLINE = "deadline"
 DEMOTE = "demote"
 DESC = "desc"
 DESIRED_COUNTRIES = "desired_countries"
+DISLODGED = "dislodged"
 DUMMY = "dummy"
 DUMMY_PLAYER = "dummy_player"
 DUMMY_POWERS = "dummy_powers"
 ERROR = "error"
 ERROR_TYPE = "error_type"
+EVICTIONS = "evictions"
 FOR_OMNISCIENCE = "for_omniscience"
 FORCED = "forced"
 FORCED_ORDERS = "forced_orders"
@@ -80,23 +84,33 @@ GLOBAL_MESSAGE_HISTORY = "global_message_history"
 GRADE = "grade"
 GRADE_UPDATE = "grade_update"
 HASHED = "hashed"
+HITS = "hits"
 HOMES = "homes"
 INCLUDE_PROTECTED = "include_protected"
 INFLUENCE = "influence"
 INITIAL_STATE = "initial_state"
 IS_DUMMY = "is_dummy"
 KICK_PLAYER = "kick_player"
+LAST_QUEUE_DELAY_MS = "last_queue_delay_ms"
+LAST_STEP_LAG_MS = "last_step_lag_ms"
+LOADED_GAMES = "loaded_games"
+LOADED_SIZE = "loaded_size"
 MAP_NAME = "map_name"
 MAP_POWERS = "map_powers"
 MAPS = "maps"
 MAPS_MTIME = "maps_mtime"
 MASTER_TYPE = "master_type"
 MAX_GAMES = "max_games"
+MAX_LOADED_GAMES = "max_loaded_games"
+MAX_LOADED_SIZE = "max_loaded_size"
+MAX_QUEUE_DELAY_MS = "max_queue_delay_ms"
+MAX_STEP_LAG_MS = "max_step_lag_ms"
 MESSAGE = "message"
 MESSAGE_BYTES = "message_bytes"
 MESSAGE_HISTORY = "message_history"
 MESSAGES = "messages"
 META_RULES = "meta_rules"
+MISSES = "misses"
 MODERATOR = "moderator"
 MODERATOR_USERNAMES = "moderator_usernames"
 MODERATORS = "moderators"
@@ -138,9 +152,12 @@ PHASE = "phase"
 PHASE_ABBR = "phase_abbr"
 PHASE_DATA = "phase_data"
 PHASE_DATA_TYPE = "phase_data_type"
+PHASE_HISTORY = "phase_history"
+PHASE_TYPE = "phase_type"
 PING_SECONDS = "ping_seconds"
 PLAYER_ID = "player_id"
 PLAYERS = "players"
+POPPED = "popped"
 POSSIBLE_ORDERS = "possible_orders"
 POWER = "power"
 POWER_FROM = "power_from"
@@ -156,8 +173,12 @@ POWERS_KICKED = "powers_kicked"
 PREVIOUS_PHASE = "previous_phase"
 PREVIOUS_PHASE_DATA = "previous_phase_data"
 PREVIOUS_STATE = "previous_state"
+PROCESSED_BATCHES = "processed_batches"
+PROCESSED_TASKS = "processed_tasks"
+PROCESSING_WORKERS = "processing_workers"
 PROMOTE = "promote"
 PROPOSAL = "proposal"
+QUEUED_DATA = "queued_data"
 RE_SENT = "re_sent"
 REASON = "reason"
 RECIPIENT = "recipient"
@@ -178,6 +199,7 @@ RESULTS = "results"
 RETREATS = "retreats"
 ROLE = "role"
 RULES = "rules"
+SCHEDULED_DATA = "scheduled_data"
 SECONDS = "seconds"
 SENDER = "sender"
 SERVER_TYPE = "server_type"
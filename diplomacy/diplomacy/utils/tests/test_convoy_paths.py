@@ -0,0 +1,152 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test convoy paths cache files."""
+import os
+import pickle
+import shutil
+
+from diplomacy.engine.map import Map
+from diplomacy.utils import convoy_paths
+
+
+def _use_cache_dir(monkeypatch, cache_dir):
+    """Use given directory as only convoy paths cache (internal, external and legacy)."""
+    monkeypatch.setattr(convoy_paths, "INTERNAL_CACHE_DIR", str(cache_dir / "internal"))
+    monkeypatch.setattr(convoy_paths, "EXTERNAL_CACHE_DIR", str(cache_dir / "external"))
+    monkeypatch.setattr(convoy_paths, "INTERNAL_CACHE_PATH", str(cache_dir / "legacy.pkl"))
+    monkeypatch.setattr(convoy_paths, "EXTERNAL_CACHE_PATH", str(cache_dir / "legacy.pkl"))
+    monkeypatch.setattr(convoy_paths, "CONVOYS_PATH_CACHE", {})
+    monkeypatch.setattr(convoy_paths, "LEGACY_CONVOY_PATHS", None)
+
+
+def _write_legacy_cache(cache_dir, map_names):
+    """Write a legacy cache (single file for all maps) with dummy convoy paths for given maps.
+    Return dummy convoy paths, with map file hash as key.
+    """
+    cache_data = {"__version__": convoy_paths.__VERSION__}
+    for map_name in map_names:
+        map_hash = convoy_paths.get_file_md5(convoy_paths.get_map_path(map_name))
+        cache_data[map_hash] = {1: [map_name]}
+    with open(str(cache_dir / "legacy.pkl"), "wb") as file:
+        pickle.dump(cache_data, file)
+    return cache_data
+
+
+def test_build_caches(tmp_path, monkeypatch):
+    """Test that caches are built in one file per map, and skipped if already built."""
+    _use_cache_dir(monkeypatch, tmp_path)
+    cache_paths = convoy_paths.build_convoy_paths_caches(
+        ["standard", "pure"], nb_processes=1, cache_dir=str(tmp_path / "external")
+    )
+    map_path = convoy_paths.get_map_path("standard")
+    map_hash = convoy_paths.get_file_md5(map_path)
+    expected_path = str(tmp_path / "external" / ("standard-%s.pkl" % map_hash))
+    assert cache_paths[map_path] == expected_path
+    assert sorted(os.listdir(str(tmp_path / "external"))) == sorted(
+        os.path.basename(path) for path in cache_paths.values()
+    )
+
+    # Cache content matches convoy paths generated from map
+    expected = convoy_paths._build_convoy_paths_cache(Map("standard"), 13, nb_cores=1)
+    assert convoy_paths.load_convoy_paths("standard", build=False) == expected
+
+    # Already built maps are skipped
+    assert convoy_paths.build_convoy_paths_caches(["standard"], nb_processes=1) == {}
+    assert convoy_paths.build_convoy_paths_caches(["standard"], nb_processes=1, force=True)
+
+
+def test_lazy_load(tmp_path, monkeypatch):
+    """Test that convoy paths are generated on first use, and that a modified map is regenerated."""
+    _use_cache_dir(monkeypatch, tmp_path)
+    map_path = str(tmp_path / "custom.map")
+    shutil.copy(convoy_paths.get_map_path("standard"), map_path)
+    assert convoy_paths.load_convoy_paths(map_path, build=False) is None
+
+    # Generated on first use and saved in external cache directory
+    this_map = Map(map_path)
+    assert not os.path.exists(str(tmp_path / "external"))
+    assert this_map.convoy_paths[1]
+    assert os.listdir(str(tmp_path / "external")) == [
+        "custom-%s.pkl" % convoy_paths.get_file_md5(map_path)
+    ]
+
+    # Modified map file has a new hash, thus a new cache file
+    with open(map_path, "a") as file:
+        file.write("\n")
+    monkeypatch.setattr(convoy_paths, "CONVOYS_PATH_CACHE", {})
+    assert convoy_paths.load_convoy_paths(map_path, build=False) is None
+    assert convoy_paths.load_convoy_paths(map_path) == this_map.convoy_paths
+    assert len(os.listdir(str(tmp_path / "external"))) == 2
+
+
+def _get_cache_file_name(map_name):
+    """Return name of cache file for given map."""
+    map_path = convoy_paths.get_map_path(map_name)
+    return os.path.basename(
+        convoy_paths.get_cache_file_path("", map_path, convoy_paths.get_file_md5(map_path))
+    )
+
+
+def test_legacy_cache_split(tmp_path, monkeypatch):
+    """Test that legacy cache is split into cache files for all maps, then marked as migrated."""
+    _use_cache_dir(monkeypatch, tmp_path)
+    _write_legacy_cache(tmp_path, ["standard", "pure", "ancmed"])
+    pure_path = convoy_paths.get_map_path("pure")
+    convoy_paths._save_cache_file(
+        str(tmp_path / "external" / _get_cache_file_name("pure")),
+        pure_path,
+        convoy_paths.get_file_md5(pure_path),
+        {1: ["pure file"]},
+    )
+
+    # Legacy cache is not loaded for maps with a cache file
+    assert convoy_paths.load_convoy_paths("pure", build=False) == {1: ["pure file"]}
+    assert convoy_paths.LEGACY_CONVOY_PATHS is None
+
+    # Legacy cache is loaded for a map without cache file, and split for all maps
+    assert convoy_paths.load_convoy_paths("standard", build=False) == {1: ["standard"]}
+    assert convoy_paths.LEGACY_CONVOY_PATHS == {}
+    assert sorted(os.listdir(str(tmp_path / "external"))) == sorted(
+        [_get_cache_file_name(name) for name in ("standard", "pure", "ancmed")]
+        + [convoy_paths.LEGACY_MIGRATED_FILE_NAME]
+    )
+    assert convoy_paths.load_convoy_paths("ancmed", build=False) == {1: ["ancmed"]}
+
+    # Migrated legacy cache is not loaded again in a new process
+    monkeypatch.setattr(convoy_paths, "CONVOYS_PATH_CACHE", {})
+    monkeypatch.setattr(convoy_paths, "LEGACY_CONVOY_PATHS", None)
+    os.remove(str(tmp_path / "external" / _get_cache_file_name("standard")))
+    assert convoy_paths.load_convoy_paths("standard", build=False) is None
+    assert convoy_paths.LEGACY_CONVOY_PATHS == {}
+
+
+def test_unwritable_cache_dir(tmp_path, monkeypatch):
+    """Test that convoy paths are kept in memory if cache files cannot be written."""
+    _use_cache_dir(monkeypatch, tmp_path)
+    _write_legacy_cache(tmp_path, ["standard"])
+    (tmp_path / "file").write_text("")
+    monkeypatch.setattr(convoy_paths, "EXTERNAL_CACHE_DIR", str(tmp_path / "file" / "external"))
+
+    # Migrated from legacy cache
+    assert convoy_paths.load_convoy_paths("standard", build=False) == {1: ["standard"]}
+    assert convoy_paths.load_convoy_paths("standard", build=False) == {1: ["standard"]}
+
+    # Generated
+    map_path = str(tmp_path / "custom.map")
+    shutil.copy(convoy_paths.get_map_path("pure"), map_path)
+    assert convoy_paths.load_convoy_paths(map_path)
+    assert convoy_paths.load_convoy_paths(map_path, build=False)
@@ -0,0 +1,130 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test class DeltaHistory."""
+from diplomacy.utils.delta_history import (
+    DeltaHistory,
+    apply_delta,
+    compute_delta,
+    decode_history,
+    is_delta,
+)
+from diplomacy.utils.sorted_dict import SortedDict
+from diplomacy.utils.tests.test_common import assert_equals
+
+
+def _build_values(count):
+    """Return a dictionary {int => state-like dictionary} with small changes between values."""
+    values = {}
+    for index in range(count):
+        values[index] = {
+            "name": "phase %d" % index,
+            "units": {"FRANCE": ["A PAR", "A MAR"], "ENGLAND": ["F LON"] * (index % 3)},
+            "centers": {"FRANCE": ["PAR"], "ENGLAND": ["LON"]},
+        }
+        if index % 4 == 0:
+            values[index]["note"] = "note %d" % index
+    return values
+
+
+def test_compute_and_apply_delta():
+    """Test functions compute_delta() and apply_delta()."""
+    previous = {"a": 1, "b": {"c": [1, 2], "d": 3}, "e": "removed"}
+    current = {"a": 1, "b": {"c": [1, 2, 3], "d": 3}, "f": "added"}
+    delta = compute_delta(previous, current)
+    assert_equals(
+        {"set": {"f": "added"}, "del": ["e"], "sub": {"b": {"set": {"c": [1, 2, 3]}}}}, delta
+    )
+    assert_equals(current, apply_delta(previous, delta))
+    # Previous dictionary must not be modified.
+    assert_equals({"a": 1, "b": {"c": [1, 2], "d": 3}, "e": "removed"}, previous)
+    assert_equals({}, compute_delta(current, current))
+
+    # Extended lists
+    delta = compute_delta(previous, current, extend_lists=True)
+    assert_equals({"set": {"f": "added"}, "del": ["e"], "sub": {"b": {"ext": {"c": [3]}}}}, delta)
+    assert_equals(current, apply_delta(previous, delta))
+
+
+def test_values_match_sorted_dict():
+    """Test that a DeltaHistory returns same values as a SortedDict."""
+    values = _build_values(40)
+    expected = SortedDict(int, dict, values)
+    history = DeltaHistory(int, values, keyframe_interval=5)
+    assert_equals(len(expected), len(history))
+    assert_equals(list(expected.keys()), list(history.keys()))
+    assert_equals(list(expected.values()), list(history.values()))
+    assert_equals(list(expected.reversed_items()), list(history.reversed_items()))
+    assert_equals(expected.sub(7, 23), history.sub(7, 23))
+    assert_equals(expected.sub(), history.sub())
+    assert_equals(expected.last_value(), history.last_value())
+    assert_equals(expected.first_value(), history.first_value())
+    assert all(history[key] == expected[key] for key in expected.keys())
+    assert history.get(1000) is None
+    assert history == expected
+
+
+def test_keyframes():
+    """Test that full values are stored only every keyframe_interval entries."""
+    history = DeltaHistory(int, _build_values(12), keyframe_interval=5)
+    keyframes = [key for key, value in history.encoded_items() if not is_delta(value)]
+    assert_equals([0, 5, 10], keyframes)
+
+
+def test_insert_and_remove():
+    """Test adding and removing values elsewhere than at the end of history."""
+    values = _build_values(10)
+    history = DeltaHistory(int, {key: values[key] for key in values if key != 4}, 3)
+    history.put(4, values[4])
+    history[8] = {"name": "replaced"}
+    assert_equals({"name": "replaced"}, history[8])
+    assert_equals(values[9], history[9])
+    assert_equals(values[4], history.remove(4))
+    assert history.remove(4) is None
+    assert_equals([0, 1, 2, 3, 5, 6, 7, 8, 9], list(history.keys()))
+    assert_equals(values[9], history.remove(9))
+    assert_equals({"name": "replaced"}, history.last_value())
+    assert_equals(values[5], history[5])
+
+
+def test_encoded_items_round_trip():
+    """Test that encoded items can be used to rebuild history."""
+    values = _build_values(20)
+    history = DeltaHistory(int, values, keyframe_interval=4)
+    encoded = dict(history.encoded_items())
+    assert any(is_delta(value) for value in encoded.values())
+    assert_equals(values, dict(decode_history(sorted(encoded.items()))))
+    assert_equals(values, dict(DeltaHistory(int, encoded).items()))
+    assert_equals(values, dict(history.copy().items()))
+
+
+def test_random_access_decodes_one_block(monkeypatch):
+    """Test that accessing a value only reads entries from its closest keyframe."""
+    history = DeltaHistory(int, _build_values(100), keyframe_interval=5)
+    positions = []
+    item_at = SortedDict._item_at
+
+    def _item_at(self, position):
+        positions.append(position)
+        return item_at(self, position)
+
+    monkeypatch.setattr(SortedDict, "_item_at", _item_at)
+    assert_equals("phase 57", history[57]["name"])
+    assert_equals([57, 56, 55, 55, 56, 57], positions)
+    del positions[:]
+    assert_equals(["phase 99", "phase 98"], [v["name"] for _, v in history.reversed_items()][:2])
+    # Each entry is read once to find keyframes and once to be decoded, plus each keyframe once.
+    assert_equals(100 + 100 + 20, len(positions))
@@ -17,8 +17,11 @@
 """Test Jsonable."""
 import ujson as json
 
-from diplomacy.utils import parsing
-from diplomacy.utils.jsonable import Jsonable
+from diplomacy.communication import notifications, requests
+from diplomacy.engine.message import Message
+from diplomacy.utils import common, exceptions, parsing
+from diplomacy.utils.game_phase_data import GamePhaseData
+from diplomacy.utils.jsonable import Jsonable, trusted
 from diplomacy.utils.sorted_dict import SortedDict
 from diplomacy.utils.sorted_set import SortedSet
 
@@ -84,3 +87,77 @@ def test_jsonable_parsing():
     assert from_json.field_e == my_jsonable.field_e
     assert from_json.field_f == my_jsonable.field_f
     assert from_json.field_g == my_jsonable.field_g
+
+
+def test_compiled_model():
+    """Test that compiled model functions convert values as parser types do."""
+    phase_data = GamePhaseData(
+        name="S1901M",
+        state={"name": "S1901M", "units": {"FRANCE": ["A PAR"]}},
+        orders={"FRANCE": ["A PAR - BUR"], "ENGLAND": None},
+        results={"A PAR": [common.StringableCode(0, "bounce")]},
+        messages={
+            10: Message(
+                sender="FRANCE", recipient="GLOBAL", message="hi", phase="S1901M", time_sent=10
+            )
+        },
+        logs={},
+        stances={"FRANCE": {"ENGLAND": 1}},
+        order_logs={},
+        is_bot={},
+        deceiving={},
+    )
+    values = [
+        MyJsonable(field_a=True, field_b="test", field_c=1.5, field_e=[3, 2], field_f=[6.5, 1.0]),
+        MyJsonable(field_a=False, field_b="test", field_e=[], field_f=[], field_g={"a": 1, "b": 2}),
+        phase_data,
+        notifications.GameProcessed(
+            token="token",
+            game_id="game",
+            game_role="FRANCE",
+            previous_phase_data=phase_data,
+            current_phase_data=phase_data,
+        ),
+        requests.SetGameState(
+            token="token",
+            game_id="game",
+            game_role="FRANCE",
+            phase="S1901M",
+            state=phase_data.state,
+            orders={"FRANCE": ["A PAR - BUR"]},
+            results={},
+            messages=phase_data.messages,
+        ),
+    ]
+    for value in values:
+        model = value.get_model()
+        expected_json = {
+            key: parsing.to_json(getattr(value, key), key_type) for key, key_type in model.items()
+        }
+        json_dict = json.loads(json.dumps(value.to_dict()))
+        assert json_dict == json.loads(json.dumps(expected_json))
+        from_json = type(value).from_dict(json_dict)
+        for key, key_type in model.items():
+            expected_value = parsing.update_data(
+                {key: parsing.to_type(json_dict[key], key_type)}, {key: key_type}
+            )[key]
+            assert parsing.to_json(getattr(from_json, key), key_type) == parsing.to_json(
+                expected_value, key_type
+            ), key
+            assert type(getattr(from_json, key)) is type(expected_value), key
+
+
+def test_trusted():
+    """Test that objects built in trusted context are updated but not validated."""
+    try:
+        MyJsonable(field_a="not a bool", field_b="test", field_e=[], field_f=[])
+        raise AssertionError("Expected a type exception.")
+    except exceptions.TypeException:
+        pass
+    with trusted():
+        my_jsonable = MyJsonable(field_a="not a bool", field_b="test", field_e=(1,), field_f=[])
+    assert my_jsonable.field_a == "not a bool"
+    assert my_jsonable.field_d == "super"
+    assert my_jsonable.field_e == [1]
+    assert isinstance(my_jsonable.field_f, SortedSet)
+    assert isinstance(my_jsonable.field_g, SortedDict)
@@ -0,0 +1,106 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test class MessageStore."""
+import random
+
+import ujson as json
+
+from diplomacy.engine.game import Game
+from diplomacy.engine.message import GLOBAL, OBSERVER, OMNISCIENT, SYSTEM, Message
+from diplomacy.utils import strings
+from diplomacy.utils.message_store import MessageStore
+from diplomacy.utils.sorted_dict import SortedDict
+
+POWER_NAMES = ["AUSTRIA", "ENGLAND", "FRANCE", "GERMANY", "ITALY", "RUSSIA", "TURKEY"]
+
+
+def _build_messages(count, seed=0):
+    """Return a dictionary {timestamp => message} with all kinds of senders, recipients and types."""
+    rng = random.Random(seed)
+    messages = {}
+    for index in range(count):
+        sender = rng.choice(POWER_NAMES + [SYSTEM])
+        recipient = rng.choice(POWER_NAMES + [GLOBAL, OBSERVER, OMNISCIENT])
+        message_type = rng.choice([None, None, strings.SUGGESTED_MESSAGE, strings.HAS_SUGGESTIONS])
+        body = "message %d" % index
+        if message_type == strings.SUGGESTED_MESSAGE:
+            body = json.dumps({"recipient": rng.choice(POWER_NAMES), "payload": body})
+        time_sent = (index + 1) * 10
+        messages[time_sent] = Message(
+            sender=sender,
+            recipient=recipient,
+            message=body,
+            phase="S1901M",
+            time_sent=time_sent,
+            type=message_type,
+        )
+    return messages
+
+
+def _check_filters(message_store, sorted_dict):
+    """Check that filtering message store and sorted dict returns same messages in same order."""
+    roles = [strings.OBSERVER_TYPE, strings.OMNISCIENT_TYPE, "FRANCE", ["ENGLAND", "RUSSIA"]]
+    intervals = [(None, None), (None, 155), (155, None), (100, 300), (1000000, None)]
+    for game_role in roles:
+        for timestamp_from, timestamp_to in intervals:
+            expected = Game.filter_messages(sorted_dict, game_role, timestamp_from, timestamp_to)
+            filtered = Game.filter_messages(message_store, game_role, timestamp_from, timestamp_to)
+            assert list(filtered.items()) == list(expected.items()), (game_role, timestamp_from)
+
+
+def test_filter_messages():
+    """Test that indexed filtering returns same messages as filtering all messages."""
+    messages = _build_messages(200)
+    message_store = MessageStore(messages)
+    sorted_dict = SortedDict(int, Message, messages)
+    assert list(message_store.keys()) == list(sorted_dict.keys())
+    _check_filters(message_store, sorted_dict)
+
+    # Indexes follow updates, and copies are indexed independently.
+    copied_store = message_store.copy()
+    for time_sent in list(message_store.keys())[::3]:
+        message_store.remove(time_sent)
+        sorted_dict.remove(time_sent)
+    replacement = Message(
+        sender="FRANCE", recipient=GLOBAL, message="replaced", phase="S1901M", time_sent=20
+    )
+    message_store.put(20, replacement)
+    sorted_dict.put(20, replacement)
+    _check_filters(message_store, sorted_dict)
+    _check_filters(copied_store, SortedDict(int, Message, messages))
+
+    message_store.clear()
+    assert not Game.filter_messages(message_store, "FRANCE")
+
+
+def test_game_messages_are_indexed():
+    """Test that game current and past messages are stored in message stores."""
+    game = Game()
+    game.add_message(
+        Message(
+            sender="FRANCE", recipient="ENGLAND", message="hello", phase=game.current_short_phase
+        )
+    )
+    assert isinstance(game.messages, MessageStore)
+    game.process()
+    assert isinstance(game.messages, MessageStore)
+    assert isinstance(game.message_history.last_value(), MessageStore)
+    assert len(game.get_phase_history(game_role="ENGLAND")[0].messages) == 1
+    assert not game.get_phase_history(game_role="ITALY")[0].messages
+    copied_game = Game.from_dict(game.to_dict())
+    assert isinstance(copied_game.messages, MessageStore)
+    assert isinstance(copied_game.message_history.last_value(), MessageStore)
@@ -0,0 +1,67 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Test class TimingWheel."""
+import random
+
+from diplomacy.utils.timing_wheel import TimingWheel
+
+
+def test_timing_wheel():
+    """Test that keys are returned exactly at their deadlines, including keys
+    moved between levels and keys beyond wheel range."""
+    rng = random.Random(0)
+    # Small wheel (4 slots, 2 levels: 16 ticks), so that all cases happen quickly.
+    wheel = TimingWheel(wheel_size=4, nb_levels=2)
+    expected = {}  # key => deadline
+    next_key = 0
+    for _ in range(300):
+        for _ in range(rng.randint(0, 3)):
+            deadline = wheel.current_time + rng.randint(1, 40)
+            wheel.put(next_key, deadline, "value %d" % next_key)
+            expected[next_key] = deadline
+            next_key += 1
+        if expected and rng.random() < 0.3:
+            key = rng.choice(list(expected))
+            if rng.random() < 0.5:
+                assert wheel.remove(key) == "value %d" % key
+                del expected[key]
+            else:
+                expected[key] = wheel.current_time + rng.randint(1, 40)
+                wheel.put(key, expected[key], "value %d" % key)
+        assert len(wheel) == len(expected)
+        due = wheel.advance()
+        due_keys = sorted(key for key, _ in due)
+        assert due_keys == sorted(
+            key for key, deadline in expected.items() if deadline == wheel.current_time
+        )
+        for key, value in due:
+            assert value == "value %d" % key
+            assert key not in wheel
+            del expected[key]
+        for key, deadline in expected.items():
+            assert wheel.get_deadline(key) == deadline
+            assert wheel[key] == "value %d" % key
+
+
+def test_past_deadline():
+    """Test that a key added with a reached deadline is due at next tick."""
+    wheel = TimingWheel(current_time=10)
+    wheel.put("a", 5)
+    wheel.put("b", 11, "value")
+    assert wheel.get("a", "missing") is None and wheel.get("c", "missing") == "missing"
+    assert sorted(wheel.advance()) == [("a", None), ("b", "value")]
+    assert not wheel and wheel.remove("a") is None
@@ -0,0 +1,129 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+"""Hierarchical timing wheel: a container of keys with integer deadlines (in ticks),
+where adding, removing or re-scheduling a key costs O(1), and advancing time by one tick
+only visits keys due at this tick (plus, once in a while, keys moved to a lower level).
+
+Wheel has ``nb_levels`` levels of ``wheel_size`` slots each. A slot of level L covers
+``wheel_size ** L`` ticks, so that level L stores keys with deadline between
+``wheel_size ** L`` and ``wheel_size ** (L + 1)`` ticks from current time. When time reaches
+start of a slot of level L > 0, keys in this slot are moved to lower levels. Keys farther than
+``wheel_size ** nb_levels`` ticks are kept apart and placed again in wheel at each
+full revolution of highest level.
+
+With default values (64 slots, 4 levels) and 1 tick per second, wheel covers about 194 days.
+"""
+
+
+class TimingWheel:
+    """Timing wheel mapping keys to values, each key being due at a given deadline (in ticks)."""
+
+    __slots__ = ["wheel_size", "nb_levels", "current_time", "__levels", "__entries", "__overflow"]
+
+    def __init__(self, wheel_size=64, nb_levels=4, current_time=0):
+        """Initialize an empty timing wheel.
+
+        :param wheel_size: number of slots per level.
+        :param nb_levels: number of levels.
+        :param current_time: initial time (in ticks).
+        """
+        assert wheel_size > 1 and nb_levels > 0
+        self.wheel_size = wheel_size
+        self.nb_levels = nb_levels
+        self.current_time = current_time
+        # Each slot is a dictionary mapping a key to its value.
+        self.__levels = [[{} for _ in range(wheel_size)] for _ in range(nb_levels)]
+        self.__entries = {}  # key => (deadline, slot containing key)
+        self.__overflow = {}  # Keys too far from current time to be placed in levels.
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __getitem__(self, key):
+        """Return value associated to given key. Raise KeyError if key is not found."""
+        return self.__entries[key][1][key]
+
+    def get(self, key, default=None):
+        """Return value associated to given key, or default value if key is not found."""
+        entry = self.__entries.get(key, None)
+        return default if entry is None else entry[1][key]
+
+    def get_deadline(self, key):
+        """Return deadline (in ticks) of given key. Raise KeyError if key is not found."""
+        return self.__entries[key][0]
+
+    def put(self, key, deadline, value=None):
+        """Add a key with given deadline and value, or re-schedule key if already present.
+        A key with a deadline already reached is due at next tick.
+        """
+        if key in self.__entries:
+            self.remove(key)
+        self.__place(key, max(deadline, self.current_time + 1), value)
+
+    def remove(self, key):
+        """Remove given key and return its value, or None if key is not found."""
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return None
+        return entry[1].pop(key)
+
+    def advance(self):
+        """Move current time forward by one tick. Remove keys due at new current time and
+        return them as a list of couples (key, value), in order keys were placed in their slot.
+        """
+        self.current_time += 1
+        time = self.current_time
+        size = self.wheel_size
+        if time % (size**self.nb_levels) == 0 and self.__overflow:
+            overflow, self.__overflow = self.__overflow, {}
+            for key, value in overflow.items():
+                self.__place(key, self.__entries.pop(key)[0], value)
+        # Move keys from higher to lower levels, starting with highest level,
+        # so that keys moved to level 0 slot of current time are returned below.
+        for level in range(self.nb_levels - 1, 0, -1):
+            span = size**level
+            if time % span == 0:
+                slot = self.__levels[level][(time // span) % size]
+                if slot:
+                    moved = list(slot.items())
+                    slot.clear()
+                    for key, value in moved:
+                        self.__place(key, self.__entries.pop(key)[0], value)
+        slot = self.__levels[0][time % size]
+        due = list(slot.items())
+        slot.clear()
+        for key, _ in due:
+            del self.__entries[key]
+        return due
+
+    def __place(self, key, deadline, value):
+        """Place key in slot associated to given deadline (not earlier than current time)."""
+        delay = deadline - self.current_time
+        size = self.wheel_size
+        span = 1
+        for level in range(self.nb_levels):
+            if delay < span * size:
+                slot = self.__levels[level][(deadline // span) % size]
+                break
+            span *= size
+        else:
+            slot = self.__overflow
+        slot[key] = value
+        self.__entries[key] = (deadline, slot)
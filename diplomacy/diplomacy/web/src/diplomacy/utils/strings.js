@@ -62,6 +62,7 @@ export const STRINGS = {
         "BUILD_ANY",
         "CD_DUMMIES",
         "CIVIL_DISORDER",
+        "DELTA_HISTORY",
         "DIFFERENT_ADJUDICATION",
         "DONT_SKIP_PHASES",
         "HOLD_WIN",
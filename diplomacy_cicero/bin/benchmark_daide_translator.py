@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+#
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+"""Measure message rounds per second of English to DAIDE translation.
+
+Compares translation as done before DaideTranslator (parser loaded for every round, messages
+parsed one at a time) with the shared, cached and batched DaideTranslator. Rounds are sampled
+from messages of a game.json, or from a few built-in messages, so that some messages repeat
+across rounds as in self-play.
+
+Usage:
+    python bin/benchmark_daide_translator.py --game-json game.json --rounds 20 --device cpu
+"""
+import argparse
+import json
+import random
+import time
+from typing import List
+
+import tabulate
+
+from fairdiplomacy.env import AMR_MODEL_DIR, DaideTranslator, Inference, eng_to_daide
+from fairdiplomacy.typedefs import MessageDict
+
+DEFAULT_MESSAGES = [
+    ("FRANCE", "ENGLAND", "I will move to the English Channel."),
+    ("ENGLAND", "FRANCE", "Please support my fleet to Belgium."),
+    ("GERMANY", "RUSSIA", "Let's keep Sweden demilitarized."),
+    ("AUSTRIA", "ITALY", "I will not attack Venice this turn."),
+    ("TURKEY", "RUSSIA", "Move your army from Sevastopol to Romania."),
+]
+
+
+def load_messages(game_json: str) -> List[MessageDict]:
+    if not game_json:
+        return [
+            dict(sender=sender, recipient=recipient, message=message, phase="S1901M")  # type: ignore
+            for sender, recipient, message in DEFAULT_MESSAGES
+        ]
+    with open(game_json) as f:
+        game = json.load(f)
+    return [message for phase in game["phases"] for message in phase["messages"]]
+
+
+def run_uncached(rounds: List[List[MessageDict]], model_dir: str, device: str) -> None:
+    for messages in rounds:
+        inference = Inference(model_dir, batch_size=16, num_beams=4, device=device)
+        for message in messages:
+            eng_to_daide(message, inference)
+
+
+def run_cached(rounds: List[List[MessageDict]], model_dir: str, device: str) -> None:
+    translator = DaideTranslator(model_dir, device=device)
+    for messages in rounds:
+        translator.translate(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--game-json", default="", help="take messages from this game")
+    parser.add_argument("--model-dir", default=AMR_MODEL_DIR)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--messages-per-round", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    messages = load_messages(args.game_json)
+    rng = random.Random(args.seed)
+    rounds = [
+        [rng.choice(messages) for _ in range(args.messages_per_round)] for _ in range(args.rounds)
+    ]
+    rows = []
+    for label, run in (("reload + one by one", run_uncached), ("DaideTranslator", run_cached)):
+        start = time.perf_counter()
+        run(rounds, args.model_dir, args.device)
+        seconds = time.perf_counter() - start
+        rows.append((label, f"{seconds:.1f}", f"{args.rounds / seconds:.3f}"))
+    print(tabulate.tabulate(rows, headers=("translation", "total (s)", "rounds/s")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+#
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+"""Compare wall-clock per CFR iteration of SearchBotAgent with and without pipelined_cfr.
+
+Runs on CPU with MockBaseStrategyModel, so only measures the overlap of rollouts (feature
+encoding, game stepping, mock forward) with the CFR bookkeeping.
+
+Usage:
+    python bin/benchmark_pipelined_cfr.py --n-rollouts 256 --max-rollout-length 2
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import tabulate
+import torch
+
+from conf import agents_cfgs
+from fairdiplomacy.agents.player import Player
+from fairdiplomacy.agents.searchbot_agent import SearchBotAgent
+from fairdiplomacy.pydipcc import Game
+
+
+def build_agent(args, pipelined_cfr: bool) -> SearchBotAgent:
+    cfg = agents_cfgs.SearchBotAgent(
+        model_path="MOCK",
+        n_rollouts=args.n_rollouts,
+        device=-1,
+        use_final_iter=0,
+        pipelined_cfr=pipelined_cfr,
+        rollouts_cfg=dict(max_rollout_length=args.max_rollout_length, n_threads=args.n_threads),
+        plausible_orders_cfg=dict(
+            n_plausible_orders=args.n_plausible_orders,
+            batch_size=args.n_plausible_orders,
+            req_size=args.n_plausible_orders,
+        ),
+    )
+    return SearchBotAgent(cfg)
+
+
+def time_search(agent: SearchBotAgent, game: Game, repeats: int, seed: int) -> float:
+    """Returns mean wall-clock time of a search in seconds."""
+    random.seed(seed)
+    np.random.seed(seed)  # type:ignore
+    torch.manual_seed(seed)
+    # Warmup.
+    Player(agent, "FRANCE").run_search(game)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        Player(agent, "FRANCE").run_search(game)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--n-rollouts", type=int, default=256, help="CFR iterations")
+    parser.add_argument("--max-rollout-length", type=int, default=2)
+    parser.add_argument("--n-plausible-orders", type=int, default=16)
+    parser.add_argument("--n-threads", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = Game()
+    rows = []
+    for pipelined_cfr in (False, True):
+        agent = build_agent(args, pipelined_cfr)
+        seconds = time_search(agent, game, args.repeats, args.seed)
+        rows.append(
+            (
+                "pipelined" if pipelined_cfr else "sequential",
+                f"{seconds:.2f}",
+                f"{seconds / args.n_rollouts * 1e3:.2f}",
+            )
+        )
+    print(tabulate.tabulate(rows, headers=("CFR loop", "search (s)", "per iteration (ms)")))
+
+
+if __name__ == "__main__":
+    main()
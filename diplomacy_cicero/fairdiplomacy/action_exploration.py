@@ -6,7 +6,7 @@
 #
 """Tools to find extra plausible actions given an equilibrium.
 """
-from typing import TYPE_CHECKING, Dict, Callable, Tuple, List, Optional, Union, cast
+from typing import TYPE_CHECKING, Dict, Callable, Hashable, Tuple, List, Optional, Union, cast
 import copy
 import datetime
 import logging
@@ -26,6 +26,11 @@ from fairdiplomacy.utils import timing_ctx
 from fairdiplomacy.utils.batching import batched_forward
 from fairdiplomacy.utils.temp_redefine import temp_redefine
 from fairdiplomacy.utils.thread_pool_encoding import FeatureEncoder
+from fairdiplomacy.utils.transposition_table import (
+    TranspositionTable,
+    board_key,
+    get_transposition_table,
+)
 from fairdiplomacy.utils.zipn import unzip2
 import nest
 
@@ -117,6 +122,9 @@ def score_actions(
     timings=None,
     use_board_state_hashing=False,
     cache: Optional[ScoreActionsCache] = None,
+    critic_key: Optional[Hashable] = None,
+    batch_size: int = BATCH_SIZE,
+    num_threads: int = 10,
 ) -> List[float]:
     """Computes EV of actions given policies of oponents.
 
@@ -127,8 +135,17 @@ def score_actions(
     exact value against their policy. If max_exact_actions is set, only top
     max_exact_actions will taken from the opponent's policy.
 
-    If use_board_state_hashing, then game states with the same units on the
-    board will be considered identical and queried once.
+    If use_board_state_hashing, then game states with the same board (see
+    pydipcc.Game.compute_board_hash) will be considered identical and queried
+    once. If critic_key is also set, values are shared across calls through the
+    process-wide transposition table (if enabled). critic_key must identify the
+    critic, i.e., its model and everything it conditions on besides the board.
+    It should not hold references to models (e.g. use
+    BaseStrategyModelWrapper.value_model_key), as entries are kept in the table.
+
+    Games for all (action, opponent joint action) pairs are stepped in bulk
+    with num_threads threads and evaluated by the critic in chunks of about
+    batch_size games (at least len(actions)).
 
     Returns EV for each action in actions.
     """
@@ -168,29 +185,44 @@ def score_actions(
     timings.stop()
     # print(selected_power, *op_weighted_actions, sep="\n")
 
-    assert not use_board_state_hashing, "Not supported any more"
-
-    scores = []
+    if not actions:
+        return []
+    selected_power_id = POWERS.index(selected_power)
+    cache_keys = []
+    missing_op_actions: Dict[Tuple, PerPowerList[Action]] = {}
     for power_actions, _ in op_weighted_actions:
-        # Will be redefined in the loop. Setting to None to make cache work.
-        power_actions[POWERS.index(selected_power)] = None  # type: ignore
+        # Will be redefined for each action. Setting to None to make cache work.
+        power_actions[selected_power_id] = None  # type: ignore
         cache_key = (tuple(power_actions), selected_power)
+        cache_keys.append(cache_key)
         if cache_key not in cache:
-            cartesian_product_games = []
-            with timings("score_actions.step"):
-                for action in actions:
-                    step_game = pydipcc.Game(game)
-                    for i, power in enumerate(POWERS):
-                        if power == selected_power:
-                            step_game.set_orders(power, action)
-                        else:
-                            step_game.set_orders(power, power_actions[i])
-                    step_game.process()
-                    cartesian_product_games.append(step_game)
-            with timings("score_actions.model"):
-                cache[cache_key] = critic(cartesian_product_games, selected_power)
-        a_scores = cache[cache_key]
-        scores.append(a_scores)
+            missing_op_actions[cache_key] = power_actions
+
+    feature_encoder = FeatureEncoder(num_threads=num_threads)
+    missing_items = list(missing_op_actions.items())
+    chunk_size = max(1, batch_size // len(actions))
+    for chunk in (
+        missing_items[i : i + chunk_size] for i in range(0, len(missing_items), chunk_size)
+    ):
+        joint_actions = []
+        for _, power_actions in chunk:
+            for action in actions:
+                joint_action = list(power_actions)
+                joint_action[selected_power_id] = action
+                joint_actions.append(joint_action)
+        with timings("score_actions.step"):
+            cartesian_product_games = _step_joint_actions(game, joint_actions, feature_encoder)
+        with timings("score_actions.model"):
+            if use_board_state_hashing:
+                values = _critic_with_board_hashing(
+                    critic, critic_key, cartesian_product_games, selected_power, timings
+                )
+            else:
+                values = critic(cartesian_product_games, selected_power)
+        for (cache_key, _), a_scores in zip(chunk, values.split(len(actions))):
+            cache[cache_key] = a_scores
+
+    scores = [cache[cache_key] for cache_key in cache_keys]
     _, weights = zip(*op_weighted_actions)
     weights = torch.as_tensor(weights).unsqueeze(0)
     # Shape action X op_action.
@@ -199,6 +231,39 @@ def score_actions(
     return scores.tolist()
 
 
+def _step_joint_actions(
+    game: pydipcc.Game, joint_actions: List[PerPowerList[Action]], feature_encoder: FeatureEncoder
+) -> List[pydipcc.Game]:
+    """Returns copies of the game stepped with each joint action, processed in parallel."""
+    games = game.clone_n_times(len(joint_actions))
+    for step_game, joint_action in zip(games, joint_actions):
+        for power, action in zip(POWERS, joint_action):
+            step_game.set_orders(power, action)
+    feature_encoder.process_multi(games)
+    return games
+
+
+def _critic_with_board_hashing(
+    critic: Callable,
+    critic_key: Optional[Hashable],
+    games: List[pydipcc.Game],
+    selected_power: Power,
+    timings: timing_ctx.TimingCtx,
+) -> torch.Tensor:
+    """Calls critic once per distinct board, reusing values from the transposition table."""
+    table = get_transposition_table() if critic_key is not None else TranspositionTable(0)
+    keys = [("score_actions", critic_key, selected_power) + board_key(game) for game in games]
+
+    def on_miss(indices: List[int]) -> List[torch.Tensor]:
+        values = critic([games[i] for i in indices], selected_power)
+        return [value.clone() for value in values]
+
+    values = table.get_or_compute_multi(
+        keys, on_miss, timings=timings, stats_prefix="transposition.score_actions"
+    )
+    return torch.stack(values, 0)
+
+
 def compactify(action):
     def cc(order):
         order = order.split(" ", 1)[1]
@@ -549,6 +614,7 @@ def double_oracle(
             timings=timings,
             use_board_state_hashing=double_oracle_cfg.use_board_state_hashing,
             cache=score_action_cache,
+            critic_key=("no_press_values", agent.base_strategy_model.value_model_key, agent_power),
         )
         with timings("do.select"):
             res = sorted(zip(actions, scores), key=lambda x: -x[1])
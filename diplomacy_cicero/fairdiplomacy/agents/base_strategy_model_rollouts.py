@@ -4,6 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 #
+import collections
 import logging
 from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
 
@@ -20,14 +21,21 @@ from fairdiplomacy.agents.base_strategy_model_wrapper import BaseStrategyModelWr
 from fairdiplomacy.game import sort_phase_key
 from fairdiplomacy.models.consts import POWERS
 from fairdiplomacy.typedefs import (
+    Action,
     JointAction,
     JointActionValues,
     PlayerRating,
     Power,
     RolloutResults,
 )
+from fairdiplomacy.utils.atomicish_file import atomicish_open_for_writing_binary
 from fairdiplomacy.utils.thread_pool_encoding import FeatureEncoder
 from fairdiplomacy.utils.timing_ctx import TimingCtx
+from fairdiplomacy.utils.transposition_table import (
+    board_key,
+    configure_transposition_table,
+    get_transposition_table,
+)
 from fairdiplomacy.utils.yearprob import (
     get_prob_of_latest_year_leq,
     parse_year_spring_prob_of_ending,
@@ -57,6 +65,10 @@ class BaseStrategyModelRollouts:
         self.clear_old_all_possible_orders = cfg.clear_old_all_possible_orders
         self.average_n_rollouts = cfg.average_n_rollouts
         self.has_press = has_press
+        self.use_transposition_table = cfg.transposition_table_size > 0
+        if self.use_transposition_table:
+            configure_transposition_table(cfg.transposition_table_size)
+        self.cache_max_memory_bytes = int(cfg.cache_max_memory_mb * 1024 * 1024)
 
         self.set_player_ratings = set_player_ratings
         self.use_player_ratings = (
@@ -289,32 +301,20 @@ class BaseStrategyModelRollouts:
         # Compute SoS for done game and query the net for not-done games.
         not_done_games = [game for game in games if not game.is_game_done]
         if not_done_games:
-            timings.start("encoding")
-            not_done_game_rating_dict = (
-                {game.game_id: game_rating_dict[game.game_id] for game in not_done_games}
-                if game_rating_dict is not None
-                else None
-            )
-            # Note, we assume that all base_strategy_models share settings of the first wrapper.
-            value_net_inputs = self.base_strategy_model.create_datafield_for_values(
-                not_done_games,
-                game_rating_dict=not_done_game_rating_dict,
-                has_press=self.has_press,
-                agent_power=agent_power,
-                feature_encoder=self.feature_encoder,
-            )
-            timings.start("v_model")
-            # Shape: [num_undone_games, num_values]
-            final_scores_per_base_strategy_model = torch.stack(
-                [
-                    base_strategy_model.forward_values_from_datafields(value_net_inputs)
-                    for base_strategy_model in all_value_functions
-                ],
-                -1,
-            )
+            if self.use_transposition_table and game_rating_dict is None:
+                final_scores_per_base_strategy_model = self._compute_values_with_transpositions(
+                    not_done_games, all_value_functions, agent_power=agent_power, timings=timings
+                )
+            else:
+                final_scores_per_base_strategy_model = self._compute_values(
+                    not_done_games,
+                    all_value_functions,
+                    agent_power=agent_power,
+                    game_rating_dict=game_rating_dict,
+                    timings=timings,
+                )
             not_done_games_mask = torch.BoolTensor([not game.is_game_done for game in games])
-            # Extra float() to handle half().
-            final_scores[not_done_games_mask] = final_scores_per_base_strategy_model.float().cpu()
+            final_scores[not_done_games_mask] = final_scores_per_base_strategy_model
 
         timings.start("final_scores")
         for i, game in enumerate(games):
@@ -360,6 +360,85 @@ class BaseStrategyModelRollouts:
 
         return final_scores
 
+    def _compute_values(
+        self,
+        games: List[pydipcc.Game],
+        value_functions: List[BaseStrategyModelWrapper],
+        *,
+        agent_power: Optional[Power],
+        game_rating_dict: Optional[Dict[str, PlayerRating]],
+        timings: TimingCtx,
+    ) -> torch.Tensor:
+        """Query value functions on games. Returns tensor [len(games), num_powers, num_values]."""
+        timings.start("encoding")
+        # Note, we assume that all base_strategy_models share settings of the first wrapper.
+        value_net_inputs = self.base_strategy_model.create_datafield_for_values(
+            games,
+            game_rating_dict=(
+                {game.game_id: game_rating_dict[game.game_id] for game in games}
+                if game_rating_dict is not None
+                else None
+            ),
+            has_press=self.has_press,
+            agent_power=agent_power,
+            feature_encoder=self.feature_encoder,
+        )
+        timings.start("v_model")
+        values = torch.stack(
+            [
+                base_strategy_model.forward_values_from_datafields(value_net_inputs)
+                for base_strategy_model in value_functions
+            ],
+            -1,
+        )
+        # Extra float() to handle half().
+        return values.float().cpu()
+
+    def _compute_values_with_transpositions(
+        self,
+        games: List[pydipcc.Game],
+        value_functions: List[BaseStrategyModelWrapper],
+        *,
+        agent_power: Optional[Power],
+        timings: TimingCtx,
+    ) -> torch.Tensor:
+        """Same as _compute_values, but reuses values of boards found in the transposition table.
+
+        Values of a single value function are stored under the same keys as
+        BaseStrategyModelWrapper.get_values, so that both share entries.
+        """
+        keys = [
+            tuple(
+                value_function.get_values_key(
+                    game, has_press=self.has_press, agent_power=agent_power
+                )
+                for value_function in value_functions
+            )
+            for game in games
+        ]
+        if len(value_functions) == 1:
+            keys = [key for (key,) in keys]
+
+        def on_miss(indices: List[int]) -> List[torch.Tensor]:
+            values = self._compute_values(
+                [games[i] for i in indices],
+                value_functions,
+                agent_power=agent_power,
+                game_rating_dict=None,
+                timings=timings,
+            )
+            if len(value_functions) == 1:
+                values = values.squeeze(-1)
+            # Clone rows so that entries don't keep the whole batch alive.
+            return [row.clone() for row in values]
+
+        timings.start("transposition")
+        values = get_transposition_table().get_or_compute_multi(
+            keys, on_miss, timings=timings, stats_prefix="transposition.values"
+        )
+        values = torch.stack(values, 0)
+        return values.unsqueeze(-1) if len(value_functions) == 1 else values
+
     def override_has_press(self, has_press: bool):
         self.has_press = has_press
 
@@ -395,8 +474,17 @@ class BaseStrategyModelRollouts:
                 timings += inner_timings
             return result
 
+        on_miss = self._maybe_with_transpositions(
+            game,
+            on_miss,
+            agent_power=agent_power,
+            player_rating=player_rating,
+            extra_base_strategy_models=None,
+            stack_results=False,
+            timings=timings,
+        )
         all_rollout_results = (
-            cache.get(set_orders_dicts, on_miss)
+            cache.get(set_orders_dicts, on_miss, timings=timings)
             if cache is not None
             else on_miss(set_orders_dicts)
         )
@@ -434,20 +522,95 @@ class BaseStrategyModelRollouts:
 
         if timings is None:
             timings = TimingCtx()
+        on_miss = self._maybe_with_transpositions(
+            game,
+            on_miss,
+            agent_power=agent_power,
+            player_rating=player_rating,
+            extra_base_strategy_models=extra_base_strategy_models,
+            stack_results=True,
+            timings=timings,
+        )
         if cache is not None:
             timings.start("cache")
 
         all_rollout_results = (
-            cache.get_multi(set_orders_dicts, on_miss)
+            cache.get_multi(set_orders_dicts, on_miss, timings=timings)
             if cache is not None
             else on_miss(set_orders_dicts)
         )
 
         return all_rollout_results
 
-    @staticmethod
-    def build_cache() -> "RolloutResultsCache":
-        return RolloutResultsCache()
+    def _maybe_with_transpositions(
+        self,
+        game: pydipcc.Game,
+        on_miss: Callable[[List[JointAction]], T],
+        *,
+        agent_power: Optional[Power],
+        player_rating: Optional[PlayerRating],
+        extra_base_strategy_models: Optional[List[BaseStrategyModelWrapper]],
+        stack_results: bool,
+        timings: Optional[TimingCtx],
+    ) -> Callable[[List[JointAction]], T]:
+        """Wraps on_miss so that rollout results are also looked up in the transposition table.
+
+        Rollout results of a joint action are shared by all searches from the same board with
+        the same models and rollout settings, even across agents. Note that sampled rollouts
+        (max_rollout_length > 0) are then reused across searches instead of being sampled again.
+
+        If stack_results, on_miss returns a tensor (as do_rollouts_multi) rather than a list.
+        """
+        if not self.use_transposition_table:
+            return on_miss
+        root_key = (
+            "rollouts_multi" if stack_results else "rollouts",
+            self.get_settings_key(),
+            agent_power,
+            player_rating,
+            tuple(m.value_model_key for m in extra_base_strategy_models or []),
+        ) + board_key(game)
+
+        def on_miss_with_transpositions(set_orders_dicts: List[JointAction]):
+            if not set_orders_dicts:
+                # E.g., RolloutResultsCache.get_multi with no joint actions.
+                return on_miss(set_orders_dicts)
+            keys = [root_key + (frozenset(d.items()),) for d in set_orders_dicts]
+            results = get_transposition_table().get_or_compute_multi(
+                keys,
+                lambda indices: on_miss([set_orders_dicts[i] for i in indices]),
+                timings=timings,
+                stats_prefix="transposition.rollouts",
+            )
+            return torch.stack(results, 0) if stack_results else results
+
+        return on_miss_with_transpositions
+
+    def get_settings_key(self) -> Tuple:
+        """Models and settings rollout results depend on, as a key for the transposition table.
+
+        Built on each call, as some settings are temporarily redefined (e.g. max_rollout_length).
+        """
+        return (
+            self.base_strategy_model.policy_model_key,
+            self.base_strategy_model.value_model_key,
+            self.has_press,
+            self.temperature,
+            self.top_p,
+            self.max_rollout_length,
+            self.mix_square_ratio_scoring,
+            self.average_n_rollouts,
+            self.set_player_ratings,
+            None
+            if self.year_spring_prob_of_ending is None
+            else tuple(sorted(self.year_spring_prob_of_ending.items())),
+        )
+
+    def build_cache(self) -> "RolloutResultsCache":
+        return RolloutResultsCache(max_memory_bytes=self.cache_max_memory_bytes)
+
+    def load_cache(self, path: str) -> "RolloutResultsCache":
+        return RolloutResultsCache.load(path, max_memory_bytes=self.cache_max_memory_bytes)
 
 
 def repeat(seq, n):
@@ -464,49 +627,210 @@ def groups_of(seq, n):
 
 
 class RolloutResultsCache:
-    def __init__(self):
-        self.cache = {}
+    """Cache of rollout results of joint actions, for searches from a single position.
+
+    Joint actions are interned: each action of a power gets a small integer id, and a joint
+    action is keyed by the tuple of action ids of all powers, so that lookups don't build a
+    frozenset of the order dict. Values are rows of a single float tensor. If max_memory_bytes
+    is positive, least recently used joint actions are evicted to keep the estimated memory of
+    the cache under it.
+
+    A cache stores either results of get (rollout results) or of get_multi (values of several
+    value functions), not both.
+    """
+
+    # Estimated memory used by an entry in addition to its values: key tuple and dict slot.
+    ENTRY_OVERHEAD_BYTES = 200
+    SERIALIZATION_VERSION = 1
+
+    def __init__(self, max_memory_bytes: int = 0):
+        self.max_memory_bytes = max_memory_bytes
+        # Per power, action -> id. Ids are never released as actions are shared by many entries.
+        self._action_ids: List[Dict[Action, int]] = [{} for _ in POWERS]
+        # Joint action key -> row in self._values, least recently used first.
+        self._rows: "collections.OrderedDict[Tuple[int, ...], int]" = collections.OrderedDict()
+        self._free_rows: List[int] = []
+        self._num_rows = 0
+        self._values: Optional[torch.Tensor] = None
         self.hits = 0
         self.calls = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _joint_action_key(self, joint_action: JointAction) -> Tuple[int, ...]:
+        return tuple(
+            -1 if power not in joint_action else ids.setdefault(joint_action[power], len(ids))
+            for power, ids in zip(POWERS, self._action_ids)
+        )
+
+    def _max_entries(self) -> Optional[int]:
+        if self.max_memory_bytes <= 0 or self._values is None:
+            return None
+        entry_bytes = self._values.shape[1:].numel() * self._values.element_size()
+        return max(1, self.max_memory_bytes // (entry_bytes + self.ENTRY_OVERHEAD_BYTES))
+
+    def memory_bytes(self) -> int:
+        """Estimated memory used by the cache."""
+        values_bytes = (
+            0 if self._values is None else self._values.nelement() * self._values.element_size()
+        )
+        return values_bytes + len(self._rows) * self.ENTRY_OVERHEAD_BYTES
+
+    def _reserve(self, num_rows: int) -> None:
+        assert self._values is not None
+        capacity = len(self._values)
+        if num_rows <= capacity:
+            return
+        new_capacity = max(num_rows, 2 * capacity)
+        max_entries = self._max_entries()
+        if max_entries is not None:
+            new_capacity = min(new_capacity, max_entries)
+        new_values = self._values.new_empty((new_capacity,) + self._values.shape[1:])
+        new_values[:capacity] = self._values
+        self._values = new_values
+
+    def _insert(self, keys: List[Tuple[int, ...]], values: torch.Tensor) -> None:
+        if self._values is None:
+            self._values = values.new_empty((0,) + values.shape[1:])
+        assert (
+            self._values.shape[1:] == values.shape[1:]
+        ), f"Cannot mix values of shape {values.shape[1:]} and {self._values.shape[1:]} in cache"
+        max_entries = self._max_entries()
+        if max_entries is not None:
+            keys, values = keys[-max_entries:], values[-max_entries:]
+            while len(self._rows) + len(keys) > max_entries:
+                _, row = self._rows.popitem(last=False)
+                self._free_rows.append(row)
+                self.evictions += 1
+        rows = []
+        for _ in keys:
+            if self._free_rows:
+                rows.append(self._free_rows.pop())
+            else:
+                rows.append(self._num_rows)
+                self._num_rows += 1
+        self._reserve(self._num_rows)
+        self._values[rows] = values
+        self._rows.update(zip(keys, rows))
 
     def _get(
         self,
         set_orders_dicts: List[JointAction],
-        onmiss_fn: Callable[[List[JointAction]], Iterable[T]],
-    ) -> List[T]:
-        joint_actions = tuple(frozenset(d.items()) for d in set_orders_dicts)
-        n_unique = len(frozenset(joint_actions))
-        self.calls += n_unique
+        onmiss_fn: Callable[[List[JointAction]], T],
+        to_values: Callable[[T], torch.Tensor],
+        timings: Optional[TimingCtx],
+    ) -> torch.Tensor:
+        """Returns a tensor of values for each joint action, calling onmiss_fn for unknown ones.
 
-        unknown_order_dicts = [
-            set_orders_dicts[i]
-            for i, joint_action in enumerate(joint_actions)
-            if joint_action not in self.cache
-        ]
+        to_values converts results of onmiss_fn to a tensor of values with a row per joint action.
+        """
+        keys = [self._joint_action_key(d) for d in set_orders_dicts]
+        hit_positions, hit_rows = [], []
+        miss_positions, miss_indices = [], []
         # Minor optimization. Orders may have duplicates.
-        unknown_order_dicts = list({frozenset(x.items()): x for x in unknown_order_dicts}.values())
-        self.hits += n_unique - len(unknown_order_dicts)
-        for set_order_dict, r in zip(unknown_order_dicts, onmiss_fn(unknown_order_dicts)):
-            joint_action = frozenset(set_order_dict.items())
-            self.cache[joint_action] = r
-        results = [self.cache[joint_action] for joint_action in joint_actions]
+        unknown_index_per_key: Dict[Tuple[int, ...], int] = {}
+        for i, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is not None:
+                self._rows.move_to_end(key)
+                hit_positions.append(i)
+                hit_rows.append(row)
+            else:
+                miss_positions.append(i)
+                index = unknown_index_per_key.setdefault(key, len(unknown_index_per_key))
+                miss_indices.append(index)
+        n_unique = len(frozenset(keys))
+        self.calls += n_unique
+        self.hits += n_unique - len(unknown_index_per_key)
+        if timings is not None:
+            timings.count("rollout_cache.hit", n_unique - len(unknown_index_per_key))
+            timings.count("rollout_cache.miss", len(unknown_index_per_key))
+
+        unknown_order_dicts: List[JointAction] = [{}] * len(unknown_index_per_key)
+        for i, index in zip(miss_positions, miss_indices):
+            unknown_order_dicts[index] = set_orders_dicts[i]
+        new_values = None
+        if unknown_order_dicts:
+            new_values = to_values(onmiss_fn(unknown_order_dicts)).float().cpu()
+        values = new_values if self._values is None else self._values
+        assert values is not None
+        results = values.new_empty((len(keys),) + values.shape[1:])
+        if hit_rows:
+            results[hit_positions] = self._values[hit_rows]
+        if new_values is not None:
+            results[miss_positions] = new_values[miss_indices]
+            self._insert(list(unknown_index_per_key), new_values)
         return results
 
     def get(
         self,
         set_orders_dicts: List[JointAction],
         onmiss_fn: Callable[[List[JointAction]], RolloutResults],
+        timings: Optional[TimingCtx] = None,
     ) -> RolloutResults:
-        return self._get(set_orders_dicts, onmiss_fn)
+        if not set_orders_dicts:
+            return []
+        values = self._get(
+            set_orders_dicts,
+            onmiss_fn,
+            lambda results: torch.tensor([[r[1][p] for p in POWERS] for r in results]),
+            timings,
+        )
+        return [
+            (set_orders_dict, dict(zip(POWERS, power_values)))
+            for set_orders_dict, power_values in zip(set_orders_dicts, values.tolist())
+        ]
 
     def get_multi(
         self,
         set_orders_dicts: List[JointAction],
         onmiss_fn: Callable[[List[JointAction]], torch.Tensor],
+        timings: Optional[TimingCtx] = None,
     ) -> torch.Tensor:
-        return torch.stack(self._get(set_orders_dicts, onmiss_fn), 0)
+        if not set_orders_dicts:
+            return onmiss_fn(set_orders_dicts)
+        return self._get(set_orders_dicts, onmiss_fn, lambda values: values, timings)
+
+    def save(self, path: str) -> None:
+        """Saves all entries, e.g. to resume an interrupted search with load.
+
+        Writes to a temporary file that is then renamed, so that path always holds a full cache.
+        """
+        data = dict(
+            version=self.SERIALIZATION_VERSION,
+            # Ids were assigned in insertion order.
+            actions=[list(ids) for ids in self._action_ids],
+            keys=torch.tensor(list(self._rows), dtype=torch.int32).view(-1, len(POWERS)),
+            values=None if self._values is None else self._values[list(self._rows.values())],
+        )
+        with atomicish_open_for_writing_binary(path) as f:
+            torch.save(data, f)
+
+    @classmethod
+    def load(cls, path: str, max_memory_bytes: int = 0) -> "RolloutResultsCache":
+        data = torch.load(path)
+        assert (
+            data["version"] == cls.SERIALIZATION_VERSION
+        ), f"Unsupported rollout cache version {data['version']} in {path}"
+        cache = cls(max_memory_bytes=max_memory_bytes)
+        cache._action_ids = [
+            {action: i for i, action in enumerate(actions)} for actions in data["actions"]
+        ]
+        if data["values"] is not None and len(data["values"]):
+            cache._insert([tuple(key) for key in data["keys"].tolist()], data["values"])
+        return cache
 
     def __repr__(self):
-        return "RolloutResultsCache[hits/calls = {} / {} = {:.3f}]".format(
-            self.hits, self.calls, 0 if self.calls == 0 else self.hits / self.calls
+        return (
+            "RolloutResultsCache[hits/calls = {} / {} = {:.3f}, size={}, evictions={}, "
+            "memory={:.1f}MB]".format(
+                self.hits,
+                self.calls,
+                0 if self.calls == 0 else self.hits / self.calls,
+                len(self._rows),
+                self.evictions,
+                self.memory_bytes() / (1024 * 1024),
+            )
         )
@@ -34,6 +34,7 @@ from fairdiplomacy.utils.order_idxs import (
 )
 from fairdiplomacy.utils.thread_pool_encoding import FeatureEncoder
 from fairdiplomacy.utils.timing_ctx import DummyCtx, TimingCtx
+from fairdiplomacy.utils.transposition_table import board_key, get_transposition_table
 
 
 class BaseStrategyModelWrapper:
@@ -73,6 +74,10 @@ class BaseStrategyModelWrapper:
         self.max_batch_size = max_batch_size
         self.half_precision = half_precision
         self.force_disable_all_power = force_disable_all_power
+        # Identify the models in keys of the process-wide transposition table. Keys must not
+        # hold references to the models, so that the table does not keep them in memory.
+        self.policy_model_key = (str(model_path), half_precision, force_disable_all_power)
+        self.value_model_key = (str(value_model_path or model_path), half_precision)
         if half_precision:
             self.model.half()
             if self.value_model is not self.model:
@@ -369,7 +374,25 @@ class BaseStrategyModelWrapper:
     def get_values(
         self, game: pydipcc.Game, *, has_press: bool, agent_power: Optional[Power]
     ) -> torch.Tensor:
-        return self.forward_values([game], has_press=has_press, agent_power=agent_power)[0]
+        table = get_transposition_table()
+        if not table.enabled:
+            return self.forward_values([game], has_press=has_press, agent_power=agent_power)[0]
+        key = self.get_values_key(game, has_press=has_press, agent_power=agent_power)
+        values = table.get(key)
+        if values is None:
+            values = self.forward_values([game], has_press=has_press, agent_power=agent_power)[0]
+            values = values.float().cpu()
+            table.put(key, values)
+        return values.clone()
+
+    def get_values_key(
+        self, game: pydipcc.Game, *, has_press: bool, agent_power: Optional[Power]
+    ) -> Tuple:
+        """Key of the value-head output for this position in the transposition table.
+
+        Values computed with the same value model checkpoint are shared across wrappers.
+        """
+        return ("values", self.value_model_key, has_press, agent_power) + board_key(game)
 
     def is_all_powers(self) -> bool:
         return not self.force_disable_all_power and self.model.is_all_powers()
@@ -9,11 +9,13 @@ from collections import defaultdict
 import math
 from typing import Callable, DefaultDict, Dict, List, Set, Tuple, Optional, Any
 import collections
+import concurrent.futures
 import copy
 import functools
 import itertools
 import json
 import logging
+import os
 import random
 import tabulate
 import time
@@ -447,6 +449,8 @@ class SearchBotAgent(BaseSearchAgent):
         self.n_rollouts = cfg.n_rollouts
         self.cache_rollout_results = cfg.cache_rollout_results
         self.precompute_cache = cfg.precompute_cache
+        self.rollout_cache_dir = cfg.rollout_cache_dir
+        self.pipelined_cfr = cfg.pipelined_cfr
         self.enable_compute_nash_conv = cfg.enable_compute_nash_conv
         self.n_plausible_orders = cfg.plausible_orders_cfg.n_plausible_orders
         self.use_optimistic_cfr = cfg.use_optimistic_cfr
@@ -755,6 +759,16 @@ class SearchBotAgent(BaseSearchAgent):
         maybe_rollout_results_cache = (
             self.base_strategy_model_rollouts.build_cache() if self.cache_rollout_results else None
         )
+        rollout_cache_path = (
+            self.get_rollout_cache_path(game, agent_power)
+            if maybe_rollout_results_cache is not None
+            else None
+        )
+        if rollout_cache_path is not None and os.path.exists(rollout_cache_path):
+            maybe_rollout_results_cache = self.base_strategy_model_rollouts.load_cache(
+                rollout_cache_path
+            )
+            logging.info(f"Loaded {maybe_rollout_results_cache} from {rollout_cache_path}")
 
         if bp_policy is None:
             bp_policy = self.get_plausible_orders_policy(
@@ -811,37 +825,8 @@ class SearchBotAgent(BaseSearchAgent):
         else:
             bilateral_stats = None
 
-        logging.info("Starting CFR iters...")
-        last_search_iter = False
-        for cfr_iter in range(self.n_rollouts):
-            if last_search_iter:
-                logging.info(f"Early exit from CFR after {cfr_iter} iterations by timeout")
-                break
-            elif deadline is not None and time.monotonic() >= deadline:
-                last_search_iter = True
-            timings.start("start")
-            # do verbose logging on 2^x iters
-            verbose_log_iter = self.is_verbose_log_iter(cfr_iter) or last_search_iter
-
-            timings.start("query_policy")
-            # get policy probs for all powers
-
-            power_action_ps = self.get_cur_iter_strategies(cfr_data, cfr_iter)
-
-            timings.start("apply_orders")
-            # sample policy for all powers
-            _, power_sampled_orders = sample_orders_from_policy(
-                cfr_data.power_plausible_orders, power_action_ps
-            )
-            if bilateral_stats is not None:
-                bilateral_stats.accum_bilateral_probs(power_sampled_orders, weight=cfr_iter)
-            set_orders_dicts = make_set_orders_dicts(
-                cfr_data.power_plausible_orders, power_sampled_orders
-            )
-
-            timings.stop()
-
-            all_rollout_results = self.base_strategy_model_rollouts.do_rollouts_maybe_cached(
+        def run_rollouts(set_orders_dicts: List[JointAction], timings: TimingCtx):
+            return self.base_strategy_model_rollouts.do_rollouts_maybe_cached(
                 game,
                 agent_power=agent_power,
                 set_orders_dicts=set_orders_dicts,
@@ -849,57 +834,140 @@ class SearchBotAgent(BaseSearchAgent):
                 timings=timings,
                 player_rating=self.player_rating,
             )
-            timings.start("cfr")
 
-            for pwr, actions in cfr_data.power_plausible_orders.items():
-                # pop this power's results
-                results, all_rollout_results = (
-                    all_rollout_results[: len(actions)],
-                    all_rollout_results[len(actions) :],
-                )
-                if bilateral_stats is not None:
-                    bilateral_stats.accum_bilateral_values(pwr, cfr_iter, results)
-                # logging.info(f"Results {pwr} = {results}")
-                # calculate regrets
-                action_utilities: List[float] = [r[1][pwr] for r in results]
-                state_utility: float = np.dot(power_action_ps[pwr], action_utilities)  # type: ignore
-
-                # log some action values
-                if verbose_log_iter:
-                    self.log_cfr_iter_state(
-                        game=game,
+        # With pipelined_cfr, rollouts of the next iteration run in a background thread while
+        # regrets of the current iteration are applied. The next iteration is then sampled from
+        # the strategy before the current update (see pipelined_cfr in agents.proto).
+        rollouts_executor = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=1) if self.pipelined_cfr else None
+        )
+        # (power_action_ps, power_sampled_orders, rollouts future, rollouts timings)
+        prefetched_iter = None
+
+        try:
+            logging.info("Starting CFR iters...")
+            last_search_iter = False
+            for cfr_iter in range(self.n_rollouts):
+                if last_search_iter:
+                    logging.info(f"Early exit from CFR after {cfr_iter} iterations by timeout")
+                    break
+                elif deadline is not None and time.monotonic() >= deadline:
+                    last_search_iter = True
+                timings.start("start")
+                # do verbose logging on 2^x iters
+                verbose_log_iter = self.is_verbose_log_iter(cfr_iter) or last_search_iter
+
+                if prefetched_iter is not None:
+                    timings.start("wait_rollouts")
+                    power_action_ps, power_sampled_orders, future, rollouts_timings = (
+                        prefetched_iter
+                    )
+                    prefetched_iter = None
+                    all_rollout_results = future.result()
+                    timings += rollouts_timings
+                else:
+                    power_action_ps, power_sampled_orders, set_orders_dicts = self.sample_cfr_iter(
+                        cfr_data, cfr_iter, bilateral_stats, timings
+                    )
+                    all_rollout_results = run_rollouts(set_orders_dicts, timings)
+
+                if (
+                    rollouts_executor is not None
+                    and not last_search_iter
+                    and cfr_iter + 1 < self.n_rollouts
+                ):
+                    next_power_action_ps, next_power_sampled_orders, set_orders_dicts = (
+                        self.sample_cfr_iter(cfr_data, cfr_iter + 1, bilateral_stats, timings)
+                    )
+                    rollouts_timings = TimingCtx()
+                    prefetched_iter = (
+                        next_power_action_ps,
+                        next_power_sampled_orders,
+                        rollouts_executor.submit(run_rollouts, set_orders_dicts, rollouts_timings),
+                        rollouts_timings,
+                    )
+                timings.start("cfr")
+
+                for pwr, actions in cfr_data.power_plausible_orders.items():
+                    # pop this power's results
+                    results, all_rollout_results = (
+                        all_rollout_results[: len(actions)],
+                        all_rollout_results[len(actions) :],
+                    )
+                    if bilateral_stats is not None:
+                        bilateral_stats.accum_bilateral_values(pwr, cfr_iter, results)
+                    # logging.info(f"Results {pwr} = {results}")
+                    # calculate regrets
+                    action_utilities: List[float] = [r[1][pwr] for r in results]
+                    state_utility: float = np.dot(power_action_ps[pwr], action_utilities)  # type: ignore
+
+                    # log some action values
+                    if verbose_log_iter:
+                        self.log_cfr_iter_state(
+                            game=game,
+                            pwr=pwr,
+                            actions=actions,
+                            cfr_data=cfr_data,
+                            cfr_iter=cfr_iter,
+                            state_utility=state_utility,
+                            action_utilities=action_utilities,
+                            power_sampled_orders=power_sampled_orders,
+                        )
+
+                    # update cfr data structures
+                    cfr_data.update(
                         pwr=pwr,
                         actions=actions,
-                        cfr_data=cfr_data,
-                        cfr_iter=cfr_iter,
                         state_utility=state_utility,
                         action_utilities=action_utilities,
-                        power_sampled_orders=power_sampled_orders,
+                        which_strategy_to_accumulate=CFRStats.ACCUMULATE_PREV_ITER,
+                        cfr_iter=cfr_iter,
                     )
 
-                # update cfr data structures
-                cfr_data.update(
-                    pwr=pwr,
-                    actions=actions,
-                    state_utility=state_utility,
-                    action_utilities=action_utilities,
-                    which_strategy_to_accumulate=CFRStats.ACCUMULATE_PREV_ITER,
-                    cfr_iter=cfr_iter,
+                # Save after iterations 2^k - 1 and the last one, so that an interrupted search
+                # loses at most half of its rollouts.
+                save_rollout_cache = rollout_cache_path is not None and (
+                    cfr_iter & (cfr_iter + 1) == 0 or verbose_log_iter
                 )
+                if prefetched_iter is not None and (
+                    save_rollout_cache
+                    or (
+                        verbose_log_iter
+                        and (
+                            self.enable_compute_nash_conv
+                            or maybe_rollout_results_cache is not None
+                        )
+                    )
+                ):
+                    # The model and the rollouts cache are not thread-safe.
+                    timings.start("wait_rollouts")
+                    concurrent.futures.wait([prefetched_iter[2]])
+
+                if self.enable_compute_nash_conv and verbose_log_iter:
+                    logging.info(f"Computing nash conv for iter {cfr_iter}")
+                    self.compute_nash_conv(
+                        cfr_data,
+                        f"cfr iter {cfr_iter}",
+                        game,
+                        cfr_data.avg_strategy,
+                        maybe_rollout_results_cache,
+                        agent_power=agent_power,
+                    )
 
-            if self.enable_compute_nash_conv and verbose_log_iter:
-                logging.info(f"Computing nash conv for iter {cfr_iter}")
-                self.compute_nash_conv(
-                    cfr_data,
-                    f"cfr iter {cfr_iter}",
-                    game,
-                    cfr_data.avg_strategy,
-                    maybe_rollout_results_cache,
-                    agent_power=agent_power,
-                )
+                if maybe_rollout_results_cache is not None and verbose_log_iter:
+                    logging.info(f"{maybe_rollout_results_cache}")
 
-            if maybe_rollout_results_cache is not None and verbose_log_iter:
-                logging.info(f"{maybe_rollout_results_cache}")
+                if save_rollout_cache:
+                    assert (
+                        rollout_cache_path is not None and maybe_rollout_results_cache is not None
+                    )
+                    timings.start("rollout_cache_save")
+                    maybe_rollout_results_cache.save(rollout_cache_path)
+        finally:
+            # Also on exceptions (e.g. agent interruption), so that the rollouts thread is not
+            # left running.
+            if rollouts_executor is not None:
+                rollouts_executor.shutdown()
 
         timings.start("to_dict")
 
@@ -935,6 +1003,8 @@ class SearchBotAgent(BaseSearchAgent):
         if bilateral_stats is not None and self.log_bilateral_values:
             bilateral_stats.log(cfr_data, min_order_prob=self.bilateral_cfg.min_order_prob)
 
+        if maybe_rollout_results_cache is not None:
+            logging.getLogger("timings").info(f"{maybe_rollout_results_cache}")
         timings.pprint(logging.getLogger("timings").info)
 
         return CFRResult(
@@ -946,6 +1016,51 @@ class SearchBotAgent(BaseSearchAgent):
             bilateral_stats=bilateral_stats,
         )
 
+    def sample_cfr_iter(
+        self,
+        cfr_data: CFRData,
+        cfr_iter: int,
+        bilateral_stats: Optional[BilateralStats],
+        timings: TimingCtx,
+    ) -> Tuple[Dict[Power, List[float]], JointAction, List[JointAction]]:
+        """Sample joint actions of a CFR iteration from the current strategies.
+
+        Returns the strategies, the sampled joint action, and joint actions to roll out.
+        """
+        timings.start("query_policy")
+        # get policy probs for all powers
+
+        power_action_ps = self.get_cur_iter_strategies(cfr_data, cfr_iter)
+
+        timings.start("apply_orders")
+        # sample policy for all powers
+        _, power_sampled_orders = sample_orders_from_policy(
+            cfr_data.power_plausible_orders, power_action_ps
+        )
+        if bilateral_stats is not None:
+            bilateral_stats.accum_bilateral_probs(power_sampled_orders, weight=cfr_iter)
+        set_orders_dicts = make_set_orders_dicts(
+            cfr_data.power_plausible_orders, power_sampled_orders
+        )
+
+        timings.stop()
+        return power_action_ps, power_sampled_orders, set_orders_dicts
+
+    def get_rollout_cache_path(self, game: Game, agent_power: Optional[Power]) -> Optional[str]:
+        """Path where the rollout results cache of a search from this position is saved."""
+        if not self.rollout_cache_dir:
+            return None
+        os.makedirs(self.rollout_cache_dir, exist_ok=True)
+        return os.path.join(
+            self.rollout_cache_dir,
+            "rollouts_{}_{}_{}_{}.pt".format(
+                game.current_short_phase,
+                game.compute_board_hash(),
+                agent_power,
+                self.player_rating,
+            ),
+        )
+
     def run_bilateral_search_with_conditional_evs(
         self, game: Game, *args, **kwargs,
     ):
@@ -99,3 +99,12 @@ class CFRAgentTest(unittest.TestCase):
         policy = player.run_search(game).get_population_policy()["FRANCE"]
         self.assertTrue(type(policy), Policy)
         self.assertNotEqual(policy, {})
+
+    def test_pipelined_cfr(self):
+        game = Game()
+        agent = SearchBotAgent(agents_cfgs.SearchBotAgent(**DEFAULT_CFG, pipelined_cfr=True))
+        player = Player(agent, power="FRANCE")
+        cfr_data = player.run_search(game).cfr_data
+        assert cfr_data is not None
+        vals = [cfr_data.avg_utility(p) for p in POWERS]
+        self.assertAlmostEqual(sum(vals), 1.0, places=4)
@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 #
 from abc import ABC, abstractmethod
+import functools
 import json
 import logging
 from parlai_diplomacy.utils.game2seq.format_helpers.message_history import MessageObjectPart
@@ -24,6 +25,7 @@ from fairdiplomacy.utils import game_scoring
 from fairdiplomacy.utils.atomicish_file import atomicish_open_for_writing
 from fairdiplomacy.utils.game import game_from_view_of
 from fairdiplomacy.utils.sampling import sample_p_dict
+from fairdiplomacy.utils.transposition_table import TranspositionTable
 from fairdiplomacy.utils.typedefs import get_last_message
 from fairdiplomacy.utils.yearprob import get_prob_of_latest_year_leq
 import fairdiplomacy.variance_reduction
@@ -510,22 +512,15 @@ def add_messages_to_game_object(game: Game, messages: List[MessageDict],profile:
     alive_powers = get_alive_powers(game)
     assert alive_powers[0] == alive_powers[0].upper(), "Bad power name formatting!"
 
-    num_beams   = 4
-    batch_size  = 16
-    device = 'cuda:0'
-    model_dir  = '/diplomacy_cicero/fairdiplomacy/AMR/amrlib/amrlib/data/model_parse_xfm/checkpoint-9920/'
-    inference = Inference(model_dir, batch_size=batch_size, num_beams=num_beams, device=device)
     power_dict = {'ENGLAND':'ENG','FRANCE':'FRA','GERMANY':'GER','ITALY':'ITA','AUSTRIA':'AUS','RUSSIA':'RUS','TURKEY':'TUR'}
     af_dict = {'A':'AMY','F':'FLT'}
-    for message in messages:
+    # All messages of the round are translated in one batched call.
+    translations = get_daide_translator().translate(messages)
+    for message, (daide_status, daide_s) in zip(messages, translations):
         logging.info(
                 f"({int(message['time_sent'])}) {message['sender']} -> {message['recipient']}: {message['message']}"
             )
         pseudo_code = profile.get_player(message["sender"]).get_pseudo_orders(game=game,recipient=message["recipient"])
-        try:
-            daide_status,daide_s = eng_to_daide(message,inference)
-        except:
-            daide_status,daide_s ='NO-DAIDE',''
         # I didn't test add daide sentence and daide status into the game.add_message function and thus into game object, I will test this whether I can change this function once get gpu.
         # Do we need to add DAIDE-ENG function here?
         if daide_status == 'Full-DAIDE':
@@ -619,32 +614,103 @@ def psudo_code_gene(current_phase_code,message,power_dict,af_dict):
                         string2 += '(XDO (('+power_dict[country]+' '+af_dict[i[8]]+' '+i[10:13]+') CTO '+i[16:19]+' VIA ('+i[2:5]+')) '
     return string1,string2
 
+AMR_MODEL_DIR = '/diplomacy_cicero/fairdiplomacy/AMR/amrlib/amrlib/data/model_parse_xfm/checkpoint-9920/'
+
+
+def message_to_amr_sentence(message: MessageDict) -> str:
+    return message["sender"] + ' send that ' + message["message"]
+
+
 def eng_to_daide(message:MessageDict,inference):
-    gen_graphs = inference.parse_sents([message["sender"]+' send that '+message["message"]], disable_progress=False)
+    gen_graphs = inference.parse_sents([message_to_amr_sentence(message)], disable_progress=False)
     for graph in gen_graphs:
-        amr = AMR()
-        amr_node, s, error_list, snt_id, snt, amr_s = amr.string_to_amr(graph)
-        if amr_node:
-            amr.root = amr_node
-        try:
-            amr_s2 = amr.amr_to_string()
-        except RecursionError:
-            return 'No-DAIDE',''
-        if amr_s2 == '(a / amr-empty)':
-            daide_s, warnings = '', []
-        else:
-            daide_s, warnings = amr.amr_to_daide()
-        if regex.search(r'[A-Z]{3}', daide_s):
-            if regex.search(r'[a-z]', daide_s):
-                daide_status = 'Partial-DAIDE'
-            elif warnings:
-                daide_status = 'Para-DAIDE'
-            else:
-                daide_status = 'Full-DAIDE'
+        return amr_graph_to_daide(graph)
+
+
+def amr_graph_to_daide(graph: str) -> Tuple[str, str]:
+    """Convert a parsed AMR graph to (daide_status, daide_string)."""
+    amr = AMR()
+    amr_node, s, error_list, snt_id, snt, amr_s = amr.string_to_amr(graph)
+    if amr_node:
+        amr.root = amr_node
+    try:
+        amr_s2 = amr.amr_to_string()
+    except RecursionError:
+        return 'No-DAIDE',''
+    if amr_s2 == '(a / amr-empty)':
+        daide_s, warnings = '', []
+    else:
+        daide_s, warnings = amr.amr_to_daide()
+    if regex.search(r'[A-Z]{3}', daide_s):
+        if regex.search(r'[a-z]', daide_s):
+            daide_status = 'Partial-DAIDE'
+        elif warnings:
+            daide_status = 'Para-DAIDE'
         else:
-            daide_status = 'No-DAIDE'
+            daide_status = 'Full-DAIDE'
+    else:
+        daide_status = 'No-DAIDE'
+
+    return daide_status,daide_s
+
 
-        return daide_status,daide_s
+class DaideTranslator:
+    """English to DAIDE translation of messages with an AMR parser loaded once.
+
+    Use get_daide_translator to share a translator within the process. Translations are
+    cached by sender and message text, and messages missing from the cache are parsed in a
+    single batched call. Messages the parser failed on (e.g. out of GPU memory) are translated
+    as No-DAIDE but not cached, so that they are parsed again next time.
+    """
+
+    def __init__(
+        self,
+        model_dir: str = AMR_MODEL_DIR,
+        *,
+        device: Optional[str] = None,
+        batch_size: int = 16,
+        num_beams: int = 4,
+        cache_size: int = 100000,
+    ):
+        if device is None:
+            device = 'cuda:0' if torch.cuda.is_available() else 'cpu'
+        logging.info(f"Loading AMR parser from {model_dir} on {device}")
+        self.inference = Inference(model_dir, batch_size=batch_size, num_beams=num_beams, device=device)
+        self.cache = TranspositionTable(max_size=cache_size)
+
+    def translate(self, messages: List[MessageDict]) -> List[Tuple[str, str]]:
+        """Return (daide_status, daide_string) for each message."""
+        sentences = [message_to_amr_sentence(message) for message in messages]
+        results = self.cache.get_or_compute_multi(
+            sentences, lambda indices: self._translate_sentences([sentences[i] for i in indices])
+        )
+        return [('No-DAIDE', '') if result is None else result for result in results]
+
+    def _translate_sentences(self, sentences: List[str]) -> List[Optional[Tuple[str, str]]]:
+        """Return (daide_status, daide_string) for each sentence, or None if parsing failed."""
+        try:
+            graphs = self.inference.parse_sents(sentences, disable_progress=True)
+        except Exception:
+            if len(sentences) == 1:
+                logging.exception(f"Failed to parse {sentences[0]!r}")
+                return [None]
+            # Isolate failing sentences.
+            return [r for sentence in sentences for r in self._translate_sentences([sentence])]
+        results: List[Optional[Tuple[str, str]]] = []
+        for graph in graphs:
+            try:
+                results.append(amr_graph_to_daide(graph))
+            except Exception:
+                # The graph is deterministic for a sentence, so the failure can be cached.
+                logging.exception(f"Failed to convert AMR graph to DAIDE: {graph!r}")
+                results.append(('No-DAIDE', ''))
+        return results
+
+
+@functools.lru_cache(maxsize=None)
+def get_daide_translator(model_dir: str = AMR_MODEL_DIR, device: Optional[str] = None) -> DaideTranslator:
+    """Return a translator shared by the process, loading the parser on first call."""
+    return DaideTranslator(model_dir, device=device)
 
 
 
@@ -33,6 +33,11 @@ class TimingCtx:
     def stop(self):
         self.start(None)
 
+    def count(self, arg, n: int = 1):
+        """Record n untimed events (e.g., cache hits) under arg. Shown in the N column."""
+        self.timings[arg] += 0.0
+        self.ns[arg] += n
+
     def __call__(self, arg):
         if self.arg is not None:
             self.__exit__()
@@ -60,8 +65,9 @@ class TimingCtx:
 
     def __iadd__(self, other):
         if other != 0:
-            self.timings += other.timings
-            self.ns += other.ns
+            # update() rather than += to keep keys of untimed events (see count()).
+            self.timings.update(other.timings)
+            self.ns.update(other.ns)
         return self
 
     def items(self):
@@ -98,7 +104,7 @@ class TimingCtx:
         for k in self.timings.keys():
             n = self.ns[k]
             t_total = self.timings[k]
-            t_mean = t_total / n
+            t_mean = t_total / n if n else 0.0
             data.append((k, n, t_total, t_mean))
         elapsed = time.time() - self.first_tic
         sum_t_total = sum(self.timings.values())
@@ -130,8 +136,8 @@ class TimingCtx:
         subtiming = TimingCtx()
         yield subtiming
         prefix = (prefix.rstrip(".") + ".") if prefix else ""
-        self.timings += {f"{prefix}{k}": v for k, v in subtiming.timings.items()}
-        self.ns += {f"{prefix}{k}": v for k, v in subtiming.ns.items()}
+        self.timings.update({f"{prefix}{k}": v for k, v in subtiming.timings.items()})
+        self.ns.update({f"{prefix}{k}": v for k, v in subtiming.ns.items()})
         if old_arg is not None:
             self.start(old_arg)
 
@@ -0,0 +1,137 @@
+#
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+"""Process-wide transposition table for results computed on board positions.
+
+Search evaluates the same positions again and again: different candidate actions often lead to
+the same board, and consecutive searches (next phase, or another search in the same phase)
+reach positions that were already evaluated. The table maps keys built from the board hash of a
+position (see pydipcc.Game.compute_board_hash, which covers phase, units, centers, and dislodged
+units in retreat phases) to value-head outputs and rollout results, and keeps the most recently
+used entries.
+
+Positions with the same board hash are considered identical, even if they were reached with
+different order histories that some models also read. So the table is disabled (max size 0)
+until configured with a positive size, e.g. by BaseStrategyModelRollouts with
+transposition_table_size set.
+"""
+import collections
+import threading
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from fairdiplomacy import pydipcc
+from fairdiplomacy.utils.timing_ctx import TimingCtx
+
+T = TypeVar("T")
+
+
+class TranspositionTable:
+    """Thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "collections.OrderedDict[Hashable, object]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute_multi(
+        self,
+        keys: Sequence[Hashable],
+        compute_fn: Callable[[List[int]], Sequence[T]],
+        timings: Optional[TimingCtx] = None,
+        stats_prefix: str = "transposition",
+    ) -> List[T]:
+        """Return values for all keys, computing missing ones with a single call.
+
+        compute_fn receives indices (in keys) of missing keys, each distinct key appearing once,
+        and must return their values in the same order. None values (e.g. failed computations)
+        are returned but not stored. Hits and misses are counted in timings as
+        "<stats_prefix>.hit" and "<stats_prefix>.miss".
+        """
+        results: List[Optional[T]] = [None] * len(keys)
+        missing_indices: List[int] = []
+        first_index_per_key = {}
+        for i, key in enumerate(keys):
+            value = self.get(key) if self.enabled else None
+            if value is not None:
+                results[i] = value
+            elif key not in first_index_per_key:
+                first_index_per_key[key] = i
+                missing_indices.append(i)
+        if timings is not None:
+            timings.count(f"{stats_prefix}.hit", len(keys) - len(missing_indices))
+            timings.count(f"{stats_prefix}.miss", len(missing_indices))
+        if missing_indices:
+            for i, value in zip(missing_indices, compute_fn(missing_indices)):
+                if value is not None:
+                    self.put(keys[i], value)
+                results[i] = value
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = results[first_index_per_key[key]]
+        return results  # type: ignore
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __repr__(self):
+        calls = self.hits + self.misses
+        return (
+            "TranspositionTable[size={}/{}, hits/calls = {} / {} = {:.3f}, evictions={}]".format(
+                len(self._data),
+                self.max_size,
+                self.hits,
+                calls,
+                0 if calls == 0 else self.hits / calls,
+                self.evictions,
+            )
+        )
+
+
+_TABLE = TranspositionTable(max_size=0)
+
+
+def get_transposition_table() -> TranspositionTable:
+    return _TABLE
+
+
+def configure_transposition_table(max_size: int) -> TranspositionTable:
+    """Enable the process-wide table. Size only grows, as it may be shared by several agents."""
+    _TABLE.max_size = max(_TABLE.max_size, max_size)
+    return _TABLE
+
+
+def board_key(game: pydipcc.Game) -> Tuple[int, str]:
+    return (game.compute_board_hash(), game.current_short_phase)
@@ -0,0 +1,44 @@
+#
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+import unittest
+
+import torch
+
+from fairdiplomacy.action_exploration import score_actions
+from fairdiplomacy.pydipcc import Game
+
+
+class TestScoreActions(unittest.TestCase):
+    def test_score_actions_in_batches(self):
+        actions = [("A PAR - BUR",), ("A PAR - GAS",), ("A PAR H",)]
+        equilibrium = {
+            "FRANCE": {action: 1 / 3 for action in actions},
+            "GERMANY": {("A MUN - BUR",): 0.5, ("A MUN H",): 0.5},
+        }
+        for batch_size, expected_batch_sizes in ((6, [6]), (3, [3, 3])):
+            batch_sizes = []
+
+            def critic(games, power):
+                batch_sizes.append(len(games))
+                units = [game.get_state()["units"][power] for game in games]
+                return torch.tensor(
+                    [float("A BUR" in u) + 0.5 * float("A GAS" in u) for u in units]
+                )
+
+            scores = score_actions(
+                "FRANCE",
+                actions,
+                Game(),
+                critic,
+                equilibrium,
+                max_br_orders=-1,
+                batch_size=batch_size,
+                num_threads=2,
+            )
+            # Moving to BUR bounces if GERMANY moves there too.
+            self.assertEqual(scores, [0.5, 0.5, 0.0])
+            self.assertEqual(batch_sizes, expected_batch_sizes)
@@ -0,0 +1,91 @@
+#
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+import unittest
+from unittest import mock
+
+from fairdiplomacy import env
+from fairdiplomacy.env import DaideTranslator, message_to_amr_sentence
+
+
+class StubInference:
+    """Parser returning sentences as graphs, and failing on batches with "crash" in them."""
+
+    def __init__(self, model_dir, batch_size, num_beams, device):
+        self.batches = []
+        self.crash = True
+
+    def parse_sents(self, sentences, disable_progress):
+        self.batches.append(list(sentences))
+        if self.crash and any("crash" in sentence for sentence in sentences):
+            raise RuntimeError("CUDA out of memory")
+        return sentences
+
+
+def _graph_to_daide(graph):
+    if "bad graph" in graph:
+        raise ValueError(graph)
+    return "Full-DAIDE", graph
+
+
+def _message(sender, text):
+    return dict(sender=sender, recipient="ENGLAND", message=text, phase="S1901M")
+
+
+class TestDaideTranslator(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            mock.patch.object(env, "Inference", StubInference),
+            mock.patch.object(env, "amr_graph_to_daide", _graph_to_daide),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.translator = DaideTranslator("model", device="cpu")
+        self.batches = self.translator.inference.batches
+
+    def test_batching_and_cache(self):
+        m1, m2, m3 = (
+            _message("FRANCE", "hello"),
+            _message("GERMANY", "hello"),
+            _message("ITALY", "hi"),
+        )
+        s1, s2, s3 = [message_to_amr_sentence(m) for m in (m1, m2, m3)]
+        self.assertEqual(
+            self.translator.translate([m1, m2, m1]),
+            [("Full-DAIDE", s1), ("Full-DAIDE", s2), ("Full-DAIDE", s1)],
+        )
+        self.assertEqual(self.batches, [[s1, s2]])
+
+        # Only messages missing from the cache are parsed.
+        self.assertEqual(
+            self.translator.translate([m2, m3]), [("Full-DAIDE", s2), ("Full-DAIDE", s3)]
+        )
+        self.assertEqual(self.batches, [[s1, s2], [s3]])
+        self.assertEqual(self.translator.translate([m3]), [("Full-DAIDE", s3)])
+        self.assertEqual(self.batches, [[s1, s2], [s3]])
+
+    def test_failures(self):
+        ok, crash, bad = (
+            _message("FRANCE", "hello"),
+            _message("FRANCE", "crash"),
+            _message("FRANCE", "bad graph"),
+        )
+        s_ok, s_crash, s_bad = [message_to_amr_sentence(m) for m in (ok, crash, bad)]
+        self.assertEqual(
+            self.translator.translate([ok, crash, bad]),
+            [("Full-DAIDE", s_ok), ("No-DAIDE", ""), ("No-DAIDE", "")],
+        )
+        # Failing batch is parsed again one sentence at a time.
+        self.assertEqual(self.batches, [[s_ok, s_crash, s_bad], [s_ok], [s_crash], [s_bad]])
+
+        # Parser failures are not cached, unlike conversion failures.
+        self.translator.inference.crash = False
+        self.assertEqual(
+            self.translator.translate([ok, crash, bad]),
+            [("Full-DAIDE", s_ok), ("Full-DAIDE", s_crash), ("No-DAIDE", "")],
+        )
+        self.assertEqual(self.batches[4:], [[s_crash]])
@@ -0,0 +1,87 @@
+#
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+import os
+import tempfile
+import unittest
+
+import torch
+
+from fairdiplomacy.agents.base_strategy_model_rollouts import RolloutResultsCache
+from fairdiplomacy.models.consts import POWERS
+from fairdiplomacy.utils.timing_ctx import TimingCtx
+
+
+def _joint_action(i):
+    return {"AUSTRIA": (f"A VIE H {i}",), "FRANCE": ("A PAR H",)}
+
+
+class TestRolloutResultsCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def _on_miss(self, set_orders_dicts):
+        self.calls.append(set_orders_dicts)
+        return [
+            (d, {p: float(len(self.calls) * 10 + i) for i, p in enumerate(POWERS)})
+            for d in set_orders_dicts
+        ]
+
+    def _on_miss_multi(self, set_orders_dicts):
+        self.calls.append(set_orders_dicts)
+        return torch.stack(
+            [torch.full((len(POWERS), 2), float(d["AUSTRIA"][0][-1])) for d in set_orders_dicts]
+        )
+
+    def test_get(self):
+        cache = RolloutResultsCache()
+        timings = TimingCtx()
+        results = cache.get([_joint_action(0), _joint_action(1), _joint_action(0)], self._on_miss)
+        self.assertEqual(self.calls, [[_joint_action(0), _joint_action(1)]])
+        self.assertEqual([r[0] for r in results], [_joint_action(i) for i in (0, 1, 0)])
+        self.assertEqual(results[0][1], results[2][1])
+        self.assertEqual(results[0][1]["AUSTRIA"], 10.0)
+
+        # A joint action with the same orders in a different dict is a hit.
+        results = cache.get(
+            [{"FRANCE": ("A PAR H",), "AUSTRIA": ("A VIE H 1",)}, _joint_action(2)],
+            self._on_miss,
+            timings=timings,
+        )
+        self.assertEqual(self.calls[1], [_joint_action(2)])
+        self.assertEqual(results[0][1]["ENGLAND"], 11.0)
+        self.assertEqual(results[1][1]["AUSTRIA"], 20.0)
+        self.assertEqual((cache.hits, cache.calls), (1, 4))
+        self.assertEqual(timings.ns["rollout_cache.hit"], 1)
+        self.assertEqual(timings.ns["rollout_cache.miss"], 1)
+
+    def test_memory_cap(self):
+        entry_bytes = len(POWERS) * 2 * 4 + RolloutResultsCache.ENTRY_OVERHEAD_BYTES
+        cache = RolloutResultsCache(max_memory_bytes=3 * entry_bytes)
+        for i in range(5):
+            values = cache.get_multi([_joint_action(i)], self._on_miss_multi)
+            self.assertEqual(values.shape, (1, len(POWERS), 2))
+        self.assertEqual((len(cache), cache.evictions), (3, 2))
+        self.assertLessEqual(cache.memory_bytes(), 3 * entry_bytes)
+
+        # Least recently used entries were evicted.
+        del self.calls[:]
+        values = cache.get_multi([_joint_action(i) for i in range(5)], self._on_miss_multi)
+        self.assertEqual(self.calls, [[_joint_action(0), _joint_action(1)]])
+        self.assertEqual(values[:, 0, 0].tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(len(cache), 3)
+
+    def test_save_load(self):
+        cache = RolloutResultsCache()
+        expected = cache.get_multi([_joint_action(i) for i in range(4)], self._on_miss_multi)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.pt")
+            cache.save(path)
+            loaded = RolloutResultsCache.load(path)
+        del self.calls[:]
+        values = loaded.get_multi([_joint_action(i) for i in range(4)], self._on_miss_multi)
+        self.assertEqual(self.calls, [])
+        self.assertTrue(torch.equal(values, expected))
@@ -0,0 +1,104 @@
+#
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+#
+import unittest
+
+import conf.agents_cfgs
+from fairdiplomacy.agents.base_strategy_model_rollouts import BaseStrategyModelRollouts
+from fairdiplomacy.agents.base_strategy_model_wrapper import BaseStrategyModelWrapper
+from fairdiplomacy.pydipcc import Game
+from fairdiplomacy.utils.timing_ctx import TimingCtx
+from fairdiplomacy.utils.transposition_table import TranspositionTable, board_key
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_lru_eviction(self):
+        table = TranspositionTable(max_size=2)
+        table.put("a", 1)
+        table.put("b", 2)
+        self.assertEqual(table.get("a"), 1)
+        table.put("c", 3)  # Evicts "b", least recently used.
+        self.assertIsNone(table.get("b"))
+        self.assertEqual(table.get("a"), 1)
+        self.assertEqual(table.get("c"), 3)
+        self.assertEqual((table.hits, table.misses, table.evictions), (3, 1, 1))
+
+    def test_disabled(self):
+        table = TranspositionTable(max_size=0)
+        table.put("a", 1)
+        self.assertEqual(len(table), 0)
+        # Duplicated keys are still computed once per call.
+        calls = []
+        values = table.get_or_compute_multi(
+            ["a", "b", "a"], lambda indices: calls.append(indices) or [10 * i for i in indices]
+        )
+        self.assertEqual(values, [0, 10, 0])
+        self.assertEqual(calls, [[0, 1]])
+
+    def test_get_or_compute_multi(self):
+        table = TranspositionTable(max_size=10)
+        timings = TimingCtx()
+        calls = []
+
+        def compute(keys):
+            def on_miss(indices):
+                calls.append([keys[i] for i in indices])
+                return [keys[i] * 2 for i in indices]
+
+            return table.get_or_compute_multi(keys, on_miss, timings=timings, stats_prefix="tt")
+
+        self.assertEqual(compute([1, 2, 1]), [2, 4, 2])
+        self.assertEqual(compute([2, 3]), [4, 6])
+        self.assertEqual(calls, [[1, 2], [3]])
+        self.assertEqual(timings.ns["tt.hit"], 2)
+        self.assertEqual(timings.ns["tt.miss"], 3)
+
+        # Counters survive merges of timings.
+        outer = TimingCtx()
+        outer += timings
+        self.assertEqual(outer.ns["tt.hit"], 2)
+        self.assertIn("tt.hit", outer.timings)
+
+    def test_board_key_of_transposed_games(self):
+        game_1 = Game()
+        game_1.set_orders("FRANCE", ["A PAR - BUR", "A MAR - GAS"])
+        game_1.process()
+        game_2 = Game()
+        game_2.set_orders("FRANCE", ["A PAR - GAS", "A MAR - BUR"])
+        game_2.process()
+        game_3 = Game()
+        game_3.process()
+        self.assertEqual(board_key(game_1), board_key(game_2))
+        self.assertNotEqual(board_key(game_1), board_key(game_3))
+
+    def test_keys_do_not_reference_models(self):
+        cfg = conf.agents_cfgs.BaseStrategyModelRollouts(
+            n_threads=1,
+            temperature=1.0,
+            max_rollout_length=0,
+            year_spring_prob_of_ending="1905,0.5",
+        )
+        keys = []
+        for _ in range(2):
+            base_strategy_model = BaseStrategyModelWrapper("MOCKV3", device="cpu")
+            rollouts = BaseStrategyModelRollouts(base_strategy_model, cfg, has_press=False)
+            keys.append(
+                (
+                    base_strategy_model.get_values_key(Game(), has_press=False, agent_power=None),
+                    rollouts.get_settings_key(),
+                )
+            )
+        # Keys are shared by agents with the same checkpoints and settings.
+        self.assertEqual(keys[0], keys[1])
+        hash(keys[0])
+
+        def leaves(key):
+            if isinstance(key, tuple):
+                return [leaf for item in key for leaf in leaves(item)]
+            return [key]
+
+        for leaf in leaves(keys[0]):
+            self.assertIsInstance(leaf, (str, int, float, bool, type(None)))